@@ -17,6 +17,7 @@ echo "[ADUC] Temp dir: $TEMP_DIR"
 echo "[ADUC] Conversation: $ADUC_CONV_PATH"
 
 # Fresh-start cleanup
+rm -rf "$TEMP_DIR/conversation" 2>/dev/null || true
 rm -f "$TEMP_DIR/conversation.json" "$TEMP_DIR/conversation.tmp" \
       "$TEMP_DIR/cli_heartbeat.json" "$TEMP_DIR/usage.json" 2>/dev/null || true
 rm -f "$TEMP_DIR"/prompt_*.txt 2>/dev/null || true
@@ -12,6 +12,7 @@ if "%ADUC_ROOT:~-1%"=="\" set "ADUC_ROOT=%ADUC_ROOT:~0,-1%"
 set "ADUC_TEMP_DIR=%TEMP%\ADUC"
 if not exist "%ADUC_TEMP_DIR%" mkdir "%ADUC_TEMP_DIR%" >nul 2>&1
 echo [ADUC] Resetting temp state in %ADUC_TEMP_DIR%
+if exist "%ADUC_TEMP_DIR%\conversation" rmdir /s /q "%ADUC_TEMP_DIR%\conversation" >nul 2>&1
 if exist "%ADUC_TEMP_DIR%\conversation.json" del /q "%ADUC_TEMP_DIR%\conversation.json" >nul 2>&1
 if exist "%ADUC_TEMP_DIR%\conversation.tmp" del /q "%ADUC_TEMP_DIR%\conversation.tmp" >nul 2>&1
 if exist "%ADUC_TEMP_DIR%\cli_heartbeat.json" del /q "%ADUC_TEMP_DIR%\cli_heartbeat.json" >nul 2>&1
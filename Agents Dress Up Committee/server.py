@@ -4,7 +4,7 @@ Minimal ADUC server
 This is a deliberately small, heavily commented Flask app that:
  - Serves a simple UI (ADUC.html + static assets)
  - Lists familiars from the local folder
- - Bridges chat via a shared temp JSON file (conversation.json)
+ - Bridges chat via a shared temp conversation log (tools/conversation_log.py)
 
 No local LLM or fallback replies. If the CLI watcher is not running,
 the UI will show pending until your external agent writes a reply.
@@ -23,6 +23,8 @@ from pathlib import Path
 
 from flask import Flask, request, jsonify, send_from_directory, send_file
 
+from tools.conversation_log import ConversationLog, notify_watcher
+
 
 # Paths
 BASE_DIR = Path(__file__).resolve().parent
@@ -30,9 +32,10 @@ FAMILIARS_DIR = BASE_DIR / "familiars"
 STATIC_DIR = BASE_DIR / "static"
 PRESETS_DIR = BASE_DIR / "presets" / "layouts"
 
-# Conversation JSON lives in the OS temp directory: <temp>/ADUC/conversation.json
+# Conversation log lives in the OS temp directory: <temp>/ADUC/conversation/
+# (a legacy <temp>/ADUC/conversation.json is imported on first use)
 TEMP_DIR = Path(tempfile.gettempdir()) / "ADUC"
-CONV_PATH = TEMP_DIR / "conversation.json"
+CONV = ConversationLog(TEMP_DIR)
 HEARTBEAT_PATH = TEMP_DIR / "cli_heartbeat.json"
 SETTINGS_PATH = TEMP_DIR / "settings.json"
 USAGE_PATH = TEMP_DIR / "usage.json"
@@ -162,18 +165,15 @@ PROMPT_TAG_RE = re.compile(r"<prompt:\s*([^>]+)>", re.IGNORECASE)
 TRICK_TAG_RE = re.compile(r"<trick:\s*([^>]+)>", re.IGNORECASE)
 
 
-# ---- Conversation JSON helpers ---------------------------------------------
+# ---- Conversation log helpers ----------------------------------------------
 
-def conv_load():
-    """Load the shared conversation document (create a new one if missing)."""
+def conv_append(turn: dict) -> str:
+    """Append a turn to the shared log and wake the watcher if it is a user turn."""
     TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    return read_json(CONV_PATH, {"version": 1, "updated_at": None, "turns": []})
-
-
-def conv_save(doc):
-    """Save the conversation JSON atomically."""
-    doc["updated_at"] = datetime.now(timezone.utc).isoformat()
-    atomic_write_json(CONV_PATH, doc)
+    CONV.append_turn(turn)
+    if turn.get("role") == "user":
+        notify_watcher(TEMP_DIR)
+    return str(turn.get("id"))
 
 
 def dashboard_base_url() -> str:
@@ -622,10 +622,9 @@ def fam_activities_load(fam_id: str) -> list:
 
 def conv_append_user(familiar: str, text: str) -> str:
     """Append a user turn and return its id."""
-    doc = conv_load()
     turn_id = str(uuid.uuid4())
     cyc = focus_cycle_status()
-    doc.setdefault("turns", []).append({
+    conv_append({
         "id": turn_id,
         "familiar": familiar,
         "role": "user",
@@ -639,13 +638,11 @@ def conv_append_user(familiar: str, text: str) -> str:
         "cycle_started_at": cyc.get("started_at"),
         "cycle_ends_at": cyc.get("ends_at"),
     })
-    conv_save(doc)
     return turn_id
 
 
 def conv_append_user_with(familiar: str, text: str, extras: dict | None = None) -> str:
     """Append a user turn with extra fields (e.g., kind, flags) and return its id."""
-    doc = conv_load()
     turn_id = str(uuid.uuid4())
     turn = {
         "id": turn_id,
@@ -673,26 +670,17 @@ def conv_append_user_with(familiar: str, text: str, extras: dict | None = None)
             turn.update({k: v for k, v in extras.items() if k not in ("id", "role")})
         except Exception:
             pass
-    doc.setdefault("turns", []).append(turn)
-    conv_save(doc)
+    conv_append(turn)
     return turn_id
 
 
 def conv_find_reply(familiar: str, turn_id: str):
-    """Return the latest CLI reply turn matching a user turn id."""
-    doc = conv_load()
-    turns = [
-        t for t in doc.get("turns", [])
-        if t.get("role") == "cli" and t.get("familiar") == familiar and t.get("in_reply_to") == turn_id
-    ]
-    if turns:
-        return turns[-1]
-    # Fallback: if familiar drifted in watcher output, still return the reply by turn id.
-    fallback = [
-        t for t in doc.get("turns", [])
-        if t.get("role") == "cli" and t.get("in_reply_to") == turn_id
-    ]
-    return fallback[-1] if fallback else None
+    """Return the latest CLI reply turn matching a user turn id.
+
+    Prefers a reply from `familiar`; falls back to any reply to the turn id in
+    case the familiar drifted in watcher output.
+    """
+    return CONV.find_reply(turn_id, familiar)
 
 
 def cli_active(threshold_seconds: int = 20):
@@ -1001,8 +989,7 @@ def clear_docs_cache():
 def clear_conversation():
     """Clear conversation history for a fresh start."""
     try:
-        if CONV_PATH.exists():
-            CONV_PATH.unlink()
+        CONV.clear()
         return jsonify({"message": "Conversation history cleared."})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1347,9 +1334,9 @@ def presets_layouts_get(preset_name):
 
 @app.route("/chat", methods=["POST"])
 def chat():
-    """Append the user's message to conversation.json and return a turn id.
+    """Append the user's message to the conversation log and return a turn id.
 
-    The external CLI agent is expected to watch the JSON and append a
+    The external CLI agent is woken by a notify ping and appends a
     matching `role: cli` reply with `in_reply_to` set to this turn id.
     """
     data = request.get_json(force=True, silent=True) or {}
@@ -1459,10 +1446,9 @@ def cli_status():
         return jsonify({"error": "Missing turn_id"}), 400
 
     # Check if turn was cancelled
-    doc = conv_load()
-    for t in doc.get("turns", []):
-        if t.get("id") == turn_id and t.get("status") == "cancelled":
-            return jsonify({"status": "cancelled"})
+    turn_meta = CONV.turn_meta(turn_id) or {}
+    if turn_meta.get("status") == "cancelled":
+        return jsonify({"status": "cancelled"})
 
     reply = conv_find_reply(fam_id, turn_id)
     if not reply:
@@ -1472,10 +1458,8 @@ def cli_status():
     # Determine if this turn is committee mode (based on user turn extras)
     committee_mode = False
     try:
-        for t in doc.get("turns", []):
-            if t.get("id") == turn_id:
-                committee_mode = isinstance(t.get("committee"), dict)
-                break
+        user_turn = CONV.get_turn(turn_id) or {}
+        committee_mode = isinstance(user_turn.get("committee"), dict)
     except Exception:
         committee_mode = False
 
@@ -1531,29 +1515,22 @@ def cli_status():
             result["pose"] = p_val
 
     # Determine if this message follows a greet (reset to default location)
-    turns = doc.get("turns", [])
-    # Find current turn index
-    idx = next((i for i, t in enumerate(turns) if t.get("id") == turn_id), -1)
-    
+    # Index-only scan: role/kind/in_reply_to live in the log index.
+    earlier = CONV.previous_ids(turn_id)
+
     is_first_reply = False
-    if idx > 0:
-         # Backward scan for the last CLI turn to check its context
-         last_cli = None
-         for i in range(idx - 1, -1, -1):
-             if turns[i].get("role") == "cli":
-                 last_cli = turns[i]
-                 break
-         
-         if last_cli:
-             # Check what the CLI was replying to
-             parent_id = last_cli.get("in_reply_to")
-             # Find that parent turn
-             parent = next((t for t in turns if t.get("id") == parent_id), None)
-             if parent and parent.get("kind") == "greet":
-                 is_first_reply = True
+    # Backward scan for the last CLI turn to check its context
+    for prev_id in reversed(earlier):
+        prev_meta = CONV.turn_meta(prev_id) or {}
+        if prev_meta.get("role") == "cli":
+            # Check what the CLI was replying to
+            parent = CONV.turn_meta(prev_meta.get("in_reply_to")) or {}
+            if parent.get("kind") == "greet":
+                is_first_reply = True
+            break
 
     # Also check if THIS turn is a greet (so we don't overwrite the greet's own background)
-    is_greet = (turns[idx].get("kind") == "greet") if idx >= 0 else False
+    is_greet = turn_meta.get("kind") == "greet"
 
     # Logic:
     # 1. If this IS a greet, do nothing (keep activity bg)
@@ -1600,14 +1577,9 @@ def cli_cancel():
     except Exception as e:
         return jsonify({"error": f"Failed to write cancel signal: {e}"}), 500
 
-    # Mark the turn as cancelled in conversation.json
+    # Mark the turn as cancelled in the conversation log
     try:
-        doc = conv_load()
-        for t in doc.get("turns", []):
-            if t.get("id") == turn_id:
-                t["status"] = "cancelled"
-                break
-        conv_save(doc)
+        CONV.update_turn(turn_id, status="cancelled")
     except Exception:
         pass
 
@@ -1619,7 +1591,7 @@ def cli_memory_clear():
     """Clear conversation history for a specific familiar.
     
     This is irreversible. It removes all turns associated with the given familiar
-    from conversation.json.
+    from the conversation log; the segment files are rewritten without them.
     """
     data = request.get_json(force=True, silent=True) or {}
     fam_id = data.get("familiar")
@@ -1627,11 +1599,7 @@ def cli_memory_clear():
         return jsonify({"error": "Missing familiar id"}), 400
         
     try:
-        doc = conv_load()
-        original_count = len(doc.get("turns", []))
-        # Keep turns that do NOT match this familiar
-        doc["turns"] = [t for t in doc.get("turns", []) if t.get("familiar") != fam_id]
-        conv_save(doc)
+        removed = CONV.forget_familiar(fam_id)
         
         # Write a signal file just in case watcher needs to know (optional)
         signal_file = TEMP_DIR / f"memory_clear_{fam_id}.signal"
@@ -1643,7 +1611,7 @@ def cli_memory_clear():
         return jsonify({
             "status": "cleared",
             "familiar": fam_id,
-            "removed_turns": original_count - len(doc["turns"])
+            "removed_turns": removed
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
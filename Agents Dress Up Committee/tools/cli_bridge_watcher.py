@@ -2,14 +2,15 @@
 """
 Minimal ADUC CLI bridge watcher
 -------------------------------
-Watches the shared conversation JSON and appends a reply for each
+Watches the shared conversation log and appends a reply for each
 pending user turn. This version is intentionally small and easy to read.
 
 Reply provider: Codex CLI (if available). If 'codex' is not on PATH,
 we append a short explanatory reply to make the UI progress predictable.
 
 Contract:
-- Read <temp>/ADUC/conversation.json
+- Read <temp>/ADUC/conversation/ (see tools/conversation_log.py); the server
+  pings us over a localhost UDP socket when it appends a user turn
 - For each { role: "user", status: "pending" } turn, append a { role: "cli" }
   with `in_reply_to` pointing at the user turn id, and include an emotion tag
   on the last line, like: "<emotion: focus>".
@@ -29,6 +30,11 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import json
 import re
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from conversation_log import ConversationLog, TurnNotifier  # noqa: E402
+from prompt_fragments import FragmentCache  # noqa: E402
 
 
 # Paths
@@ -36,7 +42,11 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 FAMILIARS_DIR = BASE_DIR / "familiars"
 FAMILIAR_DOCS_SUBDIR = "docs"
 TEMP_DIR = Path(tempfile.gettempdir()) / "ADUC"
-CONV_PATH = TEMP_DIR / "conversation.json"
+CONV = ConversationLog(TEMP_DIR)
+# Prompt fragments (docs, outfits, catalogs, memory) keyed by source-file fingerprints.
+FRAGMENTS = FragmentCache()
+# Max seconds to sleep between wake-ups when no notify ping arrives (heartbeat cadence).
+IDLE_WAIT_SECONDS = 5.0
 HEARTBEAT_PATH = TEMP_DIR / "cli_heartbeat.json"
 SETTINGS_PATH = TEMP_DIR / "settings.json"
 USAGE_PATH = TEMP_DIR / "usage.json"
@@ -93,6 +103,11 @@ def read_text(p: Path) -> str:
     return p.read_text(encoding="utf-8", errors="replace")
 
 
+def read_text_cached(p: Path) -> str:
+    """read_text() served from the fragment cache while the file is unchanged."""
+    return FRAGMENTS.text(p)
+
+
 def fam_docs_dir(fam_id: str) -> Path:
     return FAMILIARS_DIR / fam_id / FAMILIAR_DOCS_SUBDIR
 
@@ -161,8 +176,9 @@ def chronos_doc_change_note() -> str:
         else:
             if initialized and (label in old):
                 missing.append(label)
-    # Save updated mtimes and mark initialized
-    write_json_atomic(CHRONOS_DOCS_CACHE_PATH, {"mtimes": now_map, "initialized": True})
+    # Save updated mtimes and mark initialized (skip the rewrite when nothing moved)
+    if not initialized or now_map != old:
+        write_json_atomic(CHRONOS_DOCS_CACHE_PATH, {"mtimes": now_map, "initialized": True})
     if not initialized:
         return ""
     lines = []
@@ -271,11 +287,14 @@ def _resolve_merge_file_ref(fam_id: str, ref: str) -> Path | None:
 
 
 def _load_merge_map(path: Path) -> dict:
-    try:
-        data = json.loads(read_text(path) or "{}")
-        return data if isinstance(data, dict) else {}
-    except Exception:
-        return {}
+    def _render():
+        try:
+            data = json.loads(read_text(path) or "{}")
+            return (data if isinstance(data, dict) else {}), [path]
+        except Exception:
+            return {}, [path]
+
+    return FRAGMENTS.fragment("merge_map", str(path), _render)
 
 
 def _env_signal_enabled(signals) -> bool:
@@ -296,19 +315,19 @@ def load_outfits_with_avatars(fam_id: str) -> str:
     Parses outfits.md for references like `avatar/nsfw/tee/avatars.md` and
     appends the content of each referenced file to build a complete wardrobe view.
     """
+    return FRAGMENTS.fragment("outfits", fam_id, lambda: _render_outfits_with_avatars(fam_id))
+
+
+def _render_outfits_with_avatars(fam_id: str) -> tuple[str, list]:
     fdir = FAMILIARS_DIR / fam_id
-    fdocs = fam_docs_dir(fam_id)
-    fdocs = fam_docs_dir(fam_id)
-    fdocs = fam_docs_dir(fam_id)
-    fdocs = fam_docs_dir(fam_id)
-    fdocs = fam_docs_dir(fam_id)
     outfits_path = fam_docs_dir(fam_id) / "outfits.md"
+    deps = [outfits_path]
     if not outfits_path.exists():
-        return ""
+        return "", deps
     
     outfits_content = read_text(outfits_path).strip()
     if not outfits_content:
-        return ""
+        return "", deps
     
     parts = [outfits_content]
     
@@ -318,12 +337,13 @@ def load_outfits_with_avatars(fam_id: str) -> str:
     
     for ref in refs:
         ref_path = fdir / ref
+        deps.append(ref_path)
         if ref_path.exists():
             content = read_text(ref_path).strip()
             if content:
                 parts.append(f"\n--- {ref} ---\n{content}")
     
-    return "\n".join(parts)
+    return "\n".join(parts), deps
 
 
 # External context change tracking --------------------------------------------
@@ -353,15 +373,6 @@ def save_external_context_mtime(mtime_val: float) -> None:
     write_json_atomic(EXTERNAL_CTX_CACHE_PATH, {"mtime": mtime_val})
 
 
-def load_conv():
-    return read_json(CONV_PATH, {"version": 1, "updated_at": None, "turns": []})
-
-
-def save_conv(doc):
-    doc["updated_at"] = now_iso()
-    write_json_atomic(CONV_PATH, doc)
-
-
 def heartbeat(agent_id: str):
     """Best-effort heartbeat so the server/UI can detect the agent."""
     try:
@@ -375,6 +386,10 @@ def heartbeat(agent_id: str):
 def load_activities_map(fam_id: str) -> dict:
     """Return a map id -> { avatar, background } from activities.json, if present."""
     f = FAMILIARS_DIR / fam_id / "activities.json"
+    return FRAGMENTS.fragment("activities", fam_id, lambda: (_parse_activities(f), [f]))
+
+
+def _parse_activities(f: Path) -> dict:
     data = read_json(f, {})
     acts = data.get("activities", []) if isinstance(data, dict) else []
     out = {}
@@ -394,20 +409,30 @@ def load_activities_map(fam_id: str) -> dict:
 def load_background_catalog(fam_id: str) -> list:
     """Return list of background dicts from locations_list.json, if present."""
     f = FAMILIARS_DIR / fam_id / "locations_list.json"
-    data = read_json(f, {})
-    bgs = data.get("locations", []) if isinstance(data, dict) else []
-    return [b for b in bgs if isinstance(b, dict)]
+
+    def _render():
+        data = read_json(f, {})
+        bgs = data.get("locations", []) if isinstance(data, dict) else []
+        return [b for b in bgs if isinstance(b, dict)], [f]
+
+    return FRAGMENTS.fragment("background_catalog", fam_id, _render)
 
 
 def gather_background_context(fam_id: str) -> str:
     """Load locations.md or fallback to JSON list."""
-    # Try locations.md first
     md_path = fam_docs_dir(fam_id) / "locations.md"
+    json_path = FAMILIARS_DIR / fam_id / "locations_list.json"
+    return FRAGMENTS.fragment(
+        "backgrounds", fam_id, lambda: (_render_background_context(md_path, json_path), [md_path, json_path])
+    )
+
+
+def _render_background_context(md_path: Path, json_path: Path) -> str:
+    # Try locations.md first
     if md_path.exists():
         return read_text(md_path).strip()
     
     # Fallback to locations_list.json (Legacy)
-    json_path = FAMILIARS_DIR / fam_id / "locations_list.json"
     if json_path.exists():
         data = read_json(json_path, {})
         bgs = data.get("locations", [])
@@ -420,13 +445,21 @@ def gather_background_context(fam_id: str) -> str:
 
 def gather_avatar_context(fam_id: str) -> str:
     """Recursively find and merge avatars.md files."""
+    return FRAGMENTS.fragment("avatars", fam_id, lambda: _render_avatar_context(fam_id))
+
+
+def _render_avatar_context(fam_id: str) -> tuple[str, list]:
     root = FAMILIARS_DIR / fam_id / "avatar"
     if not root.exists():
-        return ""
+        return "", [root]
+    # Folder mtimes change when avatars.md files are added or removed, so
+    # every folder is a dependency alongside the files that were merged.
+    deps = [root] + [d for d in root.rglob("*") if d.is_dir()]
         
     merged = []
     # 1. Root avatars.md
     root_md = root / "avatars.md"
+    deps.append(root_md)
     if root_md.exists():
         merged.append(read_text(root_md).strip())
         
@@ -444,6 +477,7 @@ def gather_avatar_context(fam_id: str) -> str:
             if "nsfw" in parts_path: parts_path.remove("nsfw")
             header = " ".join(p.title() for p in parts_path)
             
+            deps.append(path)
             content = read_text(path).strip()
             # If content doesn't have a header, add one
             if not content.startswith("#"):
@@ -452,7 +486,7 @@ def gather_avatar_context(fam_id: str) -> str:
         except Exception:
             continue
             
-    return "\n\n".join(merged)
+    return "\n\n".join(merged), deps
 
 def build_prompt(
     fam_id: str,
@@ -479,16 +513,16 @@ def build_prompt(
     settings = read_json(SETTINGS_PATH, {})
     if bool(settings.get("disable_familiar_cache", False)):
         should_inject_fam = True
-    greet = read_text(fdocs / "greet.md").strip() if should_inject_fam else ""
-    profile = read_text(fdir / "profile.json").strip() if should_inject_fam else ""
-    affection_global = read_text(BASE_DIR / "docs" / "agents" / "affection_system.md").strip() if should_inject_fam else ""
-    affection_local = read_text(fdocs / "affection.md").strip() if should_inject_fam else ""
-    lore = read_text(fdocs / "lore.md").strip() if should_inject_fam else ""
-    preferences = read_text(fdocs / "preferences.md").strip() if should_inject_fam else ""
-    memories = read_text(fdocs / "memories.md").strip() if should_inject_fam else ""
-    profile = read_text(fdir / "profile.json").strip() if should_inject_fam else ""
-    meta_json = read_text(fdir / "meta.json").strip() if should_inject_fam else ""
-    locations_md = read_text(fdocs / "locations.md").strip() if should_inject_fam else ""
+    greet = read_text_cached(fdocs / "greet.md").strip() if should_inject_fam else ""
+    profile = read_text_cached(fdir / "profile.json").strip() if should_inject_fam else ""
+    affection_global = read_text_cached(BASE_DIR / "docs" / "agents" / "affection_system.md").strip() if should_inject_fam else ""
+    affection_local = read_text_cached(fdocs / "affection.md").strip() if should_inject_fam else ""
+    lore = read_text_cached(fdocs / "lore.md").strip() if should_inject_fam else ""
+    preferences = read_text_cached(fdocs / "preferences.md").strip() if should_inject_fam else ""
+    memories = read_text_cached(fdocs / "memories.md").strip() if should_inject_fam else ""
+    profile = read_text_cached(fdir / "profile.json").strip() if should_inject_fam else ""
+    meta_json = read_text_cached(fdir / "meta.json").strip() if should_inject_fam else ""
+    locations_md = read_text_cached(fdocs / "locations.md").strip() if should_inject_fam else ""
     # Parse profile as JSON for optional consent signals (e.g., flirt_ok)
     profile_data = {}
     try:
@@ -534,7 +568,7 @@ def build_prompt(
             path = _resolve_merge_file_ref(fam_id, str(ref))
             if not path:
                 continue
-            content = read_text(path).strip()
+            content = read_text_cached(path).strip()
             if not content:
                 continue
             parts.append(_format_static_ref(str(ref), content))
@@ -587,7 +621,7 @@ def build_prompt(
             path = _resolve_merge_file_ref(fam_id, str(ref))
             if not path:
                 continue
-            content = read_text(path).strip()
+            content = read_text_cached(path).strip()
             if not content:
                 continue
             parts.append(_format_static_ref(str(ref), content))
@@ -915,15 +949,15 @@ def build_guest_context(
     fdir = FAMILIARS_DIR / fam_id
     fdocs = fam_docs_dir(fam_id)
     should_inject_fam, fam_note, fam_mtimes = familiar_doc_change_state(fam_id)
-    agent = read_text(fdocs / "agent.md").strip() if should_inject_fam else ""
-    personality = read_text(fdocs / "personality.md").strip() if should_inject_fam else ""
-    coding = read_text(fdocs / "coding.md").strip() if should_inject_fam else ""
-    lore = read_text(fdocs / "lore.md").strip() if should_inject_fam else ""
-    preferences = read_text(fdocs / "preferences.md").strip() if should_inject_fam else ""
-    memories = read_text(fdocs / "memories.md").strip() if should_inject_fam else ""
-    meta_json = read_text(fdir / "meta.json").strip() if should_inject_fam else ""
-    locations_md = read_text(fdocs / "locations.md").strip() if should_inject_fam else ""
-    affection_local = read_text(fdocs / "affection.md").strip() if should_inject_fam else ""
+    agent = read_text_cached(fdocs / "agent.md").strip() if should_inject_fam else ""
+    personality = read_text_cached(fdocs / "personality.md").strip() if should_inject_fam else ""
+    coding = read_text_cached(fdocs / "coding.md").strip() if should_inject_fam else ""
+    lore = read_text_cached(fdocs / "lore.md").strip() if should_inject_fam else ""
+    preferences = read_text_cached(fdocs / "preferences.md").strip() if should_inject_fam else ""
+    memories = read_text_cached(fdocs / "memories.md").strip() if should_inject_fam else ""
+    meta_json = read_text_cached(fdir / "meta.json").strip() if should_inject_fam else ""
+    locations_md = read_text_cached(fdocs / "locations.md").strip() if should_inject_fam else ""
+    affection_local = read_text_cached(fdocs / "affection.md").strip() if should_inject_fam else ""
     outfits_txt = load_outfits_with_avatars(fam_id)
     state = load_state(fam_id)
 
@@ -1012,8 +1046,8 @@ def build_committee_prompt(
         force_memory=force_memory,
     )
     base_context = _extract_context_block(base_prompt)
-    committee_md = read_text(BASE_DIR / "docs" / "agents" / "committee.md").strip()
-    dynamics_md = read_text(BASE_DIR / "docs" / "agents" / "dynamics.md").strip()
+    committee_md = read_text_cached(BASE_DIR / "docs" / "agents" / "committee.md").strip()
+    dynamics_md = read_text_cached(BASE_DIR / "docs" / "agents" / "dynamics.md").strip()
     guest_contexts = []
     for g in guest_ids:
         try:
@@ -1117,22 +1151,9 @@ def build_conversation_history(fam_id: str, history_up_to: str | None = None) ->
     if max_turns == 0 or max_chars == 0:
         return ""
     try:
-        doc = load_conv()
-        turns_all = (doc.get("turns", []) or [])
-        # Only include strictly earlier turns if a cutoff id is provided
-        if history_up_to:
-            # Find index of the cutoff turn id in list order
-            cutoff_idx = None
-            for idx, t in enumerate(turns_all):
-                if t.get("id") == history_up_to:
-                    cutoff_idx = idx
-                    break
-            if cutoff_idx is not None:
-                turns_all = turns_all[:cutoff_idx]
-        turns = [
-            t for t in turns_all
-            if t.get("familiar") == fam_id and t.get("role") in ("user", "cli")
-        ]
+        # Read only the tail window (strictly earlier than the cutoff id, if given).
+        # Over-fetch so turns with empty text (greets) don't shrink the window.
+        turns = CONV.history(fam_id, before_id=history_up_to, limit=max_turns * 2)
         # Sort by time, oldest first. Fallback to list order if timestamp missing.
         def _key(t):
             ts = str(t.get("at") or "").replace("Z", "+00:00")
@@ -1176,19 +1197,7 @@ def build_memory_snippet(fam_id: str, enabled: bool | None = None) -> str:
                 return ""
         fdir = FAMILIARS_DIR / fam_id
         p = fdir / "memory.json"
-        if not p.exists():
-            return ""
-        raw = read_text(p).strip()
-        if not raw:
-            return ""
-        items = []
-        try:
-            j = json.loads(raw)
-            if isinstance(j, list):
-                items = [str(x) for x in j if isinstance(x, (str, int, float))]
-        except Exception:
-            # Fallback: treat as line-separated entries
-            items = [ln.strip() for ln in raw.splitlines() if ln.strip()]
+        items = FRAGMENTS.fragment("memory", fam_id, lambda: (_parse_memory_items(p), [p]))
         if not items:
             return ""
         limit = max(1, _env_int("ADUC_MEMORY_ITEMS", 10))
@@ -1198,6 +1207,20 @@ def build_memory_snippet(fam_id: str, enabled: bool | None = None) -> str:
         return ""
 
 
+def _parse_memory_items(p: Path) -> tuple:
+    raw = read_text(p).strip()
+    if not raw:
+        return ()
+    try:
+        j = json.loads(raw)
+        if isinstance(j, list):
+            return tuple(str(x) for x in j if isinstance(x, (str, int, float)))
+        return ()
+    except Exception:
+        # Fallback: treat as line-separated entries
+        return tuple(ln.strip() for ln in raw.splitlines() if ln.strip())
+
+
 def extract_reply(raw: str) -> str:
     """Extract the in-character reply from Codex output.
 
@@ -1282,7 +1305,7 @@ def chunk_string(s: str, n: int) -> list[str]:
     return [s[i:i+n] for i in range(0, len(s), n)] if s else []
 
 
-def feed_chunks(fam: str, merged_context: str, user_text: str, chunk_size: int, agent_id: str, parent_turn_id: str, doc: dict, committee_fams: list[str] | None = None):
+def feed_chunks(fam: str, merged_context: str, user_text: str, chunk_size: int, agent_id: str, parent_turn_id: str, committee_fams: list[str] | None = None):
     """Generate a single final reply for the user turn.
 
     Previous versions streamed per-chunk acknowledgements into the shared
@@ -1290,7 +1313,7 @@ def feed_chunks(fam: str, merged_context: str, user_text: str, chunk_size: int,
     ack. We now only append one final reply per turn.
     """
     # Optional: if a provider requires incremental priming, you could still
-    # iterate chunks here but DO NOT write interim acks to conversation.json.
+    # iterate chunks here but DO NOT write interim acks to the conversation log.
     # For simplicity and robustness, we skip priming and ask directly.
 
     if committee_fams:
@@ -1397,7 +1420,7 @@ def feed_chunks(fam: str, merged_context: str, user_text: str, chunk_size: int,
     final_delta = 0.0
     # Semi-deterministic journey scheduling on greet/messages
     try:
-        is_greet = bool((doc.get("turns", []) and any(t.get("id") == parent_turn_id and t.get("kind") == "greet" for t in doc.get("turns", []))))
+        is_greet = (CONV.turn_meta(parent_turn_id) or {}).get("kind") == "greet"
     except Exception:
         is_greet = False
     try:
@@ -1565,11 +1588,10 @@ def feed_chunks(fam: str, merged_context: str, user_text: str, chunk_size: int,
         "at": now_iso(),
         "in_reply_to": parent_turn_id,
     }
-    doc["turns"].append(reply)
-    save_conv(doc)
+    CONV.append_turn(reply)
     print(f"[ADUC] Appended final reply for turn {parent_turn_id}: {reply['id']}")
 
-def append_simple_reply(doc: dict, fam: str, parent_turn_id: str, text: str):
+def append_simple_reply(fam: str, parent_turn_id: str, text: str):
     reply = {
         "id": str(uuid.uuid4()),
         "familiar": fam,
@@ -1578,8 +1600,7 @@ def append_simple_reply(doc: dict, fam: str, parent_turn_id: str, text: str):
         "at": now_iso(),
         "in_reply_to": parent_turn_id,
     }
-    doc["turns"].append(reply)
-    save_conv(doc)
+    CONV.append_turn(reply)
     print(f"[ADUC] Appended reaction reply for turn {parent_turn_id}: {reply['id']}")
 
 
@@ -2312,11 +2333,6 @@ def run_llm_interruptible(prompt: str, turn_id: str, timeout_sec: float | None =
 
 
 
-def ensure_doc_exists():
-    if not CONV_PATH.exists():
-        save_conv({"version": 1, "updated_at": now_iso(), "turns": []})
-
-
 def _prime_state() -> dict:
     return read_json(PRIME_DONE_PATH, {"familiars": {}, "at": None})
 
@@ -2334,7 +2350,6 @@ def enqueue_prime_if_needed():
         if not agents_md:
             return
         fams = [p.name for p in FAMILIARS_DIR.iterdir() if p.is_dir()]
-        doc = load_conv()
         changed = False
         for fam in fams:
             if done.get(fam):
@@ -2349,11 +2364,10 @@ def enqueue_prime_if_needed():
                 "status": "pending",
                 "kind": "prime",
             }
-            doc.setdefault("turns", []).append(turn)
+            CONV.append_turn(turn)
             changed = True
             done[fam] = True
         if changed:
-            save_conv(doc)
             state["familiars"] = done
             state["at"] = now_iso()
             _save_prime_state(state)
@@ -2366,33 +2380,30 @@ def loop():
     agent_id = os.environ.get("ADUC_AGENT_ID", f"cli-{uuid.uuid4().hex[:8]}")
     print(f"[ADUC] Minimal watcher started as {agent_id}. Temp: {TEMP_DIR}")
 
-    ensure_doc_exists()
+    # Listen for server pings before the first scan so no append is missed.
+    notifier = TurnNotifier(TEMP_DIR)
+    notifier.listen()
     # One-time boot prime
     enqueue_prime_if_needed()
 
     while True:
         heartbeat(agent_id)
-        doc = load_conv()
         # Unstick turns that were claimed but never responded (e.g., after a crash).
         try:
             now_ts = datetime.now(timezone.utc)
-            turns = doc.get("turns", [])
-            for t in turns:
-                if t.get("role") == "user" and t.get("status") == "claimed":
-                    ts_str = str(t.get("claimed_at") or t.get("at") or "").replace("Z", "+00:00")
-                    try:
-                        ts = datetime.fromisoformat(ts_str)
-                    except Exception:
-                        ts = None
-                    # If claimed > 30s ago, return to pending
-                    if ts and (now_ts - ts).total_seconds() > 30:
-                        t["status"] = "pending"
-            save_conv(doc)
+            for t in CONV.turns_with_status("claimed"):
+                ts_str = str(t.get("claimed_at") or t.get("at") or "").replace("Z", "+00:00")
+                try:
+                    ts = datetime.fromisoformat(ts_str)
+                except Exception:
+                    ts = None
+                # If claimed > 30s ago, return to pending
+                if ts and (now_ts - ts).total_seconds() > 30:
+                    CONV.update_turn(t.get("id"), status="pending")
         except Exception:
             # Best-effort; continue
             pass
-        turns = doc.get("turns", [])
-        pending = [t for t in turns if t.get("role") == "user" and t.get("status") == "pending"]
+        pending = CONV.turns_with_status("pending")
         # Process most recent first so fresh greets/messages respond quickly.
         try:
             pending.sort(key=lambda t: str(t.get("at") or ""), reverse=True)
@@ -2402,11 +2413,11 @@ def loop():
             fam = str(u.get("familiar", ""))
             text = str(u.get("text", ""))
             kind = str(u.get("kind") or "")
+            # Skip turns cancelled or claimed since the pending scan
+            if (CONV.turn_meta(u.get("id")) or {}).get("status") != "pending":
+                continue
             # Mark claimed (not strictly required, but visible for debugging)
-            u["status"] = "claimed"
-            u["claimed_by"] = agent_id
-            u["claimed_at"] = now_iso()
-            save_conv(doc)
+            CONV.update_turn(u.get("id"), status="claimed", claimed_by=agent_id, claimed_at=now_iso())
             print(f"[ADUC] Claimed turn {u.get('id')} for familiar={fam}")
 
             # Route by kind
@@ -2425,11 +2436,10 @@ def loop():
                         out = override_emotion_tag(out, fam, "blush")
                     except Exception:
                         pass
-                    append_simple_reply(doc, fam, u.get("id"), out)
+                    append_simple_reply(fam, u.get("id"), out)
                 except Exception:
-                    append_simple_reply(doc, fam, u.get("id"), "Okay.\n\n<emotion: warm>")
-                u["status"] = "responded"
-                save_conv(doc)
+                    append_simple_reply(fam, u.get("id"), "Okay.\n\n<emotion: warm>")
+                CONV.update_turn(u.get("id"), status="responded")
                 continue
 
             if k == "prime":
@@ -2446,11 +2456,10 @@ def loop():
                     # If provider returned something else, coerce to ACK
                     if not out.strip().lower().startswith("ack"):
                         out = "ACK\n<emotion: calm>"
-                    append_simple_reply(doc, fam, u.get("id"), out)
+                    append_simple_reply(fam, u.get("id"), out)
                 except Exception:
-                    append_simple_reply(doc, fam, u.get("id"), "ACK\n<emotion: calm>")
-                u["status"] = "responded"
-                save_conv(doc)
+                    append_simple_reply(fam, u.get("id"), "ACK\n<emotion: calm>")
+                CONV.update_turn(u.get("id"), status="responded")
                 continue
 
             # Default chat/greet
@@ -2483,6 +2492,7 @@ def loop():
             committee = u.get("committee") if isinstance(u.get("committee"), dict) else {}
             guests = committee.get("guests") if isinstance(committee.get("guests"), list) else []
             guests = [str(g).strip() for g in guests if str(g).strip()]
+            FRAGMENTS.begin_turn()
             if guests:
                 merged = build_committee_prompt(
                     host_id=fam,
@@ -2505,15 +2515,20 @@ def loop():
                     force_immersive=(bool(u.get("immersive")) if imm_present else None),
                     force_memory=(bool(u.get("include_memory")) if mem_present else None),
                 )
+            m = FRAGMENTS.end_turn(merged)
+            trace_log(
+                f"prompt_build fam={fam} turn={u.get('id')} bytes={m['bytes']} "
+                f"fragments_reused={m['reused']} fragments_rendered={m['rendered']} build_ms={m['build_ms']}"
+            )
             try:
                 size = int(os.environ.get("ADUC_STREAM_CHUNK", "1000"))
             except Exception:
                 size = 1000
             committee_fams = [fam] + guests if guests else None
-            feed_chunks(fam, merged_context=merged, user_text=user_text_tagged, chunk_size=size, agent_id=agent_id, parent_turn_id=u.get("id"), doc=doc, committee_fams=committee_fams)
-            u["status"] = "responded"
-            save_conv(doc)
-        time.sleep(0.5)
+            feed_chunks(fam, merged_context=merged, user_text=user_text_tagged, chunk_size=size, agent_id=agent_id, parent_turn_id=u.get("id"), committee_fams=committee_fams)
+            CONV.update_turn(u.get("id"), status="responded")
+        if not pending:
+            notifier.wait(IDLE_WAIT_SECONDS)
 
 
 if __name__ == "__main__":
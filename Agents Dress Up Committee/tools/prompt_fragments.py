@@ -0,0 +1,100 @@
+"""
+Prompt context fragment cache for the CLI bridge watcher.
+
+Every user turn rebuilds the prompt from familiar docs, outfit/avatar
+markdown, location catalogs, activity maps and memory files. Most of those
+inputs never change between turns, so each rendered fragment is kept in
+memory together with a fingerprint (mtime_ns, size) of every file or folder
+it was built from. A fragment is re-rendered only when one of those
+fingerprints moves; otherwise the previous value is reused after a handful
+of stat() calls.
+
+Renderers return ``(value, deps)`` where ``deps`` lists the paths that were
+consulted -- including ones that did not exist, so that creating them later
+invalidates the fragment too.
+
+Per-turn metrics (fragments reused/rendered, bytes assembled, build time)
+are collected between ``begin_turn()`` and ``end_turn()``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+def _fingerprint(path: Path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class FragmentCache:
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(16, int(max_entries))
+        self._entries: dict[tuple, tuple[Any, tuple]] = {}
+        self._lock = threading.Lock()
+        self._turn: dict | None = None
+
+    # Fragments ---------------------------------------------------------------
+
+    def fragment(self, name: str, key, render: Callable[[], tuple[Any, Iterable[Path]]]):
+        """Return the cached value for (name, key), re-rendering when a dependency changed."""
+        ident = (name, key)
+        with self._lock:
+            entry = self._entries.get(ident)
+        if entry is not None:
+            value, deps = entry
+            if all(_fingerprint(p) == fp for p, fp in deps):
+                self._count("reused")
+                return value
+        value, dep_paths = render()
+        deps = tuple((Path(p), _fingerprint(Path(p))) for p in dep_paths)
+        with self._lock:
+            if len(self._entries) >= self.max_entries and ident not in self._entries:
+                # Oldest insertion first; dicts keep insertion order.
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[ident] = (value, deps)
+        self._count("rendered")
+        return value
+
+    def text(self, path: Path) -> str:
+        """Cached file contents ('' when missing)."""
+        path = Path(path)
+
+        def _render():
+            try:
+                return path.read_text(encoding="utf-8", errors="replace"), [path]
+            except OSError:
+                return "", [path]
+
+        return self.fragment("text", str(path), _render)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # Metrics -----------------------------------------------------------------
+
+    def _count(self, field: str) -> None:
+        turn = self._turn
+        if turn is not None:
+            turn[field] += 1
+
+    def begin_turn(self) -> None:
+        self._turn = {"reused": 0, "rendered": 0, "started": time.perf_counter()}
+
+    def end_turn(self, prompt: str = "") -> dict:
+        """Stop collecting and return {bytes, reused, rendered, build_ms}."""
+        turn = self._turn or {"reused": 0, "rendered": 0, "started": time.perf_counter()}
+        self._turn = None
+        return {
+            "bytes": len((prompt or "").encode("utf-8")),
+            "reused": turn["reused"],
+            "rendered": turn["rendered"],
+            "build_ms": round((time.perf_counter() - turn["started"]) * 1000.0, 2),
+        }
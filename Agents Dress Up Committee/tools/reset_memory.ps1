@@ -1,5 +1,6 @@
 $tempDir = Join-Path $env:TEMP "ADUC"
 $convPath = Join-Path $tempDir "conversation.json"
+$convDir = Join-Path $tempDir "conversation"
 $famDir = "..\familiars"
 
 # 1. Delete conversation history
@@ -7,6 +8,10 @@ if (Test-Path $convPath) {
     Remove-Item $convPath -Force
     Write-Host "Deleted conversation history."
 }
+if (Test-Path $convDir) {
+    Remove-Item $convDir -Recurse -Force
+    Write-Host "Deleted conversation log."
+}
 
 # 2. Reset Familiar State and Profile
 $familiars = Get-ChildItem $famDir -Directory
@@ -3,7 +3,8 @@ import os
 import shutil
 import time
 import yaml
-from modules.item_manager import get_item_path
+from modules.item_manager import get_item_path, delete_item
+from modules import write_coordinator
 
 def run(args, properties):
     """
@@ -58,11 +59,10 @@ def run(args, properties):
 
         
         # Write to destination
-        with open(dest_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        write_coordinator.write_yaml(dest_path, data, default_flow_style=False, sort_keys=False)
             
-        # Delete source
-        os.remove(src_path)
+        # Delete source (journaled, and drops it from the core mirror and indexes)
+        delete_item(item_type, item_name)
         
         print(f"Archived {item_type} '{item_name}' to {dest_path}")
         
@@ -4,32 +4,84 @@ import zipfile
 import time
 import glob
 from modules.item_manager import USER_DIR, ROOT_DIR
+from modules import backup_store as Store
 
 BACKUPS_DIR = os.path.join(USER_DIR, "backups")
 
 def run(args, properties):
     """
     Handles the 'backup' command.
-    backup -> creates a new zip backup of the User directory.
-    backup list -> lists available backups.
+    backup [label]        -> incremental snapshot into user/backups/store/.
+    backup zip [name]     -> full zip backup (portable single file).
+    backup list           -> lists snapshots and zip backups.
+    backup verify [id|latest|all]
+    backup prune keep:N days:D
     """
     action = args[0].lower() if args else "create"
     
     if action == "create":
-        create_backup(args, properties)
+        create_snapshot(args[1:], properties)
+    elif action == "zip":
+        create_backup(args[1:], properties)
     elif action == "list":
         list_backups()
+    elif action == "verify":
+        verify_snapshots(args[1:], properties)
+    elif action == "prune":
+        prune_snapshots(properties)
     else:
-        # Default to create if unknown arg, or maybe help?
-        # Let's assume 'create' is default but if they typed a name, maybe they meant to name it?
-        # Actually standard syntax: backup [name]
-        create_backup(args, properties)
+        # backup <label>
+        create_snapshot(args, properties)
+
+def create_snapshot(args, properties):
+    label = " ".join(str(a) for a in args).strip() or None
+    print("Creating incremental snapshot...")
+    try:
+        result = Store.create_snapshot(label)
+    except Exception as e:
+        print(f"❌ Backup failed: {e}")
+        return
+    st = result["stats"]
+    print(f"✅ Snapshot {result['id']}: {st['files']} files ({st['reused']} unchanged, {st['hashed']} read), "
+          f"{st['chunks_new']} new chunks, {st['bytes_stored'] / 1024:.1f} KB stored.")
+
+def verify_snapshots(args, properties):
+    ref = args[0] if args else None
+    if ref and ref.lower() == "all":
+        ref = None
+    try:
+        report = Store.verify(ref)
+    except Store.BackupStoreError as e:
+        print(f"❌ {e}")
+        return
+    if report["ok"]:
+        print(f"✅ Verified {report['snapshots']} snapshot(s), {report['chunks']} chunks.")
+        return
+    print(f"❌ {len(report['problems'])} problem(s) in {report['snapshots']} snapshot(s):")
+    for p in report["problems"][:50]:
+        print(f"- [{p['snapshot']}] {p['path']}: {p['error']}")
+
+def prune_snapshots(properties):
+    def _num(key, cast):
+        val = (properties or {}).get(key)
+        try:
+            return cast(val) if val not in (None, "") else None
+        except Exception:
+            return None
+    keep_last = _num("keep", int)
+    keep_days = _num("days", float)
+    if keep_last is None and keep_days is None:
+        print("Usage: backup prune keep:<count> days:<days>")
+        return
+    result = Store.prune(keep_last=keep_last, keep_days=keep_days)
+    print(f"Pruned {len(result['snapshots_removed'])} snapshot(s), {result['chunks_removed']} chunks "
+          f"({result['bytes_freed'] / 1024:.1f} KB freed).")
 
 def create_backup(args, properties):
     os.makedirs(BACKUPS_DIR, exist_ok=True)
     
     # Optional name from args
-    if args and args[0] != "create":
+    if args:
          base_name = args[0]
          if not base_name.endswith('.zip'):
              base_name += ".zip"
@@ -64,14 +116,22 @@ def list_backups():
         print("No backups found (user/backups directory missing).")
         return
         
+    snaps = Store.list_snapshots()
     files = glob.glob(os.path.join(BACKUPS_DIR, "*.zip"))
     files.sort(key=os.path.getmtime, reverse=True)
     
-    if not files:
+    if not files and not snaps:
         print("No backups found.")
         return
         
-    print("Available backups:")
+    if snaps:
+        print("Snapshots:")
+        for snap in snaps:
+            size_mb = snap["size"] / (1024 * 1024)
+            print(f"- {snap['id']}  ({snap['files']} files, {size_mb:.2f} MB)  [{snap['created']}]")
+    if not files:
+        return
+    print("Zip backups:")
     for f in files:
         size_mb = os.path.getsize(f) / (1024 * 1024)
         mtime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(f)))
@@ -80,16 +140,23 @@ def list_backups():
 def get_help_message():
     return """
 Usage:
-  backup [name]
+  backup [label]
+  backup zip [name]
   backup list
+  backup verify [snapshot_id|latest|all]
+  backup prune keep:<count> days:<days>
 
 Description:
-  Creates a full backup of the 'user' directory.
-  Saves to 'user/backups/'.
+  Creates an incremental snapshot of the 'user' directory in 'user/backups/store/'.
+  Only new or changed files are read and stored; unchanged files are shared with
+  earlier snapshots. 'backup zip' writes a full zip to 'user/backups/' instead.
+  'prune' keeps the newest <count> snapshots and any younger than <days>, then
+  deletes chunks no snapshot uses.
   
 Example:
   backup
-  backup snapshot_v1
-  backup list
+  backup before_cleanup
+  backup zip snapshot_v1
+  backup verify latest
+  backup prune keep:10 days:30
 """
-
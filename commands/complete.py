@@ -12,7 +12,7 @@ import os
 import yaml
 from datetime import datetime
 from modules.scheduler import get_flattened_schedule, build_block_key, schedule_path_for_date
-from commands.today import load_completion_payload
+from commands.today import load_completion_payload, save_completion_payload
 from modules import quality_utils
 from utilities.completion_effects import run_completion_effects
 
@@ -132,8 +132,7 @@ def run(args, properties):
         if quality:
             entry["quality"] = quality
         entries[block_key] = entry
-        with open(completion_path, "w", encoding="utf-8") as f:
-            yaml.dump(completion_data, f, default_flow_style=False, sort_keys=False)
+        save_completion_payload(completion_data, completion_path)
     except Exception:
         pass
 
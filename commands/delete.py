@@ -1,5 +1,6 @@
 import sys
 from modules.item_manager import dispatch_command
+from modules import reference_graph
 try:
     from commands import archive as Archive
 except ImportError:
@@ -25,6 +26,8 @@ def run(args, properties):
     # OR we check properties manually.
     force = bool(properties.get('force', False))
 
+    _warn_references(item_type, item_name)
+
     if force:
         # Permanent delete
         dispatch_command("delete", item_type, item_name, None, properties)
@@ -41,6 +44,20 @@ def run(args, properties):
             print(f"⚠️ Archive command not found. Proceeding with permanent delete.")
             dispatch_command("delete", item_type, item_name, None, properties)
 
+def _warn_references(item_type, item_name):
+    """Lists items that still reference the one being deleted (reverse graph lookup)."""
+    try:
+        parents = reference_graph.referenced_by(item_type, item_name)
+    except Exception:
+        return
+    if not parents:
+        return
+    print(f"⚠️ '{item_name}' is referenced by {len(parents)} item(s):")
+    for ref in parents[:10]:
+        print(f"   - {ref['name']} ({ref['type']}) via {ref['field']}")
+    if len(parents) > 10:
+        print(f"   ... and {len(parents) - 10} more (tree {item_type} \"{item_name}\" reverse:true)")
+
 def get_help_message():
     return """
 Usage: delete [-f|--force] <item_type> <item_name>
@@ -48,6 +65,7 @@ Description:
   Deletes an item of the specified type.
   - By default, moves the item to 'user/archive' (soft delete).
   - Use -f or --force (or force:true) to permanently delete.
+  - Items that still reference it are listed first.
 Example: 
   delete note MyOldNote          # Archives it
   delete note MyOldNote --force  # Deletes it forever
@@ -3,7 +3,7 @@ import yaml
 from datetime import datetime
 
 from modules.scheduler import get_flattened_schedule, build_block_key, schedule_path_for_date
-from commands.today import load_completion_payload
+from commands.today import load_completion_payload, save_completion_payload
 from modules import quality_utils
 try:
     from utilities import points as Points
@@ -163,8 +163,7 @@ def run(args, properties):
 
     entries[key] = entry
 
-    with open(completion_path, "w") as fh:
-        yaml.dump(completion_data, fh, default_flow_style=False)
+    save_completion_payload(completion_data, completion_path, sort_keys=True)
 
     if Points and status in {"completed", "partial"} and item_type:
         try:
@@ -31,8 +31,11 @@ def run(args, properties):
         os.makedirs(EXPORTS_DIR, exist_ok=True)
         out_path = os.path.join(EXPORTS_DIR, zip_name)
         # Create zip with paths relative to ROOT_DIR so contents include 'user/...'
+        skip_dirs = {os.path.join(USER_DIR, "backups"), EXPORTS_DIR}
         with zipfile.ZipFile(out_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-            for folder, _dirs, files in os.walk(USER_DIR):
+            for folder, dirs, files in os.walk(USER_DIR):
+                # Earlier exports and the snapshot store would otherwise be re-zipped every time.
+                dirs[:] = [d for d in dirs if os.path.join(folder, d) not in skip_dirs]
                 for fname in files:
                     abs_path = os.path.join(folder, fname)
                     arc = os.path.relpath(abs_path, ROOT_DIR)
@@ -93,7 +96,8 @@ Usage:
   export <filename> <command> [args...]
 
 Description:
-  export all: Zips the entire user/ directory into user/exports/[filename].zip.
+  export all: Zips the user/ directory (minus backups/ and exports/) into user/exports/[filename].zip.
+              For routine backups use 'backup', which only stores what changed.
   export filename: Executes a command and saves its table output to YAML in user/exports/.
 
 Example:
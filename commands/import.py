@@ -3,6 +3,7 @@ import os
 import yaml
 import zipfile
 from modules.item_manager import read_item_data, write_item_data
+from modules import backup_store as Store
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
@@ -15,6 +16,26 @@ def run(args, properties):
         return
 
     file_path_arg = args[0]
+
+    overwrite = False
+    mode = (properties.get('mode') if isinstance(properties, dict) else None) or None
+    if isinstance(properties, dict):
+        if properties.get('overwrite') is True or str(mode).lower() == 'overwrite':
+            overwrite = True
+
+    # Mode 0: Restore from a snapshot manifest (path to user/backups/store/snapshots/<id>.json, or the id)
+    if Store.is_manifest_file(file_path_arg) or (
+        not os.path.exists(file_path_arg) and any(s["id"] == file_path_arg for s in Store.list_snapshots())
+    ):
+        try:
+            counts = Store.restore_snapshot(file_path_arg, overwrite=overwrite)
+            print(
+                f"Imported snapshot '{file_path_arg}': {counts['restored']} files written, "
+                f"{counts['unchanged']} unchanged, {counts['skipped']} existing skipped."
+            )
+        except Exception as e:
+            print(f"Error importing snapshot: {e}")
+        return
     
     # Check if the file exists
     if not os.path.exists(file_path_arg):
@@ -28,11 +49,6 @@ def run(args, properties):
 
     # Mode A: Import a full backup zip
     if file_path.lower().endswith('.zip'):
-        overwrite = False
-        mode = (properties.get('mode') if isinstance(properties, dict) else None) or None
-        if isinstance(properties, dict):
-            if properties.get('overwrite') is True or str(mode).lower() == 'overwrite':
-                overwrite = True
         try:
             user_dir = os.path.join(ROOT_DIR, 'user')
             with zipfile.ZipFile(file_path, 'r') as zf:
@@ -104,15 +120,18 @@ def run(args, properties):
 def get_help_message():
     return """
 Usage:
-  import <file_path>
+  import <file_path|snapshot_id>
 
 Description:
   - If <file_path> ends with .zip, extracts the backup into the user/ directory.
     Use property overwrite:true or mode:overwrite to overwrite existing files.
+  - If it is a snapshot id or manifest (user/backups/store/snapshots/<id>.json),
+    restores that snapshot the same way (existing files kept unless overwrite:true).
   - If <file_path> is a YAML list, imports items (skips if already exist).
 
 Example:
   import user/exports/my_tasks.yml
   import user/exports/chronos_backup.zip overwrite:true
+  import 20250101_090000 overwrite:true
 """
 
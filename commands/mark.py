@@ -4,9 +4,11 @@ import yaml
 from datetime import datetime
 from modules.item_manager import get_item_path, read_item_data, write_item_data
 from modules.scheduler import schedule_path_for_date, build_block_key
-from commands.today import load_completion_payload
+from commands.today import load_completion_payload, save_completion_payload
 from modules import quality_utils
 from utilities.completion_effects import run_completion_effects
+from utilities import tracking_history
+from utilities.tracking import HISTORY_TYPES
 
 
 def _normalize_time_str(value):
@@ -174,8 +176,7 @@ def run(args, properties):
         if quality:
             entry["quality"] = quality
         entries[block_key] = entry
-        with open(completion_path, 'w') as f:
-            yaml.dump(completion_data, f, default_flow_style=False, sort_keys=False)
+        save_completion_payload(completion_data, completion_path)
 
     status_lower = str(new_status).lower()
     if is_repeating:
@@ -189,10 +190,15 @@ def run(args, properties):
                 today = target_date
                 last_completed = item_data.get('last_completed')
                 if new_status == 'completed':
-                    completion_dates = item_data.get('completion_dates', [])
-                    if today not in completion_dates:
-                        completion_dates.append(today)
-                    item_data['completion_dates'] = completion_dates
+                    if str(item_type).lower() in HISTORY_TYPES:
+                        # Out-of-line history; the item keeps only the summaries.
+                        tracking_history.migrate_item(item_type, item_name, item_data)
+                        tracking_history.record(item_type, item_name, 'completion', today)
+                    else:
+                        completion_dates = item_data.get('completion_dates', [])
+                        if today not in completion_dates:
+                            completion_dates.append(today)
+                        item_data['completion_dates'] = completion_dates
                     item_data['last_completed'] = today
                     yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
                     if last_completed == yesterday:
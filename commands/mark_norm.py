@@ -4,7 +4,7 @@ import yaml
 from datetime import datetime
 from modules.item_manager import get_item_path, read_item_data, write_item_data
 from modules.scheduler import schedule_path_for_date, build_block_key
-from commands.today import load_completion_payload
+from commands.today import load_completion_payload, save_completion_payload
 from modules import quality_utils
 try:
     from utilities import points as Points
@@ -165,8 +165,7 @@ def run(args, properties):
         if quality:
             entry["quality"] = quality
         entries[block_key] = entry
-        with open(completion_path, 'w') as f:
-            yaml.dump(completion_data, f, default_flow_style=False, sort_keys=False)
+        save_completion_payload(completion_data, completion_path)
 
     status_lower = str(new_status).lower()
     if is_repeating:
@@ -3,7 +3,7 @@ import os
 import yaml
 import json
 
-from modules.item_manager import list_all_items_any
+from modules import due_index
 from modules.scheduler import (
     schedule_path_for_date,
     get_flattened_schedule,
@@ -245,34 +245,21 @@ def _collect_due_items(max_minutes, days_window, base_date):
     today = base_date
     due_soon_end = today + timedelta(days=days_window)
     results = []
-    for item in list_all_items_any() or []:
-        name = _get_ci(item, ["name"]) or ""
+    # Index range scan: everything due by the end of the window, overdue included.
+    for row in due_index.due_within(days_window, today=today, max_minutes=max_minutes,
+                                    exclude_statuses=DONE_STATUSES):
+        name = row.get("name") or ""
         if not name:
             continue
-        status = str(_get_ci(item, ["status"]) or "").lower()
-        if status in DONE_STATUSES:
-            continue
-
-        duration = _item_duration_minutes(item)
-        is_parallel, is_zero = _duration_flags(item)
+        duration = row.get("minutes")
         inferred_flag = False
-        if is_parallel:
-            duration = None
-        elif is_zero:
-            duration = 0
-        if duration is None or duration > max_minutes:
-            continue
-
-        deadline = _parse_date(_get_ci(item, ["deadline"]))
-        due_date = _parse_date(_get_ci(item, ["due_date", "due date"]))
-
-        if not deadline and not due_date:
-            continue
+        deadline = _parse_date(row.get("deadline"))
+        due_date = _parse_date(row.get("due_date"))
 
         if deadline and deadline < today:
             results.append({
                 "name": name,
-                "type": _get_ci(item, ["type"]) or "task",
+                "type": row.get("item_type") or "task",
                 "minutes": duration,
                 "reason": f"overdue deadline ({deadline.isoformat()})",
                 "rank": 0,
@@ -282,7 +269,7 @@ def _collect_due_items(max_minutes, days_window, base_date):
         if due_date and due_date < today:
             results.append({
                 "name": name,
-                "type": _get_ci(item, ["type"]) or "task",
+                "type": row.get("item_type") or "task",
                 "minutes": duration,
                 "reason": f"overdue due_date ({due_date.isoformat()})",
                 "rank": 1,
@@ -294,7 +281,7 @@ def _collect_due_items(max_minutes, days_window, base_date):
             label = "due today" if deadline == today else f"due in { (deadline - today).days }d"
             results.append({
                 "name": name,
-                "type": _get_ci(item, ["type"]) or "task",
+                "type": row.get("item_type") or "task",
                 "minutes": duration,
                 "reason": f"deadline {label} ({deadline.isoformat()})",
                 "rank": 3 if deadline == today else 5,
@@ -305,7 +292,7 @@ def _collect_due_items(max_minutes, days_window, base_date):
             label = "due today" if due_date == today else f"due in { (due_date - today).days }d"
             results.append({
                 "name": name,
-                "type": _get_ci(item, ["type"]) or "task",
+                "type": row.get("item_type") or "task",
                 "minutes": duration,
                 "reason": f"due_date {label} ({due_date.isoformat()})",
                 "rank": 4 if due_date == today else 6,
@@ -0,0 +1,23 @@
+from commands.undo import replay_journal
+from modules import op_journal
+
+def run(args, properties):
+    """
+    Handles the 'redo' command.
+    redo [N] -> re-applies the last N operations reverted with `undo`.
+    """
+    if args and args[0].lower() in ("help", "-h", "--help"):
+        print(get_help_message())
+        return
+    count = args[0] if args and args[0].isdigit() else properties.get("count", 1)
+    replay_journal(op_journal.redo, count, properties, "Redid")
+
+def get_help_message():
+    return """
+Usage:
+  redo [N] [force:true]
+
+Description:
+  Re-applies the last N operations reverted with `undo` (default 1).
+  Running any other command that changes files clears the redo stack.
+"""
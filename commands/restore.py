@@ -5,6 +5,7 @@ import glob
 import shutil
 from modules.item_manager import USER_DIR, ROOT_DIR
 from commands import backup as Backup
+from modules import backup_store as Store
 
 BACKUPS_DIR = Backup.BACKUPS_DIR
 
@@ -21,14 +22,22 @@ def run(args, properties):
     
     # Locate the file
     backup_path = None
+    snapshot_ref = None
     
     if target.lower() == "latest":
         files = glob.glob(os.path.join(BACKUPS_DIR, "*.zip"))
-        if not files:
+        snaps = Store.list_snapshots()
+        if not files and not snaps:
             print("No backups found.")
             return
         files.sort(key=os.path.getmtime, reverse=True)
-        backup_path = files[0]
+        # Newest of the latest snapshot and the latest zip.
+        if snaps and (not files or snaps[0]["created_ts"] >= os.path.getmtime(files[0])):
+            snapshot_ref = snaps[0]["id"]
+        else:
+            backup_path = files[0]
+    elif Store.is_manifest_file(target) or any(s["id"] == target for s in Store.list_snapshots()):
+        snapshot_ref = target
     else:
         # Check if full path or just filename
         if os.path.exists(target):
@@ -42,14 +51,14 @@ def run(args, properties):
             if os.path.exists(possible_path):
                 backup_path = possible_path
             
-    if not backup_path:
+    if not backup_path and not snapshot_ref:
         print(f"Error: Backup '{target}' not found.")
         return
 
     # Confirmation
     force = bool(properties.get('force', False))
     if not force:
-        print(f"⚠️  WARNING: This will overwrite your current 'user' data with '{os.path.basename(backup_path)}'.")
+        print(f"⚠️  WARNING: This will overwrite your current 'user' data with '{os.path.basename(backup_path or snapshot_ref)}'.")
         print("Type 'yes' to confirm or use restore <file> force:true")
         # In actual CLI usage, interactive input isn't always easy. 
         # But Console.py supports input() so we can try.
@@ -58,6 +67,15 @@ def run(args, properties):
         print("To proceed, run: restore <file> force:true")
         return
 
+    if snapshot_ref:
+        print(f"Restoring snapshot {snapshot_ref}...")
+        try:
+            counts = Store.restore_snapshot(snapshot_ref, overwrite=True)
+            print(f"✅ Restore complete ({counts['restored']} files written, {counts['unchanged']} already current).")
+        except Exception as e:
+            print(f"❌ Restore failed: {e}")
+        return
+
     print(f"Restoring from {backup_path}...")
     
     try:
@@ -79,15 +97,15 @@ def run(args, properties):
 def get_help_message():
     return """
 Usage:
-  restore <filename|latest> force:true
+  restore <snapshot_id|filename|latest> force:true
 
 Description:
-  Restores the 'user' directory from a backup zip.
+  Restores the 'user' directory from a snapshot (see 'backup list') or a backup zip.
+  'latest' picks the newest of either kind.
   Requires 'force:true' property to confirm overwrite.
   
 Example:
   restore latest force:true
+  restore 20250101_090000 force:true
   restore chronos_backup_20250101.zip force:true
 """
-
-
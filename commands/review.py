@@ -3,6 +3,7 @@ import yaml
 from datetime import datetime, timedelta, date
 from modules.item_manager import get_user_dir, get_item_dir, list_all_items
 from modules.scheduler import schedule_path_for_date
+from utilities import tracking_history
 
 
 def run(args, properties):
@@ -211,12 +212,18 @@ def _summary_tasks(start: datetime, end: datetime):
     created = {}
     for t in types:
         items = list_all_items(t)
+        # Out-of-line completion history for the whole type, one range query
+        try:
+            stored = tracking_history.dates_by_item(t, 'completion', start, end)
+        except Exception:
+            stored = {}
         c = 0
         for it in items:
             if not isinstance(it, dict):
                 continue
             # completion_dates preferred
-            cds = it.get('completion_dates') or []
+            cds = list(it.get('completion_dates') or [])
+            cds += [d for d in stored.get(tracking_history.item_key(it.get('name')), []) if d not in cds]
             for ds in cds:
                 try:
                     dt = datetime.strptime(str(ds), '%Y-%m-%d')
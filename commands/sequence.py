@@ -15,6 +15,7 @@ from modules.sequence.behavior_builder import build_behavior_db
 from modules.sequence.journal_builder import build_journal_db
 from modules.sequence.events_builder import build_events_db
 from modules.sequence.trends_builder import build_trends_report
+from modules.sequence.docs_index import build_docs_index
 
 SYNC_HANDLERS = {
     "matrix": build_matrix_cache,
@@ -23,6 +24,7 @@ SYNC_HANDLERS = {
     "journal": build_journal_db,
     "events": build_events_db,
     "trends": build_trends_report,
+    "docs": build_docs_index,
 }
 
 
@@ -168,7 +170,7 @@ Usage:
   sequence status
       Show the current registry of SQLite mirrors and digests.
 
-  sequence sync [matrix|core|events|behavior|journal|memory|trends|trends_digest ...]
+  sequence sync [matrix|core|events|behavior|journal|memory|trends|trends_digest|docs ...]
       Placeholder sync hook. If no targets are provided it touches every dataset.
       Use space-separated keys (e.g., `sequence sync matrix core`). Properties
       `db`/`database` still work for automation hooks.
@@ -24,6 +24,15 @@ def _skills_list(registry):
     return rows if isinstance(rows, list) else []
 
 
+def _skill_body_hits(q):
+    """Skill file paths (repo-relative) whose body mentions q, via the docs index."""
+    try:
+        from modules.sequence import docs_index
+        return {f"docs/{p}" for p in docs_index.matching_paths(q, prefix="agents/skills/")}
+    except Exception:
+        return set()
+
+
 def _print_skill(row):
     sid = str(row.get("id") or "")
     label = str(row.get("label") or sid)
@@ -92,6 +101,7 @@ def run(args, properties):
         if not q:
             print("Usage: skills where q:<text>")
             return
+        body_hits = _skill_body_hits(q)
         out = []
         for row in rows:
             sid = str(row.get("id") or "")
@@ -99,7 +109,7 @@ def run(args, properties):
             summary = str(row.get("summary") or "")
             path = str(row.get("path") or "")
             hay = f"{sid} {label} {summary} {path}".lower()
-            if q in hay:
+            if q in hay or path in body_hits:
                 out.append(row)
         if not out:
             print("No skills matched.")
@@ -117,7 +127,7 @@ def get_help_message():
 Usage:
   skills list [q:<text>]
   skills show <skill_id>
-  skills where q:<text>
+  skills where q:<text>      (also matches skill body text)
   skills refresh
 
 Description:
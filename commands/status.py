@@ -1,8 +1,9 @@
 import yaml
 import os
-from datetime import datetime
-from modules.scheduler import status_current_path, status_history_path_for_date
+from modules.scheduler import status_current_path
+from modules import status_store
 from modules import status_utils
+from modules import write_coordinator
 from modules import variables as Variables
 
 def run(args, properties):
@@ -54,49 +55,23 @@ def run(args, properties):
         return
 
     try:
-        # Read existing status
-        if os.path.exists(status_file_path):
-            with open(status_file_path, 'r') as f:
-                current_status = yaml.safe_load(f)
-                if current_status is None:
-                    current_status = {}
-        else:
-            current_status = {}
+        # Update status (read-modify-write under the file's write lock)
+        def _set_indicator(status):
+            status = status if isinstance(status, dict) else {}
+            status[indicator_key] = normalized_value
+            return status
 
-        # Update status
-        current_status[indicator_key] = normalized_value
-
-        # Write updated status
-        with open(status_file_path, 'w') as f:
-            yaml.dump(current_status, f, default_flow_style=False)
+        current_status = write_coordinator.update_yaml(status_file_path, _set_indicator, default_flow_style=False)
         try:
             Variables.sync_status_vars(current_status)
         except Exception:
             pass
 
-        # Append to dated status history
-        history_path = status_history_path_for_date(datetime.now())
-        os.makedirs(os.path.dirname(history_path), exist_ok=True)
-        history = {}
-        if os.path.exists(history_path):
-            try:
-                with open(history_path, 'r') as f:
-                    history = yaml.safe_load(f) or {}
-            except Exception:
-                history = {}
-        if not isinstance(history, dict):
-            history = {}
-        entries = history.get("entries")
-        if not isinstance(entries, list):
-            entries = []
-        entries.append({
-            "at": datetime.now().strftime("%H:%M:%S"),
-            "status": dict(current_status),
-        })
-        history["date"] = datetime.now().strftime("%Y-%m-%d")
-        history["entries"] = entries
-        with open(history_path, 'w') as f:
-            yaml.dump(history, f, default_flow_style=False)
+        # Append to the status time series (one indexed insert)
+        try:
+            status_store.record({indicator_key: normalized_value}, source="status")
+        except Exception as e:
+            print(f"⚠️ Status history not recorded: {e}")
 
         print(f"✅ Status updated: {indicator_key} set to {normalized_value}")
 
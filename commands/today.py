@@ -18,6 +18,7 @@ Reader map:
 """
 
 import os
+import copy
 import yaml
 import math
 from datetime import datetime, timedelta
@@ -32,6 +33,8 @@ from modules.scheduler import (
     resolve_variant, scan_and_inject_items, schedule_flexible_items,
     schedule_path_for_date, manual_modifications_path_for_date, status_current_path
 )
+from modules.scheduler import template_cache
+from modules.scheduler import template_catalog
 from modules.scheduler.sleep_gate import (
     SLEEP_POLICY_OPTIONS,
     build_sleep_interrupt,
@@ -40,6 +43,7 @@ from modules.scheduler.sleep_gate import (
 
 from utilities.duration_parser import parse_duration_string
 from modules.item_manager import read_item_data
+from modules import write_coordinator
 
 
 def _prompt_sleep_policy(interrupt):
@@ -89,8 +93,8 @@ def load_scheduling_config():
     defaults_path = os.path.join(USER_DIR, "settings", "scheduling_defaults.yml")
     settings_path = os.path.join(USER_DIR, "settings", "scheduling_settings.yml")
     
-    defaults = read_template(defaults_path) or {}
-    settings = read_template(settings_path) or {}
+    defaults = template_catalog.read_yaml_cached(defaults_path) or {}
+    settings = template_catalog.read_yaml_cached(settings_path) or {}
     
     # Deep merge settings over defaults
     config = _deep_merge(defaults, settings)
@@ -480,57 +484,33 @@ def select_template_for_day(day_of_week, status_context):
     # Check for forced template
     if template_config.get("mode") == "explicit" and template_config.get("forced_template"):
         forced_path = os.path.join(USER_DIR, "days", template_config["forced_template"])
-        if os.path.exists(forced_path):
-            template = read_template(forced_path)
-            if template:
-                return {"path": forced_path, "template": template, "score": float('inf')}
+        record = template_catalog.record_for(forced_path)
+        if record is not None and record.template:
+            return {"path": forced_path, "template": copy.deepcopy(record.template), "score": float('inf')}
     
-    # Gather all templates
+    # Gather all templates (parsed once per file version by the catalog)
     candidate_paths = list_day_template_paths(day_of_week)
+    fallback_path = get_day_template_path(day_of_week)
     if not candidate_paths:
-        fallback_path = get_day_template_path(day_of_week)
         return {"path": fallback_path, "template": read_template(fallback_path), "score": 0}
 
     candidates = []
-    fallback_path = get_day_template_path(day_of_week)
-    
-    for path in candidate_paths:
-        template = read_template(path)
-        if not template:
+    for record in template_catalog.records(candidate_paths):
+        # Eligibility: 'days' property, status-only templates, or filename match
+        if not record.eligible(day_of_week, is_template_eligible_for_day):
             continue
+
+        # Calculate score
+        requirements = record.requirements(status_context, extract_status_requirements)
+        score = score_status_alignment(requirements, status_context)
         
-        # Check eligibility based on 'days' property or filename
-        filename = os.path.basename(path)
-        stem = os.path.splitext(filename)[0].lower()
+        # Bonus for specific day match (prefer Monday.yml over generic sick day on Monday)
+        day_bonus = 5 if record.is_day_specific(day_of_week) else 0
         
-        # Check if template has explicit 'days' property
-        if is_template_eligible_for_day(template, day_of_week):
-            # Template is eligible - check if it's day-specific or universal
-            has_days_prop = template.get("days") is not None
-            has_status_req = bool(template.get("status_requirements"))
-            
-            # If no days property and no status requirements, must match filename
-            if not has_days_prop and not has_status_req:
-                # Traditional weekday template - filename must match
-                if not (stem == day_of_week.lower() or 
-                        stem.startswith(f"{day_of_week.lower()}_") or
-                        stem.startswith(f"{day_of_week.lower()}__")):
-                    continue
-            
-            # Calculate score
-            requirements = extract_status_requirements(template, status_context)
-            score = score_status_alignment(requirements, status_context)
-            
-            # Bonus for specific day match (prefer Monday.yml over generic sick day on Monday)
-            is_day_specific = stem.startswith(day_of_week.lower())
-            day_bonus = 5 if is_day_specific else 0
-            
-            # Bonus for having status requirements that match
-            status_bonus = 10 if has_status_req and score > 0 else 0
-            
-            total_score = score + day_bonus + status_bonus
-            
-            candidates.append((total_score, path, template))
+        # Bonus for having status requirements that match
+        status_bonus = 10 if record.has_status_req and score > 0 else 0
+        
+        candidates.append((score + day_bonus + status_bonus, record))
 
     # Note:
     # this function is intentionally score-based (soft constraints). Kairos adds
@@ -539,11 +519,12 @@ def select_template_for_day(day_of_week, status_context):
     if not candidates:
         return {"path": fallback_path, "template": read_template(fallback_path), "score": 0}
 
-    # Sort by score (highest first)
+    # Highest score wins (stable: first listed template on ties)
     candidates.sort(key=lambda x: x[0], reverse=True)
-    best_score, best_path, best_template = candidates[0]
+    best_score, best = candidates[0]
     
-    return {"path": best_path, "template": best_template, "score": best_score}
+    # Callers mutate the template while building; keep the catalog's copy intact.
+    return {"path": best.path, "template": copy.deepcopy(best.template), "score": best_score}
 
 def load_completion_payload(date_str):
     """
@@ -554,18 +535,23 @@ def load_completion_payload(date_str):
     os.makedirs(completions_dir, exist_ok=True)
     per_day_path = os.path.join(completions_dir, f"{date_str}.yml")
 
-    if os.path.exists(per_day_path):
-        with open(per_day_path, "r") as fh:
-            data = yaml.safe_load(fh) or {}
-    else:
-        data = {"entries": {}}
+    # Tracked read: save_completion_payload merges entries other writers
+    # logged in the meantime instead of overwriting them.
+    data = write_coordinator.read_yaml(per_day_path, default={"entries": {}}) or {}
 
-    if "entries" not in data or not isinstance(data.get("entries"), dict):
+    if not isinstance(data, dict) or not isinstance(data.get("entries"), dict):
         data = {"entries": {}}
 
     return data, per_day_path
 
 
+def save_completion_payload(data, path, **dump_kwargs):
+    """Commit a payload obtained from load_completion_payload (locked, atomic, merged)."""
+    dump_kwargs.setdefault("default_flow_style", False)
+    dump_kwargs.setdefault("sort_keys", False)
+    write_coordinator.write_yaml(path, data, **dump_kwargs)
+
+
 def persist_kairos_cut_skips(notes, completion_payload, completion_file_path):
     """
     Persist Kairos repair-cut removals as explicit `skipped` entries.
@@ -630,8 +616,7 @@ def persist_kairos_cut_skips(notes, completion_payload, completion_file_path):
 
     if changed > 0:
         try:
-            with open(completion_file_path, "w", encoding="utf-8") as fh:
-                yaml.dump(completion_payload, fh, default_flow_style=False, sort_keys=False)
+            save_completion_payload(completion_payload, completion_file_path)
         except Exception as write_err:
             print(f"Warning: failed to persist Kairos auto-skip entries: {write_err}")
     return changed
@@ -992,30 +977,29 @@ def build_initial_schedule(template, current_start_time=None, parent=None, statu
     if not items:
          return schedule, conflicts
 
-    for child_entry in items:
-        child_name = child_entry.get('name')
-        child_type = child_entry.get('type')
-        if not child_name:
-             conflicts.append(f"Error: Child entry missing name: {child_entry}")
-             continue
-
-        # Try to read external item data, but fallback to inline data if not found
-        item_data = None
-        if child_type:
-            item_data = read_item_data(child_type, child_name)
-        
-        # If no external data found, use the entry itself as the data source (Virtual/Inline Item)
-        # This allows routines to have simple steps like "- name: brush teeth\n  duration: 5" without a file.
-        if not item_data:
-             item_data = child_entry.copy()
-             if "type" not in item_data:
-                 item_data["type"] = "task" # Default type for inline items
-            
-        # --- Variant Resolution ---
-        # If status_context is provided, resolve any variants BEFORE processing the item
-        if status_context:
-            item_data = resolve_variant(item_data, status_context)
-            
+    # File reads and variant resolution are memoized per subtree (see template_cache);
+    # only the time layout below runs on every build.
+    nodes = template_cache.expand_children(
+        items, status_context, read_item=read_item_data, resolve=resolve_variant
+    )
+    return _layout_expansion(nodes, current_start_time, parent)
+
+
+def _layout_expansion(nodes, current_start_time, parent=None):
+    """
+    Lays out expanded template nodes from `current_start_time`, recursing into children.
+    """
+    schedule = []
+    conflicts = []
+    for node in nodes:
+        if "error" in node:
+            conflicts.append(node["error"])
+            continue
+        child_entry = node["entry"]
+        child_type = node["child_type"]
+        # Cached nodes are shared; each schedule item gets its own data.
+        item_data = copy.deepcopy(node["data"])
+
         item = {
             "name": item_data.get("name", "Unnamed Item"),
             "type": item_data.get("type", child_type), # Ensure type is carried over
@@ -1056,11 +1040,8 @@ def build_initial_schedule(template, current_start_time=None, parent=None, statu
         # My resolve_variant implementation copies 'items', 'children', 'sequence' directly.
         # So check all keys.
         
-        children_source = item_data.get("children") or item_data.get("items") or item_data.get("sequence")
-        
-        if children_source:
-            # We must pass status_context recursively!
-            child_schedule, child_conflicts = build_initial_schedule({"children": children_source}, current_start_time=item_actual_start_time, parent=item, status_context=status_context)
+        if node["children"]:
+            child_schedule, child_conflicts = _layout_expansion(node["children"], item_actual_start_time, parent=item)
             item["children"] = child_schedule
             conflicts.extend(child_conflicts)
             children_total_duration = sum(parse_duration_string(child_item["duration"]) for child_item in child_schedule if not child_item.get("is_parallel_item"))
@@ -1714,6 +1695,12 @@ def run(args, properties):
                         ctx["_days"] = max(1, int(val))
                     except Exception:
                         warnings.append(f"Invalid days value: {val}")
+                elif low.startswith("workers:"):
+                    val = token.split(":", 1)[1].strip()
+                    try:
+                        ctx["_workers"] = max(1, int(val))
+                    except Exception:
+                        warnings.append(f"Invalid workers value: {val}")
                 elif low.startswith("status:"):
                     kv = _parse_kv_csv(token.split(":", 1)[1].strip())
                     if kv:
@@ -1837,12 +1824,13 @@ def run(args, properties):
             from modules.scheduler import KairosV2Scheduler, kairosScheduler, WeeklyGenerator, save_weekly_skeleton
             is_week_mode = bool(kairos_context.pop("_mode_week", False))
             weekly_days = int(kairos_context.pop("_days", 7) or 7)
+            weekly_workers = kairos_context.pop("_workers", None)
             engine_version = str(kairos_context.pop("engine_version", "v2") or "v2").strip().lower()
             if is_week_mode:
                 # Weekly mode writes a planning scaffold (not today's executable
                 # schedule) so users can inspect load distribution first.
                 weekly = WeeklyGenerator(user_context=kairos_context)
-                payload = weekly.generate_skeleton(days=weekly_days, start_date=today_date)
+                payload = weekly.generate_skeleton(days=weekly_days, start_date=today_date, workers=weekly_workers)
                 weekly_path = os.path.join(USER_DIR, "schedules", f"schedule_{today_str}_kairos_weekly_skeleton.yml")
                 save_weekly_skeleton(weekly_path, payload)
                 rows = payload.get("skeleton", []) if isinstance(payload, dict) else []
@@ -1924,8 +1912,7 @@ def run(args, properties):
                             copy2(main_schedule_path, archive_path)
                         except Exception as e:
                             print(f"Warning: Failed to archive previous schedule: {e}")
-                    with open(main_schedule_path, "w", encoding="utf-8") as f:
-                        yaml.dump(resolved_schedule, f, default_flow_style=False)
+                    save_schedule(resolved_schedule, main_schedule_path)
                     print(f"Kairos v2 schedule applied to: {main_schedule_path}")
                 else:
                     print("Main schedule unchanged (Kairos v2 shadow mode).")
@@ -3144,8 +3131,7 @@ def run(args, properties):
                                 copy2(schedule_path, archive_path)
                             except Exception as e:
                                 print(f"Warning: Failed to archive previous schedule: {e}")
-                        with open(schedule_path, "w", encoding="utf-8") as f:
-                            yaml.dump(resolved_schedule, f, default_flow_style=False)
+                        save_schedule(resolved_schedule, schedule_path)
                         print(f"Kairos v2 schedule applied to: {schedule_path}")
                     else:
                         print("Main schedule unchanged (Kairos v2 shadow mode).")
@@ -3216,8 +3202,7 @@ def run(args, properties):
                     except Exception as e:
                         print(f"Warning: Failed to archive previous schedule: {e}")
 
-                with open(schedule_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(resolved_schedule, f, default_flow_style=False)
+                save_schedule(resolved_schedule, schedule_path)
                 print(f"Kairos schedule saved to: {schedule_path}")
                 if kairos_context:
                     print(f"[Kairos] Context: {kairos_context}")
@@ -3460,8 +3445,7 @@ def run(args, properties):
                 print(f"Warning: Failed to archive previous schedule: {e}")
 
         # Save the resolved schedule to the dated schedule file
-        with open(schedule_path, 'w') as f:
-            yaml.dump(resolved_schedule, f, default_flow_style=False)
+        save_schedule(resolved_schedule, schedule_path)
         print(f"✅ Resolved schedule saved to: {schedule_path}")
 
         # Write conflict log to file
@@ -3,16 +3,25 @@
 import sys
 from modules.item_manager import dispatch_command
 try:
-    from utilities.tracking import is_trackable, show_tracking
+    from utilities.tracking import is_trackable, show_tracking, migrate_history
 except Exception:
     is_trackable = None
     show_tracking = None
+    migrate_history = None
 
 def run(args, properties):
     """
     Handles the 'track' command by dispatching it to the appropriate item handler
     to display its tracking data.
     """
+    if args and args[0].lower() == 'migrate' and migrate_history and not any(arg in ['/h', '-h', '--help'] for arg in args):
+        # Move inline completion/session/missed lists into the tracking history store
+        moved = migrate_history([a.lower() for a in args[1:]] or None)
+        for item_type, count in moved.items():
+            print(f"  {item_type}: {count} history entries moved")
+        print("✅ Tracking history migrated.")
+        return
+
     if len(args) < 2 or any(arg in ['/h', '-h', '--help'] for arg in args):
         print(get_help_message())
         return
@@ -53,10 +62,14 @@ def run(args, properties):
 def get_help_message():
     return """
 Usage: track <item_type> <item_name>
+       track migrate [item_type ...]
 Description: Displays tracking data for a specific item (streaks, sessions, minutes, history).
+  'migrate' moves completion_dates / sessions / missed_dates lists out of item
+  files into the tracking history store (user/logs/tracking_history.db).
 Examples:
   track task "Deep Work"
   track routine "Morning Routine"
+  track migrate
 """
 
 
@@ -1,13 +1,14 @@
 
 import os
-import yaml
-from modules.item_manager import read_item_data, get_item_path
+from modules.item_manager import read_item_data
 from modules.item_manager import USER_DIR
+from modules import reference_graph
 
 def run(args, properties):
     """
     Handles the 'tree' command.
     tree <type> <name> -> visuals nested item structure
+    tree <type> <name> reverse:true -> items that reference it, up to the roots
     tree dir <path> -> visualizes directory structure
     """
     if len(args) < 2:
@@ -33,9 +34,11 @@ def run(args, properties):
             return
         
         print(f"📦 {item_data.get('name', target_name)} ({target_type})")
-        # Check for children keys: children, tasks, milestones, subroutines, etc.
-        # We'll use a generic approach looking for list-of-dicts or list-of-strings
-        print_item_tree(item_data)
+        # References come from the indexed graph (children, sequence, tasks,
+        # milestones, subroutines, microroutines, items, inventory_items).
+        reverse = str(properties.get("reverse", "")).lower() in ("1", "true", "yes")
+        with reference_graph.Graph() as graph:
+            print_item_tree(graph, target_type, item_data.get("name", target_name), reverse=reverse)
 
 def print_dir_tree(path, prefix=""):
     try:
@@ -56,81 +59,67 @@ def print_dir_tree(path, prefix=""):
             extension = "    " if is_last else "│   "
             print_dir_tree(full_path, prefix + extension)
 
-def print_item_tree(item_data, prefix="", visited=None):
-    if visited is None:
-        visited = set()
-    
-    # Avoid infinite recursion
-    item_id = f"{item_data.get('type')}:{item_data.get('name')}"
-    if item_id in visited:
-        print(f"{prefix}└── [Recursive: {item_data.get('name')}]")
-        return
-    visited.add(item_id)
-
-    # Gather children from known keys
-    children = []
-    
-    # 1. explicit children list (Template Builder style)
-    if "children" in item_data and isinstance(item_data["children"], list):
-        children.extend(item_data["children"])
-        
-    # 2. specific keys common in Chronos
-    for key in ["tasks", "milestones", "subroutines", "microroutines", "items"]:
-        if key in item_data and isinstance(item_data[key], list):
-             for child in item_data[key]:
-                 if isinstance(child, str):
-                     # Likely just a name, or specific format like "Task: Name"
-                     # Try to resolve type info if possible, or just treat as generic child
-                     if ":" in child:
-                         c_type, c_name = child.split(":", 1)
-                         children.append({"type": c_type.strip(), "name": c_name.strip()})
-                     else:
-                         # Use key as type hint (tasks -> task)
-                         type_hint = key[:-1] if key.endswith('s') else key
-                         children.append({"type": type_hint, "name": child})
-                 elif isinstance(child, dict):
-                     children.append(child)
-
-    # 3. inventory items, seeds, etc
-    if "inventory_items" in item_data:
-        for child in item_data["inventory_items"]:
-             children.append({"type": "inventory_item", "name": child})
+def print_item_tree(graph, item_type, name, reverse=False):
+    neighbours = graph.parents if reverse else graph.children
+    root = graph.node(item_type, name)
+    root_id = root["id"] if root else reference_graph.node_id(item_type, name)
+    lines, _cyclic = _subtree_lines(graph, neighbours, item_type, name, {root_id}, {})
+    for line in lines:
+        print(line)
 
-    # Render
-    for i, child in enumerate(children):
-        is_last = (i == len(children) - 1)
+def _subtree_lines(graph, neighbours, item_type, name, ancestors, memo):
+    """
+    Returns (lines below one node relative to its prefix, hit an ancestor).
+    A subtree that hit no ancestor does not depend on the path to it, so
+    shared subtrees are rendered once and reused.
+    """
+    lines = []
+    cyclic = False
+    refs = neighbours(item_type, name)
+    for i, ref in enumerate(refs):
+        is_last = (i == len(refs) - 1)
         connector = "└── " if is_last else "├── "
-        
-        c_name = child.get("name", "Unknown")
-        c_type = child.get("type", "item")
-        
-        # Try to resolve full data for nested visualization
-        c_data = read_item_data(c_type, c_name)
-        
-        lbl = f"{c_name} ({c_type})"
+        node = ref["node"]
+
+        lbl = f"{ref['name']} ({ref['type']})"
         # Add quick status info if available
-        if c_data and "status" in c_data:
-            lbl += f" [{c_data['status']}]"
-            
-        print(f"{prefix}{connector}{lbl}")
-        
-        # Recurse if we found the item data
-        if c_data:
-            extension = "    " if is_last else "│   "
-            print_item_tree(c_data, prefix + extension, visited.copy())
+        if node and node.get("status") is not None:
+            lbl += f" [{node['status']}]"
+        lines.append(f"{connector}{lbl}")
+
+        # Recurse if the reference resolves to an item
+        if not node:
+            continue
+        extension = "    " if is_last else "│   "
+        if node["id"] in ancestors:
+            lines.append(f"{extension}└── [Recursive: {node['name']}]")
+            cyclic = True
+            continue
+        cached = memo.get(node["id"])
+        if cached is None:
+            sub, sub_cyclic = _subtree_lines(graph, neighbours, node["item_type"], node["name"], ancestors | {node["id"]}, memo)
+            cyclic = cyclic or sub_cyclic
+            if not sub_cyclic:
+                memo[node["id"]] = sub
+        else:
+            sub = cached
+        lines.extend(extension + line for line in sub)
+    return lines, cyclic
 
 def get_help_message():
     return """
 Usage:
-  tree <type> <name>
+  tree <type> <name> [reverse:true]
   tree dir <path>
 
 Description:
   Visualizes the hierarchy of an item (routines, projects) or a directory.
+  reverse:true shows what references the item instead.
   
 Example:
   tree routine "Morning Core"
   tree project "My Game"
+  tree task "Stretch" reverse:true
   tree dir user/tasks
 """
 
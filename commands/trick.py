@@ -45,27 +45,24 @@ def _print_element(row):
     print(f"- {eid}  kind:{kind}  actions:[{actions}]")
 
 
-def _resolve_surface(registry, surface_id):
-    sid = str(surface_id or "").strip().lower()
-    for row in _as_list(registry) or []:
-        if str(row.get("id") or "").lower() == sid:
-            return row
-    return None
-
-
-def _resolve_element(registry, element_id):
-    eid = str(element_id or "").strip().lower()
-    elements = _as_elements(registry)
-    if isinstance(elements, dict):
-        row = elements.get(eid)
-        if isinstance(row, dict):
-            return row
-    # Fallback scan in case index is missing
-    for surf in _as_list(registry) or []:
-        for row in surf.get("elements") or []:
-            if str(row.get("id") or "").lower() == eid:
-                return row
-    return None
+def _surfaces_by_id(registry):
+    return {str(row.get("id") or "").lower(): row for row in _as_list(registry) or []}
+
+
+def _resolve_id(index, ident, kind):
+    """Exact id, else the only id it prefixes. Returns (id, candidates)."""
+    ident = str(ident or "").strip().lower()
+    if index.kind(ident) == kind:
+        return ident, []
+    candidates = index.complete(ident, kind) if ident else []
+    if len(candidates) == 1:
+        return candidates[0], []
+    return None, candidates
+
+
+def _print_candidates(candidates):
+    shown = candidates[:10]
+    print("Did you mean: " + ", ".join(shown) + (f" (+{len(candidates) - 10} more)" if len(candidates) > 10 else ""))
 
 
 def run(args, properties):
@@ -83,23 +80,15 @@ def run(args, properties):
         print(f"TRICK registry rebuilt. surfaces={len(_as_list(data) or [])} elements={len(_as_elements(data) or {})}")
         return
 
-    registry = registry_builder.build_trick_registry(force=force)
+    index = registry_builder.load_trick_index(force=force)
+    registry = registry_builder.build_trick_registry()
 
     if sub == "list":
         kv, rest = _parse_kv(args[1:])
         q = str(kv.get("q") or (" ".join(rest) if rest else "")).strip().lower()
         type_filter = str(kv.get("type") or "").strip().lower()
-        rows = []
-        for row in _as_list(registry) or []:
-            sid = str(row.get("id") or "")
-            stype = str(row.get("type") or "").lower()
-            label = str(row.get("label") or "")
-            if type_filter and stype != type_filter:
-                continue
-            hay = f"{sid} {stype} {label}".lower()
-            if q and q not in hay:
-                continue
-            rows.append(row)
+        by_id = _surfaces_by_id(registry)
+        rows = [by_id[sid] for sid in index.surfaces(q=q, type_=type_filter) if sid in by_id]
         if not rows:
             print("No TRICK surfaces matched.")
             return
@@ -113,9 +102,12 @@ def run(args, properties):
         if not target:
             print("Usage: trick show <type.name>")
             return
-        surface = _resolve_surface(registry, target)
+        sid, candidates = _resolve_id(index, target, "surface")
+        surface = _surfaces_by_id(registry).get(sid) if sid else None
         if not surface:
             print(f"Surface not found: {target}")
+            if candidates:
+                _print_candidates(candidates)
             return
         _print_surface(surface)
         elems = surface.get("elements") or []
@@ -132,12 +124,15 @@ def run(args, properties):
         if not target:
             print("Usage: trick actions <type.name.element>")
             return
-        row = _resolve_element(registry, target)
-        if not row:
+        eid, candidates = _resolve_id(index, target, "element")
+        row = (_as_elements(registry) or {}).get(eid) if eid else None
+        if not isinstance(row, dict):
             print(f"Element not found: {target}")
+            if candidates:
+                _print_candidates(candidates)
             return
         actions = row.get("actions") if isinstance(row.get("actions"), list) else []
-        print(f"{target}: {', '.join(actions) if actions else '(none)'}")
+        print(f"{eid}: {', '.join(actions) if actions else '(none)'}")
         return
 
     if sub == "where":
@@ -147,20 +142,11 @@ def run(args, properties):
         if not action:
             print("Usage: trick where action:<get|set|type|copy|paste|press|click|highlight|wait>")
             return
-        matches = []
-        for row in (_as_elements(registry) or {}).values():
-            if not isinstance(row, dict):
-                continue
-            actions = {str(a).lower() for a in (row.get("actions") or [])}
-            if action not in actions:
-                continue
-            if q and q not in str(row.get("id") or "").lower():
-                continue
-            matches.append(row)
+        elements = _as_elements(registry) or {}
+        matches = [elements[eid] for eid in index.elements(action=action, q=q) if isinstance(elements.get(eid), dict)]
         if not matches:
             print("No TRICK elements matched.")
             return
-        matches.sort(key=lambda r: str(r.get("id") or ""))
         for row in matches:
             _print_element(row)
         print(f"Matched elements: {len(matches)}")
@@ -181,4 +167,6 @@ Usage:
 Description:
   Query the TRICK capability registry built from dashboard trick.yml manifests.
   Use this to see what UI surfaces/elements familiars can interact with.
+  q: matches words of ids (and surface labels) by prefix, e.g. q:"tim start".
+  show/actions accept an id prefix when it names a single surface or element.
 """
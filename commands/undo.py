@@ -1,4 +1,3 @@
-
 import os
 import shutil
 import time
@@ -7,29 +6,82 @@ import glob
 import yaml
 from modules.item_manager import USER_DIR, get_item_dir
 from modules.scheduler import schedule_path_for_date
+from modules import op_journal
 
 ARCHIVE_DIR = os.path.join(USER_DIR, "archive")
 
 def run(args, properties):
     """
     Handles the 'undo' command.
+    undo [N] -> reverts the last N journaled operations (default 1).
+    undo list [N] -> shows the most recent operations.
     undo delete [type] -> restores the most recently archived item (of that type, or global).
     undo reschedule -> restores the most recent schedule from archive/schedules/.
     """
-    if not args:
-        print(get_help_message())
-        return
-
-    action = args[0].lower()
+    action = args[0].lower() if args else ""
 
     if action == "delete":
         handle_undo_delete(args[1:] if len(args) > 1 else [])
     elif action == "reschedule":
         handle_undo_reschedule()
+    elif action == "list":
+        print_history(args[1] if len(args) > 1 else properties.get("limit", 10))
+    elif action in ("help", "-h", "--help"):
+        print(get_help_message())
+    elif not action or action.isdigit():
+        count = int(action) if action else properties.get("count", properties.get("last", 1))
+        replay_journal(op_journal.undo, count, properties, "Undid")
     else:
         print(f"Unknown undo action: {action}")
         print(get_help_message())
 
+def replay_journal(step, count, properties, verb):
+    """Runs op_journal.undo/redo and reports what changed (shared with `redo`)."""
+    try:
+        op_journal.compact_if_due()
+    except Exception:
+        pass
+    force = str(properties.get("force", "")).lower() in ("1", "true", "yes")
+    try:
+        count = max(1, int(count))
+    except (TypeError, ValueError):
+        count = 1
+    done = []
+    try:
+        for _ in range(count):
+            ops = step(1, force=force)
+            if not ops:
+                break
+            done.extend(ops)
+    except op_journal.JournalConflictError as e:
+        for op in done:
+            print(f"{verb} #{op['seq']}: {op['label']}")
+        print(f"Stopped: {e}")
+        print("Those files were edited since. Re-run with force:true to overwrite them.")
+        return
+    if not done:
+        print("Nothing to undo." if step is op_journal.undo else "Nothing to redo.")
+        return
+    for op in done:
+        files = ", ".join(os.path.relpath(p, USER_DIR) for p in op["paths"][:3])
+        more = f" (+{len(op['paths']) - 3} more)" if len(op["paths"]) > 3 else ""
+        stores = "; " + ", ".join(op.get("effects") or []) if op.get("effects") else ""
+        print(f"{verb} #{op['seq']}: {op['label']} [{files}{more}{stores}]")
+
+def print_history(limit):
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 10
+    ops = op_journal.history(limit)
+    if not ops:
+        print("No journaled operations.")
+        return
+    for op in ops:
+        marker = "↶" if op["state"] == "undone" else " "
+        stores = f", {', '.join(op['effects'])}" if op.get("effects") else ""
+        print(f"{marker} #{op['seq']:<5} {op['at']}  {op['label']}  ({len(op['paths'])} file(s){stores})")
+
 def handle_undo_delete(args):
     """
     Restores the most recently modified file in user/archive.
@@ -121,11 +173,20 @@ def ensure_dir(path):
 def get_help_message():
     return """
 Usage:
+  undo [N] [force:true]
+  undo list [N]
   undo delete [type]
   undo reschedule
 
 Description:
+  undo [N]: Reverts the last N operations from the operation journal (default 1).
+    Every command's item, schedule and completion changes are one operation.
+    Stops if a file was edited since, unless force:true.
+    Side stores are compensated rather than restored: completion/session
+    history rows and status samples the operation added are deleted, and
+    points are reversed with an opposite `undo:` ledger entry (the ledger
+    itself is never rewritten). These are not conflict-checked.
+  undo list: Shows recent operations (↶ marks undone ones; see `redo`).
   undo delete: Restores the most recently archived item.
   undo reschedule: Reverts today's schedule file to the previous version.
 """
-
@@ -0,0 +1,344 @@
+"""
+Content-addressed, incremental backups of the user/ directory.
+
+`backup` used to deflate the whole tree into a new zip every run. The store
+under user/backups/store/ keeps:
+
+- objects/<aa>/<sha256>  zlib-compressed chunks (files are cut into
+  CHUNK_SIZE pieces), written once and shared by every snapshot;
+- snapshots/<id>.json    one manifest per snapshot: for each file its
+  path relative to ROOT_DIR (so "user/..."), size, mtime_ns and chunk list.
+
+A new snapshot starts from the previous manifest: a file whose size and
+mtime_ns are unchanged reuses its chunk list without being opened. Only new
+or changed files are read, hashed and (for unseen chunks) compressed.
+
+Restores write each file atomically and put back its recorded mtime, so the
+next snapshot after a restore is still incremental. `prune` applies the
+retention policy to manifests and then drops chunks no manifest references.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+from modules.item_manager import ROOT_DIR, USER_DIR
+
+BACKUPS_DIR = os.path.join(USER_DIR, "backups")
+STORE_DIR = os.path.join(BACKUPS_DIR, "store")
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_VERSION = 1
+# Top-level folders of the source never snapshotted (the backups themselves).
+EXCLUDED_SUBDIRS = ("backups",)
+
+
+class BackupStoreError(Exception):
+    pass
+
+
+def _objects_dir(store_dir: str) -> str:
+    return os.path.join(store_dir, "objects")
+
+
+def _snapshots_dir(store_dir: str) -> str:
+    return os.path.join(store_dir, "snapshots")
+
+
+def _object_path(store_dir: str, digest: str) -> str:
+    return os.path.join(_objects_dir(store_dir), digest[:2], digest)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _slug(label: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(label or "").strip().lower()).strip("_")
+
+
+# Snapshot creation --------------------------------------------------------
+
+
+def _walk(source_dir: str, excluded: Iterable[str]) -> Iterable[str]:
+    excluded = {os.path.normcase(os.path.abspath(p)) for p in excluded}
+    for folder, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.normcase(os.path.abspath(os.path.join(folder, d))) not in excluded)
+        for fname in sorted(files):
+            yield os.path.join(folder, fname)
+
+
+def _store_file(store_dir: str, abs_path: str, stats: Dict[str, int]) -> List[str]:
+    chunks = []
+    with open(abs_path, "rb") as fh:
+        while True:
+            data = fh.read(CHUNK_SIZE)
+            if not data:
+                break
+            digest = hashlib.sha256(data).hexdigest()
+            chunks.append(digest)
+            stats["bytes_read"] += len(data)
+            obj = _object_path(store_dir, digest)
+            if not os.path.exists(obj):
+                packed = zlib.compress(data, 6)
+                _write_atomic(obj, packed)
+                stats["chunks_new"] += 1
+                stats["bytes_stored"] += len(packed)
+    return chunks
+
+
+def create_snapshot(label: Optional[str] = None, source_dir: str = USER_DIR, store_dir: str = STORE_DIR,
+                    root_dir: str = ROOT_DIR) -> Dict[str, Any]:
+    """Snapshot `source_dir` into the store. Returns {"id", "path", "stats"}."""
+    previous = latest_manifest(store_dir)
+    prev_files = (previous or {}).get("files") or {}
+    stats = {"files": 0, "reused": 0, "hashed": 0, "chunks_new": 0, "bytes_read": 0, "bytes_stored": 0}
+    files: Dict[str, Dict[str, Any]] = {}
+    excluded = {os.path.join(source_dir, d) for d in EXCLUDED_SUBDIRS} | {store_dir}
+    for abs_path in _walk(source_dir, excluded):
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            continue
+        rel = os.path.relpath(abs_path, root_dir).replace("\\", "/")
+        stats["files"] += 1
+        prev = prev_files.get(rel)
+        if prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+            files[rel] = prev
+            stats["reused"] += 1
+            continue
+        try:
+            chunks = _store_file(store_dir, abs_path, stats)
+        except OSError:
+            continue
+        stats["hashed"] += 1
+        files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "chunks": chunks}
+
+    snap_id = time.strftime("%Y%m%d_%H%M%S")
+    if label:
+        snap_id += f"_{_slug(label)}"
+    snaps = _snapshots_dir(store_dir)
+    base, n = snap_id, 1
+    while os.path.exists(os.path.join(snaps, f"{snap_id}.json")):
+        n += 1
+        snap_id = f"{base}_{n}"
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "id": snap_id,
+        "label": label or None,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "created_ts": time.time(),
+        "files": files,
+    }
+    path = os.path.join(snaps, f"{snap_id}.json")
+    _write_atomic(path, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+    return {"id": snap_id, "path": path, "stats": stats}
+
+
+# Manifests ----------------------------------------------------------------
+
+
+def list_snapshots(store_dir: str = STORE_DIR) -> List[Dict[str, Any]]:
+    """Snapshot summaries, newest first."""
+    out = []
+    snaps = _snapshots_dir(store_dir)
+    if not os.path.isdir(snaps):
+        return out
+    for fname in os.listdir(snaps):
+        if not fname.endswith(".json"):
+            continue
+        try:
+            manifest = load_manifest(os.path.join(snaps, fname))
+        except BackupStoreError:
+            continue
+        files = manifest.get("files") or {}
+        out.append({
+            "id": manifest.get("id") or fname[:-5],
+            "label": manifest.get("label"),
+            "created": manifest.get("created"),
+            "created_ts": float(manifest.get("created_ts") or 0),
+            "files": len(files),
+            "size": sum(int(f.get("size") or 0) for f in files.values()),
+        })
+    out.sort(key=lambda s: (s["created_ts"], s["id"]), reverse=True)
+    return out
+
+
+def is_manifest_file(path: str) -> bool:
+    if not str(path).lower().endswith(".json") or not os.path.isfile(path):
+        return False
+    try:
+        manifest = load_manifest(path)
+    except BackupStoreError:
+        return False
+    return isinstance(manifest.get("files"), dict)
+
+
+def load_manifest(ref: str, store_dir: str = STORE_DIR) -> Dict[str, Any]:
+    """Load by path, snapshot id or 'latest'."""
+    ref = str(ref or "").strip()
+    if ref.lower() == "latest":
+        snaps = list_snapshots(store_dir)
+        if not snaps:
+            raise BackupStoreError("No snapshots found.")
+        ref = snaps[0]["id"]
+    path = ref if os.path.isfile(ref) else os.path.join(_snapshots_dir(store_dir), f"{ref}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except FileNotFoundError:
+        raise BackupStoreError(f"Snapshot '{ref}' not found.")
+    except Exception as e:
+        raise BackupStoreError(f"Unreadable snapshot manifest '{ref}': {e}")
+    if not isinstance(manifest, dict):
+        raise BackupStoreError(f"Invalid snapshot manifest '{ref}'.")
+    return manifest
+
+
+def latest_manifest(store_dir: str = STORE_DIR) -> Optional[Dict[str, Any]]:
+    try:
+        return load_manifest("latest", store_dir)
+    except BackupStoreError:
+        return None
+
+
+def _store_for_manifest(path: str, store_dir: str) -> str:
+    """A manifest path outside the default store (e.g. a copied store) reads objects next to it."""
+    if os.path.isfile(path):
+        candidate = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        if os.path.isdir(_objects_dir(candidate)):
+            return candidate
+    return store_dir
+
+
+# Restore / verify / prune -------------------------------------------------
+
+
+def _read_chunk(store_dir: str, digest: str) -> bytes:
+    try:
+        with open(_object_path(store_dir, digest), "rb") as fh:
+            data = zlib.decompress(fh.read())
+    except FileNotFoundError:
+        raise BackupStoreError(f"Missing chunk {digest}")
+    except zlib.error:
+        raise BackupStoreError(f"Corrupt chunk {digest}")
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise BackupStoreError(f"Corrupt chunk {digest}")
+    return data
+
+
+def restore_snapshot(ref: str, dest_root: str = ROOT_DIR, overwrite: bool = True,
+                     store_dir: str = STORE_DIR) -> Dict[str, int]:
+    """
+    Write every file in the snapshot under `dest_root`. Files already present
+    are skipped unless `overwrite`; files that match the manifest's size and
+    mtime are left alone either way. Files not in the snapshot are not removed.
+    """
+    manifest = load_manifest(ref, store_dir)
+    store_dir = _store_for_manifest(ref, store_dir)
+    base = os.path.abspath(dest_root)
+    counts = {"restored": 0, "unchanged": 0, "skipped": 0}
+    for rel, entry in (manifest.get("files") or {}).items():
+        dest = os.path.abspath(os.path.join(base, rel))
+        if not dest.startswith(base + os.sep):
+            counts["skipped"] += 1
+            continue
+        try:
+            st = os.stat(dest)
+        except OSError:
+            st = None
+        if st is not None:
+            if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+                counts["unchanged"] += 1
+                continue
+            if not overwrite:
+                counts["skipped"] += 1
+                continue
+        data = b"".join(_read_chunk(store_dir, d) for d in entry.get("chunks") or [])
+        _write_atomic(dest, data)
+        mtime = entry.get("mtime_ns")
+        if isinstance(mtime, int):
+            os.utime(dest, ns=(mtime, mtime))
+        counts["restored"] += 1
+    return counts
+
+
+def verify(ref: Optional[str] = None, store_dir: str = STORE_DIR, deep: bool = True) -> Dict[str, Any]:
+    """
+    Check that every chunk referenced by the snapshot (or all snapshots when
+    ref is None) exists and, when `deep`, decompresses to its hash.
+    """
+    ids = [ref] if ref else [s["id"] for s in list_snapshots(store_dir)]
+    checked: Dict[str, Optional[str]] = {}
+    problems = []
+    for snap in ids:
+        manifest = load_manifest(snap, store_dir)
+        for rel, entry in (manifest.get("files") or {}).items():
+            for digest in entry.get("chunks") or []:
+                if digest not in checked:
+                    error = None
+                    if deep:
+                        try:
+                            _read_chunk(store_dir, digest)
+                        except BackupStoreError as e:
+                            error = str(e)
+                    elif not os.path.exists(_object_path(store_dir, digest)):
+                        error = f"Missing chunk {digest}"
+                    checked[digest] = error
+                if checked[digest]:
+                    problems.append({"snapshot": manifest.get("id") or snap, "path": rel, "error": checked[digest]})
+    return {"ok": not problems, "snapshots": len(ids), "chunks": len(checked), "problems": problems}
+
+
+def prune(keep_last: Optional[int] = None, keep_days: Optional[float] = None, store_dir: str = STORE_DIR,
+          now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Delete snapshots outside the retention policy, then unreferenced chunks.
+    A snapshot is kept if it is among the newest `keep_last` or younger than
+    `keep_days`; the newest snapshot is always kept.
+    """
+    snaps = list_snapshots(store_dir)
+    now = time.time() if now is None else now
+    removed = []
+    for idx, snap in enumerate(snaps):
+        keep = idx == 0
+        if keep_last is not None and idx < int(keep_last):
+            keep = True
+        if keep_days is not None and now - snap["created_ts"] <= float(keep_days) * 86400:
+            keep = True
+        if keep_last is None and keep_days is None:
+            keep = True
+        if not keep:
+            try:
+                os.remove(os.path.join(_snapshots_dir(store_dir), f"{snap['id']}.json"))
+                removed.append(snap["id"])
+            except OSError:
+                pass
+
+    live = set()
+    for snap in list_snapshots(store_dir):
+        for entry in (load_manifest(snap["id"], store_dir).get("files") or {}).values():
+            live.update(entry.get("chunks") or [])
+    chunks_removed = 0
+    bytes_freed = 0
+    objects = _objects_dir(store_dir)
+    if os.path.isdir(objects):
+        for folder, _dirs, files in os.walk(objects):
+            for fname in files:
+                if fname in live:
+                    continue
+                path = os.path.join(folder, fname)
+                try:
+                    bytes_freed += os.path.getsize(path)
+                    os.remove(path)
+                    chunks_removed += 1
+                except OSError:
+                    pass
+    return {"snapshots_removed": removed, "chunks_removed": chunks_removed, "bytes_freed": bytes_freed}
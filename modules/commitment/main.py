@@ -10,6 +10,7 @@ from modules.item_manager import (
     write_item_data,
     open_item_in_editor,
 )
+from utilities.tracking import completion_dates as tracked_completion_dates
 
 ITEM_TYPE = "commitment"
 
@@ -174,8 +175,7 @@ def _get_dates_for_target(item_type: str, item_name: str, *, for_never: bool) ->
         if polarity == 'bad':
             dates = data.get('incident_dates') or []
             return [d for d in dates if isinstance(d, str)]
-    dates = data.get('completion_dates') or []
-    return [d for d in dates if isinstance(d, str)]
+    return tracked_completion_dates(item_type, item_name, data)
 
 def _normalize_triggers(c: dict) -> dict:
     triggers = c.get('triggers') if isinstance(c.get('triggers'), dict) else {}
@@ -303,10 +303,7 @@ def _get_completion_dates(item_type: str, item_name: str) -> list[str]:
     data = read_item_data(item_type, item_name)
     if not data:
         return []
-    dates = data.get('completion_dates') or []
-    if not isinstance(dates, list):
-        return []
-    return [d for d in dates if isinstance(d, str)]
+    return tracked_completion_dates(item_type, item_name, data)
 
 
 def _run_script(script_path: str):
@@ -76,6 +76,7 @@ from modules import variables as Variables
 from modules import console_style
 from modules.logger import Logger
 from modules import alpha_gate as AlphaGate
+from modules import op_journal as OpJournal
 
 # Suppress pygame's support prompt in non-interactive command usage.
 os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
@@ -1244,6 +1245,10 @@ def load_module(module_name):
     return module
 
 # --- Command Execution ---
+def _journal_label(command_name, args):
+    parts = [str(command_name)] + [shlex.quote(str(a)) if " " in str(a) else str(a) for a in (args or [])]
+    return " ".join(parts)
+
 def run_command(command_name, args, properties):
     """
     Executes a command by dynamically loading its corresponding Python file
@@ -1270,7 +1275,9 @@ def run_command(command_name, args, properties):
 
             # Check if the module has a 'run' function and execute it
             if hasattr(command_module, "run"):
-                command_module.run(args, properties)
+                # Files the command changes are journaled as one undoable operation.
+                with OpJournal.operation(_journal_label(command_name, args)):
+                    command_module.run(args, properties)
                 if command_name.lower() == "today" and any(str(a).lower() == "reschedule" for a in (args or [])):
                     _play_cli_sound("done")
             else:
@@ -1287,7 +1294,8 @@ def run_command(command_name, args, properties):
         plugin_fn = _PLUGIN_COMMANDS.get(command_name)
         if callable(plugin_fn):
             try:
-                plugin_fn(args, properties)
+                with OpJournal.operation(_journal_label(command_name, args)):
+                    plugin_fn(args, properties)
             except Exception as e:
                 print(f"❌ Error running plugin command '{command_name}': {e}")
                 Logger.error(f"Plugin command failed: {command_name}", e)
@@ -1965,6 +1973,12 @@ if __name__ == "__main__":
 
     if startup_sync_enabled:
         _run_startup_core_sync_with_macro_hook()
+    # The undo journal is trimmed here, not on the write path.
+    try:
+        from modules import op_journal
+        op_journal.compact_if_due()
+    except Exception:
+        pass
     if startup_sound_enabled:
         _play_cli_sound("startup")
 
@@ -2011,6 +2025,9 @@ if __name__ == "__main__":
             _play_cli_sound("error")
     else:
         # Enter interactive mode if no command-line arguments
+        if SoundFX:
+            # Open the mixer and decode enabled sounds before the first chime.
+            SoundFX.warm()
         console_cfg = _load_console_settings()
         prompt_toolkit_enabled = runtime_options.get("prompt_toolkit")
         if prompt_toolkit_enabled is None:
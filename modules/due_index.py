@@ -0,0 +1,342 @@
+"""
+Deadline / due-date index over all items.
+
+Quick wins, the tray's due-soon list and the dashboard due-soon popup used to
+parse every item in user/ on each call to find the handful with a deadline.
+This index keeps one row per dated item in `user/data/due_index.db`:
+
+    entries(path, item_type, name, status, minutes, deadline, due_date,
+            due_raw, due_kind, due_at)
+    index (deadline), (due_date), (due_at), (minutes)
+    files(path, mtime_ns, size)          fingerprint of every item file seen
+
+- `deadline` / `due_date` are ISO dates; `due_at` is the first of
+  deadline/due_date/due/date as an ISO timestamp (times kept when given).
+- `minutes` follows quick wins: `duration: parallel` is NULL, `0` is 0.
+
+`item_manager.write_item_data` / `update_item_data` / `delete_item` update the
+index in place once it exists, and `item_manager.item_file_saved` does the
+same after the `edit` editor and the dashboard editor / file API save. Edits
+made outside Chronos entirely are picked up by
+`reconcile()`, a stat-only pass that re-parses changed files; queries run it
+at most every `RECONCILE_SECONDS`. A missing store is built on first query.
+
+Queries (`query`, `overdue`, `due_within`) are ranged index scans that
+return plain dicts, soonest first.
+"""
+
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+from modules import item_manager
+from utilities.duration_parser import parse_duration_string
+
+RECONCILE_SECONDS = 300
+_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d")
+_DATETIME_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d", "%m/%d/%Y")
+
+
+def store_path() -> str:
+    return os.path.join(item_manager.get_user_dir(), "data", "due_index.db")
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS entries (
+            path TEXT PRIMARY KEY,
+            item_type TEXT NOT NULL,
+            name TEXT NOT NULL,
+            status TEXT,
+            minutes INTEGER,
+            deadline TEXT,
+            due_date TEXT,
+            due_raw TEXT,
+            due_kind TEXT,
+            due_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_deadline ON entries(deadline);
+        CREATE INDEX IF NOT EXISTS idx_entries_due_date ON entries(due_date);
+        CREATE INDEX IF NOT EXISTS idx_entries_due_at ON entries(due_at);
+        CREATE INDEX IF NOT EXISTS idx_entries_minutes ON entries(minutes);
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            size INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """
+    )
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or store_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass
+    _create_schema(conn)
+    return conn
+
+
+# Parsing ---------------------------------------------------------------------
+
+def _parse_date(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        raw = value.strip()
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(raw, fmt).date().isoformat()
+            except ValueError:
+                continue
+    return None
+
+
+def _parse_datetime(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).isoformat(timespec="seconds")
+    txt = str(value or "").strip()
+    if not txt:
+        return None
+    for fmt in _DATETIME_FORMATS:
+        try:
+            return datetime.strptime(txt, fmt).isoformat(timespec="seconds")
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(txt.replace("Z", "+00:00")).replace(tzinfo=None).isoformat(timespec="seconds")
+    except ValueError:
+        return None
+
+
+def _minutes(data: Dict[str, Any]) -> Optional[int]:
+    duration = data.get("duration")
+    if isinstance(duration, str):
+        if duration.strip().lower() == "parallel":
+            return None
+        if duration.strip().isdigit() and int(duration.strip()) == 0:
+            return 0
+    if isinstance(duration, (int, float)) and int(duration) == 0:
+        return 0
+    for key in ("duration", "minutes", "time"):
+        if key in data:
+            try:
+                minutes = parse_duration_string(data[key])
+            except Exception:
+                return None
+            return int(minutes) if isinstance(minutes, (int, float)) else None
+    return None
+
+
+def _record(path: str, data: Any, item_type: str = "", dir_name: str = "") -> Optional[Dict[str, Any]]:
+    """Index row for one item document, or None if it carries no due information."""
+    if not isinstance(data, dict):
+        return None
+    data = {(k.lower() if isinstance(k, str) else k): v for k, v in data.items()}
+    deadline = _parse_date(data.get("deadline"))
+    due_date = _parse_date(data.get("due_date", data.get("due date")))
+    due_raw = next((data.get(k) for k in ("deadline", "due_date", "due", "date") if data.get(k)), None)
+    due_at = _parse_datetime(due_raw) if due_raw else None
+    if not (deadline or due_date or due_at):
+        return None
+    name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+    rtype = data.get("type") or item_type or item_manager._infer_type_from_dir(dir_name or "")
+    if not rtype:
+        return None
+    return {
+        "path": path,
+        "item_type": str(rtype).lower(),
+        "name": str(name),
+        "status": str(data.get("status") or "").strip().lower(),
+        "minutes": _minutes(data),
+        "deadline": deadline,
+        "due_date": due_date,
+        "due_raw": str(due_raw) if due_raw else None,
+        "due_kind": "deadline" if data.get("deadline") else "due_date",
+        "due_at": due_at,
+    }
+
+
+def _fingerprint(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _store(conn: sqlite3.Connection, path: str, record: Optional[Dict[str, Any]], fp) -> None:
+    conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+    if record is not None:
+        conn.execute(
+            """
+            INSERT INTO entries (path, item_type, name, status, minutes, deadline, due_date, due_raw, due_kind, due_at)
+            VALUES (:path, :item_type, :name, :status, :minutes, :deadline, :due_date, :due_raw, :due_kind, :due_at)
+            """,
+            record,
+        )
+    if fp is None:
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+    else:
+        conn.execute("INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)", (path, fp[0], fp[1]))
+
+
+def _load(path: str) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return yaml.safe_load(fh)
+    except Exception:
+        return None
+
+
+# Maintenance -------------------------------------------------------------------
+
+def index_item(path: str, data: Any, item_type: str = "") -> None:
+    """Write hook: refresh one item's row. No-op until the store exists."""
+    store = store_path()
+    if not os.path.exists(store):
+        return
+    path = os.path.abspath(path)
+    conn = connect(store)
+    try:
+        with conn:
+            _store(conn, path, _record(path, data, item_type), _fingerprint(path))
+    finally:
+        conn.close()
+
+
+def remove_item(path: str) -> None:
+    """Delete hook."""
+    store = store_path()
+    if not os.path.exists(store):
+        return
+    conn = connect(store)
+    try:
+        with conn:
+            _store(conn, os.path.abspath(path), None, None)
+    finally:
+        conn.close()
+
+
+def reconcile(force: bool = False) -> int:
+    """
+    Bring the index in line with user/ by file fingerprint (stat only; only
+    new or changed files are parsed). Returns the number of files re-read.
+    Skipped if the last pass was under RECONCILE_SECONDS ago, unless `force`.
+    """
+    conn = connect()
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'reconciled_at'").fetchone()
+        if not force and row is not None and time.time() - float(row["value"]) < RECONCILE_SECONDS:
+            return 0
+        known = {r["path"]: (r["mtime_ns"], r["size"]) for r in conn.execute("SELECT path, mtime_ns, size FROM files")}
+        reread = 0
+        with conn:
+            for path, dir_name in item_manager.iter_item_files():
+                path = os.path.abspath(path)
+                fp = _fingerprint(path)
+                if known.pop(path, None) == fp:
+                    continue
+                _store(conn, path, _record(path, _load(path), dir_name=dir_name), fp)
+                reread += 1
+            for gone in known:
+                _store(conn, gone, None, None)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('reconciled_at', ?)", (str(time.time()),)
+            )
+        return reread
+    finally:
+        conn.close()
+
+
+def rebuild() -> int:
+    conn = connect()
+    try:
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM meta")
+    finally:
+        conn.close()
+    return reconcile(force=True)
+
+
+# Queries ---------------------------------------------------------------------
+
+def _day(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+def query(fields: Iterable[str] = ("deadline", "due_date"), start: Any = None, end: Any = None,
+          max_minutes: Optional[int] = None, types: Optional[Iterable[str]] = None,
+          exclude_statuses: Iterable[str] = (), fresh: bool = True) -> List[Dict[str, Any]]:
+    """
+    Items with any of `fields` (deadline, due_date, due_at) in [start, end].
+    Bounds are ISO dates (or timestamps for due_at) compared as strings. `max_minutes` drops items without a duration.
+    """
+    if fresh:
+        reconcile()
+    clauses, params = [], []
+    for field in fields:
+        if field not in ("deadline", "due_date", "due_at"):
+            raise ValueError(f"Unknown due field: {field}")
+        parts = [f"{field} IS NOT NULL"]
+        if start is not None:
+            parts.append(f"{field} >= ?")
+            params.append(start)
+        if end is not None:
+            parts.append(f"{field} <= ?")
+            # A date bound on due_at covers the whole day.
+            params.append(f"{end}T23:59:59" if field == "due_at" and len(str(end)) == 10 else end)
+        clauses.append("(" + " AND ".join(parts) + ")")
+    sql = "SELECT * FROM entries WHERE (" + " OR ".join(clauses or ["1"]) + ")"
+    if max_minutes is not None:
+        sql += " AND minutes IS NOT NULL AND minutes <= ?"
+        params.append(int(max_minutes))
+    types = [str(t).lower() for t in (types or [])]
+    if types:
+        sql += f" AND item_type IN ({','.join('?' * len(types))})"
+        params.extend(types)
+    statuses = [str(s).lower() for s in exclude_statuses]
+    if statuses:
+        sql += f" AND status NOT IN ({','.join('?' * len(statuses))})"
+        params.extend(statuses)
+    sql += " ORDER BY COALESCE(deadline, due_date, substr(due_at, 1, 10)), name"
+    conn = connect()
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def overdue(today: Any = None, **kwargs) -> List[Dict[str, Any]]:
+    """Items whose deadline or due_date is before `today`."""
+    today = _day(today or date.today())
+    yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+    return query(end=yesterday, **kwargs)
+
+
+def due_within(days: int, today: Any = None, include_overdue: bool = True, **kwargs) -> List[Dict[str, Any]]:
+    """Items due on or before `today + days` (and not before today unless `include_overdue`)."""
+    today = _day(today or date.today())
+    end = (date.fromisoformat(today) + timedelta(days=int(days))).isoformat()
+    return query(start=None if include_overdue else today, end=end, **kwargs)
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import importlib.util
 from modules.filter_manager import FilterManager
 from modules.logger import Logger
+from modules import write_coordinator
 
 # Determine the root directory of the Chronos Engine project
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -144,14 +145,127 @@ def read_item_data(item_type, name):
     path = get_item_path(item_type, name)
     if not os.path.exists(path):
         return None
-    with open(path, 'r', encoding='utf-8') as f:
-        raw_data = yaml.safe_load(f) or {}
-        data = {k.lower(): v for k, v in raw_data.items()}
-    return data
+    # Remembers the file version so write_item_data can merge concurrent edits.
+    return write_coordinator.read_yaml(path, default={}, transform=_lower_keys)
+
+
+def _lower_keys(raw_data):
+    if not isinstance(raw_data, dict):
+        return {}
+    return {(k.lower() if isinstance(k, str) else k): v for k, v in raw_data.items()}
+
+
+def _core_upsert_hook(item_type, name):
+    def _upsert(data):
+        try:
+            # Reactive core-mirror update for Kairos data access.
+            from modules.sequence.core_builder import upsert_item_in_core_db
+            upsert_item_in_core_db(item_type, (data or {}).get("name", name), data or {})
+        except Exception as e:
+            Logger.debug_to_file("sequence_core_sync.txt", f"write hook failed for {item_type}:{name}: {e}")
+    return _upsert
+
+def _item_index_hook(item_type, path):
+    def _index(data):
+        # Derived indexes (deadlines, references) refresh this file's rows.
+        from modules import due_index, reference_graph
+        for index in (due_index, reference_graph):
+            try:
+                index.index_item(path, data, item_type)
+            except Exception as e:
+                Logger.debug_to_file("item_index_sync.txt", f"{index.__name__} write hook failed for {path}: {e}")
+    return _index
+
+
+def _journal_change(path, before, after):
+    # Undo/redo journal; every coordinated commit reports here too.
+    try:
+        from modules import op_journal
+        op_journal.record_change(path, before, after)
+    except Exception as e:
+        Logger.debug_to_file("op_journal.txt", f"journal hook failed for {path}: {e}")
+
+
+write_coordinator.add_commit_observer(_journal_change)
+
+
+def _item_identity(path, data):
+    """(type, name) of an item file under user/, or None for non-item paths."""
+    try:
+        rel = os.path.relpath(os.path.abspath(path), os.path.abspath(USER_DIR))
+    except ValueError:
+        return None
+    top = rel.split(os.sep)[0]
+    if rel.startswith(os.pardir) or top == rel or top.lower() in SKIP_ITEM_DIRS:
+        return None
+    data = data if isinstance(data, dict) else {}
+    item_type = data.get("type") or _infer_type_from_dir(top)
+    name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+    return item_type, name
+
+
+def refresh_item_file(path, data, previous=None):
+    """
+    Re-sync the core mirror and item indexes after `path` was restored
+    outside write_item_data/delete_item (undo/redo, direct saves). `data` is
+    None when the file was removed; `previous` identifies what it held before.
+    """
+    identity = _item_identity(path, data if data is not None else previous)
+    if identity is None:
+        return
+    item_type, name = identity
+    if data is None:
+        try:
+            from modules.sequence.core_builder import delete_item_from_core_db
+            delete_item_from_core_db(item_type, name)
+        except Exception as e:
+            Logger.debug_to_file("sequence_core_sync.txt", f"restore hook failed for {item_type}:{name}: {e}")
+        from modules import due_index, reference_graph
+        for index in (due_index, reference_graph):
+            try:
+                index.remove_item(path)
+            except Exception:
+                pass
+        return
+    _core_upsert_hook(item_type, name)(data)
+    _item_index_hook(item_type, path)(data)
+
+
+def item_file_saved(path):
+    """
+    Call after writing an item file directly (external editor, dashboard
+    editor / file API) so the core mirror, due index and reference graph do
+    not wait for their next reconcile. Non-item and unparsable files are ignored.
+    """
+    if not str(path).lower().endswith((".yml", ".yaml")) or _item_identity(path, None) is None:
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = yaml.safe_load(fh)
+    except Exception:
+        return
+    if isinstance(data, dict):
+        refresh_item_file(path, data)
+
+
+def _commit_hook(item_type, name, path):
+    upsert = _core_upsert_hook(item_type, name)
+    index = _item_index_hook(item_type, path)
+
+    def _on_commit(data):
+        upsert(data)
+        index(data)
+    return _on_commit
 
 def write_item_data(item_type, name, data):
     """
     Writes the given data to an item's YAML file.
+
+    If the file changed since this thread's read_item_data, the write is
+    merged key by key into the current document. Lists are merged as whole
+    values: appending to a stale list drops an entry another writer appended
+    meanwhile (logged as a write conflict, not raised). Append to lists with
+    update_item_data instead.
     """
     path = get_item_path(item_type, name)
     ensure_dir(os.path.dirname(path))
@@ -165,14 +279,39 @@ def write_item_data(item_type, name, data):
         data = apply_happiness_associations(item_type, data)
     except Exception:
         pass
-    with open(path, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
-    try:
-        # Reactive core-mirror update for Kairos data access.
-        from modules.sequence.core_builder import upsert_item_in_core_db
-        upsert_item_in_core_db(item_type, data.get("name", name), data)
-    except Exception as e:
-        Logger.debug_to_file("sequence_core_sync.txt", f"write hook failed for {item_type}:{name}: {e}")
+    # Locked, atomic and merged with changes made since this thread's
+    # read_item_data; the core mirror is upserted under the same lock so the
+    # DB row (and the due index) follow file order.
+    write_coordinator.write_yaml(
+        path,
+        data,
+        on_commit=_commit_hook(item_type, name, path),
+        default_flow_style=False,
+        allow_unicode=True,
+    )
+
+
+def update_item_data(item_type, name, update):
+    """
+    Read-modify-write an item under its write lock. `update(data)` receives
+    the current data (keys lowercased, {} for a new item) and mutates it or
+    returns a replacement. Use this for counters/appends that must not race.
+    """
+    path = get_item_path(item_type, name)
+    ensure_dir(os.path.dirname(path))
+
+    def _apply(raw):
+        data = _lower_keys(raw) if raw is not None else {}
+        result = update(data)
+        return data if result is None else result
+
+    return write_coordinator.update_yaml(
+        path,
+        _apply,
+        on_commit=_commit_hook(item_type, name, path),
+        default_flow_style=False,
+        allow_unicode=True,
+    )
 
 def list_all_items(item_type):
     """
@@ -193,13 +332,13 @@ def list_all_items(item_type):
             Logger.error(f"Could not read {f}: {e}")
     return items_data
 
-def list_all_items_any():
+def iter_item_files():
     """
-    Lists all items across item type directories (including templates).
+    Yields (path, top-level dir name) for every item YAML under user/ (skipping
+    SKIP_ITEM_DIRS), the same set list_all_items_any reads.
     """
     if not os.path.isdir(USER_DIR):
-        return []
-    items_data = []
+        return
     for entry in os.scandir(USER_DIR):
         if not entry.is_dir():
             continue
@@ -208,25 +347,32 @@ def list_all_items_any():
             continue
         for root, _, files in os.walk(entry.path):
             for filename in files:
-                if not filename.lower().endswith((".yml", ".yaml")):
-                    continue
-                path = os.path.join(root, filename)
-                try:
-                    with open(path, "r", encoding="utf-8") as item_file:
-                        data = yaml.safe_load(item_file) or {}
-                except Exception as e:
-                    Logger.error(f"Could not read {filename}: {e}")
-                    continue
-                if not isinstance(data, dict):
-                    continue
-                data = dict(data)
-                if not data.get("name"):
-                    data["name"] = os.path.splitext(filename)[0]
-                if not data.get("type"):
-                    data["type"] = _infer_type_from_dir(dir_name)
-                if not data.get("type"):
-                    continue
-                items_data.append(data)
+                if filename.lower().endswith((".yml", ".yaml")):
+                    yield os.path.join(root, filename), dir_name
+
+def list_all_items_any():
+    """
+    Lists all items across item type directories (including templates).
+    """
+    items_data = []
+    for path, dir_name in iter_item_files():
+        filename = os.path.basename(path)
+        try:
+            with open(path, "r", encoding="utf-8") as item_file:
+                data = yaml.safe_load(item_file) or {}
+        except Exception as e:
+            Logger.error(f"Could not read {filename}: {e}")
+            continue
+        if not isinstance(data, dict):
+            continue
+        data = dict(data)
+        if not data.get("name"):
+            data["name"] = os.path.splitext(filename)[0]
+        if not data.get("type"):
+            data["type"] = _infer_type_from_dir(dir_name)
+        if not data.get("type"):
+            continue
+        items_data.append(data)
     return items_data
 
 def get_filtered_items(item_type):
@@ -248,13 +394,23 @@ def delete_item(item_type, name):
     if not os.path.exists(path):
         Logger.debug_to_file("item_manager_delete.txt", f"File not found: {path}")
         return False
-    os.remove(path)
+    with write_coordinator.file_lock(path):
+        with open(path, "rb") as fh:
+            before = fh.read()
+        os.remove(path)
+        _journal_change(path, before, None)
     Logger.debug_to_file("item_manager_delete.txt", f"Successfully deleted: {path}")
     try:
         from modules.sequence.core_builder import delete_item_from_core_db
         delete_item_from_core_db(item_type, name)
     except Exception as e:
         Logger.debug_to_file("sequence_core_sync.txt", f"delete hook failed for {item_type}:{name}: {e}")
+    from modules import due_index, reference_graph
+    for index in (due_index, reference_graph):
+        try:
+            index.remove_item(path)
+        except Exception as e:
+            Logger.debug_to_file("item_index_sync.txt", f"{index.__name__} delete hook failed for {path}: {e}")
     return True
 
 # --- Command Dispatcher ---
@@ -445,6 +601,7 @@ def open_item_in_editor(item_type, name, editor_command):
     try:
         print(f"Attempting to open '{name}.yml' with '{editor_command}'...")
         subprocess.run([editor_command, path], check=True)
+        item_file_saved(path)
         print(f"✅ Opened {item_type} '{name}.yml' in {editor_command}.")
     except FileNotFoundError:
         print(f"❌ Editor '{editor_command}' not found. Please ensure it's in your PATH.")
@@ -18,9 +18,14 @@ from modules.alarm.main import load_alarms, check_alarms, trigger_alarm, update_
 from modules.reminder.main import load_reminders, check_reminders, trigger_reminder
 from modules.timer import main as Timer
 from modules.sequence.automation import maybe_queue_midnight_sync
+from modules.listener.trigger_executor import TriggerExecutor
 
 # --- Constants ---
 LISTENER_LOG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'user', 'logs', 'listener.log'))
+# `sequence sync` rebuilds several mirrors; give it longer than an ordinary trigger.
+MIDNIGHT_SYNC_TIMEOUT_SECONDS = 1800
+
+_EXECUTOR = None
 
 def log_message(message):
     """
@@ -32,6 +37,22 @@ def log_message(message):
     print(log_entry)
 
 
+def log_trigger(message):
+    """
+    Trigger outcomes (one line per trigger, with latency) are also appended to
+    listener.log, which `sequence sync events` ingests. Unlike the per-second
+    DEBUG chatter these grow with the number of triggers only.
+    """
+    log_message(message)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        os.makedirs(os.path.dirname(LISTENER_LOG_PATH), exist_ok=True)
+        with open(LISTENER_LOG_PATH, 'a', encoding='utf-8') as fh:
+            fh.write(f"[{timestamp}] {message}\n")
+    except Exception:
+        pass
+
+
 def _quote_arg(s: str) -> str:
     try:
         # Simple Windows-safe quoting for item names with spaces
@@ -40,10 +61,11 @@ def _quote_arg(s: str) -> str:
         return f'"{s}"'
 
 
-def _run_cli_command(args_str: str):
+def _spawn_cli_command(args_str: str):
     """
     Invoke the Chronos Console launcher with a one-line command string.
     Keeps quoting simple and consistent with existing script execution.
+    Only used for commands the trigger executor cannot run in its workers.
     """
     try:
         batch_path = os.path.join(ROOT_DIR, 'console_launcher.bat')
@@ -56,6 +78,24 @@ def _run_cli_command(args_str: str):
         log_message(f"Warning: failed to run CLI command '{args_str}': {e}")
 
 
+def _trigger_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = TriggerExecutor(log=log_trigger, spawn=_spawn_cli_command)
+    return _EXECUTOR
+
+
+def _run_cli_command(args_str: str, source: str = "listener", timeout=None):
+    """
+    Queue a one-line Chronos command on the listener's trigger executor.
+    Returns immediately; completion and latency are logged by the executor.
+    """
+    try:
+        _trigger_executor().submit(args_str, source=source, timeout=timeout)
+    except Exception as e:
+        log_message(f"Warning: failed to run CLI command '{args_str}': {e}")
+
+
 def _execute_target_action(entity: dict):
     """
     Execute a linked target action when an alarm/reminder triggers.
@@ -66,6 +106,7 @@ def _execute_target_action(entity: dict):
         action: complete | open | set_status
         status: <value>              # required if action == set_status
         properties: {k:v, ...}       # optional extra properties passed as key:value
+      trigger_timeout: <seconds>     # optional, on the entity; overrides listener_settings.yml
     """
     try:
         target = entity.get('target')
@@ -105,7 +146,11 @@ def _execute_target_action(entity: dict):
 
         if args_str:
             log_message(f"DEBUG: Executing target action via CLI: {args_str}")
-            _run_cli_command(args_str)
+            _run_cli_command(
+                args_str,
+                source=f"{entity.get('type') or 'trigger'} {entity.get('name') or ''}".strip(),
+                timeout=entity.get('trigger_timeout'),
+            )
     except Exception as e:
         log_message(f"Warning: Exception while executing target action: {e}")
 
@@ -134,10 +179,22 @@ def run_listener():
     loaded_reminders_with_paths = load_reminders()
     log_message(f"DEBUG: Loaded {len(loaded_reminders_with_paths)} reminders.")
 
+    try:
+        _listen(loaded_alarms_with_paths, loaded_reminders_with_paths)
+    finally:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False)
+
+
+def _run_midnight_sync(args_str: str):
+    _run_cli_command(args_str, source="midnight sync", timeout=MIDNIGHT_SYNC_TIMEOUT_SECONDS)
+
+
+def _listen(loaded_alarms_with_paths, loaded_reminders_with_paths):
     while True:
         current_time = datetime.now()
         try:
-            maybe_queue_midnight_sync(current_time, _run_cli_command)
+            maybe_queue_midnight_sync(current_time, _run_midnight_sync)
         except Exception as automation_err:
             log_message(f"DEBUG: Sequence automation hook error: {automation_err}")
         
@@ -186,7 +243,7 @@ def run_listener():
                     log_message(f"Executing script for alarm '{alarm_name}': {script_path}")
                     # Use the existing CLI runner to execute the script path
                     try:
-                        _run_cli_command(_quote_arg(script_path))
+                        _run_cli_command(_quote_arg(script_path), source=f"alarm {alarm_name}", timeout=alarm.get('trigger_timeout'))
                     except Exception as e:
                         log_message(f"Warning: failed to execute script for alarm '{alarm_name}': {e}")
                 else:
@@ -230,7 +287,11 @@ def run_listener():
                 if os.path.exists(script_path):
                     log_message(f"Executing script for reminder '{reminder.get('name')}': {script_path}")
                     try:
-                        _run_cli_command(_quote_arg(script_path))
+                        _run_cli_command(
+                            _quote_arg(script_path),
+                            source=f"reminder {reminder.get('name')}",
+                            timeout=reminder.get('trigger_timeout'),
+                        )
                     except Exception as e:
                         log_message(f"Warning: failed to execute script for reminder '{reminder.get('name')}': {e}")
                 else:
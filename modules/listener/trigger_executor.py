@@ -0,0 +1,138 @@
+"""
+Command executor for listener triggers.
+
+Alarms, reminders, target actions and the midnight sequence sync used to
+launch `console_launcher` through a shell for every trigger, paying
+interpreter startup, imports and YAML reloads each time, and a burst of
+triggers forked a burst of consoles. `TriggerExecutor` hands trigger command
+lines to a `ConsolePool` owned by the listener instead: a bounded set of
+worker processes with the command registry preloaded. The listener loop only
+submits; at most `workers` triggers run at once and the rest wait their turn.
+
+Each trigger has its own timeout. A command past it is logged as still
+running and left to finish on its worker (the pool never kills a job halfway
+through writing); a crashing command takes down only its worker, which the
+pool replaces. Commands that cannot run headless in a
+worker (editors, UIs, other launchers) are listed in SUBPROCESS_ONLY_COMMANDS
+and go through the old launcher path, but only when
+`subprocess_fallback` is enabled in listener_settings.yml; otherwise they are
+skipped with a log line.
+
+Every trigger logs its trigger-to-completion latency (queue wait included).
+"""
+
+import os
+import shlex
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import yaml
+
+from utilities.console_pool import ConsolePool
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SETTINGS_PATH = os.path.join(ROOT_DIR, "user", "settings", "listener_settings.yml")
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT_SECONDS = 120.0
+
+# Interactive or long-lived commands: they open editors/windows or start other
+# background processes, which a pooled worker must not own.
+SUBPROCESS_ONLY_COMMANDS = {
+    "aduc", "cmd", "console", "dashboard", "edit", "listener", "pause",
+    "powershell", "topos", "tray",
+}
+
+
+def load_settings(path: str = SETTINGS_PATH) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = yaml.safe_load(fh) or {}
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _command_of(line: str) -> str:
+    try:
+        tokens = shlex.split(str(line or ""))
+    except ValueError:
+        tokens = str(line or "").split()
+    return tokens[0].strip().lower() if tokens else ""
+
+
+def _positive(value: Any, default: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+class TriggerExecutor:
+    def __init__(
+        self,
+        log: Callable[[str], None] = print,
+        spawn: Optional[Callable[[str], None]] = None,
+        settings: Optional[Dict[str, Any]] = None,
+        pool: Optional[ConsolePool] = None,
+    ):
+        settings = load_settings() if settings is None else settings
+        self.workers = int(_positive(settings.get("trigger_workers"), DEFAULT_WORKERS))
+        self.timeout = _positive(settings.get("trigger_timeout_seconds"), DEFAULT_TIMEOUT_SECONDS)
+        self.allow_subprocess = bool(settings.get("subprocess_fallback", False))
+        self.log = log
+        self.spawn = spawn
+        self.pool = pool or ConsolePool(ROOT_DIR, size=self.workers)
+        self._dispatch = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="chronos-trigger")
+
+    def submit(self, line: str, source: str = "trigger", timeout: Any = None) -> Optional[Future]:
+        """
+        Queue one command line (or .chs script path). Returns a Future with the
+        pool result, or None when the command was spawned or skipped.
+        """
+        line = str(line or "").strip()
+        if not line:
+            return None
+        triggered = time.monotonic()
+        command = _command_of(line)
+        if command in SUBPROCESS_ONLY_COMMANDS:
+            self._run_outside(line, source, triggered)
+            return None
+        limit = _positive(timeout, self.timeout)
+        return self._dispatch.submit(self._run, line, source, limit, triggered)
+
+    def _run_outside(self, line: str, source: str, triggered: float) -> None:
+        if not self.allow_subprocess or self.spawn is None:
+            self.log(
+                f"Trigger skipped: [{source}] {line} (needs a separate process; "
+                "enable subprocess_fallback in listener_settings.yml)"
+            )
+            return
+        try:
+            self.spawn(line)
+            status = "spawned"
+        except Exception as e:
+            status = f"spawn failed: {e}"
+        elapsed_ms = (time.monotonic() - triggered) * 1000.0
+        self.log(f"Trigger {status}: [{source}] {line} via subprocess in {elapsed_ms:.0f} ms")
+
+    def _run(self, line: str, source: str, timeout: float, triggered: float) -> Dict[str, Any]:
+        try:
+            result = self.pool.run_line(line, timeout=timeout)
+        except Exception as e:
+            result = {"ok": False, "stdout": "", "stderr": f"Trigger executor failed: {e}"}
+        elapsed_ms = (time.monotonic() - triggered) * 1000.0
+        status = "completed" if result.get("ok") else "failed"
+        self.log(f"Trigger {status}: [{source}] {line} in {elapsed_ms:.0f} ms")
+        if not result.get("ok"):
+            detail = (result.get("stderr") or result.get("stdout") or "").strip().splitlines()
+            if detail:
+                self.log(f"Trigger error: [{source}] {detail[-1]}")
+        result["latency_ms"] = round(elapsed_ms, 1)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._dispatch.shutdown(wait=wait)
+        self.pool.shutdown()
@@ -1,6 +1,31 @@
+"""
+Engine logger.
+
+`Logger` keeps its static API (info/warn/error/debug/debug_to_file). Lines are
+formatted at call time and handed to a background writer thread through a
+bounded queue, so callers never open files:
+
+- the writer flushes in batches (every `flush_lines` lines or
+  `flush_interval_seconds`, whichever comes first), one open per file per
+  batch, and once more at interpreter exit (`Logger.flush()` forces it);
+- logs/engine.log and debug files rotate at `max_bytes` to `<name>.1` ...
+  `<name>.<backups>`;
+- hot debug categories can be sampled or muted: `sample` maps a DEBUG
+  message prefix (e.g. "[Kairos]") or a debug_to_file filename to a keep
+  rate between 0 (suppress) and 1;
+- a full queue drops DEBUG/INFO lines (counted and reported in the log)
+  and makes WARN/ERROR wait briefly before falling back to a direct write.
+
+Settings come from user/settings/logging_settings.yml.
+"""
+
+import atexit
 import os
+import queue
 import sys
 import datetime
+import threading
+import time
 import traceback
 
 # Setup paths
@@ -8,6 +33,7 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 LOGS_DIR = os.path.join(ROOT_DIR, "logs")
 DEBUG_DIR = os.path.join(ROOT_DIR, "debug")
 LEGACY_DEBUG_DIR = os.path.join(ROOT_DIR, "Debug")
+SETTINGS_PATH = os.path.join(ROOT_DIR, "user", "settings", "logging_settings.yml")
 
 if not os.path.exists(LOGS_DIR):
     try:
@@ -23,26 +49,216 @@ if not os.path.exists(DEBUG_DIR):
 
 LOG_FILE = os.path.join(LOGS_DIR, "engine.log")
 
+DEFAULT_SETTINGS = {
+    "queue_size": 10000,
+    "flush_lines": 200,
+    "flush_interval_seconds": 1.0,
+    "max_bytes": 5 * 1024 * 1024,
+    "backups": 5,
+    "sample": {},
+}
+
+
+def _load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        import yaml
+        with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        if isinstance(data, dict):
+            settings.update({k: v for k, v in data.items() if v is not None})
+    except Exception:
+        pass
+    if not isinstance(settings.get("sample"), dict):
+        settings["sample"] = {}
+    return settings
+
+
+def _rotate(path, max_bytes, backups):
+    try:
+        if max_bytes <= 0 or os.path.getsize(path) < max_bytes:
+            return
+    except OSError:
+        return
+    try:
+        if backups <= 0:
+            os.remove(path)
+            return
+        for idx in range(backups - 1, 0, -1):
+            older = f"{path}.{idx}"
+            if os.path.exists(older):
+                os.replace(older, f"{path}.{idx + 1}")
+        os.replace(path, f"{path}.1")
+    except OSError:
+        pass
+
+
+class _Sampler:
+    """Keeps every Nth line per category (rate 1/N); rate 0 drops the category."""
+
+    def __init__(self, rules):
+        self.rules = []
+        for key, rate in (rules or {}).items():
+            try:
+                self.rules.append((str(key), max(0.0, min(1.0, float(rate)))))
+            except (TypeError, ValueError):
+                continue
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def keep(self, text):
+        for key, rate in self.rules:
+            if text.startswith(key):
+                if rate >= 1.0:
+                    return True
+                if rate <= 0.0:
+                    return False
+                every = max(1, int(round(1.0 / rate)))
+                with self.lock:
+                    count = self.seen.get(key, 0)
+                    self.seen[key] = count + 1
+                return count % every == 0
+        return True
+
+
+class _Writer:
+    def __init__(self, settings):
+        self.settings = settings
+        self.queue = queue.Queue(maxsize=max(1, int(settings["queue_size"])))
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self._run, name="chronos-logger", daemon=True)
+        self.thread.start()
+
+    def put(self, path, line, important=False):
+        try:
+            if important:
+                self.queue.put((path, line), timeout=0.5)
+            else:
+                self.queue.put_nowait((path, line))
+        except queue.Full:
+            if important:
+                self._write_batch({path: [line]})
+            else:
+                with self.lock:
+                    self.dropped += 1
+
+    def flush(self, timeout=5.0):
+        done = threading.Event()
+        try:
+            self.queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def _run(self):
+        flush_lines = max(1, int(self.settings["flush_lines"]))
+        interval = max(0.01, float(self.settings["flush_interval_seconds"]))
+        pending = {}
+        count = 0
+        deadline = 0.0
+        while True:
+            # Idle: block until the next line. Buffering: wait at most until the batch is due.
+            timeout = max(0.0, deadline - time.monotonic()) if count else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, threading.Event):
+                self._write_batch(pending)
+                pending, count = {}, 0
+                item.set()
+                continue
+            if item is not None:
+                path, line = item
+                pending.setdefault(path, []).append(line)
+                if not count:
+                    deadline = time.monotonic() + interval
+                count += 1
+                if count < flush_lines and time.monotonic() < deadline:
+                    continue
+            if pending:
+                self._write_batch(pending)
+                pending, count = {}, 0
+
+    def _write_batch(self, pending):
+        with self.lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            pending.setdefault(LOG_FILE, []).append(f"[{stamp}] WARN: Logger queue full; dropped {dropped} lines\n")
+        for path, lines in pending.items():
+            if not lines:
+                continue
+            _rotate(path, int(self.settings["max_bytes"]), int(self.settings["backups"]))
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+            except Exception:
+                pass
+
+
+_settings = None
+_sampler = None
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _backend():
+    global _settings, _sampler, _writer
+    writer = _writer
+    if writer is not None and writer.pid == os.getpid():
+        return writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            if _settings is None:
+                _settings = _load_settings()
+                _sampler = _Sampler(_settings.get("sample"))
+            try:
+                _writer = _Writer(_settings)
+            except Exception:
+                _writer = None
+        return _writer
+
+
+def _reset_after_fork():
+    # The parent's writer thread does not exist in a forked child; start a new one on first use.
+    global _writer, _writer_lock
+    _writer = None
+    _writer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _enqueue(path, line, important=False):
+    writer = _backend()
+    if writer is None:
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except Exception:
+            pass
+        return
+    writer.put(path, line, important)
+
+
+def _keep(text):
+    if _sampler is None:
+        _backend()
+    return _sampler is None or _sampler.keep(text)
+
+
 class Logger:
     @staticmethod
     def _write(level, message):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         line = f"[{timestamp}] {level.upper()}: {message}\n"
-        
-        # Write to file
-        try:
-            with open(LOG_FILE, "a", encoding="utf-8") as f:
-                f.write(line)
-        except Exception:
-            pass
-            
-        # Print to console (optional, maybe filter debug?)
-        # try:
-        #     # We print to stderr for logs to avoid mixing with command output on stdout if needed,
-        #     # but for now stdout is fine for general visibility.
-        #     print(line.strip())
-        # except Exception:
-        #     pass
+        if level.upper() == "DEBUG" and not _keep(str(message)):
+            return
+        _enqueue(LOG_FILE, line, important=level.upper() in ("WARN", "ERROR"))
 
     @staticmethod
     def info(message):
@@ -72,16 +288,27 @@ class Logger:
     def debug_to_file(filename, message):
         """Writes raw debug info to a specific file in the debug folder."""
         try:
+            if not _keep(str(filename)):
+                return
             path = os.path.join(DEBUG_DIR, filename)
             if os.path.exists(LEGACY_DEBUG_DIR):
                 legacy_path = os.path.join(LEGACY_DEBUG_DIR, filename)
                 if os.path.exists(legacy_path) and not os.path.exists(path):
                     path = legacy_path
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {message}\n")
+            _enqueue(path, f"[{timestamp}] {message}\n")
         except Exception:
             pass
 
+    @staticmethod
+    def flush(timeout=5.0):
+        """Blocks until every line logged so far is on disk."""
+        writer = _writer
+        if writer is not None and writer.pid == os.getpid():
+            writer.flush(timeout)
+
+
+atexit.register(Logger.flush)
+
 # Initialize by writing a session start marker
 Logger.info("=== Chronos Engine Session Started ===")
@@ -10,6 +10,7 @@ from modules.item_manager import (
     list_all_items,
     open_item_in_editor,
 )
+from utilities.tracking import completion_dates as tracked_completion_dates
 
 # Define the item type for this module
 ITEM_TYPE = "milestone"
@@ -141,7 +142,7 @@ def _progress_count(cfg: dict, m: dict):
         if not t or not n:
             continue
         data = read_item_data(t, n) or {}
-        dates = data.get('completion_dates') or []
+        dates = tracked_completion_dates(t, n, data)
         current += _count_in_period(dates, period)
     percent = min(100.0, (current / target * 100.0) if target > 0 else 0.0)
     return {
@@ -163,8 +164,7 @@ def _progress_checklist(cfg: dict, m: dict):
         data = read_item_data(t, n) or {}
         # Consider completed if explicit status is completed OR any completion date exists
         st = str(data.get('status','')).lower()
-        dates = data.get('completion_dates') or []
-        if st == 'completed' or (isinstance(dates, list) and len(dates) > 0):
+        if st == 'completed' or data.get('last_completed') or tracked_completion_dates(t, n, data):
             completed += 1
     target = total if str(require).lower() == 'all' else int(require)
     target = max(0, min(target, total))
@@ -3,7 +3,6 @@ import os
 import subprocess
 import sys
 import textwrap
-from datetime import datetime
 from pathlib import Path
 
 import yaml
@@ -14,8 +13,9 @@ if str(ROOT_DIR) not in _sys_paths:
     sys.path.insert(0, str(ROOT_DIR))
 
 from modules import console_style# noqa: E402
+from modules import status_store  # noqa: E402
 from modules import status_utils# noqa: E402
-from modules.scheduler import status_current_path, status_history_path_for_date  # noqa: E402
+from modules.scheduler import status_current_path  # noqa: E402
 
 
 def slugify(name: str) -> str:
@@ -264,20 +264,10 @@ class OnboardingWizard:
                     else:
                         data[key] = normalized
         self.save_yaml(path, data)
-        history_path = Path(status_history_path_for_date(datetime.now()))
-        history = self.load_yaml(history_path, {}) if history_path.exists() else {}
-        if not isinstance(history, dict):
-            history = {}
-        entries = history.get("entries")
-        if not isinstance(entries, list):
-            entries = []
-        entries.append({
-            "at": datetime.now().strftime("%H:%M:%S"),
-            "status": dict(data),
-        })
-        history["date"] = datetime.now().strftime("%Y-%m-%d")
-        history["entries"] = entries
-        self.save_yaml(history_path, history)
+        try:
+            status_store.record(dict(data), source="onboarding")
+        except Exception as e:
+            print(f"Warning: status history not recorded: {e}")
         self.changes.append("Updated current status defaults")
         print()
 
@@ -0,0 +1,385 @@
+"""
+Operation journal for undo / redo.
+
+Every coordinated YAML commit (items, schedules, completions, status) and
+every `delete_item` reports the file's bytes before and after. The journal
+groups those changes into operations and appends them to
+`user/logs/op_journal.db`:
+
+    ops(seq, label, source, at, state)       index (state, seq)
+    changes(op_seq, position, path, before, after)   index (op_seq)
+    effects(op_seq, position, store, payload)         index (op_seq)
+
+- A console command runs inside `operation(label)`; everything it changes
+  becomes one operation. Changes made outside one (dashboard requests,
+  listener, timers) are journaled as single-change operations.
+- Within an operation, repeated writes to a path keep the first `before` and
+  the last `after`. Contents are stored zlib-compressed; `before`/`after` is
+  NULL when the file did not exist.
+- `undo()` reverts the newest applied operation and `redo()` re-applies the
+  oldest undone one; both are index lookups by sequence number. A new
+  operation discards the redo stack. Before touching anything they check
+  that each file still holds the content the journal expects, raising
+  `JournalConflictError` otherwise (`force=True` overrides).
+- Changes made outside an operation are inserted once the commit's file lock
+  is released (`write_coordinator.after_unlock`), so the sqlite write never
+  holds up other writers of that file.
+- `compact()` trims the log to `RETENTION_OPS` operations and
+  `RETENTION_DAYS` days. It is not run on the write path: console startup and
+  `undo` call `compact_if_due()`, which compacts once the log is
+  `COMPACT_EVERY` operations or a day past those limits.
+
+user/logs, user/data and user/temp are not journaled as files. The side
+stores that live there (tracking history, the points ledger, status history)
+report what they appended through `record_effect(store, payload)` instead;
+undo asks the store to compensate (`undo_effect(payload)`: delete the rows,
+append the opposite points delta) and redo to re-apply (`redo_effect`).
+Effects are not conflict-checked: later writes to those stores are kept.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from modules import item_manager
+from modules import write_coordinator
+
+RETENTION_OPS = 1000
+RETENTION_DAYS = 60
+COMPACT_EVERY = 100
+UNJOURNALED_DIRS = {"logs", "data", "temp"}
+# record_effect store name -> module providing undo_effect / redo_effect.
+EFFECT_STORES = {
+    "tracking_history": "utilities.tracking_history",
+    "points": "utilities.points",
+    "status_history": "modules.status_store",
+}
+
+
+class JournalConflictError(Exception):
+    """Files changed since the journaled operation; undo/redo would overwrite them."""
+
+    def __init__(self, seq: int, paths: List[str]):
+        super().__init__(f"Operation #{seq}: {len(paths)} file(s) changed since: {', '.join(paths)}")
+        self.seq = seq
+        self.paths = paths
+
+
+def store_path() -> str:
+    return os.path.join(item_manager.get_user_dir(), "logs", "op_journal.db")
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS ops (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            label TEXT,
+            source TEXT,
+            at TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'applied'
+        );
+        CREATE INDEX IF NOT EXISTS idx_ops_state_seq ON ops(state, seq);
+        CREATE TABLE IF NOT EXISTS changes (
+            op_seq INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            path TEXT NOT NULL,
+            before BLOB,
+            after BLOB
+        );
+        CREATE INDEX IF NOT EXISTS idx_changes_op ON changes(op_seq, position);
+        CREATE TABLE IF NOT EXISTS effects (
+            op_seq INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            store TEXT NOT NULL,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_effects_op ON effects(op_seq, position);
+        """
+    )
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or store_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass
+    _create_schema(conn)
+    return conn
+
+
+# Recording ---------------------------------------------------------------------
+
+_local = threading.local()
+
+
+def is_journaled(path: str) -> bool:
+    user_dir = os.path.abspath(item_manager.get_user_dir())
+    path = os.path.abspath(path)
+    try:
+        rel = os.path.relpath(path, user_dir)
+    except ValueError:
+        return False
+    if rel.startswith(os.pardir):
+        return False
+    return rel.split(os.sep)[0].lower() not in UNJOURNALED_DIRS
+
+
+def _pack(data: Optional[bytes]) -> Optional[bytes]:
+    return None if data is None else zlib.compress(data)
+
+
+def _unpack(blob: Optional[bytes]) -> Optional[bytes]:
+    return None if blob is None else zlib.decompress(blob)
+
+
+def _append(label: str, source: str, changes: List[Tuple[str, Optional[bytes], Optional[bytes]]],
+            effects: List[Tuple[str, Dict[str, Any]]] = ()) -> Optional[int]:
+    changes = [c for c in changes if c[1] != c[2]]
+    if not changes and not effects:
+        return None
+    conn = connect()
+    try:
+        with conn:
+            # A new operation ends the redo branch.
+            undone = [r["seq"] for r in conn.execute("SELECT seq FROM ops WHERE state = 'undone'")]
+            if undone:
+                conn.executemany("DELETE FROM changes WHERE op_seq = ?", [(s,) for s in undone])
+                conn.executemany("DELETE FROM effects WHERE op_seq = ?", [(s,) for s in undone])
+                conn.execute("DELETE FROM ops WHERE state = 'undone'")
+            seq = conn.execute(
+                "INSERT INTO ops (label, source, at, state) VALUES (?, ?, ?, 'applied')",
+                (label, source, datetime.now().isoformat(timespec="seconds")),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO changes (op_seq, position, path, before, after) VALUES (?, ?, ?, ?, ?)",
+                [(seq, pos, path, _pack(before), _pack(after)) for pos, (path, before, after) in enumerate(changes)],
+            )
+            conn.executemany(
+                "INSERT INTO effects (op_seq, position, store, payload) VALUES (?, ?, ?, ?)",
+                [(seq, pos, store, json.dumps(payload, default=str)) for pos, (store, payload) in enumerate(effects)],
+            )
+    finally:
+        conn.close()
+    return seq
+
+
+def record_change(path: str, before: Optional[bytes], after: Optional[bytes]) -> None:
+    """Commit observer / delete hook entry point."""
+    if getattr(_local, "replaying", False) or before == after or not is_journaled(path):
+        return
+    path = os.path.abspath(path)
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        label = os.path.relpath(path, item_manager.get_user_dir())
+        write_coordinator.after_unlock(lambda: _append(label, "auto", [(path, before, after)]))
+        return
+    entry = pending.get(path)
+    # Keep the first before and the latest after per path.
+    pending[path] = (entry[0] if entry else before, after)
+
+
+def record_effect(store: str, payload: Dict[str, Any], label: str = "") -> None:
+    """A side store (see `EFFECT_STORES`) appended data; `payload` is what its undo/redo_effect needs."""
+    if getattr(_local, "replaying", False):
+        return
+    if store not in EFFECT_STORES:
+        raise ValueError(f"Unknown journal effect store: {store}")
+    if getattr(_local, "pending", None) is None:
+        write_coordinator.after_unlock(lambda: _append(label or store, "auto", [], [(store, payload)]))
+        return
+    _local.effects.append((store, payload))
+
+
+@contextmanager
+def operation(label: str, source: str = "cli"):
+    """Group every journaled change made by this thread inside the block into one operation."""
+    if getattr(_local, "pending", None) is not None:
+        yield  # nested commands join the outer operation
+        return
+    _local.pending = {}
+    _local.effects = []
+    try:
+        yield
+    finally:
+        pending, _local.pending = _local.pending, None
+        effects, _local.effects = _local.effects, []
+        try:
+            _append(label, source, [(path, b, a) for path, (b, a) in pending.items()], effects)
+        except Exception:
+            pass
+
+
+# Undo / redo -------------------------------------------------------------------
+
+def _digest(data: Optional[bytes]) -> Optional[str]:
+    return None if data is None else hashlib.sha1(data).hexdigest()
+
+
+def _current(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return None
+
+
+def _parse(data: Optional[bytes]) -> Any:
+    if data is None:
+        return None
+    try:
+        return yaml.safe_load(data.decode("utf-8"))
+    except Exception:
+        return None
+
+
+def _replay(seq: int, changes: List[sqlite3.Row], effects: List[sqlite3.Row], to_after: bool, force: bool) -> None:
+    expected_key, target_key = ("before", "after") if to_after else ("after", "before")
+    steps = [(row["path"], _unpack(row[expected_key]), _unpack(row[target_key])) for row in changes]
+    if not to_after:
+        steps.reverse()
+    if not force:
+        stale = [path for path, expected, _ in steps if _digest(_current(path)) != _digest(expected)]
+        if stale:
+            raise JournalConflictError(seq, stale)
+    _local.replaying = True
+    try:
+        for path, expected, target in steps:
+            with write_coordinator.file_lock(path):
+                if target is None:
+                    if os.path.exists(path):
+                        os.remove(path)
+                else:
+                    write_coordinator.atomic_write_text(path, target.decode("utf-8"))
+            try:
+                item_manager.refresh_item_file(path, _parse(target), previous=_parse(expected))
+            except Exception:
+                pass
+        for row in (effects if to_after else reversed(effects)):
+            module = importlib.import_module(EFFECT_STORES[row["store"]])
+            handler = module.redo_effect if to_after else module.undo_effect
+            try:
+                handler(json.loads(row["payload"]))
+            except Exception:
+                pass
+    finally:
+        _local.replaying = False
+
+
+def _step(from_state: str, to_state: str, force: bool) -> Optional[Dict[str, Any]]:
+    order = "DESC" if from_state == "applied" else "ASC"
+    conn = connect()
+    try:
+        op = conn.execute(
+            f"SELECT seq, label, source, at FROM ops WHERE state = ? ORDER BY seq {order} LIMIT 1", (from_state,)
+        ).fetchone()
+        if op is None:
+            return None
+        changes = conn.execute(
+            "SELECT path, before, after FROM changes WHERE op_seq = ? ORDER BY position", (op["seq"],)
+        ).fetchall()
+        effects = conn.execute(
+            "SELECT store, payload FROM effects WHERE op_seq = ? ORDER BY position", (op["seq"],)
+        ).fetchall()
+        _replay(op["seq"], changes, effects, to_after=(to_state == "applied"), force=force)
+        with conn:
+            conn.execute("UPDATE ops SET state = ? WHERE seq = ?", (to_state, op["seq"]))
+        return dict(op, paths=[row["path"] for row in changes], effects=_stores(effects))
+    finally:
+        conn.close()
+
+
+def undo(count: int = 1, force: bool = False) -> List[Dict[str, Any]]:
+    """Revert up to `count` operations, newest first. Returns the operations reverted."""
+    done = []
+    for _ in range(max(1, int(count))):
+        op = _step("applied", "undone", force)
+        if op is None:
+            break
+        done.append(op)
+    return done
+
+
+def redo(count: int = 1, force: bool = False) -> List[Dict[str, Any]]:
+    """Re-apply up to `count` undone operations, oldest first."""
+    done = []
+    for _ in range(max(1, int(count))):
+        op = _step("undone", "applied", force)
+        if op is None:
+            break
+        done.append(op)
+    return done
+
+
+def _stores(effects: List[sqlite3.Row]) -> List[str]:
+    return list(dict.fromkeys(row["store"] for row in effects))
+
+
+def history(limit: int = 20) -> List[Dict[str, Any]]:
+    """Newest operations first: seq, label, source, at, state, paths, effects (store names)."""
+    if not os.path.exists(store_path()):
+        return []
+    conn = connect()
+    try:
+        ops = conn.execute(
+            "SELECT seq, label, source, at, state FROM ops ORDER BY seq DESC LIMIT ?", (int(limit),)
+        ).fetchall()
+        out = []
+        for op in ops:
+            paths = [r["path"] for r in conn.execute(
+                "SELECT path FROM changes WHERE op_seq = ? ORDER BY position", (op["seq"],)
+            )]
+            effects = conn.execute(
+                "SELECT store FROM effects WHERE op_seq = ? ORDER BY position", (op["seq"],)
+            ).fetchall()
+            out.append(dict(op, paths=paths, effects=_stores(effects)))
+        return out
+    finally:
+        conn.close()
+
+
+def compact(max_ops: int = RETENTION_OPS, max_days: int = RETENTION_DAYS) -> int:
+    """Drop operations beyond the newest `max_ops` or older than `max_days`. Returns the number dropped."""
+    cutoff = (datetime.now() - timedelta(days=max_days)).isoformat(timespec="seconds")
+    conn = connect()
+    try:
+        with conn:
+            row = conn.execute("SELECT seq FROM ops ORDER BY seq DESC LIMIT 1 OFFSET ?", (max(0, int(max_ops)),)).fetchone()
+            floor = row["seq"] if row else 0
+            doomed = [r["seq"] for r in conn.execute(
+                "SELECT seq FROM ops WHERE seq <= ? OR at < ?", (floor, cutoff)
+            )]
+            conn.executemany("DELETE FROM changes WHERE op_seq = ?", [(s,) for s in doomed])
+            conn.executemany("DELETE FROM effects WHERE op_seq = ?", [(s,) for s in doomed])
+            conn.executemany("DELETE FROM ops WHERE seq = ?", [(s,) for s in doomed])
+        if doomed:
+            conn.execute("VACUUM")
+        return len(doomed)
+    finally:
+        conn.close()
+
+
+def compact_if_due() -> int:
+    """`compact()` once the log is COMPACT_EVERY operations or a day past the retention limits."""
+    conn = connect()
+    try:
+        row = conn.execute("SELECT COUNT(*) AS n, MIN(at) AS oldest FROM ops").fetchone()
+    finally:
+        conn.close()
+    expired = (datetime.now() - timedelta(days=RETENTION_DAYS + 1)).isoformat(timespec="seconds")
+    if row["n"] < RETENTION_OPS + COMPACT_EVERY and (row["oldest"] is None or row["oldest"] >= expired):
+        return 0
+    return compact(RETENTION_OPS, RETENTION_DAYS)
@@ -0,0 +1,426 @@
+"""
+Item reference graph.
+
+Items point at other items by name from list fields (`children`, `sequence`,
+`tasks`, `milestones`, `subroutines`, `microroutines`, `items`,
+`inventory_items`). `tree` used to resolve each reference with
+read_item_data and re-read shared subtrees once per path, and nothing could
+answer "what references this?" without parsing every item. This index keeps
+the edges in `user/data/reference_graph.db`:
+
+    nodes(path, item_type, item_key, name, status)    index (item_type, item_key)
+    edges(src_path, position, field, dst_type, dst_key, dst_name)
+          index (src_path), (dst_type, dst_key)
+    files(path, mtime_ns, size)
+
+`children(type, name)` (forward, in field order) and `parents(type, name)`
+(reverse) are index lookups; `cycles()` lists reference cycles (strongly
+connected components). Maintenance follows `modules.due_index`: the item
+write/delete hooks update a file's rows once the store exists, and
+`reconcile()` re-reads only files whose fingerprint changed. `Graph(fresh=True)`
+(tree, delete's reference warning, the dashboard) always runs that stat pass,
+so hand edits are seen at once; `reconcile()` on its own is rate-limited to
+every `RECONCILE_SECONDS`. A missing store is built on first use.
+
+Node ids are `type:key` where key is the whitespace-collapsed, lower-cased
+name; references without a type use the field's type hint (`tasks` -> task)
+or `item`.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from modules import item_manager
+
+RECONCILE_SECONDS = 300
+# Fields holding references, in the order `tree` renders them.
+REFERENCE_FIELDS = (
+    "children",
+    "sequence",
+    "tasks",
+    "milestones",
+    "subroutines",
+    "microroutines",
+    "items",
+    "inventory_items",
+)
+
+
+def store_path() -> str:
+    return os.path.join(item_manager.get_user_dir(), "data", "reference_graph.db")
+
+
+def item_key(name: Any) -> str:
+    return " ".join(str(name or "").split()).lower()
+
+
+def node_id(item_type: Any, name: Any) -> str:
+    return f"{str(item_type or 'item').strip().lower()}:{item_key(name)}"
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS nodes (
+            path TEXT PRIMARY KEY,
+            item_type TEXT NOT NULL,
+            item_key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            status TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_nodes_identity ON nodes(item_type, item_key);
+        CREATE TABLE IF NOT EXISTS edges (
+            src_path TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            dst_type TEXT NOT NULL,
+            dst_key TEXT NOT NULL,
+            dst_name TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_edges_src ON edges(src_path, position);
+        CREATE INDEX IF NOT EXISTS idx_edges_dst ON edges(dst_type, dst_key);
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            size INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """
+    )
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or store_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass
+    _create_schema(conn)
+    return conn
+
+
+# Extraction --------------------------------------------------------------------
+
+def extract_references(data: Any) -> List[Tuple[str, str, str]]:
+    """(field, child_type, child_name) for every reference in `data`, in render order."""
+    if not isinstance(data, dict):
+        return []
+    data = {(k.lower() if isinstance(k, str) else k): v for k, v in data.items()}
+    refs = []
+    for field in REFERENCE_FIELDS:
+        values = data.get(field)
+        if not isinstance(values, list):
+            continue
+        if field == "inventory_items":
+            hint = "inventory_item"
+        elif field in ("children", "sequence"):
+            hint = "item"
+        else:
+            hint = field[:-1] if field.endswith("s") else field
+        for entry in values:
+            if isinstance(entry, dict):
+                name = entry.get("name")
+                child_type = entry.get("type") if field != "inventory_items" else hint
+                child_type = child_type or hint
+            elif isinstance(entry, str):
+                name, child_type = entry, hint
+                # "Type: Name" shorthand in the typed list fields
+                if ":" in entry and field not in ("children", "sequence", "inventory_items"):
+                    prefix, rest = entry.split(":", 1)
+                    name, child_type = rest.strip(), prefix.strip()
+            else:
+                continue
+            if item_key(name):
+                refs.append((field, str(child_type).strip().lower(), " ".join(str(name).split())))
+    return refs
+
+
+def _node_row(path: str, data: Any, item_type: str = "", dir_name: str = "") -> Optional[Dict[str, Any]]:
+    if not isinstance(data, dict):
+        return None
+    lowered = {(k.lower() if isinstance(k, str) else k): v for k, v in data.items()}
+    name = lowered.get("name") or os.path.splitext(os.path.basename(path))[0]
+    rtype = lowered.get("type") or item_type or item_manager._infer_type_from_dir(dir_name or "")
+    if not rtype:
+        return None
+    status = lowered.get("status")
+    return {
+        "path": path,
+        "item_type": str(rtype).strip().lower(),
+        "item_key": item_key(name),
+        "name": str(name),
+        "status": None if status is None else str(status),
+    }
+
+
+def _fingerprint(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _store(conn: sqlite3.Connection, path: str, data: Any, fp, item_type: str = "", dir_name: str = "") -> None:
+    conn.execute("DELETE FROM nodes WHERE path = ?", (path,))
+    conn.execute("DELETE FROM edges WHERE src_path = ?", (path,))
+    row = _node_row(path, data, item_type, dir_name) if fp is not None else None
+    if row is not None:
+        conn.execute(
+            "INSERT INTO nodes (path, item_type, item_key, name, status) "
+            "VALUES (:path, :item_type, :item_key, :name, :status)",
+            row,
+        )
+        conn.executemany(
+            "INSERT INTO edges (src_path, position, field, dst_type, dst_key, dst_name) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (path, pos, field, child_type, item_key(name), name)
+                for pos, (field, child_type, name) in enumerate(extract_references(data))
+            ],
+        )
+    if fp is None:
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+    else:
+        conn.execute("INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)", (path, fp[0], fp[1]))
+
+
+def _load(path: str) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return yaml.safe_load(fh)
+    except Exception:
+        return None
+
+
+# Maintenance -------------------------------------------------------------------
+
+def index_item(path: str, data: Any, item_type: str = "") -> None:
+    """Write hook: refresh one item's node and outgoing edges. No-op until the store exists."""
+    store = store_path()
+    if not os.path.exists(store):
+        return
+    path = os.path.abspath(path)
+    conn = connect(store)
+    try:
+        with conn:
+            _store(conn, path, data, _fingerprint(path), item_type)
+    finally:
+        conn.close()
+
+
+def remove_item(path: str) -> None:
+    """Delete hook."""
+    store = store_path()
+    if not os.path.exists(store):
+        return
+    conn = connect(store)
+    try:
+        with conn:
+            _store(conn, os.path.abspath(path), None, None)
+    finally:
+        conn.close()
+
+
+def reconcile(force: bool = False) -> int:
+    """Re-read new or changed item files (by fingerprint). Returns the number re-read."""
+    conn = connect()
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'reconciled_at'").fetchone()
+        if not force and row is not None and time.time() - float(row["value"]) < RECONCILE_SECONDS:
+            return 0
+        known = {r["path"]: (r["mtime_ns"], r["size"]) for r in conn.execute("SELECT path, mtime_ns, size FROM files")}
+        reread = 0
+        with conn:
+            for path, dir_name in item_manager.iter_item_files():
+                path = os.path.abspath(path)
+                fp = _fingerprint(path)
+                if known.pop(path, None) == fp:
+                    continue
+                _store(conn, path, _load(path), fp, dir_name=dir_name)
+                reread += 1
+            for gone in known:
+                _store(conn, gone, None, None)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('reconciled_at', ?)", (str(time.time()),)
+            )
+        return reread
+    finally:
+        conn.close()
+
+
+def rebuild() -> int:
+    conn = connect()
+    try:
+        with conn:
+            for table in ("nodes", "edges", "files", "meta"):
+                conn.execute(f"DELETE FROM {table}")
+    finally:
+        conn.close()
+    return reconcile(force=True)
+
+
+# Queries -------------------------------------------------------------------------
+
+class Graph:
+    """
+    Read handle for a batch of lookups (one connection, per-node results cached).
+    Use as a context manager; `fresh=False` skips the reconcile pass.
+    """
+
+    def __init__(self, fresh: bool = True):
+        if fresh:
+            reconcile(force=True)
+        self.conn = connect()
+        self._nodes: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._children: Dict[str, List[Dict[str, Any]]] = {}
+        self._parents: Dict[str, List[Dict[str, Any]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def node(self, item_type: Any, name: Any) -> Optional[Dict[str, Any]]:
+        nid = node_id(item_type, name)
+        if nid not in self._nodes:
+            row = self.conn.execute(
+                "SELECT path, item_type, item_key, name, status FROM nodes "
+                "WHERE item_type = ? AND item_key = ? ORDER BY path LIMIT 1",
+                (str(item_type or "item").strip().lower(), item_key(name)),
+            ).fetchone()
+            self._nodes[nid] = dict(row, id=nid) if row else None
+        return self._nodes[nid]
+
+    def children(self, item_type: Any, name: Any) -> List[Dict[str, Any]]:
+        """Outgoing references in field order: {id, type, name, field, node (or None)}."""
+        nid = node_id(item_type, name)
+        if nid not in self._children:
+            src = self.node(item_type, name)
+            rows = []
+            if src is not None:
+                rows = self.conn.execute(
+                    "SELECT field, dst_type, dst_key, dst_name FROM edges WHERE src_path = ? ORDER BY position",
+                    (src["path"],),
+                ).fetchall()
+            self._children[nid] = [
+                {
+                    "id": f"{row['dst_type']}:{row['dst_key']}",
+                    "type": row["dst_type"],
+                    "name": row["dst_name"],
+                    "field": row["field"],
+                    "node": self.node(row["dst_type"], row["dst_name"]),
+                }
+                for row in rows
+            ]
+        return self._children[nid]
+
+    def parents(self, item_type: Any, name: Any) -> List[Dict[str, Any]]:
+        """Items referencing this one: {id, type, name, field, node}."""
+        nid = node_id(item_type, name)
+        if nid not in self._parents:
+            rows = self.conn.execute(
+                """
+                SELECT DISTINCT n.item_type, n.item_key, n.name, n.status, n.path, e.field
+                FROM edges e JOIN nodes n ON n.path = e.src_path
+                WHERE e.dst_type = ? AND e.dst_key = ?
+                ORDER BY n.item_type, n.item_key, e.field
+                """,
+                (str(item_type or "item").strip().lower(), item_key(name)),
+            ).fetchall()
+            out = []
+            for row in rows:
+                pid = f"{row['item_type']}:{row['item_key']}"
+                node = {k: row[k] for k in ("path", "item_type", "item_key", "name", "status")}
+                node["id"] = pid
+                out.append({"id": pid, "type": row["item_type"], "name": row["name"], "field": row["field"], "node": node})
+            self._parents[nid] = out
+        return self._parents[nid]
+
+    def adjacency(self) -> Dict[str, List[str]]:
+        """Forward adjacency over all known nodes (node id -> referenced node ids)."""
+        adj: Dict[str, List[str]] = {}
+        rows = self.conn.execute(
+            "SELECT n.item_type, n.item_key, e.dst_type, e.dst_key "
+            "FROM edges e JOIN nodes n ON n.path = e.src_path ORDER BY e.src_path, e.position"
+        )
+        for row in rows:
+            adj.setdefault(f"{row[0]}:{row[1]}", []).append(f"{row[2]}:{row[3]}")
+        return adj
+
+
+def _strongly_connected(adj: Dict[str, List[str]]) -> List[List[str]]:
+    # Iterative Tarjan; deep reference chains must not hit the recursion limit.
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    components = []
+    counter = 0
+    for root in list(adj):
+        if root in index:
+            continue
+        work = [(root, iter(adj.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, it = work[-1]
+            advanced = False
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(adj.get(nxt, ()))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def cycles(fresh: bool = True) -> List[List[str]]:
+    """Reference cycles: node ids of each strongly connected component with a loop."""
+    with Graph(fresh=fresh) as graph:
+        adj = graph.adjacency()
+    out = []
+    for component in _strongly_connected(adj):
+        if len(component) > 1 or component[0] in adj.get(component[0], ()):
+            out.append(sorted(component))
+    return sorted(out)
+
+
+def referenced_by(item_type: Any, name: Any, fresh: bool = True) -> List[Dict[str, Any]]:
+    with Graph(fresh=fresh) as graph:
+        return graph.parents(item_type, name)
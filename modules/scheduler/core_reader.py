@@ -0,0 +1,159 @@
+"""
+Read layer for Kairos candidate gathering over chronos_core.db.
+
+Kairos only needs a handful of item columns to gather candidates, yet the
+original path opened a new connection per run, selected every column and
+decoded every row's `raw_json` up front. `CoreReader` keeps one read-only
+connection open for its lifetime (sqlite3 reuses the prepared statements for
+the fixed SQL below on that connection), selects only the projected columns,
+and memoizes both the rows and decoded payloads while the database is
+unchanged (same file, same `PRAGMA data_version`).
+
+A reader is meant to be scoped: one `today` run or one `WeeklyGenerator`
+horizon. Closing it releases the file handle so `sequence sync core` can
+swap the database in place (Windows refuses to replace an open file).
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns Kairos reads during gather/filter/score; everything else stays in raw_json.
+CANDIDATE_COLUMNS = (
+    "id",
+    "slug",
+    "name",
+    "type",
+    "category",
+    "status",
+    "priority",
+    "due_date",
+    "duration_minutes",
+    "raw_json",
+)
+
+_PROJECTION = ", ".join(CANDIDATE_COLUMNS)
+
+BACKLOG_SQL = (
+    f"SELECT {_PROJECTION} FROM items "
+    "WHERE type IN ('subroutine','microroutine','task','habit') "
+    "AND (status IS NULL OR lower(status) NOT IN ('completed','done','archived','cancelled','skipped'))"
+)
+COMMITMENTS_SQL = f"SELECT {_PROJECTION} FROM items WHERE type = 'commitment'"
+
+
+def default_core_db_path() -> str:
+    from modules.item_manager import get_user_dir
+
+    return os.path.join(get_user_dir(), "data", "chronos_core.db")
+
+
+class CoreReader:
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or default_core_db_path()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._file_sig: Optional[Tuple[int, int]] = None
+        self._rows_key: Optional[Tuple[Any, ...]] = None
+        self._rows: Optional[Tuple[List[tuple], List[tuple]]] = None
+        self._payloads: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
+        self._pinned = False
+        self.stats = {"connects": 0, "queries": 0, "decoded": 0, "decode_reused": 0}
+
+    @classmethod
+    def from_snapshot(cls, db_path: str, snapshot: Tuple[List[tuple], List[tuple]]) -> "CoreReader":
+        """A reader pinned to rows taken with `snapshot()`; it never opens the DB."""
+        reader = cls(db_path)
+        reader._rows = (list(snapshot[0]), list(snapshot[1]))
+        reader._pinned = True
+        return reader
+
+    def snapshot(self) -> Tuple[List[tuple], List[tuple]]:
+        """Raw projected rows (picklable) for handing to worker processes."""
+        if not self._pinned:
+            self._refresh_rows()
+        return self._rows  # type: ignore[return-value]
+
+    def __enter__(self) -> "CoreReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def exists(self) -> bool:
+        return self._pinned or os.path.exists(self.db_path)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._file_sig = None
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _connection(self) -> sqlite3.Connection:
+        sig = self._signature()
+        if self._conn is not None and sig == self._file_sig:
+            return self._conn
+        # The file was swapped (sequence rebuilds via os.replace) or never opened.
+        self.close()
+        uri = "file:" + os.path.abspath(self.db_path).replace("\\", "/") + "?mode=ro"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._file_sig = sig
+        self.stats["connects"] += 1
+        return self._conn
+
+    def candidate_rows(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (executable backlog rows, commitment rows) as projected column dicts."""
+        if not self._pinned:
+            self._refresh_rows()
+        backlog, commitments = self._rows  # type: ignore[misc]
+        return (
+            [dict(zip(CANDIDATE_COLUMNS, row)) for row in backlog],
+            [dict(zip(CANDIDATE_COLUMNS, row)) for row in commitments],
+        )
+
+    def _refresh_rows(self) -> None:
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        key = (self._file_sig, version)
+        if self._rows is None or self._rows_key != key:
+            backlog = conn.execute(BACKLOG_SQL).fetchall()
+            commitments = conn.execute(COMMITMENTS_SQL).fetchall()
+            self._rows = (backlog, commitments)
+            self._rows_key = key
+            self.stats["queries"] += 1
+
+    def payload(self, item_id: Any, raw_json: Any) -> Dict[str, Any]:
+        """Decode a row's raw_json once; later calls with the same text reuse the dict."""
+        if item_id is not None:
+            cached = self._payloads.get(item_id)
+            if cached is not None and (cached[0] is raw_json or cached[0] == raw_json):
+                self.stats["decode_reused"] += 1
+                return cached[1]
+        decoded = decode_payload(raw_json)
+        self.stats["decoded"] += 1
+        if item_id is not None and isinstance(raw_json, str):
+            self._payloads[item_id] = (raw_json, decoded)
+        return decoded
+
+
+def decode_payload(raw: Any) -> Dict[str, Any]:
+    """Parse stored JSON payload from a DB row into a dict-safe shape."""
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    try:
+        v = json.loads(str(raw))
+        return v if isinstance(v, dict) else {}
+    except Exception:
+        return {}
@@ -17,7 +17,7 @@ High-level pipeline:
 - emit decision log
 """
 
-import json
+import copy
 import os
 import re
 import sqlite3
@@ -26,6 +26,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from modules.scheduler.core_reader import CANDIDATE_COLUMNS, CoreReader, decode_payload
 from utilities.duration_parser import parse_duration_string  # type: ignore
 
 # Item types Kairos can place into a concrete daily timeline.
@@ -37,9 +38,20 @@ ANCHOR_NAME_HINTS = ("sleep", "work", "uni", "school", "commute", "transit", "be
 
 
 class KairosScheduler:
-    def __init__(self, user_context: Dict[str, Any] = None):
-        """Initialize per-run state and optional user overrides."""
+    def __init__(self, user_context: Dict[str, Any] = None, core_reader: Optional[CoreReader] = None):
+        """
+        Initialize per-run state and optional user overrides.
+
+        `core_reader` lets a caller share one core.db read layer across runs
+        (e.g. a multi-day horizon); otherwise each run opens and closes its own.
+        """
         self.user_context = user_context or {}
+        self.core_reader = core_reader
+        self._run_reader: Optional[CoreReader] = None
+        # Date-independent inputs (see `load_world`); shared across a horizon when set.
+        self.world: Optional[Dict[str, Any]] = None
+        # Horizon workers leave the *_latest decision logs to the final day.
+        self.write_latest_decision_log = True
         env_debug = str(os.getenv("CHRONOS_KAIROS_DEBUG", "")).strip().lower() in ("1", "true", "yes", "on")
         self.debug = self._as_bool(self.user_context.get("debug"), False) or env_debug
         self.verbose = self._as_bool(self.user_context.get("verbose"), False) or self.debug
@@ -100,10 +112,14 @@ class KairosScheduler:
         self.runtime = self._load_runtime()
         self.windows = self._resolve_windows(target_date)
         self._log(f"[Kairos] Generating schedule for {target_date}...")
-        candidates = self.gather_candidates(target_date)
-        self._log(f"[Kairos] Gathered {len(candidates)} candidates.")
-        valid = self.filter_candidates(candidates)
-        self._log(f"[Kairos] Filtered down to {len(valid)} valid items.")
+        try:
+            candidates = self.gather_candidates(target_date)
+            self._log(f"[Kairos] Gathered {len(candidates)} candidates.")
+            valid = self.filter_candidates(candidates)
+            self._log(f"[Kairos] Filtered down to {len(valid)} valid items.")
+        finally:
+            if self.core_reader is None and self._run_reader is not None:
+                self._run_reader.close()
         scored = self.score_candidates(valid)
         schedule = self.construct_schedule(scored, target_date)
         self.last_schedule = schedule
@@ -141,74 +157,109 @@ class KairosScheduler:
 
         self.phase_notes["pre_schedule_hooks"] = {"enabled": True, "results": results}
 
+    def load_world(self) -> Dict[str, Any]:
+        """
+        Load the date-independent inputs of a run: status context, settings,
+        scoring weights, options and the trend map.
+
+        A multi-day horizon loads this once and hands it to every day through
+        `self.world` (it is plain data, so it also crosses process boundaries);
+        single runs load it on demand from `_load_runtime`.
+        """
+        from commands import today as T
+        from modules.scheduler import USER_DIR, read_template, status_current_path
+        status_settings = read_template(os.path.join(USER_DIR, "settings", "status_settings.yml")) or {}
+        current_status = read_template(status_current_path()) or read_template(os.path.join(USER_DIR, "current_status.yml")) or {}
+        status_context = T.build_status_context(status_settings, current_status)
+        happiness_map = T.load_happiness_map()
+        sched_priorities = read_template(os.path.join(USER_DIR, "settings", "scheduling_priorities.yml")) or {}
+        buffer_settings = read_template(os.path.join(USER_DIR, "settings", "buffer_settings.yml")) or {}
+        quick_wins_settings = read_template(os.path.join(USER_DIR, "settings", "quick_wins_settings.yml")) or {}
+        timer_settings = read_template(os.path.join(USER_DIR, "settings", "timer_settings.yml")) or {}
+        timer_profiles = read_template(os.path.join(USER_DIR, "settings", "timer_profiles.yml")) or {}
+        status_match_threshold = self.user_context.get("status_match_threshold")
+        options = {
+            "force_template": self.user_context.get("force_template"),
+            "use_buffers": self._as_bool(self.user_context.get("use_buffers"), True),
+            "use_timer_breaks": self._as_bool(self.user_context.get("use_timer_breaks"), False),
+            "use_timer_sprints": self._as_bool(self.user_context.get("use_timer_sprints"), False),
+            "timer_profile": self.user_context.get("timer_profile"),
+            "ignore_trends": self._as_bool(self.user_context.get("ignore_trends"), False),
+            "custom_property": self.user_context.get("custom_property"),
+            "status_match_threshold": status_match_threshold,
+        }
+        status_overrides = self.user_context.get("status_overrides")
+        if isinstance(status_overrides, dict):
+            curr = status_context.get("current", {}) if isinstance(status_context, dict) else {}
+            if not isinstance(curr, dict):
+                curr = {}
+                status_context["current"] = curr
+            for k, v in status_overrides.items():
+                nk = self._normalize_key(k)
+                if not nk:
+                    continue
+                curr[nk] = str(v).strip().lower()
+        trend_map, trend_notes = self._load_trend_map(ignore_trends=bool(options.get("ignore_trends")))
+        missed_promo_threshold = 30
+        missed_promo_boost = 20.0
+        if T and hasattr(T, "load_scheduling_config"):
+            try:
+                cfg = T.load_scheduling_config() or {}
+                rescheduling_cfg = cfg.get("rescheduling", {}) if isinstance(cfg, dict) else {}
+                missed_promo_threshold = int(rescheduling_cfg.get("importance_threshold", 30) or 30)
+                status_matching_cfg = cfg.get("status_matching", {}) if isinstance(cfg, dict) else {}
+                if status_match_threshold is None:
+                    status_match_threshold = status_matching_cfg.get("requirement_threshold")
+                    options["status_match_threshold"] = status_match_threshold
+            except Exception:
+                missed_promo_threshold = 30
+        if self.user_context.get("missed_promotion_threshold") is not None:
+            try:
+                missed_promo_threshold = int(self.user_context.get("missed_promotion_threshold"))
+            except Exception:
+                pass
+        if self.user_context.get("missed_promotion_boost") is not None:
+            try:
+                missed_promo_boost = float(self.user_context.get("missed_promotion_boost"))
+            except Exception:
+                pass
+        return {
+            "status_context": status_context,
+            "happiness_map": happiness_map,
+            "weights": self._apply_weight_overrides(self._weights_from_settings(sched_priorities)),
+            "buffer_settings": buffer_settings,
+            "quick_wins_settings": quick_wins_settings,
+            "timer_settings": timer_settings,
+            "timer_profiles": timer_profiles,
+            "options": options,
+            "trend_map": trend_map,
+            "trend_notes": trend_notes,
+            "missed_promotion_threshold": missed_promo_threshold,
+            "missed_promotion_boost": missed_promo_boost,
+            # Day-name -> (template selection, template_match notes), filled lazily.
+            "templates": {},
+        }
+
     def _load_runtime(self) -> Dict[str, Any]:
         """
         Load external runtime dependencies and user settings.
 
         Runtime is intentionally centralized so pure scheduling logic can remain
-        stateless and test-friendly.
+        stateless and test-friendly. Date-independent inputs come from
+        `load_world()` (or the shared `self.world`); completions and missed
+        promotions are read per target date.
         """
         try:
             from commands import today as T
-            from modules.scheduler import USER_DIR, normalize_completion_entries, read_template, status_current_path
-            status_settings = read_template(os.path.join(USER_DIR, "settings", "status_settings.yml")) or {}
-            current_status = read_template(status_current_path()) or read_template(os.path.join(USER_DIR, "current_status.yml")) or {}
-            status_context = T.build_status_context(status_settings, current_status)
-            happiness_map = T.load_happiness_map()
-            sched_priorities = read_template(os.path.join(USER_DIR, "settings", "scheduling_priorities.yml")) or {}
-            buffer_settings = read_template(os.path.join(USER_DIR, "settings", "buffer_settings.yml")) or {}
-            quick_wins_settings = read_template(os.path.join(USER_DIR, "settings", "quick_wins_settings.yml")) or {}
-            timer_settings = read_template(os.path.join(USER_DIR, "settings", "timer_settings.yml")) or {}
-            timer_profiles = read_template(os.path.join(USER_DIR, "settings", "timer_profiles.yml")) or {}
-            status_match_threshold = self.user_context.get("status_match_threshold")
-            options = {
-                "force_template": self.user_context.get("force_template"),
-                "use_buffers": self._as_bool(self.user_context.get("use_buffers"), True),
-                "use_timer_breaks": self._as_bool(self.user_context.get("use_timer_breaks"), False),
-                "use_timer_sprints": self._as_bool(self.user_context.get("use_timer_sprints"), False),
-                "timer_profile": self.user_context.get("timer_profile"),
-                "ignore_trends": self._as_bool(self.user_context.get("ignore_trends"), False),
-                "custom_property": self.user_context.get("custom_property"),
-                "status_match_threshold": status_match_threshold,
-            }
-            status_overrides = self.user_context.get("status_overrides")
-            if isinstance(status_overrides, dict):
-                curr = status_context.get("current", {}) if isinstance(status_context, dict) else {}
-                if not isinstance(curr, dict):
-                    curr = {}
-                    status_context["current"] = curr
-                for k, v in status_overrides.items():
-                    nk = self._normalize_key(k)
-                    if not nk:
-                        continue
-                    curr[nk] = str(v).strip().lower()
-            trend_map, trend_notes = self._load_trend_map(ignore_trends=bool(options.get("ignore_trends")))
+            from modules.scheduler import USER_DIR, normalize_completion_entries, read_template
+            if self.world is None:
+                self.world = self.load_world()
+            else:
+                self.phase_notes["trends"] = copy.deepcopy(self.world.get("trend_notes") or {})
+            world = self.world
             target = self.last_target_date or date.today()
             start_from_now = bool(self._as_bool(self.user_context.get("start_from_now"), False))
             missed_promo_enabled = bool(target == date.today() and start_from_now)
-            missed_promo_threshold = 30
-            missed_promo_boost = 20.0
-            if T and hasattr(T, "load_scheduling_config"):
-                try:
-                    cfg = T.load_scheduling_config() or {}
-                    rescheduling_cfg = cfg.get("rescheduling", {}) if isinstance(cfg, dict) else {}
-                    missed_promo_threshold = int(rescheduling_cfg.get("importance_threshold", 30) or 30)
-                    status_matching_cfg = cfg.get("status_matching", {}) if isinstance(cfg, dict) else {}
-                    if status_match_threshold is None:
-                        status_match_threshold = status_matching_cfg.get("requirement_threshold")
-                        options["status_match_threshold"] = status_match_threshold
-                except Exception:
-                    missed_promo_threshold = 30
-            if self.user_context.get("missed_promotion_threshold") is not None:
-                try:
-                    missed_promo_threshold = int(self.user_context.get("missed_promotion_threshold"))
-                except Exception:
-                    pass
-            if self.user_context.get("missed_promotion_boost") is not None:
-                try:
-                    missed_promo_boost = float(self.user_context.get("missed_promotion_boost"))
-                except Exception:
-                    pass
             completion_path = os.path.join(USER_DIR, "schedules", "completions", f"{target.isoformat()}.yml")
             completion_payload = read_template(completion_path) or {}
             completion_entries = normalize_completion_entries(completion_payload)
@@ -219,23 +270,24 @@ class KairosScheduler:
             missed_by_name, missed_notes = self._load_recent_missed_entries(target, enabled=missed_promo_enabled)
             return {
                 "Today": T,
-                "status_context": status_context,
-                "happiness_map": happiness_map,
-                "weights": self._apply_weight_overrides(self._weights_from_settings(sched_priorities)),
-                "buffer_settings": buffer_settings,
-                "quick_wins_settings": quick_wins_settings,
-                "timer_settings": timer_settings,
-                "timer_profiles": timer_profiles,
-                "options": options,
-                "trend_map": trend_map,
+                # Per-day copies: scheduling may annotate these, the world stays pristine.
+                "status_context": copy.deepcopy(world["status_context"]),
+                "happiness_map": copy.deepcopy(world["happiness_map"]),
+                "weights": dict(world["weights"]),
+                "buffer_settings": copy.deepcopy(world["buffer_settings"]),
+                "quick_wins_settings": copy.deepcopy(world["quick_wins_settings"]),
+                "timer_settings": copy.deepcopy(world["timer_settings"]),
+                "timer_profiles": copy.deepcopy(world["timer_profiles"]),
+                "options": dict(world["options"]),
+                "trend_map": world["trend_map"],
                 "completion_entries": completion_entries,
                 "completed_names": completed_names,
                 "completed_blocks": completed_blocks,
                 "completed_specs": completed_specs,
                 "missed_promotions": {
                     "enabled": missed_promo_enabled,
-                    "threshold": missed_promo_threshold,
-                    "boost": missed_promo_boost,
+                    "threshold": world["missed_promotion_threshold"],
+                    "boost": world["missed_promotion_boost"],
                     "by_name": missed_by_name,
                     "notes": missed_notes,
                 },
@@ -552,7 +604,7 @@ class KairosScheduler:
                 # Legacy parity + stricter gate:
                 # 1) prefer templates that explicitly match current status/place
                 # 2) if none match, fall back to legacy weighted selector
-                info = self._select_template_for_day_strict(day_name, T) or {}
+                info = self._select_template_for_day_cached(day_name, T)
             template = info.get("template") if isinstance(info, dict) else None
 
             loaded_templates: Dict[str, Dict[str, Any]] = {}
@@ -932,6 +984,19 @@ class KairosScheduler:
                 return {}
         return {}
 
+    def _select_template_for_day_cached(self, day_name: str, T: Any) -> Dict[str, Any]:
+        """Strict template selection, memoized per weekday in the shared world."""
+        templates = self.world.get("templates") if isinstance(self.world, dict) else None
+        if not isinstance(templates, dict):
+            return self._select_template_for_day_strict(day_name, T) or {}
+        if day_name not in templates:
+            info = self._select_template_for_day_strict(day_name, T) or {}
+            templates[day_name] = (copy.deepcopy(info), copy.deepcopy(self.phase_notes.get("template_match")))
+        info, match_notes = templates[day_name]
+        if match_notes is not None:
+            self.phase_notes["template_match"] = copy.deepcopy(match_notes)
+        return copy.deepcopy(info)
+
     def gather_candidates(self, target_date: date) -> List[Dict[str, Any]]:
         """
         Pull executable items + commitments from the core mirror DB.
@@ -948,41 +1013,25 @@ class KairosScheduler:
         }
         skipped_for_template = 0
         try:
-            from modules.item_manager import get_user_dir
-            db = os.path.join(get_user_dir(), "data", "chronos_core.db")
-            if not os.path.exists(db):
+            reader = self._core_reader()
+            db = reader.db_path
+            if not reader.exists():
                 self.phase_notes["gather"] = {"error": f"missing:{db}", "total": len(blueprint_items), "template_blueprint": len(blueprint_items)}
                 return blueprint_items
-            conn = sqlite3.connect(db)
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT * FROM items
-                WHERE type IN ('subroutine','microroutine','task','habit')
-                AND (status IS NULL OR lower(status) NOT IN ('completed','done','archived','cancelled','skipped'))
-                """
-            )
-            backlog = cur.fetchall()
+            # Projected columns only; `_raw` is decoded on demand by `_candidate_source`.
+            backlog, commitments = reader.candidate_rows()
             self._log(f"[Kairos Debug] DB returned {len(backlog)} executable items.", debug=True)
-            for row in backlog:
-                item = dict(row)
+            for item in backlog:
                 item["_source_kind"] = "backlog"
-                item["_raw"] = self._decode_raw(item.get("raw_json"))
                 key = (self._normalize_key(item.get("type")), self._normalize_key(item.get("name")))
                 if key in blueprint_keys:
                     skipped_for_template += 1
                     continue
                 out.append(item)
-            cur.execute("SELECT * FROM items WHERE type = 'commitment'")
-            commitments = cur.fetchall()
             self._log(f"[Kairos Debug] DB returned {len(commitments)} commitments.", debug=True)
-            for row in commitments:
-                item = dict(row)
+            for item in commitments:
                 item["_source_kind"] = "commitment_rule"
-                item["_raw"] = self._decode_raw(item.get("raw_json"))
                 out.append(item)
-            conn.close()
             out.extend(blueprint_items)
             self.phase_notes["gather"] = {
                 "source_db": db,
@@ -997,17 +1046,49 @@ class KairosScheduler:
             self.phase_notes["gather"] = {"error": str(e), "template_blueprint": len(blueprint_items), "total": len(out)}
         return out
 
+    def _core_reader(self) -> CoreReader:
+        """Shared reader when one was passed in, otherwise a reader scoped to this run."""
+        if self.core_reader is not None:
+            return self.core_reader
+        if self._run_reader is None:
+            self._run_reader = CoreReader()
+        return self._run_reader
+
     def _decode_raw(self, raw: Any) -> Dict[str, Any]:
         """Parse stored JSON payload from DB row into a dict-safe shape."""
+        return decode_payload(raw)
+
+    def _candidate_source(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the payload dict for a candidate, decoding `raw_json` on first use.
+
+        DB rows arrive with projected columns only; their full JSON is decoded
+        lazily so candidates rejected on column data never pay for it.
+        """
+        raw = item.get("_raw")
         if isinstance(raw, dict):
             return raw
-        if not raw:
-            return {}
-        try:
-            v = json.loads(str(raw))
-            return v if isinstance(v, dict) else {}
-        except Exception:
-            return {}
+        if "_raw" not in item and "raw_json" in item:
+            reader = self.core_reader or self._run_reader
+            if reader is not None:
+                raw = reader.payload(item.get("id"), item.get("raw_json"))
+            else:
+                raw = self._decode_raw(item.get("raw_json"))
+            item["_raw"] = raw
+            return raw
+        return item
+
+    def _candidate_field(self, item: Dict[str, Any], key: str) -> Any:
+        """
+        A candidate field without decoding when it is a projected column.
+
+        For undecoded DB rows the column is authoritative (it was indexed from
+        the same payload), so a NULL column does not trigger a decode.
+        """
+        value = item.get(key)
+        if value or ("_raw" not in item and "raw_json" in item and key in CANDIDATE_COLUMNS):
+            return value
+        return self._candidate_source(item).get(key)
 
     def _manual_adjustments(self) -> List[Dict[str, Any]]:
         """Return normalized per-run manual adjustments passed in from `today`."""
@@ -1068,12 +1149,13 @@ class KairosScheduler:
         """
         events: List[Dict[str, Any]] = []
         target = dict(item or {})
-        raw = dict(target.get("_raw") or {}) if isinstance(target.get("_raw"), dict) else {}
-        if raw:
-            target["_raw"] = raw
         adjustments = self._matching_manual_adjustments(target)
         if not adjustments:
             return target, events
+        self._candidate_source(target)
+        raw = dict(target.get("_raw") or {}) if isinstance(target.get("_raw"), dict) else {}
+        if raw:
+            target["_raw"] = raw
         for adj in adjustments:
             action = str(adj.get("action") or "").strip().lower()
             if action == "cut":
@@ -1171,9 +1253,8 @@ class KairosScheduler:
         candidate_nt_counts: Dict[Tuple[str, str], int] = {}
         manual_events: List[Dict[str, Any]] = []
         for item in candidates:
-            src = item.get("_raw") if isinstance(item.get("_raw"), dict) else item
-            tkey = self._normalize_key(item.get("type") or src.get("type"))
-            nkey = self._normalize_key(item.get("name") or src.get("name"))
+            tkey = self._normalize_key(self._candidate_field(item, "type"))
+            nkey = self._normalize_key(self._candidate_field(item, "name"))
             if tkey and nkey:
                 key = (tkey, nkey)
                 candidate_nt_counts[key] = int(candidate_nt_counts.get(key, 0) or 0) + 1
@@ -1185,16 +1266,23 @@ class KairosScheduler:
             if item is None:
                 rejected.append({"name": None, "type": None, "reason": "manual_cut"})
                 continue
-            src = item.get("_raw") if isinstance(item.get("_raw"), dict) else item
             item_type = str(item.get("type") or "").strip().lower()
-            name_key = self._normalize_key(item.get("name") or src.get("name"))
-            type_key = self._normalize_key(item_type or src.get("type"))
+            # Column-only checks first; only their survivors get `raw_json` decoded.
+            if item.get("_source_kind") == "commitment_rule":
+                rejected.append({"name": item.get("name"), "type": item.get("type"), "reason": "observer_only_commitment"})
+                continue
+            if item_type not in EXECUTABLE_TYPES:
+                rejected.append({"name": item.get("name"), "type": item.get("type"), "reason": "non_executable_type"})
+                continue
+            name_key = self._normalize_key(self._candidate_field(item, "name"))
+            type_key = self._normalize_key(item_type)
             done_specs = []
             if name_key and type_key:
                 done_specs.extend(completed_specs.get(f"{type_key}|{name_key}") or [])
             if name_key:
                 done_specs.extend(completed_specs.get(f"*|{name_key}") or [])
             if done_specs:
+                src = self._candidate_source(item)
                 same_count = int(candidate_nt_counts.get((type_key, name_key), 0) or 0)
                 candidate_time_hints = [
                     self._parse_hhmm_flexible(src.get("start_time")),
@@ -1228,15 +1316,10 @@ class KairosScheduler:
                         }
                     )
                     continue
-            if item.get("_source_kind") == "commitment_rule":
-                rejected.append({"name": item.get("name"), "type": item.get("type"), "reason": "observer_only_commitment"})
-                continue
+            src = self._candidate_source(item)
             if bool(src.get("observer_only", item.get("observer_only"))):
                 rejected.append({"name": item.get("name"), "type": item.get("type"), "reason": "observer_only_item"})
                 continue
-            if item_type not in EXECUTABLE_TYPES:
-                rejected.append({"name": item.get("name"), "type": item.get("type"), "reason": "non_executable_type"})
-                continue
             children_payload = src.get("children")
             if not isinstance(children_payload, list):
                 children_payload = src.get("items")
@@ -3744,8 +3827,9 @@ class KairosScheduler:
         body = "\n".join(lines) + "\n"
         with open(out, "w", encoding="utf-8") as f:
             f.write(body)
-        with open(latest, "w", encoding="utf-8") as f:
-            f.write(body)
+        if self.write_latest_decision_log:
+            with open(latest, "w", encoding="utf-8") as f:
+                f.write(body)
         yaml_payload = {
             "generated_at": datetime.now().isoformat(timespec="seconds"),
             "run_date": run_date,
@@ -3757,10 +3841,13 @@ class KairosScheduler:
             "phase_notes": self.phase_notes,
             "schedule": self.last_schedule if isinstance(self.last_schedule, dict) else {"blocks": blocks},
         }
+        # Serialize once; the latest copy reuses the same text.
+        yaml_text = yaml.safe_dump(yaml_payload, sort_keys=False, allow_unicode=True)
         with open(out_yaml, "w", encoding="utf-8") as f:
-            yaml.safe_dump(yaml_payload, f, sort_keys=False, allow_unicode=True)
-        with open(latest_yaml, "w", encoding="utf-8") as f:
-            yaml.safe_dump(yaml_payload, f, sort_keys=False, allow_unicode=True)
+            f.write(yaml_text)
+        if self.write_latest_decision_log:
+            with open(latest_yaml, "w", encoding="utf-8") as f:
+                f.write(yaml_text)
         self.decision_log = lines
         self._log(f"[Kairos] Decision log written: {out}", debug=True)
         self._log(f"[Kairos] Decision YAML written: {out_yaml}", debug=True)
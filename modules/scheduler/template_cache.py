@@ -0,0 +1,145 @@
+"""
+Memoized template expansion for the legacy schedule builder.
+
+`build_initial_schedule` used to call `read_item_data` (YAML parse) for every
+child routine, subroutine and microroutine each time it appeared, on every
+`today`, planner preview and weekly preview. `expand_children` splits that
+work out: it turns a template's child entries into an expansion tree of
+resolved item data (external file or inline entry, variant applied), and
+caches each file-backed subtree keyed by item identity and status context.
+
+A cached subtree records the fingerprint (mtime_ns, size) of every file it
+touched, its own and all descendants'. A hit costs one `stat` per dependency
+instead of a read+parse per node; any changed, created or deleted dependency
+drops the entry and the subtree is expanded again. Inline children (entries
+without a backing file) are never cached on their own, only as part of the
+file-backed item that contains them.
+
+Nodes are shared between callers; the schedule layout copies `data` before
+handing it out.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from modules import item_manager
+
+CACHE_SIZE = 512
+
+Node = Dict[str, Any]
+Fingerprint = Optional[Tuple[int, int]]
+
+_CACHE: "OrderedDict[Tuple[str, str, str, str], Tuple[str, Dict[str, Fingerprint], Node]]" = OrderedDict()
+_STATS = {"hits": 0, "misses": 0}
+
+
+def _fingerprint(path: str) -> Fingerprint:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _status_key(status_context: Any) -> str:
+    if not status_context:
+        return ""
+    try:
+        return json.dumps(status_context, sort_keys=True, default=str)
+    except Exception:
+        return repr(status_context)
+
+
+def _valid(deps: Dict[str, Fingerprint]) -> bool:
+    return all(_fingerprint(path) == sig for path, sig in deps.items())
+
+
+def clear() -> None:
+    _CACHE.clear()
+
+
+def stats() -> Dict[str, int]:
+    return dict(_STATS, entries=len(_CACHE))
+
+
+def expand_children(
+    entries: Any,
+    status_context: Any = None,
+    read_item: Optional[Callable[[str, str], Any]] = None,
+    resolve: Optional[Callable[[Any, Any], Any]] = None,
+) -> List[Node]:
+    """
+    Expand child entries into nodes:
+    {"entry", "child_type", "data", "children", "deps"} or {"error"}.
+    """
+    read_item = read_item or item_manager.read_item_data
+    if resolve is None:
+        from modules.scheduler.v1 import resolve_variant as resolve
+    return _expand_list(entries, status_context, _status_key(status_context), read_item, resolve)
+
+
+def _expand_list(entries, status_context, status_key, read_item, resolve) -> List[Node]:
+    nodes: List[Node] = []
+    for entry in entries or []:
+        if not isinstance(entry, dict) or not entry.get("name"):
+            nodes.append({"error": f"Error: Child entry missing name: {entry}"})
+            continue
+        nodes.append(_expand_entry(entry, status_context, status_key, read_item, resolve))
+    return nodes
+
+
+def _expand_entry(entry, status_context, status_key, read_item, resolve) -> Node:
+    child_name = entry.get("name")
+    child_type = entry.get("type")
+    key = None
+    if child_type:
+        key = (item_manager.get_item_dir(child_type), str(child_type).lower(), str(child_name), status_key)
+        cached = _CACHE.get(key)
+        # The entry's own fields (essential flag, inline fallback) are part of the result.
+        if cached is not None and cached[0] == _entry_sig(entry) and _valid(cached[1]):
+            _CACHE.move_to_end(key)
+            _STATS["hits"] += 1
+            return cached[2]
+        _STATS["misses"] += 1
+
+    deps: Dict[str, Fingerprint] = {}
+    item_data = None
+    if child_type:
+        path = item_manager.get_item_path(child_type, child_name)
+        deps[path] = _fingerprint(path)
+        item_data = read_item(child_type, child_name)
+        if not item_data:
+            # A file created later may be found by name scan, so watch the directory too.
+            item_dir = os.path.dirname(path)
+            deps[item_dir] = _fingerprint(item_dir)
+
+    # Inline item: the entry itself is the data (e.g. "- name: brush teeth\n  duration: 5").
+    if not item_data:
+        item_data = entry.copy()
+        if "type" not in item_data:
+            item_data["type"] = "task"
+
+    if status_context:
+        item_data = resolve(item_data, status_context)
+
+    children_source = item_data.get("children") or item_data.get("items") or item_data.get("sequence")
+    children = _expand_list(children_source, status_context, status_key, read_item, resolve) if children_source else []
+    for child in children:
+        deps.update(child.get("deps") or {})
+
+    node = {"entry": entry, "child_type": child_type, "data": item_data, "children": children, "deps": deps}
+    if key is not None:
+        _CACHE[key] = (_entry_sig(entry), deps, node)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return node
+
+
+def _entry_sig(entry: Dict[str, Any]) -> str:
+    try:
+        return json.dumps(entry, sort_keys=True, default=str)
+    except Exception:
+        return repr(entry)
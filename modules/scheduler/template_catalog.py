@@ -0,0 +1,130 @@
+"""
+Compiled catalog of day templates for template selection.
+
+`select_template_for_day` used to parse every file in user/days/ (and the
+scheduling config) on each call, then re-derive eligibility and status
+requirements before scoring. The catalog parses each template once into a
+`TemplateRecord` and keeps it while the file's fingerprint (mtime_ns, size)
+is unchanged:
+
+- eligibility per weekday (the `days` property, status-only templates and
+  the filename rule for plain weekday templates) is computed once per day;
+- the day-specific flag comes from the filename;
+- extracted status requirements are memoized per set of status types (the
+  legacy direct keys depend on which indicators exist).
+
+Selection is then a scoring pass over records. Files added, edited or removed
+in user/days/ are picked up on the next call. `read_yaml_cached` gives the
+same per-file caching to small settings files.
+"""
+
+import copy
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+Fingerprint = Optional[Tuple[int, int]]
+
+
+def _fingerprint(path: str) -> Fingerprint:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class TemplateRecord:
+    def __init__(self, path: str, template: Any):
+        self.path = path
+        self.template = template
+        self.stem = os.path.splitext(os.path.basename(path))[0].lower()
+        self.has_days_prop = isinstance(template, dict) and template.get("days") is not None
+        self.has_status_req = isinstance(template, dict) and bool(template.get("status_requirements"))
+        self._eligible: Dict[str, bool] = {}
+        self._requirements: Dict[Tuple, Dict[str, List[str]]] = {}
+
+    def is_day_specific(self, day_of_week: str) -> bool:
+        return self.stem.startswith(day_of_week.lower())
+
+    def eligible(self, day_of_week: str, is_eligible: Callable[[Any, str], bool]) -> bool:
+        day = day_of_week.lower()
+        cached = self._eligible.get(day)
+        if cached is None:
+            cached = bool(self.template) and bool(is_eligible(self.template, day_of_week))
+            if cached and not self.has_days_prop and not self.has_status_req:
+                # Traditional weekday template - filename must match
+                cached = self.stem == day or self.stem.startswith(f"{day}_")
+            self._eligible[day] = cached
+        return cached
+
+    def requirements(self, status_context: Any, extract: Callable[[Any, Any], Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        if not status_context:
+            return {}
+        types = status_context.get("types", {}) if isinstance(status_context, dict) else {}
+        key = tuple(sorted((str(slug), str((info or {}).get("name", ""))) for slug, info in types.items()))
+        cached = self._requirements.get(key)
+        if cached is None:
+            cached = extract(self.template, status_context)
+            self._requirements[key] = cached
+        return cached
+
+
+_RECORDS: Dict[str, Tuple[Fingerprint, TemplateRecord]] = {}
+_YAML: Dict[str, Tuple[Fingerprint, Any]] = {}
+
+
+def _read(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as fh:
+        return yaml.safe_load(fh)
+
+
+def record_for(path: str) -> Optional[TemplateRecord]:
+    """Compiled record for one template file (None if it is missing or unreadable)."""
+    key = os.path.normcase(os.path.abspath(path))
+    fp = _fingerprint(path)
+    if fp is None:
+        _RECORDS.pop(key, None)
+        return None
+    cached = _RECORDS.get(key)
+    if cached is not None and cached[0] == fp:
+        return cached[1]
+    try:
+        record = TemplateRecord(path, _read(path))
+    except Exception:
+        record = TemplateRecord(path, None)
+    _RECORDS[key] = (fp, record)
+    return record
+
+
+def records(paths: List[str]) -> List[TemplateRecord]:
+    out = []
+    for path in paths:
+        record = record_for(path)
+        if record is not None and record.template:
+            out.append(record)
+    return out
+
+
+def read_yaml_cached(path: str) -> Any:
+    """Parsed YAML for `path`, re-read only when the file changes. Returns a copy."""
+    key = os.path.normcase(os.path.abspath(path))
+    fp = _fingerprint(path)
+    if fp is None:
+        _YAML.pop(key, None)
+        return None
+    cached = _YAML.get(key)
+    if cached is None or cached[0] != fp:
+        try:
+            data = _read(path)
+        except Exception:
+            data = None
+        cached = (fp, data)
+        _YAML[key] = cached
+    return copy.deepcopy(cached[1])
+
+
+def clear() -> None:
+    _RECORDS.clear()
+    _YAML.clear()
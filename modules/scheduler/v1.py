@@ -2,6 +2,7 @@ import os
 import yaml
 from datetime import datetime, timedelta
 import re
+from modules import write_coordinator
 
 # --- Constants ---
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -36,17 +37,6 @@ def status_current_path():
             return path
     return candidates[0]
 
-def status_history_path_for_date(date_value=None):
-    date_str = _normalize_date_str(date_value)
-    candidates = [
-        os.path.join(USER_DIR, "logs", f"status_{date_str}.yml"),
-        os.path.join(USER_DIR, "profile", "Status", f"status_{date_str}.yml"),
-    ]
-    for path in candidates:
-        if os.path.exists(path):
-            return path
-    return candidates[0]
-
 def _extract_schedule_date(schedule_path):
     if not schedule_path:
         return None
@@ -258,8 +248,7 @@ def save_schedule(schedule, file_path):
     """
     Saves the given schedule to a YAML file.
     """
-    with open(file_path, 'w') as f:
-        yaml.dump(schedule, f, default_flow_style=False)
+    write_coordinator.write_yaml(file_path, schedule, default_flow_style=False)
 
 def load_manual_modifications(file_path):
     """
@@ -4,56 +4,109 @@ from typing import Any, Dict, List, Optional
 
 from modules.commitment.main import get_commitment_status
 from modules.item_manager import list_all_items
+from modules.scheduler.core_reader import CoreReader
 from modules.scheduler.kairos import KairosScheduler
 
 
+# Horizons shorter than this run serially: spawning workers (each re-imports
+# the scheduler stack) costs more than it saves on a handful of days.
+PARALLEL_MIN_DAYS = 14
+
+# Per-process state for horizon workers (set by `_horizon_worker_init`).
+_WORKER: Dict[str, Any] = {}
+
+
+def _day_row(d: date, ks: Any, schedule: Dict[str, Any]) -> tuple:
+    """Summarize one generated day into (skeleton row, blocks)."""
+    stats = schedule.get("stats", {}) if isinstance(schedule, dict) else {}
+    blocks = schedule.get("blocks", []) if isinstance(schedule, dict) else []
+    if not isinstance(stats, dict):
+        stats = {}
+    if not isinstance(blocks, list):
+        blocks = []
+    row = {
+        "date": d.isoformat(),
+        "weekday": d.strftime("%A"),
+        "valid": bool(stats.get("valid", True)),
+        "invalid_reason": stats.get("invalid_reason"),
+        "scheduled_items": int(stats.get("scheduled_items", len(blocks)) or 0),
+        "template": (ks.phase_notes.get("template", {}) if isinstance(ks.phase_notes, dict) else {}).get("template_path"),
+        "windows_found": (ks.phase_notes.get("template", {}) if isinstance(ks.phase_notes, dict) else {}).get("windows_found", 0),
+        "anchors": (ks.phase_notes.get("anchors", {}) if isinstance(ks.phase_notes, dict) else {}).get("placed", 0),
+        "top_blocks": [
+            {
+                "start_time": b.get("start_time"),
+                "end_time": b.get("end_time"),
+                "name": b.get("name"),
+                "type": b.get("type"),
+                "score": b.get("kairos_score"),
+            }
+            for b in blocks[:8]
+        ],
+    }
+    return row, blocks
+
+
+def _horizon_worker_init(user_context: Dict[str, Any], world: Dict[str, Any], db_path: str, snapshot: Any) -> None:
+    _WORKER["user_context"] = user_context
+    _WORKER["world"] = world
+    _WORKER["reader"] = CoreReader.from_snapshot(db_path, snapshot) if snapshot is not None else CoreReader(db_path)
+
+
+def _horizon_worker_day(day_iso: str, write_latest: bool) -> tuple:
+    d = date.fromisoformat(day_iso)
+    ks = KairosScheduler(user_context=_WORKER["user_context"])
+    ks.core_reader = _WORKER["reader"]
+    ks.world = _WORKER["world"]
+    ks.write_latest_decision_log = write_latest
+    schedule = ks.generate_schedule(d) or {}
+    row, blocks = _day_row(d, ks, schedule)
+    return day_iso, row, blocks
+
+
 class WeeklyGenerator:
     """
     Generates a rolling N-day Kairos skeleton and a lightweight commitment
     load-balancing recommendation across the horizon.
+
+    Shared inputs (settings, status, weights, trends, templates and core.db
+    candidates) are loaded once per horizon. Days are independent given those
+    inputs, so long horizons fan out across a process pool; results are merged
+    in date order and the cross-day commitment plan is computed afterwards,
+    which keeps parallel output identical to a serial run.
+
+    Pre-schedule hooks (commitment/milestone evaluators) mutate shared state,
+    so either path runs them once per horizon, before the first day, and
+    generates every day with `evaluate_hooks` off.
     """
 
     def __init__(self, user_context: Optional[Dict[str, Any]] = None):
         self.user_context = user_context or {}
 
-    def generate_skeleton(self, days: int = 7, start_date: Optional[date] = None) -> Dict[str, Any]:
+    def generate_skeleton(self, days: int = 7, start_date: Optional[date] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the horizon. `workers=None` picks a pool size automatically
+        (serial below PARALLEL_MIN_DAYS days); `workers=1` forces serial.
+        """
         horizon = max(1, int(days or 7))
         start = start_date or date.today()
+        dates = [start + timedelta(days=idx) for idx in range(horizon)]
+
+        results = None
+        day_context = self.user_context
+        pool_size = self._pool_size(horizon, workers)
+        if pool_size > 1:
+            day_context = self._run_horizon_hooks()
+            results = self._generate_parallel(dates, pool_size, day_context)
+        if results is None:
+            results = self._generate_serial(dates, day_context)
 
+        # Deterministic merge: date order, regardless of worker completion order.
         day_rows: List[Dict[str, Any]] = []
         per_day_blocks: Dict[str, List[Dict[str, Any]]] = {}
-        for idx in range(horizon):
-            d = start + timedelta(days=idx)
-            ks = KairosScheduler(user_context=self.user_context)
-            schedule = ks.generate_schedule(d) or {}
-            stats = schedule.get("stats", {}) if isinstance(schedule, dict) else {}
-            blocks = schedule.get("blocks", []) if isinstance(schedule, dict) else []
-            if not isinstance(stats, dict):
-                stats = {}
-            if not isinstance(blocks, list):
-                blocks = []
-            day_rows.append(
-                {
-                    "date": d.isoformat(),
-                    "weekday": d.strftime("%A"),
-                    "valid": bool(stats.get("valid", True)),
-                    "invalid_reason": stats.get("invalid_reason"),
-                    "scheduled_items": int(stats.get("scheduled_items", len(blocks)) or 0),
-                    "template": (ks.phase_notes.get("template", {}) if isinstance(ks.phase_notes, dict) else {}).get("template_path"),
-                    "windows_found": (ks.phase_notes.get("template", {}) if isinstance(ks.phase_notes, dict) else {}).get("windows_found", 0),
-                    "anchors": (ks.phase_notes.get("anchors", {}) if isinstance(ks.phase_notes, dict) else {}).get("placed", 0),
-                    "top_blocks": [
-                        {
-                            "start_time": b.get("start_time"),
-                            "end_time": b.get("end_time"),
-                            "name": b.get("name"),
-                            "type": b.get("type"),
-                            "score": b.get("kairos_score"),
-                        }
-                        for b in blocks[:8]
-                    ],
-                }
-            )
+        for d in dates:
+            row, blocks = results[d.isoformat()]
+            day_rows.append(row)
             per_day_blocks[d.isoformat()] = blocks
 
         commitment_plan = self._build_commitment_plan(start, horizon, per_day_blocks)
@@ -65,6 +118,69 @@ class WeeklyGenerator:
             "generated_at": date.today().isoformat(),
         }
 
+    def _pool_size(self, horizon: int, workers: Optional[int]) -> int:
+        if workers is None:
+            if horizon < PARALLEL_MIN_DAYS:
+                return 1
+            workers = os.cpu_count() or 1
+        try:
+            workers = int(workers)
+        except Exception:
+            workers = 1
+        return max(1, min(workers, horizon))
+
+    def _run_horizon_hooks(self) -> Dict[str, Any]:
+        """Run the pre-schedule hooks once; returns the per-day context with them disabled."""
+        KairosScheduler(user_context=self.user_context)._run_pre_schedule_hooks()
+        return dict(self.user_context, evaluate_hooks=False)
+
+    def _generate_serial(self, dates: List[date], user_context: Optional[Dict[str, Any]] = None) -> Dict[str, tuple]:
+        results: Dict[str, tuple] = {}
+        # One core.db read layer and one world for the whole horizon: rows,
+        # decoded payloads, settings and trends are loaded by the first day
+        # and reused by the rest. Hooks (if enabled) run with the first day only.
+        context = self.user_context if user_context is None else user_context
+        world = None
+        with CoreReader() as reader:
+            for d in dates:
+                ks = KairosScheduler(user_context=context if d == dates[0] else dict(context, evaluate_hooks=False))
+                ks.core_reader = reader
+                ks.world = world
+                ks.write_latest_decision_log = d == dates[-1]
+                schedule = ks.generate_schedule(d) or {}
+                world = ks.world
+                results[d.isoformat()] = _day_row(d, ks, schedule)
+        return results
+
+    def _generate_parallel(self, dates: List[date], pool_size: int,
+                           worker_context: Dict[str, Any]) -> Optional[Dict[str, tuple]]:
+        """Fan days out across processes; returns None so the caller can fall back to serial."""
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Hooks already ran for the horizon (see generate_skeleton).
+            world = KairosScheduler(user_context=worker_context).load_world()
+            with CoreReader() as reader:
+                snapshot = reader.snapshot() if reader.exists() else None
+                db_path = reader.db_path
+            last_iso = dates[-1].isoformat()
+            results: Dict[str, tuple] = {}
+            with ProcessPoolExecutor(
+                max_workers=pool_size,
+                initializer=_horizon_worker_init,
+                initargs=(worker_context, world, db_path, snapshot),
+            ) as pool:
+                futures = [
+                    pool.submit(_horizon_worker_day, d.isoformat(), d.isoformat() == last_iso)
+                    for d in dates
+                ]
+                for fut in futures:
+                    day_iso, row, blocks = fut.result()
+                    results[day_iso] = (row, blocks)
+            return results
+        except Exception:
+            return None
+
     def _build_commitment_plan(self, start: date, horizon: int, day_blocks: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         plans: List[Dict[str, Any]] = []
         try:
@@ -1,7 +1,9 @@
+import hashlib
+import json
 import os
 import sqlite3
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 
 from modules.sequence.registry import ensure_data_home, update_database_entry, load_registry
 from modules.sequence.core_builder import build_core_db
@@ -12,6 +14,10 @@ DATA_DIR = os.path.join(USER_DIR, "data")
 CORE_DB_PATH = os.path.join(DATA_DIR, "chronos_core.db")
 BEHAVIOR_DB_PATH = os.path.join(DATA_DIR, "chronos_behavior.db")
 
+# Bump when the fact/rollup derivation changes so existing DBs rebuild in full.
+SCHEMA_VERSION = "2"
+ON_TIME_THRESHOLD_MINUTES = 5
+
 
 def _timestamp() -> str:
     return datetime.now().isoformat(timespec="seconds")
@@ -22,8 +28,8 @@ def _ensure_core(registry: Dict[str, Any]) -> None:
         build_core_db(registry)
 
 
-def _read_core_tables() -> Dict[str, List[Any]]:
-    conn = sqlite3.connect(CORE_DB_PATH)
+def _read_core_tables(core_path: str = CORE_DB_PATH) -> Dict[str, List[Any]]:
+    conn = sqlite3.connect(core_path)
     conn.row_factory = sqlite3.Row
     schedules = conn.execute(
         """
@@ -59,10 +65,18 @@ def _read_core_tables() -> Dict[str, List[Any]]:
             entry = dict(row)
             entry["quality"] = None
             completions.append(entry)
+    try:
+        habits = [
+            dict(row)
+            for row in conn.execute("SELECT slug, name, raw_json FROM items WHERE type = 'habit' ORDER BY slug")
+        ]
+    except sqlite3.OperationalError:
+        habits = []
     conn.close()
     return {
         "schedules": schedules,
         "completions": completions,
+        "habits": habits,
     }
 
 
@@ -77,12 +91,20 @@ def _variance_minutes(plan_start: Any, plan_end: Any, actual_start: Any, actual_
     return 0
 
 
-def _prepare_activity_facts(schedules: List[sqlite3.Row], completions: List[Any]) -> List[Dict[str, Any]]:
-    completion_index: Dict[str, sqlite3.Row] = {}
+def _completion_index(completions: List[Any]) -> Dict[str, Any]:
+    """Newest completion per block key (completions arrive ordered by logged_at DESC)."""
+    completion_index: Dict[str, Any] = {}
     for entry in completions:
         key = entry["block_key"]
         if key and key not in completion_index:
             completion_index[key] = entry
+    return completion_index
+
+
+def _prepare_activity_facts(schedules: List[sqlite3.Row], completions: List[Any],
+                            completion_index: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    if completion_index is None:
+        completion_index = _completion_index(completions)
 
     facts: List[Dict[str, Any]] = []
     for schedule in schedules:
@@ -119,10 +141,64 @@ def _prepare_activity_facts(schedules: List[sqlite3.Row], completions: List[Any]
     return facts
 
 
+# Change feed --------------------------------------------------------------
+#
+# Every schedule date and habit gets a digest of exactly the core rows its
+# facts are derived from (the date's schedule rows plus the completion picked
+# for each block key; the habit's raw_json). build_state keeps the digests of
+# the last build, so a sync only rewrites facts/rollups for digests that moved.
+
+
+def _digest(parts: Iterable[Any]) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def _date_key(value: Any) -> str:
+    return str(value) if value else ""
+
+
+def _schedules_by_date(schedules: List[Any]) -> Dict[str, List[Any]]:
+    grouped: Dict[str, List[Any]] = {}
+    for row in schedules:
+        grouped.setdefault(_date_key(row["schedule_date"]), []).append(row)
+    return grouped
+
+
+def _date_digests(by_date: Dict[str, List[Any]], completion_index: Dict[str, Any]) -> Dict[str, str]:
+    digests = {}
+    for date_key, rows in by_date.items():
+        parts = []
+        for row in rows:
+            completion = completion_index.get(row["block_key"]) if row["block_key"] else None
+            parts.append([[row[k] for k in row.keys()], dict(completion) if completion else None])
+        digests[date_key] = _digest(parts)
+    return digests
+
+
+def _habit_digests(habits: List[Dict[str, Any]]) -> Dict[str, str]:
+    return {str(h["slug"]): _digest([h.get("name"), h.get("raw_json")]) for h in habits if h.get("slug")}
+
+
+def _week_start(date_key: str) -> str:
+    try:
+        day = datetime.strptime(date_key[:10], "%Y-%m-%d").date()
+    except Exception:
+        return ""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
 def _create_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
         DROP TABLE IF EXISTS activity_facts;
+        DROP TABLE IF EXISTS daily_rollup;
+        DROP TABLE IF EXISTS weekly_rollup;
+        DROP TABLE IF EXISTS habit_facts;
+        DROP TABLE IF EXISTS build_state;
 
         CREATE TABLE activity_facts (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -145,21 +221,73 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             completion_json TEXT
         );
         CREATE INDEX idx_activity_date ON activity_facts(schedule_date);
+
+        CREATE TABLE daily_rollup (
+            schedule_date TEXT PRIMARY KEY,
+            week_start TEXT,
+            blocks_total INTEGER,
+            blocks_completed INTEGER,
+            blocks_in_progress INTEGER,
+            variance_sum INTEGER,
+            variance_count INTEGER,
+            on_time INTEGER,
+            late INTEGER,
+            delay_sum INTEGER
+        );
+        CREATE INDEX idx_daily_week ON daily_rollup(week_start);
+
+        CREATE TABLE weekly_rollup (
+            week_start TEXT PRIMARY KEY,
+            blocks_total INTEGER,
+            blocks_completed INTEGER,
+            blocks_in_progress INTEGER,
+            variance_sum INTEGER,
+            variance_count INTEGER,
+            on_time INTEGER,
+            late INTEGER,
+            delay_sum INTEGER
+        );
+
+        CREATE TABLE habit_facts (
+            slug TEXT PRIMARY KEY,
+            name TEXT,
+            polarity TEXT,
+            current_streak INTEGER,
+            longest_streak INTEGER,
+            last_incident TEXT,
+            creation_date TEXT,
+            clean_current_streak TEXT,
+            completion_dates_json TEXT
+        );
+
+        CREATE TABLE build_state (
+            key TEXT PRIMARY KEY,
+            digest TEXT
+        );
         """
     )
+    conn.execute("INSERT INTO build_state (key, digest) VALUES ('schema', ?)", (SCHEMA_VERSION,))
+
+
+def _schema_current(conn: sqlite3.Connection) -> bool:
+    try:
+        row = conn.execute("SELECT digest FROM build_state WHERE key = 'schema'").fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return bool(row) and row[0] == SCHEMA_VERSION
 
 
 def _insert_activity_facts(conn: sqlite3.Connection, facts: List[Dict[str, Any]]) -> None:
-    for fact in facts:
-        conn.execute(
-            """
-            INSERT INTO activity_facts (
-                schedule_date, block_key, name, item_slug, item_type,
-                planned_start, planned_end, actual_start, actual_end,
-                planned_minutes, importance_score, status, depth,
-                order_index, variance_minutes, completion_quality, completion_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    conn.executemany(
+        """
+        INSERT INTO activity_facts (
+            schedule_date, block_key, name, item_slug, item_type,
+            planned_start, planned_end, actual_start, actual_end,
+            planned_minutes, importance_score, status, depth,
+            order_index, variance_minutes, completion_quality, completion_json
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
             (
                 fact["schedule_date"],
                 fact["block_key"],
@@ -178,11 +306,147 @@ def _insert_activity_facts(conn: sqlite3.Connection, facts: List[Dict[str, Any]]
                 fact["variance_minutes"],
                 fact.get("completion_quality"),
                 fact.get("completion_json"),
-            ),
-        )
+            )
+            for fact in facts
+        ],
+    )
+
+
+def _refresh_daily_rollup(conn: sqlite3.Connection, date_key: str) -> None:
+    date_value = date_key or None
+    conn.execute("DELETE FROM daily_rollup WHERE schedule_date = ?", (date_key,))
+    row = conn.execute(
+        """
+        SELECT COUNT(*),
+               SUM(CASE WHEN LOWER(status) = 'completed' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN LOWER(status) = 'in_progress' THEN 1 ELSE 0 END),
+               SUM(variance_minutes),
+               COUNT(variance_minutes),
+               SUM(CASE WHEN variance_minutes IS NOT NULL AND ABS(variance_minutes) <= ? THEN 1 ELSE 0 END),
+               SUM(CASE WHEN variance_minutes IS NOT NULL AND ABS(variance_minutes) > ? THEN 1 ELSE 0 END),
+               SUM(CASE WHEN variance_minutes > 0 THEN variance_minutes ELSE 0 END)
+        FROM activity_facts WHERE schedule_date IS ?
+        """,
+        (ON_TIME_THRESHOLD_MINUTES, ON_TIME_THRESHOLD_MINUTES, date_value),
+    ).fetchone()
+    if not row or not row[0]:
+        return
+    conn.execute(
+        "INSERT INTO daily_rollup VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (date_key, _week_start(date_key), *[int(v or 0) for v in row[:8]]),
+    )
+
+
+def _refresh_weekly_rollup(conn: sqlite3.Connection, week_start: str) -> None:
+    conn.execute("DELETE FROM weekly_rollup WHERE week_start = ?", (week_start,))
+    row = conn.execute(
+        """
+        SELECT COUNT(*), SUM(blocks_total), SUM(blocks_completed), SUM(blocks_in_progress),
+               SUM(variance_sum), SUM(variance_count), SUM(on_time), SUM(late), SUM(delay_sum)
+        FROM daily_rollup WHERE week_start = ?
+        """,
+        (week_start,),
+    ).fetchone()
+    if not row or not row[0]:
+        return
+    conn.execute(
+        "INSERT INTO weekly_rollup VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (week_start, *[int(v or 0) for v in row[1:]]),
+    )
+
+
+def _habit_row(habit: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+    """Fields the trends report needs; None when the payload is unusable (the report skipped those too)."""
+    try:
+        data = json.loads(habit.get("raw_json") or "{}")
+    except Exception:
+        return None
+    if not isinstance(data, dict):
+        return None
+    try:
+        polarity = str(data.get("polarity", "good")).lower()
+        current = int(data.get("current_streak", 0)) if polarity != "bad" else 0
+        longest = int(data.get("longest_streak", 0)) if polarity != "bad" else 0
+    except Exception:
+        return None
+    dates = data.get("completion_dates", [])
+    return (
+        str(habit["slug"]),
+        data.get("name", habit.get("name")),
+        polarity,
+        current,
+        longest,
+        str(data["last_incident"]) if data.get("last_incident") else None,
+        str(data["creation_date"]) if data.get("creation_date") else None,
+        str(data.get("clean_current_streak", 0)),
+        json.dumps([str(d) for d in dates] if isinstance(dates, list) else []),
+    )
+
+
+def refresh_behavior(conn: sqlite3.Connection, core_data: Dict[str, List[Any]], full: bool = False) -> Dict[str, Any]:
+    """
+    Bring `conn` (the behavior DB) up to date with `core_data`. Only dates and
+    habits whose digests changed since the last build are rewritten, and only
+    the day/week rollups they touch are recomputed.
+    """
+    if full or not _schema_current(conn):
+        _create_schema(conn)
+        full = True
+    known = {k: v for k, v in conn.execute("SELECT key, digest FROM build_state WHERE key != 'schema'")}
 
+    completion_index = _completion_index(core_data["completions"])
+    by_date = _schedules_by_date(core_data["schedules"])
+    date_digests = _date_digests(by_date, completion_index)
+    known_dates = {k[5:]: v for k, v in known.items() if k.startswith("date:")}
+    changed_dates = {d for d, dg in date_digests.items() if known_dates.get(d) != dg}
+    removed_dates = set(known_dates) - set(date_digests)
 
-def build_behavior_db(registry: Dict[str, Any]) -> None:
+    touched_weeks: Set[str] = set()
+    for date_key in sorted(changed_dates | removed_dates):
+        conn.execute("DELETE FROM activity_facts WHERE schedule_date IS ?", (date_key or None,))
+        if date_key in date_digests:
+            facts = _prepare_activity_facts(by_date[date_key], [], completion_index)
+            _insert_activity_facts(conn, facts)
+            conn.execute("INSERT OR REPLACE INTO build_state (key, digest) VALUES (?, ?)",
+                         (f"date:{date_key}", date_digests[date_key]))
+        else:
+            conn.execute("DELETE FROM build_state WHERE key = ?", (f"date:{date_key}",))
+        _refresh_daily_rollup(conn, date_key)
+        touched_weeks.add(_week_start(date_key))
+    for week in sorted(touched_weeks):
+        _refresh_weekly_rollup(conn, week)
+
+    habits = core_data.get("habits") or []
+    habit_digests = _habit_digests(habits)
+    known_habits = {k[6:]: v for k, v in known.items() if k.startswith("habit:")}
+    changed_habits = 0
+    for habit in habits:
+        slug = str(habit.get("slug") or "")
+        if not slug or known_habits.get(slug) == habit_digests[slug]:
+            continue
+        conn.execute("DELETE FROM habit_facts WHERE slug = ?", (slug,))
+        row = _habit_row(habit)
+        if row is not None:
+            conn.execute("INSERT INTO habit_facts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+        conn.execute("INSERT OR REPLACE INTO build_state (key, digest) VALUES (?, ?)", (f"habit:{slug}", habit_digests[slug]))
+        changed_habits += 1
+    for slug in set(known_habits) - set(habit_digests):
+        conn.execute("DELETE FROM habit_facts WHERE slug = ?", (slug,))
+        conn.execute("DELETE FROM build_state WHERE key = ?", (f"habit:{slug}",))
+        changed_habits += 1
+
+    records = conn.execute("SELECT COUNT(*) FROM activity_facts").fetchone()[0]
+    return {
+        "mode": "full" if full else "incremental",
+        "records": records,
+        "dates": len(date_digests),
+        "dates_changed": len(changed_dates | removed_dates),
+        "weeks_changed": len(touched_weeks),
+        "habits_changed": changed_habits,
+    }
+
+
+def build_behavior_db(registry: Dict[str, Any], full: bool = False) -> None:
     ensure_data_home()
     _ensure_core(registry)
 
@@ -194,25 +458,16 @@ def build_behavior_db(registry: Dict[str, Any]) -> None:
         raise ValueError("Behavior database path is not configured.")
 
     os.makedirs(os.path.dirname(target_path), exist_ok=True)
-    tmp_path = f"{target_path}.tmp"
-    if os.path.exists(tmp_path):
-        os.remove(tmp_path)
 
     core_data = _read_core_tables()
-    facts = _prepare_activity_facts(core_data["schedules"], core_data["completions"])
 
-    conn = sqlite3.connect(tmp_path)
+    conn = sqlite3.connect(target_path)
     try:
-        _create_schema(conn)
-        _insert_activity_facts(conn, facts)
+        result = refresh_behavior(conn, core_data, full=full)
         conn.commit()
     except Exception as exc:
         conn.rollback()
         conn.close()
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
         update_database_entry(
             registry,
             "behavior",
@@ -223,13 +478,19 @@ def build_behavior_db(registry: Dict[str, Any]) -> None:
         raise
     else:
         conn.close()
-        os.replace(tmp_path, target_path)
         update_database_entry(
             registry,
             "behavior",
             last_sync=_timestamp(),
             status="ready",
-            records=len(facts),
+            records=result["records"],
+            watermark={
+                "mode": result["mode"],
+                "dates": result["dates"],
+                "dates_changed": result["dates_changed"],
+                "weeks_changed": result["weeks_changed"],
+                "habits_changed": result["habits_changed"],
+            },
             notes="",
         )
 
@@ -237,4 +498,3 @@ def build_behavior_db(registry: Dict[str, Any]) -> None:
 def sync_behavior_db() -> None:
     registry = load_registry()
     build_behavior_db(registry)
-
@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from modules.sequence.registry import ensure_data_home
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DOCS_DIR = os.path.join(ROOT_DIR, "docs")
+DATA_DIR = os.path.join(ROOT_DIR, "user", "data")
+DOCS_INDEX_PATH = os.path.join(DATA_DIR, "chronos_docs.db")
+
+_LOCK = threading.Lock()
+_FTS_AVAILABLE: Optional[bool] = None
+SNIPPET_CHARS = 240
+
+
+def _timestamp() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _connect() -> sqlite3.Connection:
+    ensure_data_home()
+    conn = sqlite3.connect(DOCS_INDEX_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _fts_supported(conn: sqlite3.Connection) -> bool:
+    """FTS5 with the trigram tokenizer gives case-insensitive substring matching."""
+    global _FTS_AVAILABLE
+    if _FTS_AVAILABLE is None:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE temp._probe USING fts5(t, tokenize='trigram')")
+            conn.execute("DROP TABLE temp._probe")
+            _FTS_AVAILABLE = True
+        except sqlite3.Error:
+            _FTS_AVAILABLE = False
+    return _FTS_AVAILABLE
+
+
+def _create_schema(conn: sqlite3.Connection) -> bool:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS doc_files (
+            path TEXT PRIMARY KEY,
+            mtime REAL,
+            size INTEGER,
+            line_count INTEGER,
+            indexed_at TEXT
+        );
+        """
+    )
+    fts = _fts_supported(conn)
+    if fts:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS doc_lines USING fts5("
+            "path UNINDEXED, line UNINDEXED, text, tokenize='trigram')"
+        )
+    else:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS doc_lines (
+                path TEXT,
+                line INTEGER,
+                text TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_doc_lines_path ON doc_lines(path);
+            """
+        )
+    return fts
+
+
+def _scan_docs() -> Dict[str, os.stat_result]:
+    found: Dict[str, os.stat_result] = {}
+    if not os.path.isdir(DOCS_DIR):
+        return found
+    for root_dir, _dirs, files in os.walk(DOCS_DIR):
+        for fname in files:
+            path = os.path.join(root_dir, fname)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rel = os.path.relpath(path, DOCS_DIR).replace("\\", "/")
+            found[rel] = st
+    return found
+
+
+def _read_lines(rel: str) -> Optional[List[str]]:
+    try:
+        with open(os.path.join(DOCS_DIR, rel), "r", encoding="utf-8") as fh:
+            return fh.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _refresh(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Re-index only files whose (mtime, size) changed; drop files that vanished."""
+    on_disk = _scan_docs()
+    known = {
+        row["path"]: (row["mtime"], row["size"])
+        for row in conn.execute("SELECT path, mtime, size FROM doc_files")
+    }
+    stats = {"added": 0, "updated": 0, "removed": 0, "files": len(on_disk)}
+    for rel in known:
+        if rel not in on_disk:
+            conn.execute("DELETE FROM doc_lines WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM doc_files WHERE path = ?", (rel,))
+            stats["removed"] += 1
+    for rel, st in on_disk.items():
+        prev = known.get(rel)
+        if prev and prev[0] == st.st_mtime and prev[1] == st.st_size:
+            continue
+        lines = _read_lines(rel)
+        conn.execute("DELETE FROM doc_lines WHERE path = ?", (rel,))
+        if lines:
+            conn.executemany(
+                "INSERT INTO doc_lines (path, line, text) VALUES (?, ?, ?)",
+                [(rel, idx, text) for idx, text in enumerate(lines, start=1) if text.strip()],
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO doc_files (path, mtime, size, line_count, indexed_at) VALUES (?, ?, ?, ?, ?)",
+            (rel, st.st_mtime, st.st_size, len(lines or []), _timestamp()),
+        )
+        stats["updated" if prev else "added"] += 1
+    conn.commit()
+    return stats
+
+
+def refresh_index() -> Dict[str, int]:
+    with _LOCK:
+        conn = _connect()
+        try:
+            _create_schema(conn)
+            return _refresh(conn)
+        finally:
+            conn.close()
+
+
+def build_docs_index(registry: Dict[str, Any]) -> None:
+    """Sequence sync handler: refresh the index and record file/line counts."""
+    from modules.sequence.registry import update_database_entry
+
+    stats = refresh_index()
+    conn = _connect()
+    try:
+        lines = conn.execute("SELECT COALESCE(SUM(line_count), 0) FROM doc_files").fetchone()[0]
+    finally:
+        conn.close()
+    update_database_entry(
+        registry,
+        "docs",
+        last_attempt=_timestamp(),
+        last_sync=_timestamp(),
+        status="ready",
+        records=int(stats.get("files") or 0),
+        notes=(
+            f"lines={int(lines or 0)} added={stats['added']} "
+            f"updated={stats['updated']} removed={stats['removed']}"
+        ),
+    )
+
+
+def list_paths() -> List[str]:
+    """Return every doc path (relative to docs/), sorted case-insensitively."""
+    with _LOCK:
+        conn = _connect()
+        try:
+            _create_schema(conn)
+            _refresh(conn)
+            paths = [row["path"] for row in conn.execute("SELECT path FROM doc_files")]
+        finally:
+            conn.close()
+    paths.sort(key=lambda p: p.lower())
+    return paths
+
+
+def search(query: str, limit: int = 200, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Ranked, case-insensitive substring search over indexed doc lines.
+
+    Returns dicts with path, line, text (trimmed line) and snippet (the match
+    with surrounding context). `prefix` restricts results to a docs subfolder.
+    """
+    query = str(query or "").strip()
+    if not query:
+        return []
+    limit = max(1, int(limit))
+    with _LOCK:
+        conn = _connect()
+        try:
+            fts = _create_schema(conn)
+            _refresh(conn)
+            # Prefix is compared with substr() rather than LIKE: FTS5 hands LIKE
+            # constraints to the trigram tokenizer, which ignores UNINDEXED columns.
+            path_prefix = (prefix or "").replace("\\", "/")
+            if fts and len(query) >= 3:
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = conn.execute(
+                    """
+                    SELECT path, line, text,
+                           snippet(doc_lines, 2, '', '', '...', 24) AS snippet
+                    FROM doc_lines
+                    WHERE doc_lines MATCH ? AND substr(path, 1, ?) = ?
+                    ORDER BY bm25(doc_lines), path, line
+                    LIMIT ?
+                    """,
+                    (phrase, len(path_prefix), path_prefix, limit),
+                ).fetchall()
+            else:
+                # Trigram matching needs 3+ characters; short needles scan.
+                needle = "%" + query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                rows = conn.execute(
+                    """
+                    SELECT path, line, text, text AS snippet
+                    FROM doc_lines
+                    WHERE lower(text) LIKE ? ESCAPE '\\' AND substr(path, 1, ?) = ?
+                    ORDER BY path, line
+                    LIMIT ?
+                    """,
+                    (needle, len(path_prefix), path_prefix, limit),
+                ).fetchall()
+        finally:
+            conn.close()
+    return [
+        {
+            "path": row["path"],
+            "line": int(row["line"]),
+            "text": str(row["text"] or "").strip()[:SNIPPET_CHARS],
+            "snippet": str(row["snippet"] or "").strip()[:SNIPPET_CHARS],
+        }
+        for row in rows
+    ]
+
+
+def matching_paths(query: str, prefix: Optional[str] = None, limit: int = 500) -> List[str]:
+    """Distinct doc paths containing `query`, best-ranked first."""
+    seen: List[str] = []
+    for hit in search(query, limit=limit, prefix=prefix):
+        if hit["path"] not in seen:
+            seen.append(hit["path"])
+    return seen
@@ -1,7 +1,8 @@
+import hashlib
 import os
 import sqlite3
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 import yaml
 
@@ -14,30 +15,23 @@ LISTENER_LOG = os.path.join(LOGS_DIR, "listener.log")
 DATA_DIR = os.path.join(USER_DIR, "data")
 EVENTS_DB_PATH = os.path.join(DATA_DIR, "chronos_events.db")
 
+# Listener log ingestion is checkpointed: the DB remembers how far it read and
+# a hash of the log's first HEAD_BYTES so a rotated/truncated log is detected.
+HEAD_BYTES = 4096
+READ_BLOCK = 1024 * 1024
+INSERT_BATCH = 1000
+
 
 def _timestamp() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
-def _parse_listener_log() -> List[Dict[str, Any]]:
-    if not os.path.exists(LISTENER_LOG):
-        return []
-    events: List[Dict[str, Any]] = []
-    with open(LISTENER_LOG, "r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line.startswith("[") or "]" not in line:
-                continue
-            ts, message = line.split("]", 1)
-            events.append(
-                {
-                    "timestamp": ts.lstrip("["),
-                    "event_type": "listener",
-                    "message": message.strip(),
-                    "payload": {"source": "listener.log"},
-                }
-            )
-    return events
+def _parse_listener_line(line: str) -> Optional[Tuple[str, str]]:
+    line = line.strip()
+    if not line.startswith("[") or "]" not in line:
+        return None
+    ts, message = line.split("]", 1)
+    return ts.lstrip("["), message.strip()
 
 
 def _collect_command_runs(registry: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -86,11 +80,7 @@ def _collect_trigger_logs() -> List[Dict[str, Any]]:
 def _create_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
-        DROP TABLE IF EXISTS events;
-        DROP TABLE IF EXISTS command_runs;
-        DROP TABLE IF EXISTS trigger_log;
-
-        CREATE TABLE events (
+        CREATE TABLE IF NOT EXISTS events (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT,
             event_type TEXT,
@@ -98,7 +88,7 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             payload_json TEXT
         );
 
-        CREATE TABLE command_runs (
+        CREATE TABLE IF NOT EXISTS command_runs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT,
             command TEXT,
@@ -108,33 +98,27 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             notes TEXT
         );
 
-        CREATE TABLE trigger_log (
+        CREATE TABLE IF NOT EXISTS trigger_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT,
             trigger_type TEXT,
             name TEXT,
             payload_json TEXT
         );
+
+        CREATE TABLE IF NOT EXISTS ingest_state (
+            source TEXT PRIMARY KEY,
+            file_id TEXT,
+            offset INTEGER,
+            head_len INTEGER,
+            head_sha256 TEXT,
+            source_size INTEGER,
+            updated_at TEXT
+        );
         """
     )
 
 
-def _insert_events(conn: sqlite3.Connection, events: List[Dict[str, Any]]) -> None:
-    for event in events:
-        conn.execute(
-            """
-            INSERT INTO events (timestamp, event_type, message, payload_json)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                event.get("timestamp"),
-                event.get("event_type"),
-                event.get("message"),
-                yaml.safe_dump(event.get("payload") or {}, sort_keys=True),
-            ),
-        )
-
-
 def _insert_command_runs(conn: sqlite3.Connection, runs: List[Dict[str, Any]]) -> None:
     for run in runs:
         conn.execute(
@@ -169,6 +153,94 @@ def _insert_triggers(conn: sqlite3.Connection, triggers: List[Dict[str, Any]]) -
         )
 
 
+def _file_id(st: os.stat_result) -> str:
+    return f"{st.st_dev}:{st.st_ino}"
+
+
+def _head_hash(fh, length: int) -> str:
+    fh.seek(0)
+    return hashlib.sha256(fh.read(length)).hexdigest()
+
+
+def _load_state(conn: sqlite3.Connection, source: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        "SELECT file_id, offset, head_len, head_sha256 FROM ingest_state WHERE source = ?",
+        (source,),
+    ).fetchone()
+    if not row:
+        return None
+    return {"file_id": row[0], "offset": int(row[1] or 0), "head_len": int(row[2] or 0), "head_sha256": row[3]}
+
+
+def _ingest_listener_log(conn: sqlite3.Connection, log_path: str = LISTENER_LOG) -> Dict[str, Any]:
+    """
+    Append listener events past the stored offset. The whole events table is
+    rebuilt only when the log was replaced (new file id), truncated (shorter
+    than the offset) or rewritten (head hash differs).
+    """
+    source = "listener.log"
+    state = _load_state(conn, source)
+    result = {"mode": "incremental", "appended": 0, "offset": 0, "source_size": 0}
+    if not os.path.exists(log_path):
+        if state is not None:
+            conn.execute("DELETE FROM events WHERE event_type = 'listener'")
+            conn.execute("DELETE FROM ingest_state WHERE source = ?", (source,))
+            result["mode"] = "full"
+        return result
+    st = os.stat(log_path)
+    payload_text = yaml.safe_dump({"source": "listener.log"}, sort_keys=True)
+    insert_sql = "INSERT INTO events (timestamp, event_type, message, payload_json) VALUES (?, ?, ?, ?)"
+    with open(log_path, "rb") as fh:
+        start = 0
+        if (
+            state is not None
+            and state["file_id"] == _file_id(st)
+            and st.st_size >= state["offset"]
+            and state["head_len"] <= st.st_size
+            and _head_hash(fh, state["head_len"]) == state["head_sha256"]
+        ):
+            start = state["offset"]
+        else:
+            conn.execute("DELETE FROM events WHERE event_type = 'listener'")
+            result["mode"] = "full"
+
+        fh.seek(start)
+        offset = start
+        carry = b""
+        batch: List[Tuple[Any, ...]] = []
+        while True:
+            chunk = fh.read(READ_BLOCK)
+            if not chunk:
+                break
+            lines = (carry + chunk).split(b"\n")
+            carry = lines.pop()
+            for raw in lines:
+                offset += len(raw) + 1
+                parsed = _parse_listener_line(raw.decode("utf-8", errors="ignore"))
+                if parsed is None:
+                    continue
+                batch.append((parsed[0], "listener", parsed[1], payload_text))
+                if len(batch) >= INSERT_BATCH:
+                    conn.executemany(insert_sql, batch)
+                    result["appended"] += len(batch)
+                    batch = []
+        if batch:
+            conn.executemany(insert_sql, batch)
+            result["appended"] += len(batch)
+        # A trailing partial line (no newline yet) is left for the next sync.
+        head_len = min(HEAD_BYTES, offset)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO ingest_state (source, file_id, offset, head_len, head_sha256, source_size, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (source, _file_id(st), offset, head_len, _head_hash(fh, head_len), st.st_size, _timestamp()),
+        )
+    result["offset"] = offset
+    result["source_size"] = st.st_size
+    return result
+
+
 def build_events_db(registry: Dict[str, Any]) -> None:
     ensure_data_home()
     entry = registry.get("databases", {}).get("events")
@@ -178,28 +250,27 @@ def build_events_db(registry: Dict[str, Any]) -> None:
     if not target_path:
         raise ValueError("Events database path is not configured.")
     os.makedirs(os.path.dirname(target_path), exist_ok=True)
-    tmp_path = f"{target_path}.tmp"
-    if os.path.exists(tmp_path):
-        os.remove(tmp_path)
 
-    listener_events = _parse_listener_log()
     command_runs = _collect_command_runs(registry)
     trigger_logs = _collect_trigger_logs()
 
-    conn = sqlite3.connect(tmp_path)
+    conn = sqlite3.connect(target_path)
     try:
         _create_schema(conn)
-        _insert_events(conn, listener_events)
+        ingest = _ingest_listener_log(conn)
+        # Command runs and trigger logs are small snapshots; replace them wholesale.
+        conn.execute("DELETE FROM command_runs")
+        conn.execute("DELETE FROM trigger_log")
         _insert_command_runs(conn, command_runs)
         _insert_triggers(conn, trigger_logs)
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("events", "command_runs", "trigger_log")
+        }
         conn.commit()
     except Exception as exc:
         conn.rollback()
         conn.close()
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
         update_database_entry(
             registry,
             "events",
@@ -210,13 +281,20 @@ def build_events_db(registry: Dict[str, Any]) -> None:
         raise
     else:
         conn.close()
-        os.replace(tmp_path, target_path)
         update_database_entry(
             registry,
             "events",
             last_sync=_timestamp(),
             status="ready",
-            records=len(listener_events),
+            records=counts["events"],
+            row_counts=counts,
+            watermark={
+                "source": LISTENER_LOG,
+                "offset": ingest["offset"],
+                "source_size": ingest["source_size"],
+                "mode": ingest["mode"],
+                "appended": ingest["appended"],
+            },
             notes="",
         )
 
@@ -224,4 +302,3 @@ def build_events_db(registry: Dict[str, Any]) -> None:
 def sync_events_db() -> None:
     registry = load_registry()
     build_events_db(registry)
-
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 import sqlite3
@@ -28,6 +29,12 @@ DIMENSION_TARGETS = [
     "template_type",
 ]
 
+# Dimensions materialized pairwise into matrix_cube. Property and schedule
+# time dimensions stay on the raw dimension_entries join.
+CUBE_DIMENSIONS = list(DIMENSION_TARGETS) + ["dataset"]
+CUBE_SCHEMA = "1"
+ALL_PERIODS = matrix_utils.CUBE_ALL_PERIODS
+
 
 def _timestamp() -> str:
     return datetime.now().isoformat(timespec="seconds")
@@ -180,6 +187,8 @@ def _create_schema(conn: sqlite3.Connection) -> None:
         """
         PRAGMA journal_mode=OFF;
         PRAGMA synchronous=OFF;
+        DROP TABLE IF EXISTS matrix_cube;
+        DROP TABLE IF EXISTS cube_meta;
         DROP TABLE IF EXISTS dimension_entries;
         DROP TABLE IF EXISTS items;
         CREATE TABLE items (
@@ -195,6 +204,7 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             template_type TEXT,
             duration_minutes INTEGER,
             points_value REAL,
+            period TEXT,
             raw_json TEXT
         );
         CREATE TABLE dimension_entries (
@@ -204,9 +214,27 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             display TEXT,
             kind TEXT NOT NULL DEFAULT 'dimension'
         );
+        CREATE TABLE matrix_cube (
+            dim_a TEXT NOT NULL,
+            value_a TEXT NOT NULL,
+            display_a TEXT,
+            dim_b TEXT NOT NULL,
+            value_b TEXT NOT NULL,
+            display_b TEXT,
+            period TEXT NOT NULL,
+            item_count INTEGER NOT NULL,
+            duration_minutes INTEGER NOT NULL,
+            points_value REAL NOT NULL,
+            item_names TEXT
+        );
+        CREATE TABLE cube_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
         CREATE INDEX idx_items_type ON items(type);
         CREATE INDEX idx_dim_dimension_value ON dimension_entries(dimension, value);
         CREATE INDEX idx_dim_kind ON dimension_entries(kind);
+        CREATE INDEX idx_cube_dims ON matrix_cube(dim_a, dim_b, period);
         """
     )
 
@@ -276,15 +304,16 @@ def _populate(conn: sqlite3.Connection, dataset: List[Tuple[str, Dict[str, Any]]
             _normalize_key(data.get("template_type")),
             duration,
             points,
+            matrix_utils._period_key(data.get("schedule_date")) if data.get("dataset") == "schedule" else "",
             json.dumps(data, ensure_ascii=False, default=str),
         )
         cursor = conn.execute(
             """
             INSERT INTO items (
                 slug, name, type, source_type, status, priority, category, project,
-                template_type, duration_minutes, points_value, raw_json
+                template_type, duration_minutes, points_value, period, raw_json
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             fields,
         )
@@ -303,6 +332,89 @@ def _populate(conn: sqlite3.Connection, dataset: List[Tuple[str, Dict[str, Any]]
     return records
 
 
+def _build_cube(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Materialize matrix_cube from the freshly populated items/dimension_entries.
+
+    One row per (dim_a <= dim_b, value pair, period) for every pair of
+    CUBE_DIMENSIONS, with the same aggregates the raw join computes: distinct
+    item count, duration/points summed over join rows, distinct names. Each
+    pair is stored for the period '*' (everything) and for each schedule month.
+
+    The cube version is a digest of every row the matrix queries read, so an
+    unchanged library rebuilds to the same version and cached answers survive.
+    """
+    hasher = hashlib.sha256(f"cube:{CUBE_SCHEMA}".encode("utf-8"))
+    items: Dict[int, Tuple[str, int, float, str]] = {}
+    for item_id, slug, name, item_type, duration, points, period in conn.execute(
+        "SELECT id, slug, name, type, duration_minutes, points_value, period FROM items ORDER BY id"
+    ):
+        items[item_id] = (name or "", duration or 0, points or 0.0, period or "")
+        hasher.update(json.dumps([slug, name, item_type, duration, points, period], default=str).encode("utf-8"))
+
+    wanted = set(CUBE_DIMENSIONS)
+    entries: Dict[int, Dict[str, List[Tuple[str, str]]]] = {}
+    for item_id, dim, value, display, kind in conn.execute(
+        "SELECT item_id, dimension, value, display, kind FROM dimension_entries ORDER BY rowid"
+    ):
+        hasher.update(json.dumps([item_id, dim, value, display, kind]).encode("utf-8"))
+        if dim in wanted:
+            entries.setdefault(item_id, {}).setdefault(dim, []).append((value, display or ""))
+
+    pairs = [
+        (a, b)
+        for i, a in enumerate(sorted(wanted))
+        for b in sorted(wanted)[i:]
+    ]
+    cells: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    for item_id, dims in entries.items():
+        name, duration, points, period = items.get(item_id, ("", 0, 0.0, ""))
+        periods = [ALL_PERIODS] + ([period] if period else [])
+        for a, b in pairs:
+            left = dims.get(a)
+            right = dims.get(b)
+            if not left or not right:
+                continue
+            for value_a, display_a in left:
+                for value_b, display_b in right:
+                    for bucket in periods:
+                        key = (a, value_a, display_a, b, value_b, display_b, bucket)
+                        cell = cells.get(key)
+                        if cell is None:
+                            cell = {"ids": set(), "duration": 0, "points": 0.0, "names": {}}
+                            cells[key] = cell
+                        cell["ids"].add(item_id)
+                        cell["duration"] += duration
+                        cell["points"] += points
+                        if name:
+                            cell["names"].setdefault(name, None)
+
+    conn.executemany(
+        """
+        INSERT INTO matrix_cube (
+            dim_a, value_a, display_a, dim_b, value_b, display_b, period,
+            item_count, duration_minutes, points_value, item_names
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            key + (len(cell["ids"]), cell["duration"], cell["points"], matrix_utils.NAME_SEPARATOR.join(cell["names"]))
+            for key, cell in cells.items()
+        ],
+    )
+    version = hasher.hexdigest()[:16]
+    conn.executemany(
+        "INSERT INTO cube_meta (key, value) VALUES (?, ?)",
+        [
+            ("version", version),
+            ("schema", CUBE_SCHEMA),
+            ("dimensions", json.dumps(sorted(wanted))),
+            ("built_at", _timestamp()),
+        ],
+    )
+    return {"version": version, "cells": len(cells)}
+
+
 def build_matrix_cache(registry: Dict[str, Any]) -> None:
     ensure_data_home()
     entry = registry.get("databases", {}).get("matrix")
@@ -321,6 +433,7 @@ def build_matrix_cache(registry: Dict[str, Any]) -> None:
     try:
         _create_schema(conn)
         records = _populate(conn, dataset)
+        cube = _build_cube(conn)
         conn.commit()
     except Exception as exc:
         conn.rollback()
@@ -346,6 +459,8 @@ def build_matrix_cache(registry: Dict[str, Any]) -> None:
             last_sync=_timestamp(),
             status="ready",
             records=records,
+            cube_version=cube["version"],
+            cube_cells=cube["cells"],
             notes="",
         )
 
@@ -52,6 +52,12 @@ DEFAULT_DATABASES: Dict[str, Dict[str, Any]] = {
         "type": "sqlite",
         "description": "Aggregated metastudy metrics derived from memory/events.",
     },
+    "docs": {
+        "name": "Docs Search Index",
+        "filename": "chronos_docs.db",
+        "type": "sqlite",
+        "description": "Incremental full-text index of docs/ for dashboard search and skill lookups.",
+    },
     "trends_digest": {
         "name": "Behavior Trends Digest",
         "filename": "trends.md",
@@ -162,6 +168,20 @@ def update_database_entry(registry: Dict[str, Any], key: str, **updates: Any) ->
     return entry
 
 
+def _describe_watermark(watermark: Dict[str, Any]) -> str:
+    """Ingestion offset vs. the source file's current size (how far the mirror is behind)."""
+    offset = int(watermark.get("offset") or 0)
+    try:
+        size = os.path.getsize(watermark["source"])
+    except OSError:
+        return f"byte {offset} of {os.path.basename(watermark['source'])} (source missing)"
+    if size < offset:
+        behind = "rotated; next sync rebuilds"
+    else:
+        behind = f"{size - offset} bytes behind"
+    return f"byte {offset} of {size} in {os.path.basename(watermark['source'])} ({behind})"
+
+
 def describe_registry(registry: Dict[str, Any]) -> List[str]:
     if not registry:
         return ["No registry data found."]
@@ -181,6 +201,14 @@ def describe_registry(registry: Dict[str, Any]) -> List[str]:
         lines.append(f"  last sync  : {last_sync}")
         if entry.get("records") is not None:
             lines.append(f"  records    : {entry.get('records')}")
+        row_counts = entry.get("row_counts")
+        if isinstance(row_counts, dict) and row_counts:
+            lines.append("  rows       : " + ", ".join(f"{k}={v}" for k, v in sorted(row_counts.items())))
+        watermark = entry.get("watermark")
+        if isinstance(watermark, dict) and watermark.get("source"):
+            lines.append(f"  watermark  : {_describe_watermark(watermark)}")
+        elif isinstance(watermark, dict) and watermark:
+            lines.append("  last build : " + ", ".join(f"{k}={v}" for k, v in watermark.items()))
         if entry.get("description"):
             lines.append(f"  details    : {entry.get('description')}")
         if path:
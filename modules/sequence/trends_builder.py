@@ -1,12 +1,13 @@
+import hashlib
 import json
 import os
 import sqlite3
 import yaml
 from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 
 from modules.sequence.registry import ensure_data_home, update_database_entry, load_registry
-from modules.sequence.behavior_builder import build_behavior_db
+from modules.sequence.behavior_builder import build_behavior_db, SCHEMA_VERSION as BEHAVIOR_SCHEMA_VERSION
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 USER_DIR = os.path.join(ROOT_DIR, "user")
@@ -38,29 +39,47 @@ def _ensure_behavior(registry: Dict[str, Any]) -> None:
 
 
 def _behavior_has_completion_columns() -> bool:
+    """True when the behavior DB has the completion columns and the current rollup schema."""
     try:
         conn = sqlite3.connect(BEHAVIOR_DB_PATH)
         columns = {row[1] for row in conn.execute("PRAGMA table_info(activity_facts)").fetchall()}
+        try:
+            row = conn.execute("SELECT digest FROM build_state WHERE key = 'schema'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
         conn.close()
-        return {"completion_quality", "completion_json"}.issubset(columns)
+        return {"completion_quality", "completion_json"}.issubset(columns) and bool(row) and row[0] == BEHAVIOR_SCHEMA_VERSION
     except Exception:
         return False
 
 
-def _fetch_behavior_stats() -> Dict[str, Any]:
-    conn = sqlite3.connect(BEHAVIOR_DB_PATH)
+def _rollup_totals(cursor: sqlite3.Cursor) -> Dict[str, int]:
+    """Sum the per-day rollups maintained by behavior_builder."""
+    row = cursor.execute(
+        """
+        SELECT COALESCE(SUM(blocks_total), 0), COALESCE(SUM(blocks_completed), 0),
+               COALESCE(SUM(blocks_in_progress), 0), COALESCE(SUM(variance_sum), 0),
+               COALESCE(SUM(variance_count), 0), COALESCE(SUM(on_time), 0),
+               COALESCE(SUM(late), 0), COALESCE(SUM(delay_sum), 0)
+        FROM daily_rollup
+        """
+    ).fetchone()
+    keys = ("blocks_total", "blocks_completed", "blocks_in_progress", "variance_sum",
+            "variance_count", "on_time", "late", "delay_sum")
+    return dict(zip(keys, (int(v or 0) for v in row)))
+
+
+def _fetch_behavior_stats(db_path: str = BEHAVIOR_DB_PATH) -> Dict[str, Any]:
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     stats = {}
-    stats["blocks_total"] = cursor.execute("SELECT COUNT(*) FROM activity_facts").fetchone()[0]
-    stats["blocks_completed"] = cursor.execute(
-        "SELECT COUNT(*) FROM activity_facts WHERE LOWER(status) = 'completed'"
-    ).fetchone()[0]
-    stats["blocks_in_progress"] = cursor.execute(
-        "SELECT COUNT(*) FROM activity_facts WHERE LOWER(status) = 'in_progress'"
-    ).fetchone()[0]
-    stats["average_variance"] = cursor.execute(
-        "SELECT COALESCE(AVG(variance_minutes), 0) FROM activity_facts"
-    ).fetchone()[0] or 0
+    totals = _rollup_totals(cursor)
+    stats["blocks_total"] = totals["blocks_total"]
+    stats["blocks_completed"] = totals["blocks_completed"]
+    stats["blocks_in_progress"] = totals["blocks_in_progress"]
+    stats["average_variance"] = (
+        totals["variance_sum"] / totals["variance_count"] if totals["variance_count"] else 0
+    )
     stats["latest_status_snapshot"] = None
     quality_counts, custom_property_counts = _collect_completion_property_stats(cursor)
     stats["quality_counts"] = quality_counts
@@ -103,9 +122,8 @@ def _collect_completion_property_stats(cursor: sqlite3.Cursor) -> Tuple[Dict[str
     return quality_counts, custom_property_counts
 
 
-def _fetch_habit_stats() -> Dict[str, Any]:
-    """Collect metrics from all habit files."""
-    habits_dir = os.path.join(USER_DIR, "habits")
+def _fetch_habit_stats(db_path: str = BEHAVIOR_DB_PATH) -> Dict[str, Any]:
+    """Collect habit metrics from the habit_facts rows behavior_builder mirrors from chronos_core.db."""
     stats = {
         "total_habits": 0,
         "habits_with_current_streak": 0,
@@ -114,69 +132,71 @@ def _fetch_habit_stats() -> Dict[str, Any]:
         "completion_rate_today": 0.0,
         "bad_habits_total_clean_days": 0,
         "bad_habits_count": 0,
+        "best_habit": None,
     }
-    
-    if not os.path.isdir(habits_dir):
+    try:
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            """
+            SELECT name, polarity, current_streak, longest_streak, last_incident,
+                   creation_date, clean_current_streak, completion_dates_json
+            FROM habit_facts ORDER BY slug
+            """
+        ).fetchall()
+        conn.close()
+    except sqlite3.Error:
         return stats
-    
+
     today = datetime.now().strftime("%Y-%m-%d")
     completed_today = 0
-    
-    for filename in os.listdir(habits_dir):
-        if not filename.lower().endswith(".yml"):
-            continue
-        
-        filepath = os.path.join(habits_dir, filename)
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            
-            stats["total_habits"] += 1
-            polarity = str(data.get("polarity", "good")).lower()
-            
-            if polarity == "bad":
-                stats["bad_habits_count"] += 1
-                # Calculate clean streak for bad habits
-                last_incident = data.get("last_incident")
-                if last_incident:
+    best_streak = 0
+
+    for name, polarity, current_streak, longest_streak, last_incident, creation_date, clean_streak, dates_json in rows:
+        stats["total_habits"] += 1
+        if polarity == "bad":
+            stats["bad_habits_count"] += 1
+            # Calculate clean streak for bad habits
+            if last_incident:
+                try:
+                    last_dt = datetime.strptime(str(last_incident), "%Y-%m-%d").date()
+                    clean_days = (datetime.now().date() - last_dt).days - 1
+                    stats["bad_habits_total_clean_days"] += max(0, clean_days)
+                except Exception:
                     try:
-                        last_dt = datetime.strptime(str(last_incident), "%Y-%m-%d").date()
-                        clean_days = (datetime.now().date() - last_dt).days - 1
-                        stats["bad_habits_total_clean_days"] += max(0, clean_days)
+                        stats["bad_habits_total_clean_days"] += int(clean_streak or 0)
                     except Exception:
-                        stats["bad_habits_total_clean_days"] += int(data.get("clean_current_streak", 0))
-                else:
-                    # No incidents ever
-                    creation_date = data.get("creation_date")
-                    if creation_date:
-                        try:
-                            created_dt = datetime.strptime(str(creation_date), "%Y-%m-%d").date()
-                            clean_days = (datetime.now().date() - created_dt).days
-                            stats["bad_habits_total_clean_days"] += max(0, clean_days)
-                        except Exception:
-                            pass
-            else:
-                # Good habit streaks
-                current_streak = int(data.get("current_streak", 0))
-                longest_streak = int(data.get("longest_streak", 0))
-                
-                if current_streak > 0:
-                    stats["habits_with_current_streak"] += 1
-                    stats["total_current_streak_days"] += current_streak
-                
-                if longest_streak > stats["longest_streak_overall"]:
-                    stats["longest_streak_overall"] = longest_streak
-            
-            # Check if completed today
-            completion_dates = data.get("completion_dates", [])
-            if isinstance(completion_dates, list) and today in completion_dates:
+                        pass
+            elif creation_date:
+                # No incidents ever
+                try:
+                    created_dt = datetime.strptime(str(creation_date), "%Y-%m-%d").date()
+                    clean_days = (datetime.now().date() - created_dt).days
+                    stats["bad_habits_total_clean_days"] += max(0, clean_days)
+                except Exception:
+                    pass
+        else:
+            # Good habit streaks
+            current_streak = int(current_streak or 0)
+            longest_streak = int(longest_streak or 0)
+            if current_streak > 0:
+                stats["habits_with_current_streak"] += 1
+                stats["total_current_streak_days"] += current_streak
+            if longest_streak > stats["longest_streak_overall"]:
+                stats["longest_streak_overall"] = longest_streak
+            if current_streak > best_streak:
+                best_streak = current_streak
+                stats["best_habit"] = name
+
+        # Check if completed today
+        try:
+            if today in json.loads(dates_json or "[]"):
                 completed_today += 1
         except Exception:
-            continue
-    
+            pass
+
     if stats["total_habits"] > 0:
         stats["completion_rate_today"] = (completed_today / stats["total_habits"]) * 100
-    
+
     return stats
 
 
@@ -271,6 +291,7 @@ def _fetch_timer_stats() -> Dict[str, Any]:
         "focus_minutes": 0,
         "break_minutes": 0,
         "profile_usage": {},
+        "daily_focus_minutes": {},
     }
     
     if not os.path.isdir(sessions_dir):
@@ -305,6 +326,7 @@ def _fetch_timer_stats() -> Dict[str, Any]:
                 
                 if phase == "focus":
                     stats["focus_minutes"] += minutes
+                    stats["daily_focus_minutes"][date] = stats["daily_focus_minutes"].get(date, 0) + minutes
                 elif phase in ("short_break", "long_break", "break"):
                     stats["break_minutes"] += minutes
                 
@@ -318,7 +340,7 @@ def _fetch_timer_stats() -> Dict[str, Any]:
 
 
 def _compute_adherence_stats(cursor: sqlite3.Cursor) -> Dict[str, Any]:
-    """Compute adherence metrics from behavior database."""
+    """Compute adherence metrics from the behavior database's daily rollups."""
     stats = {
         "on_time_count": 0,
         "late_count": 0,
@@ -327,43 +349,17 @@ def _compute_adherence_stats(cursor: sqlite3.Cursor) -> Dict[str, Any]:
     }
     
     try:
-        # Query variance from activity_facts
-        rows = cursor.execute(
-            """
-            SELECT variance_minutes
-            FROM activity_facts
-            WHERE variance_minutes IS NOT NULL
-            """
-        ).fetchall()
-        
-        if not rows:
-            return stats
-        
-        total = len(rows)
-        on_time_threshold = 5  # minutes
-        total_delay = 0
-        
-        for (variance,) in rows:
-            try:
-                variance_val = float(variance)
-                if abs(variance_val) <= on_time_threshold:
-                    stats["on_time_count"] += 1
-                else:
-                    stats["late_count"] += 1
-                
-                if variance_val > 0:
-                    total_delay += variance_val
-            except (ValueError, TypeError):
-                continue
-        
-        if total > 0:
-            stats["adherence_percentage"] = (stats["on_time_count"] / total) * 100
-        
-        if stats["late_count"] > 0:
-            stats["avg_delay_minutes"] = total_delay / stats["late_count"]
+        totals = _rollup_totals(cursor)
     except sqlite3.OperationalError:
-        pass
-    
+        return stats
+    total = totals["on_time"] + totals["late"]
+    if not total:
+        return stats
+    stats["on_time_count"] = totals["on_time"]
+    stats["late_count"] = totals["late"]
+    stats["adherence_percentage"] = (stats["on_time_count"] / total) * 100
+    if stats["late_count"] > 0:
+        stats["avg_delay_minutes"] = totals["delay_sum"] / stats["late_count"]
     return stats
 
 
@@ -493,71 +489,14 @@ def _format_duration_prose(minutes: int) -> str:
 
 
 def _superlative_habit(habit_stats: Dict[str, Any]) -> str:
-    """Find the habit with the longest current streak."""
-    habits_dir = os.path.join(USER_DIR, "habits")
-    if not os.path.isdir(habits_dir):
-        return "your habits"
-    
-    best_name = None
-    best_streak = 0
-    
-    for filename in os.listdir(habits_dir):
-        if not filename.lower().endswith(".yml"):
-            continue
-        filepath = os.path.join(habits_dir, filename)
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            polarity = str(data.get("polarity", "good")).lower()
-            if polarity != "bad":
-                streak = int(data.get("current_streak", 0))
-                if streak > best_streak:
-                    best_streak = streak
-                    best_name = data.get("name", os.path.splitext(filename)[0])
-        except Exception:
-            continue
-    
+    """The habit with the longest current streak."""
+    best_name = habit_stats.get("best_habit")
     return f'"{best_name}"' if best_name else "your habits"
 
 
 def _productivity_peak_day(timer_stats: Dict[str, Any]) -> tuple:
     """Find the most productive day by timer minutes."""
-    sessions_dir = os.path.join(USER_DIR, "timers", "sessions")
-    if not os.path.isdir(sessions_dir):
-        return ("this week", 0)
-    
-    daily_minutes = {}
-    today = datetime.now()
-    
-    for i in range(7):
-        date = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-        session_file = os.path.join(sessions_dir, f"{date}.yml")
-        
-        if not os.path.exists(session_file):
-            continue
-        
-        try:
-            with open(session_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            
-            entries = data.get("entries", [])
-            if not isinstance(entries, list):
-                continue
-            
-            total = 0
-            for entry in entries:
-                if not isinstance(entry, dict):
-                    continue
-                phase = entry.get("phase", "focus")
-                if phase == "focus":
-                    seconds = int(entry.get("seconds", 0))
-                    total += max(1, seconds // 60)
-            
-            if total > 0:
-                daily_minutes[date] = total
-        except Exception:
-            continue
-    
+    daily_minutes = {d: m for d, m in (timer_stats.get("daily_focus_minutes") or {}).items() if m > 0}
     if not daily_minutes:
         return ("this week", 0)
     
@@ -731,11 +670,43 @@ def _generate_narrative(stats: Dict[str, Any]) -> str:
     return "\n".join(lines) + "\n"
 
 
-def _write_digest(stats: Dict[str, Any]) -> None:
-    """Write natural language performance report."""
+def _section_inputs(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Everything each rendered trends.md section depends on (the header timestamp aside)."""
+    return {
+        "summary": [
+            stats.get("blocks_total", 0),
+            stats.get("blocks_completed", 0),
+            stats.get("average_variance", 0),
+            (stats.get("adherence_stats") or {}).get("adherence_percentage", 0),
+        ],
+        "habits": stats.get("habit_stats") or {},
+        "goals": stats.get("goal_stats") or {},
+        "focus": stats.get("timer_stats") or {},
+        "quality": stats.get("quality_counts") or {},
+    }
+
+
+def _section_digests(stats: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        name: hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        for name, inputs in _section_inputs(stats).items()
+    }
+
+
+def _write_digest(stats: Dict[str, Any], previous: Optional[Dict[str, str]] = None,
+                  path: str = TRENDS_MD_PATH) -> Tuple[bool, Dict[str, str]]:
+    """
+    Write natural language performance report, unless every section's
+    inputs match `previous` and the file is still there.
+    Returns (written, section digests).
+    """
+    digests = _section_digests(stats)
+    if previous == digests and os.path.exists(path):
+        return False, digests
     narrative = _generate_narrative(stats)
-    with open(TRENDS_MD_PATH, "w", encoding="utf-8") as fh:
+    with open(path, "w", encoding="utf-8") as fh:
         fh.write(narrative)
+    return True, digests
 
 
 def _format_counts(counts: Dict[str, int], limit: int = 8) -> str:
@@ -796,7 +767,9 @@ def build_trends_report(registry: Dict[str, Any]) -> None:
     else:
         conn.close()
         os.replace(tmp_path, target_path)
-        _write_digest(stats)
+        digest_entry = registry.get("databases", {}).get("trends_digest") or {}
+        previous = digest_entry.get("section_digests")
+        written, digests = _write_digest(stats, previous if isinstance(previous, dict) else None)
         update_database_entry(
             registry,
             "trends",
@@ -811,7 +784,8 @@ def build_trends_report(registry: Dict[str, Any]) -> None:
             last_sync=_timestamp(),
             status="ready",
             records=1,
-            notes="Digest refreshed",
+            section_digests=digests,
+            notes="Digest refreshed" if written else "Digest unchanged (no section inputs changed)",
         )
 
 
@@ -1,5 +1,24 @@
+"""
+UI sound effects (startup / done / error / exit).
+
+Playback goes through a process-wide `SoundBank`:
+
+- The audio backend (pygame mixer) is initialized once, lazily; `warm()`
+  does that and preloads every enabled sound on a background thread so the
+  first chime does not pay for it.
+- Decoded samples are kept in an LRU bounded by `MAX_CACHE_BYTES`, keyed by
+  path and checked against the file's (mtime, size) fingerprint, so an
+  edited sound file is reloaded on its next play.
+- Settings are re-read only when sound_settings.yml's fingerprint changes.
+- `NullBackend` reads files instead of decoding them and plays nothing, for
+  machines without audio (CHRONOS_SOUND_BACKEND=null) and tests
+  (`set_backend()`).
+"""
+
 import os
 import threading
+import time
+from collections import OrderedDict
 
 try:
     import yaml  # type: ignore
@@ -15,6 +34,7 @@ except Exception:
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SETTINGS_PATH = os.path.join(ROOT_DIR, "user", "settings", "sound_settings.yml")
 ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+MAX_CACHE_BYTES = 32 * 1024 * 1024
 
 DEFAULT_SETTINGS = {
     "enabled": True,
@@ -50,9 +70,8 @@ def _base_settings():
         },
     }
 
-_mixer_lock = threading.Lock()
-_mixer_ready = False
-_mixer_failed = False
+_bank = None
+_bank_lock = threading.Lock()
 
 
 def _merged_settings(data):
@@ -109,6 +128,8 @@ def save_settings(settings):
                 f.write(str(merged))
     except Exception:
         pass
+    if _bank is not None:
+        _bank.invalidate_settings()
     return merged
 
 
@@ -143,15 +164,11 @@ def get_status():
 
 
 def _is_enabled(sound_name):
-    st = load_settings(write_if_missing=False)
-    name = str(sound_name or "").strip().lower()
-    if not st.get("enabled", True):
-        return False
-    return bool((st.get("sounds") or {}).get(name, False))
+    return bank().is_enabled(str(sound_name or "").strip().lower())
 
 
-def _resolve_sound_path(sound_name):
-    st = load_settings(write_if_missing=False)
+def _resolve_sound_path(sound_name, settings=None):
+    st = settings if settings is not None else load_settings(write_if_missing=False)
     name = str(sound_name or "").strip().lower()
     fn = (st.get("files") or {}).get(name)
     if not fn:
@@ -166,57 +183,252 @@ def _resolve_sound_path(sound_name):
     return None
 
 
-def _ensure_mixer():
-    global _mixer_ready, _mixer_failed
-    if _mixer_ready:
-        return True
-    if _mixer_failed or pygame is None:
-        return False
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class PygameBackend:
+    name = "pygame"
 
-    with _mixer_lock:
-        if _mixer_ready:
+    def init(self):
+        if pygame.mixer.get_init():
             return True
-        if _mixer_failed or pygame is None:
+        pygame.mixer.init()
+        return True
+
+    def load(self, path):
+        return pygame.mixer.Sound(path)
+
+    def size(self, sample):
+        freq, fmt, channels = pygame.mixer.get_init() or (44100, -16, 2)
+        return int(sample.get_length() * freq) * channels * (abs(fmt) // 8)
+
+    def play(self, sample, channel=None):
+        if channel is None:
+            return sample.play()
+        ch = pygame.mixer.Channel(channel)
+        ch.play(sample)
+        return ch
+
+
+class NullBackend:
+    """No audio device: 'decodes' by reading the file and records what was played."""
+
+    name = "null"
+
+    def __init__(self):
+        self.loads = []
+        self.played = []
+
+    def init(self):
+        return True
+
+    def load(self, path):
+        with open(path, "rb") as fh:
+            data = fh.read()
+        self.loads.append(path)
+        return data
+
+    def size(self, sample):
+        return len(sample)
+
+    def play(self, sample, channel=None):
+        self.played.append(sample)
+        return None
+
+
+def _default_backend():
+    if str(os.environ.get("CHRONOS_SOUND_BACKEND", "")).strip().lower() in {"null", "none", "off"}:
+        return NullBackend()
+    if pygame is None:
+        return None
+    return PygameBackend()
+
+
+class SoundBank:
+    """Decoded sample cache plus settings lookup for `play()`."""
+
+    def __init__(self, backend=None, max_bytes=MAX_CACHE_BYTES):
+        self.backend = backend
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.RLock()
+        self._samples = OrderedDict()  # path -> (fingerprint, sample, size)
+        self._bytes = 0
+        self._ready = None
+        self._settings = None
+        self._settings_fp = None
+        self._paths = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Backend ---------------------------------------------------------------
+
+    def ready(self):
+        """Initialize the backend once; False if there is no usable audio."""
+        if self._ready is not None:
+            return self._ready
+        with self._lock:
+            if self._ready is None:
+                try:
+                    self._ready = bool(self.backend and self.backend.init())
+                except Exception:
+                    self._ready = False
+            return self._ready
+
+    # Settings --------------------------------------------------------------
+
+    def settings(self):
+        fp = _fingerprint(SETTINGS_PATH)
+        if self._settings is None or fp != self._settings_fp:
+            with self._lock:
+                self._settings = load_settings(write_if_missing=False)
+                self._settings_fp = fp
+                self._paths = {}
+        return self._settings
+
+    def invalidate_settings(self):
+        with self._lock:
+            self._settings = None
+            self._paths = {}
+
+    def is_enabled(self, name):
+        st = self.settings()
+        if not st.get("enabled", True):
+            return False
+        return bool((st.get("sounds") or {}).get(name, False))
+
+    def resolve(self, name):
+        st = self.settings()
+        if name not in self._paths:
+            self._paths[name] = _resolve_sound_path(name, st)
+        path = self._paths[name]
+        if path and not os.path.exists(path):
+            self._paths.pop(name, None)
+            return None
+        return path
+
+    # Samples ---------------------------------------------------------------
+
+    def sample(self, path):
+        """Decoded sample for `path`, from cache unless the file changed."""
+        if not path or not self.ready():
+            return None
+        fp = _fingerprint(path)
+        if fp is None:
+            return None
+        with self._lock:
+            entry = self._samples.get(path)
+            if entry is not None and entry[0] == fp:
+                self._samples.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+        try:
+            sample = self.backend.load(path)
+            size = int(self.backend.size(sample))
+        except Exception:
+            return None
+        with self._lock:
+            self.misses += 1
+            old = self._samples.pop(path, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._samples[path] = (fp, sample, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._samples) > 1:
+                _, (_, _, dropped) = self._samples.popitem(last=False)
+                self._bytes -= dropped
+                self.evictions += 1
+        return sample
+
+    def preload(self, names=None):
+        """Decode every enabled sound (or `names`). Returns how many are cached."""
+        loaded = 0
+        for name in names or list_sound_names():
+            if self.is_enabled(name) and self.sample(self.resolve(name)) is not None:
+                loaded += 1
+        return loaded
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": getattr(self.backend, "name", None),
+                "ready": self._ready,
+                "entries": len(self._samples),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # Playback --------------------------------------------------------------
+
+    def play_path(self, path, wait=False, max_wait_seconds=2.0, channel=None):
+        sample = self.sample(path)
+        if sample is None:
             return False
         try:
-            pygame.mixer.init()
-            _mixer_ready = True
+            ch = self.backend.play(sample, channel)
+            if wait and ch is not None:
+                deadline = time.time() + max(0.1, float(max_wait_seconds))
+                while ch.get_busy() and time.time() < deadline:
+                    time.sleep(0.03)
             return True
         except Exception:
-            _mixer_failed = True
             return False
 
 
+def bank():
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = SoundBank(_default_backend())
+    return _bank
+
+
+def set_backend(backend, max_bytes=MAX_CACHE_BYTES):
+    """Replace the sound bank (e.g. `NullBackend()` in tests). Returns the new bank."""
+    global _bank
+    with _bank_lock:
+        _bank = SoundBank(backend, max_bytes=max_bytes)
+    return _bank
+
+
+def warm():
+    """Initialize audio and preload enabled sounds on a background thread."""
+    threading.Thread(target=lambda: bank().ready() and bank().preload(), daemon=True).start()
+
+
+def _ensure_mixer():
+    return bank().ready()
+
+
 def _play_sync(path, wait=False, max_wait_seconds=2.0):
-    if not _ensure_mixer():
-        return False
-    try:
-        snd = pygame.mixer.Sound(path)
-        ch = snd.play()
-        if wait and ch is not None:
-            try:
-                import time
-                deadline = time.time() + max(0.1, float(max_wait_seconds))
-                while ch.get_busy() and time.time() < deadline:
-                    time.sleep(0.03)
-            except Exception:
-                pass
-        return True
-    except Exception:
-        return False
+    return bank().play_path(path, wait=wait, max_wait_seconds=max_wait_seconds)
 
 
 def play(sound_name, wait=False, max_wait_seconds=2.0):
     name = str(sound_name or "").strip().lower()
     if not name:
         return False
-    if not _is_enabled(name):
+    sounds = bank()
+    if not sounds.is_enabled(name):
         return False
-    path = _resolve_sound_path(name)
+    path = sounds.resolve(name)
     if not path:
         return False
     if wait:
         return _play_sync(path, wait=True, max_wait_seconds=max_wait_seconds)
     threading.Thread(target=_play_sync, args=(path, False, max_wait_seconds), daemon=True).start()
     return True
-
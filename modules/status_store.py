@@ -0,0 +1,335 @@
+"""
+Append-only status time series.
+
+Status changes used to be appended to a dated YAML file
+(`user/logs/status_YYYY-MM-DD.yml`, one full snapshot per change), which
+meant re-parsing and re-dumping the whole day on every `status` call, and a
+YAML parse per day for anyone reading status over a range. This store keeps
+one row per indicator change in `user/logs/status_history.db`:
+
+    samples(ts, indicator, value, source)   index (indicator, ts)
+    indicators(name, first_ts, last_ts)      one row per indicator seen
+
+A write is a single insert. Queries are index range scans:
+
+- `history(start, end, indicators)`: changes in [start, end], optionally with
+  the value in effect at `start`;
+- `latest_at(when, indicators)`: value of each indicator at a point in time;
+- `downsample(indicator, start, end, bucket_minutes)`: per bucket, the value
+  held longest (time-weighted), the value at bucket end and the number of
+  changes.
+
+Legacy dated YAML files are imported once, the first time the store is
+opened, keeping only entries where an indicator's value actually changed.
+Timestamps are local ISO strings (`YYYY-MM-DDTHH:MM:SS`), which sort in time
+order. `record` reports its samples to `modules.op_journal`, so `undo`
+deletes them (`undo_effect`) and `redo` writes them again (`redo_effect`).
+"""
+
+import glob
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+from modules.item_manager import get_user_dir
+
+LEGACY_IMPORT_KEY = "legacy_yaml_import"
+_LEGACY_NAME_RE = re.compile(r"status_(\d{4}-\d{2}-\d{2})\.ya?ml$", re.IGNORECASE)
+
+
+def store_path() -> str:
+    return os.path.join(get_user_dir(), "logs", "status_history.db")
+
+
+def _legacy_dirs() -> List[str]:
+    user_dir = get_user_dir()
+    return [os.path.join(user_dir, "logs"), os.path.join(user_dir, "profile", "Status")]
+
+
+def _ts(value: Any) -> str:
+    if value is None:
+        return datetime.now().isoformat(timespec="seconds")
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="seconds")
+    text = str(value).strip()
+    if len(text) == 10:
+        return f"{text}T00:00:00"
+    return text.replace(" ", "T", 1)[:19]
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS samples (
+            id INTEGER PRIMARY KEY,
+            ts TEXT NOT NULL,
+            indicator TEXT NOT NULL,
+            value TEXT,
+            source TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_samples_indicator_ts ON samples(indicator, ts);
+        CREATE TABLE IF NOT EXISTS indicators (
+            name TEXT PRIMARY KEY,
+            first_ts TEXT,
+            last_ts TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """
+    )
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open the store, creating it and importing legacy YAML history on first use."""
+    path = path or store_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass
+    _create_schema(conn)
+    if not _legacy_imported(conn):
+        # Take the write lock and re-check: another process may have imported
+        # between our read and now.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if _legacy_imported(conn):
+                conn.commit()
+            else:
+                import_legacy(conn)
+        except BaseException:
+            conn.rollback()
+            conn.close()
+            raise
+    return conn
+
+
+def _legacy_imported(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM meta WHERE key = ?", (LEGACY_IMPORT_KEY,)).fetchone() is not None
+
+
+def _insert(conn: sqlite3.Connection, ts: str, indicator: str, value: Any, source: Optional[str]) -> None:
+    value = None if value is None else str(value)
+    conn.execute(
+        "INSERT INTO samples (ts, indicator, value, source) VALUES (?, ?, ?, ?)",
+        (ts, indicator, value, source),
+    )
+    conn.execute(
+        """
+        INSERT INTO indicators (name, first_ts, last_ts) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            first_ts = MIN(first_ts, excluded.first_ts),
+            last_ts = MAX(last_ts, excluded.last_ts)
+        """,
+        (indicator, ts, ts),
+    )
+
+
+def record(changes: Dict[str, Any], when: Any = None, source: str = "status") -> int:
+    """Append one sample per indicator in `changes`. Returns the number written."""
+    ts = _ts(when)
+    rows = {str(k): v for k, v in (changes or {}).items() if str(k).strip()}
+    if not rows:
+        return 0
+    conn = connect()
+    try:
+        with conn:
+            for indicator, value in rows.items():
+                _insert(conn, ts, indicator, value, source)
+    finally:
+        conn.close()
+    try:
+        from modules import op_journal
+        op_journal.record_effect("status_history", {"ts": ts, "source": source, "changes": rows},
+                                 label=f"status: {', '.join(rows)}")
+    except Exception:
+        pass
+    return len(rows)
+
+
+def undo_effect(payload: Dict[str, Any]) -> None:
+    """Delete the samples a journaled `record` wrote and refresh those indicators' bounds."""
+    ts, source = payload.get("ts"), payload.get("source")
+    conn = connect()
+    try:
+        with conn:
+            for indicator, value in (payload.get("changes") or {}).items():
+                value = None if value is None else str(value)
+                conn.execute(
+                    """
+                    DELETE FROM samples WHERE id = (
+                        SELECT id FROM samples
+                        WHERE ts = ? AND indicator = ? AND value IS ? AND source IS ?
+                        ORDER BY id DESC LIMIT 1)
+                    """,
+                    (ts, indicator, value, source),
+                )
+                bounds = conn.execute(
+                    "SELECT MIN(ts), MAX(ts) FROM samples WHERE indicator = ?", (indicator,)
+                ).fetchone()
+                if bounds[0] is None:
+                    conn.execute("DELETE FROM indicators WHERE name = ?", (indicator,))
+                else:
+                    conn.execute(
+                        "UPDATE indicators SET first_ts = ?, last_ts = ? WHERE name = ?",
+                        (bounds[0], bounds[1], indicator),
+                    )
+    finally:
+        conn.close()
+
+
+def redo_effect(payload: Dict[str, Any]) -> None:
+    record(payload.get("changes") or {}, payload.get("ts"), payload.get("source"))
+
+
+def import_legacy(conn: sqlite3.Connection, dirs: Optional[Iterable[str]] = None) -> int:
+    """
+    One-time import of dated status YAML (full snapshots per change). Only
+    indicator values that differ from the previous snapshot become samples.
+    Commits on return; `connect` calls it inside its BEGIN IMMEDIATE.
+    """
+    files: Dict[str, str] = {}
+    for directory in dirs or _legacy_dirs():
+        for path in glob.glob(os.path.join(directory, "status_*.y*ml")):
+            match = _LEGACY_NAME_RE.search(os.path.basename(path))
+            if match:
+                files.setdefault(match.group(1), path)
+    last: Dict[str, Any] = {}
+    count = 0
+    with conn:
+        for date_str in sorted(files):
+            try:
+                with open(files[date_str], "r", encoding="utf-8") as fh:
+                    data = yaml.safe_load(fh) or {}
+            except Exception:
+                continue
+            entries = data.get("entries") if isinstance(data, dict) else None
+            if not isinstance(entries, list):
+                continue
+            for entry in sorted((e for e in entries if isinstance(e, dict)), key=lambda e: str(e.get("at") or "")):
+                status = entry.get("status")
+                if not isinstance(status, dict):
+                    continue
+                ts = f"{date_str}T{str(entry.get('at') or '00:00:00')[:8]}"
+                for indicator, value in status.items():
+                    indicator = str(indicator)
+                    if indicator in last and last[indicator] == value:
+                        continue
+                    last[indicator] = value
+                    _insert(conn, ts, indicator, value, "legacy")
+                    count += 1
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (LEGACY_IMPORT_KEY, f"{datetime.now().isoformat(timespec='seconds')} ({count} samples)"),
+        )
+    return count
+
+
+def _indicator_names(conn: sqlite3.Connection, indicators: Optional[Iterable[str]]) -> List[str]:
+    if indicators:
+        return [str(i) for i in indicators if str(i).strip()]
+    return [row["name"] for row in conn.execute("SELECT name FROM indicators ORDER BY name")]
+
+
+def _value_at(conn: sqlite3.Connection, indicator: str, ts: str) -> Optional[sqlite3.Row]:
+    return conn.execute(
+        "SELECT ts, value FROM samples WHERE indicator = ? AND ts <= ? ORDER BY ts DESC, id DESC LIMIT 1",
+        (indicator, ts),
+    ).fetchone()
+
+
+def latest_at(when: Any = None, indicators: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Value of each indicator at `when` (default now); indicators never set before it are omitted."""
+    ts = _ts(when)
+    conn = connect()
+    try:
+        out = {}
+        for indicator in _indicator_names(conn, indicators):
+            row = _value_at(conn, indicator, ts)
+            if row is not None:
+                out[indicator] = row["value"]
+        return out
+    finally:
+        conn.close()
+
+
+def history(start: Any, end: Any = None, indicators: Optional[Iterable[str]] = None,
+            include_prior: bool = False) -> List[Dict[str, Any]]:
+    """
+    Samples with start <= ts <= end, oldest first. With `include_prior`, each
+    indicator's value in effect at `start` is included (at its original ts).
+    """
+    start_ts, end_ts = _ts(start), _ts(end)
+    conn = connect()
+    try:
+        out: List[Dict[str, Any]] = []
+        for indicator in _indicator_names(conn, indicators):
+            if include_prior:
+                prior = conn.execute(
+                    "SELECT ts, value FROM samples WHERE indicator = ? AND ts < ? ORDER BY ts DESC, id DESC LIMIT 1",
+                    (indicator, start_ts),
+                ).fetchone()
+                if prior is not None:
+                    out.append({"at": prior["ts"], "indicator": indicator, "value": prior["value"]})
+            for row in conn.execute(
+                "SELECT ts, value FROM samples WHERE indicator = ? AND ts BETWEEN ? AND ? ORDER BY ts, id",
+                (indicator, start_ts, end_ts),
+            ):
+                out.append({"at": row["ts"], "indicator": indicator, "value": row["value"]})
+        out.sort(key=lambda r: r["at"])
+        return out
+    finally:
+        conn.close()
+
+
+def downsample(indicator: str, start: Any, end: Any = None, bucket_minutes: int = 60) -> List[Dict[str, Any]]:
+    """
+    Buckets of `bucket_minutes` over [start, end): the value held for the most
+    time in each bucket (`value`), the value at its end (`last`) and how many
+    changes fell inside it.
+    """
+    start_dt = datetime.fromisoformat(_ts(start))
+    end_dt = datetime.fromisoformat(_ts(end))
+    step = timedelta(minutes=max(1, int(bucket_minutes or 60)))
+    changes = [
+        (datetime.fromisoformat(row["at"]), row["value"])
+        for row in history(start_dt, end_dt, [indicator], include_prior=True)
+    ]
+    buckets: List[Dict[str, Any]] = []
+    idx = 0
+    current = None
+    while idx < len(changes) and changes[idx][0] <= start_dt:
+        current = changes[idx][1]
+        idx += 1
+    bucket_start = start_dt
+    while bucket_start < end_dt:
+        bucket_end = min(bucket_start + step, end_dt)
+        held: Dict[Any, float] = {}
+        cursor = bucket_start
+        count = 0
+        while idx < len(changes) and changes[idx][0] < bucket_end:
+            at, value = changes[idx]
+            if current is not None:
+                held[current] = held.get(current, 0.0) + (at - cursor).total_seconds()
+            cursor, current = at, value
+            count += 1
+            idx += 1
+        if current is not None:
+            held[current] = held.get(current, 0.0) + (bucket_end - cursor).total_seconds()
+        buckets.append({
+            "start": bucket_start.isoformat(timespec="seconds"),
+            "end": bucket_end.isoformat(timespec="seconds"),
+            "value": max(held, key=held.get) if held else None,
+            "last": current,
+            "changes": count,
+        })
+        bucket_start = bucket_end
+    return buckets
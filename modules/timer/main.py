@@ -518,13 +518,18 @@ def _log_to_bound_item(st, seconds: int):
         t = bound.get('type'); n = bound.get('name')
         if not t or not n:
             return
+        minutes = max(1, seconds // 60)
+        from utilities.tracking import HISTORY_TYPES, record_session
+        if str(t).lower() in HISTORY_TYPES:
+            # Session history lives in the tracking store; the item keeps totals.
+            record_session(t, n, minutes, source='timer')
+            return
         data = read_item_data(t, n) or {}
         # minimal ensure fields
         if 'sessions' not in data or data.get('sessions') is None:
             data['sessions'] = []
         if 'totals' not in data or data.get('totals') is None:
             data['totals'] = {'sessions': 0, 'minutes': 0}
-        minutes = max(1, seconds // 60)
         data['sessions'].append({'date': _now_str(), 'minutes': minutes, 'source': 'timer'})
         data['totals']['sessions'] = int(data['totals'].get('sessions', 0)) + 1
         data['totals']['minutes'] = int(data['totals'].get('minutes', 0)) + minutes
@@ -653,7 +658,7 @@ def _record_schedule_completion(block, status: str = "completed"):
     scheduled_start = block.get("start") or block.get("scheduled_start")
     scheduled_end = block.get("end") or block.get("scheduled_end")
     try:
-        from commands.today import load_completion_payload
+        from commands.today import load_completion_payload, save_completion_payload
         from modules.scheduler import build_block_key
         schedule_date = str(block.get("date") or datetime.now().strftime("%Y-%m-%d"))
         completion_data, completion_path = load_completion_payload(schedule_date)
@@ -667,8 +672,7 @@ def _record_schedule_completion(block, status: str = "completed"):
             "logged_at": datetime.now().isoformat(timespec="seconds"),
         }
         entries[block_key] = entry
-        with open(completion_path, "w") as fh:
-            yaml.dump(completion_data, fh, default_flow_style=False, sort_keys=False)
+        save_completion_payload(completion_data, completion_path)
     except Exception:
         return
 
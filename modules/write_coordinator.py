@@ -0,0 +1,460 @@
+"""
+Coordinated YAML writes shared by every process that mutates user data.
+
+The dashboard's threads, the listener, timers and console sessions all
+rewrite item, schedule, completion and status YAML. A bare
+`open(path, 'w')` + `yaml.dump` lets concurrent writers interleave (torn
+files) and silently drops whichever update lands first. This module puts
+three things in front of those writes:
+
+- Locking and atomicity: every commit holds an advisory lock for the target
+  file (a lock file under user/temp/locks, `flock` / `msvcrt.locking`) and
+  replaces the file via a temp file + `os.replace`, so readers only ever see
+  a complete old or new document.
+- Coalescing: writes to the same file within a process queue up behind the
+  commit in flight and are folded into one document, one file write and one
+  commit hook (e.g. the core-DB upsert) instead of one each.
+- Conflict detection: `read_yaml` remembers, per thread, the file version
+  (a digest of the bytes it parsed) and those bytes; the document it read is
+  only re-parsed from them if a merge is needed. When a later write from
+  that thread finds a different version on disk, its changes are re-applied
+  key by key on top of the current document; keys both sides changed are
+  reported as conflicts (this writer wins, or `WriteConflictError` with
+  `strict=True`).
+
+`update_yaml` is the read-modify-write form: the callback sees the current
+document under the lock, so nothing it does can be lost.
+"""
+
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
+try:
+    import msvcrt  # type: ignore
+except ImportError:
+    msvcrt = None  # type: ignore
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LOCK_DIR = os.path.join(ROOT_DIR, "user", "temp", "locks")
+LOCK_TIMEOUT_SECONDS = 30.0
+READ_BASES_PER_THREAD = 256
+
+Version = str
+
+
+class WriteConflictError(Exception):
+    """A strict write found keys changed on disk since this thread read them."""
+
+    def __init__(self, path: str, keys: List[str]):
+        super().__init__(f"Concurrent change to {', '.join(keys)} in {path}")
+        self.path = path
+        self.keys = keys
+
+
+def file_version(path: str) -> Optional[Version]:
+    # Content digest rather than mtime/size/inode: replaced files reuse
+    # inodes and mtime granularity is coarse on some filesystems.
+    return _read(path)[0]
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+# Inter-process lock --------------------------------------------------------
+
+_held = threading.local()
+
+
+def after_unlock(fn: Callable[[], None]) -> None:
+    """
+    Run `fn()` once this thread holds no file lock (right away if it holds
+    none). For follow-up work such as the journal insert that should not
+    keep other writers waiting.
+    """
+    if getattr(_held, "depth", 0):
+        _held.deferred.append(fn)
+        return
+    fn()
+
+
+def _run_deferred() -> None:
+    while _held.deferred:
+        fn = _held.deferred.pop(0)
+        try:
+            fn()
+        except Exception:
+            pass
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = LOCK_TIMEOUT_SECONDS):
+    """Exclusive advisory lock for `path`, shared by every Chronos process."""
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    digest = hashlib.sha1(_key(path).encode("utf-8")).hexdigest()[:24]
+    lock_path = os.path.join(LOCK_DIR, f"{digest}.lock")
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for write lock on {path}")
+                time.sleep(0.005)
+        if not getattr(_held, "depth", 0):
+            _held.depth, _held.deferred = 0, []
+        _held.depth += 1
+        try:
+            yield
+        finally:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+            _held.depth -= 1
+    finally:
+        os.close(fd)
+        if not getattr(_held, "depth", 0) and getattr(_held, "deferred", None):
+            _run_deferred()
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    """Write via a sibling temp file and os.replace (retried while Windows holds the target open)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        for attempt in range(50):
+            try:
+                os.replace(tmp, path)
+                return
+            except PermissionError:
+                if attempt == 49:
+                    raise
+                time.sleep(0.02)
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def _read_raw(path: str) -> Tuple[Optional[bytes], Optional[Version], Any]:
+    """(bytes, version, document) from one read of the file; all None if missing."""
+    try:
+        with open(path, "rb") as fh:
+            raw = fh.read()
+    except FileNotFoundError:
+        return None, None, None
+    return raw, hashlib.sha1(raw).hexdigest(), yaml.safe_load(raw.decode("utf-8"))
+
+
+def _read(path: str) -> Tuple[Optional[Version], Any]:
+    """(version, document) from one read of the file; (None, None) if missing."""
+    return _read_raw(path)[1:]
+
+
+# Commit observers ------------------------------------------------------------
+
+_OBSERVERS: List[Callable[[str, Optional[bytes], Optional[bytes]], None]] = []
+
+
+def add_commit_observer(fn: Callable[[str, Optional[bytes], Optional[bytes]], None]) -> None:
+    """
+    `fn(path, before, after)` runs under the file lock after every commit,
+    with the file's bytes before (None if it did not exist) and after. Keep
+    it cheap; slow work goes through `after_unlock`.
+    """
+    if fn not in _OBSERVERS:
+        _OBSERVERS.append(fn)
+
+
+def _notify(path: str, before: Optional[bytes], after: Optional[bytes]) -> None:
+    for fn in list(_OBSERVERS):
+        try:
+            fn(path, before, after)
+        except Exception:
+            pass
+
+
+# Per-thread read bases -------------------------------------------------------
+
+_local = threading.local()
+
+
+def _bases() -> "OrderedDict[str, Tuple[Optional[Version], Optional[bytes], Optional[Callable[[Any], Any]], Any]]":
+    bases = getattr(_local, "bases", None)
+    if bases is None:
+        bases = OrderedDict()
+        _local.bases = bases
+    return bases
+
+
+def remember_base(path: str, version: Optional[Version], raw: Optional[bytes],
+                  transform: Optional[Callable[[Any], Any]] = None, default: Any = None) -> None:
+    """Record what this thread last saw of `path`: its version and bytes (`default` if missing)."""
+    bases = _bases()
+    key = _key(path)
+    bases[key] = (version, raw, transform, copy.deepcopy(default) if raw is None else None)
+    bases.move_to_end(key)
+    while len(bases) > READ_BASES_PER_THREAD:
+        bases.popitem(last=False)
+
+
+def forget_base(path: str) -> None:
+    _bases().pop(_key(path), None)
+
+
+def _base_doc(raw: Optional[bytes], transform: Optional[Callable[[Any], Any]], default: Any) -> Any:
+    """The document a base was read as (parsed again; only needed to merge)."""
+    doc = default if raw is None else yaml.safe_load(raw.decode("utf-8"))
+    return transform(doc) if (transform is not None and doc is not None) else doc
+
+
+def read_yaml(path: str, default: Any = None, transform: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Load `path` and remember its version for this thread, so a later
+    write_yaml from the same thread can detect changes made in between.
+    `transform` (e.g. key lowercasing) is applied to the returned data and
+    to the on-disk document when merging.
+    """
+    raw, version, data = _read_raw(path)
+    if data is None:
+        data = default
+    if transform is not None and data is not None:
+        data = transform(data)
+    remember_base(path, version, raw, transform, default)
+    return data
+
+
+# Merging ---------------------------------------------------------------------
+
+_MISSING = object()
+
+
+def _merge(base: Any, ours: Any, theirs: Any, prefix: str = "") -> Tuple[Any, List[str]]:
+    """
+    Apply ours-vs-base changes on top of theirs, descending into nested
+    mappings (so two writers adding different completion entries both land).
+    Returns (doc, conflicting key paths).
+    """
+    if not (isinstance(base, dict) and isinstance(ours, dict) and isinstance(theirs, dict)):
+        if theirs == base or theirs == ours:
+            return ours, []
+        return ours, [prefix.rstrip(".") or "<document>"]
+    merged = dict(theirs)
+    conflicts: List[str] = []
+    for key in list(base) + [k for k in ours if k not in base]:
+        mine = ours.get(key, _MISSING)
+        old = base.get(key, _MISSING)
+        if mine == old:
+            continue
+        current = theirs.get(key, _MISSING)
+        if old is _MISSING and isinstance(mine, dict) and isinstance(current, dict):
+            old = {}  # both sides created the mapping: merge their entries
+        if isinstance(mine, dict) and isinstance(old, dict) and isinstance(current, dict):
+            merged[key], nested = _merge(old, mine, current, f"{prefix}{key}.")
+            conflicts.extend(nested)
+            continue
+        if current != old and current != mine:
+            conflicts.append(f"{prefix}{key}")
+        if mine is _MISSING:
+            merged.pop(key, None)
+        else:
+            merged[key] = mine
+    return merged, conflicts
+
+
+# Coalescing queue ------------------------------------------------------------
+
+class _Op:
+    __slots__ = ("data", "update", "base", "strict", "on_commit", "dump_kwargs",
+                 "error", "conflicts", "result", "done")
+
+    def __init__(self, data=None, update=None, base=None, strict=False, on_commit=None, dump_kwargs=None):
+        self.data = data
+        self.update = update
+        self.base = base
+        self.strict = strict
+        self.on_commit = on_commit
+        self.dump_kwargs = dump_kwargs or {}
+        self.error: Optional[BaseException] = None
+        self.conflicts: List[str] = []
+        self.result: Tuple[Optional[Version], Any, Optional[bytes]] = (None, None, None)
+        self.done = False
+
+
+class _PathQueue:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.ops: List[_Op] = []
+        self.flushing = False
+
+
+_QUEUES: Dict[str, _PathQueue] = {}
+_QUEUES_LOCK = threading.Lock()
+_STATS = {"ops": 0, "commits": 0, "conflicts": 0}
+
+
+def stats() -> Dict[str, int]:
+    """Counters since import: queued operations, file commits, conflicting writes."""
+    with _QUEUES_LOCK:
+        return dict(_STATS)
+
+
+def _queue_for(path: str) -> _PathQueue:
+    key = _key(path)
+    with _QUEUES_LOCK:
+        queue = _QUEUES.get(key)
+        if queue is None:
+            queue = _PathQueue()
+            _QUEUES[key] = queue
+        return queue
+
+
+def _submit(path: str, op: _Op) -> Tuple[Optional[Version], Any, Optional[bytes]]:
+    """
+    Queue `op` for `path`. The first thread to find no commit in flight takes
+    everything queued so far and commits it as one batch; the others wait for
+    it (or take the next batch).
+    """
+    queue = _queue_for(path)
+    with queue.cond:
+        queue.ops.append(op)
+        while not op.done and queue.flushing:
+            queue.cond.wait()
+        batch = None
+        if not op.done:
+            batch, queue.ops = queue.ops, []
+            queue.flushing = True
+    if batch is not None:
+        try:
+            _flush(path, batch)
+        finally:
+            with queue.cond:
+                for pending in batch:
+                    pending.done = True
+                queue.flushing = False
+                queue.cond.notify_all()
+    if op.error is not None:
+        raise op.error
+    return op.result
+
+
+def _flush(path: str, batch: List[_Op]) -> None:
+    try:
+        with file_lock(path):
+            before, version, doc = _read_raw(path)
+            applied: List[_Op] = []
+            for op in batch:
+                try:
+                    doc = _apply(path, op, doc, version if not applied else _MISSING)
+                    applied.append(op)
+                except Exception as e:  # reported to that caller only
+                    op.error = e
+            if not applied:
+                return
+            text = yaml.dump(doc, **applied[-1].dump_kwargs)
+            atomic_write_text(path, text)
+            after = text.encode("utf-8")
+            version = hashlib.sha1(after).hexdigest()
+            _notify(path, before, after)
+            with _QUEUES_LOCK:
+                _STATS["ops"] += len(batch)
+                _STATS["commits"] += 1
+            # Same file, same item: the newest hook sees the final document.
+            hook = next((op.on_commit for op in reversed(applied) if op.on_commit is not None), None)
+            if hook is not None:
+                try:
+                    hook(doc)
+                except Exception:
+                    pass
+            for op in applied:
+                op.result = (version, doc, after)
+    except Exception as e:
+        for op in batch:
+            if op.error is None:
+                op.error = e
+
+
+def _apply(path: str, op: _Op, doc: Any, version: Any) -> Any:
+    """Fold one operation into `doc`. `version` is _MISSING once earlier ops in the batch changed doc."""
+    if op.update is not None:
+        current = copy.deepcopy(doc)
+        updated = op.update(current)
+        return current if updated is None else updated
+    if op.base is None:
+        return op.data
+    base_version, base_raw, transform, base_default = op.base
+    if doc is None or (version is not _MISSING and base_version == version):
+        # Unchanged since this thread's read, or gone: nothing to merge with.
+        return op.data
+    theirs = transform(doc) if (transform is not None and doc is not None) else doc
+    merged, conflicts = _merge(_base_doc(base_raw, transform, base_default), op.data, theirs)
+    if conflicts:
+        with _QUEUES_LOCK:
+            _STATS["conflicts"] += 1
+        op.conflicts = conflicts
+        if op.strict:
+            raise WriteConflictError(path, conflicts)
+        try:
+            from modules.logger import Logger
+            Logger.warn(f"Write conflict on {path}: {', '.join(conflicts)} changed concurrently; keeping this write.")
+        except Exception:
+            pass
+    return merged
+
+
+def write_yaml(path: str, data: Any, strict: bool = False,
+               on_commit: Optional[Callable[[Any], None]] = None, **dump_kwargs) -> Any:
+    """
+    Commit `data` to `path`. If this thread read the file with read_yaml and
+    it changed since, the changes are merged (see module docstring).
+    `on_commit(doc)` runs under the file lock after the file is replaced.
+    """
+    base = _bases().get(_key(path))
+    op = _Op(data=data, base=base, strict=strict, on_commit=on_commit, dump_kwargs=dump_kwargs)
+    version, _doc, raw = _submit(path, op)
+    remember_base(path, version, raw, base[2] if base else None)
+
+
+def update_yaml(path: str, update: Callable[[Any], Any],
+                on_commit: Optional[Callable[[Any], None]] = None, **dump_kwargs) -> Any:
+    """
+    Read-modify-write under the lock: `update(doc)` gets the current document
+    (None if the file is missing), mutates it or returns a replacement.
+    Returns a copy of the committed document.
+    """
+    op = _Op(update=update, on_commit=on_commit, dump_kwargs=dump_kwargs)
+    _version, doc, _raw = _submit(path, op)
+    # Any read base this thread holds stays as it was: a later write_yaml of
+    # that (now stale) data merges instead of undoing this update.
+    return copy.deepcopy(doc)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Benchmark serial vs parallel WeeklyGenerator horizons on a synthetic library.
+
+Builds a throwaway user dir (core.db with N executable items + commitments,
+one windowed day template), points the scheduler modules at it, and times
+`generate_skeleton` for 7/30/90 days with `workers=1` and with a process pool.
+Each parallel result is checked against the serial one (minus `generated_at`).
+
+    python scripts/bench_weekly_horizon.py [--items 2000] [--days 7,30,90] [--workers N]
+
+Worker processes inherit the redirected user dir through `fork`; on platforms
+without it the parallel column is skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import yaml  # noqa: E402
+
+from commands import today as Today  # noqa: E402
+import modules.item_manager as item_manager  # noqa: E402
+import modules.scheduler as scheduler_pkg  # noqa: E402
+import modules.scheduler.v1 as scheduler_v1  # noqa: E402
+from modules.scheduler.weekly_generator import WeeklyGenerator  # noqa: E402
+
+TYPES = ("task", "habit", "subroutine", "microroutine")
+CATEGORIES = ("work", "health", "home", "learning", "admin")
+PRIORITIES = ("low", "medium", "high")
+
+
+def build_library(user_dir: Path, items: int, seed: int) -> None:
+    rng = random.Random(seed)
+    (user_dir / "data").mkdir(parents=True)
+    (user_dir / "days").mkdir()
+    (user_dir / "settings").mkdir()
+    template = {
+        "name": "Bench Day",
+        "type": "day",
+        "children": [
+            {"name": "Morning", "window": True, "start": "08:00", "end": "12:00"},
+            {"name": "Afternoon", "window": True, "start": "13:00", "end": "18:00"},
+            {"name": "Evening", "window": True, "start": "19:00", "end": "22:00"},
+        ],
+    }
+    with open(user_dir / "days" / "bench_day.yml", "w", encoding="utf-8") as fh:
+        yaml.safe_dump(template, fh, sort_keys=False)
+
+    conn = sqlite3.connect(user_dir / "data" / "chronos_core.db")
+    conn.execute(
+        """
+        CREATE TABLE items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slug TEXT UNIQUE, name TEXT, type TEXT, category TEXT, status TEXT,
+            priority TEXT, due_date TEXT, duration_minutes INTEGER, points_value REAL,
+            tags TEXT, path TEXT, relative_path TEXT, created_at TEXT, updated_at TEXT,
+            raw_json TEXT
+        )
+        """
+    )
+    rows = []
+    for idx in range(items):
+        item_type = TYPES[idx % len(TYPES)]
+        name = f"Bench {item_type} {idx:05d}"
+        duration = rng.choice((10, 15, 20, 30, 45, 60, 90))
+        raw = {
+            "name": name,
+            "type": item_type,
+            "category": rng.choice(CATEGORIES),
+            "priority": rng.choice(PRIORITIES),
+            "duration": f"{duration}m",
+            "frequency": rng.choice(("daily", "weekly", None)),
+            "notes": "lorem ipsum " * rng.randint(5, 40),
+            "tags": [rng.choice(CATEGORIES) for _ in range(3)],
+        }
+        rows.append(
+            (
+                name.lower().replace(" ", "_"), name, item_type, raw["category"], "pending",
+                raw["priority"], None, duration, json.dumps(raw),
+            )
+        )
+    for idx in range(max(1, items // 100)):
+        name = f"Bench commitment {idx:03d}"
+        raw = {"name": name, "type": "commitment", "frequency": {"times": 3, "period": "week"}}
+        rows.append((name.lower().replace(" ", "_"), name, "commitment", None, "active", None, None, None, json.dumps(raw)))
+    conn.executemany(
+        "INSERT INTO items (slug, name, type, category, status, priority, due_date, duration_minutes, raw_json) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def point_scheduler_at(user_dir: Path) -> None:
+    for module in (item_manager, scheduler_pkg, scheduler_v1, Today):
+        module.USER_DIR = str(user_dir)
+
+
+def timed(gen: WeeklyGenerator, days: int, workers: int) -> tuple[float, dict]:
+    started = time.perf_counter()
+    payload = gen.generate_skeleton(days=days, start_date=date(2026, 1, 5), workers=workers)
+    return time.perf_counter() - started, payload
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--days", default="7,30,90")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if can_fork:
+        multiprocessing.set_start_method("fork", force=True)
+
+    tmp = Path(tempfile.mkdtemp(prefix="chronos_bench_"))
+    try:
+        user_dir = tmp / "user"
+        build_library(user_dir, args.items, args.seed)
+        point_scheduler_at(user_dir)
+        gen = WeeklyGenerator(user_context={"ignore_trends": True})
+        print(f"items={args.items} workers={args.workers} cpus={os.cpu_count()}")
+        print(f"{'days':>5} {'serial_s':>10} {'parallel_s':>11} {'speedup':>8} {'match':>6}")
+        for days in [int(d) for d in args.days.split(",") if d.strip()]:
+            serial_s, serial = timed(gen, days, 1)
+            if not can_fork:
+                print(f"{days:>5} {serial_s:>10.2f} {'n/a':>11} {'n/a':>8} {'n/a':>6}")
+                continue
+            parallel_s, parallel = timed(gen, days, args.workers)
+            serial.pop("generated_at", None)
+            parallel.pop("generated_at", None)
+            match = "yes" if serial == parallel else "NO"
+            print(f"{days:>5} {serial_s:>10.2f} {parallel_s:>11.2f} {serial_s / max(parallel_s, 1e-9):>7.2f}x {match:>6}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
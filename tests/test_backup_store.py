@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from modules import backup_store as Store
+
+
+class TestBackupStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmp, "root")
+        self.user = os.path.join(self.root, "user")
+        self.store = os.path.join(self.user, "backups", "store")
+        os.makedirs(os.path.join(self.user, "tasks"))
+        self._write("tasks/a.yml", "name: A\n")
+        self._write("tasks/b.yml", "name: B\n")
+        self._write("backups/old.zip", "zip bytes")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, rel, text):
+        path = os.path.join(self.user, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def _snap(self, label=None):
+        return Store.create_snapshot(label, source_dir=self.user, store_dir=self.store, root_dir=self.root)
+
+    def test_incremental_snapshots_and_restore(self):
+        first = self._snap("first")
+        self.assertEqual(first["stats"]["files"], 2)
+        self.assertEqual(first["stats"]["hashed"], 2)
+
+        second = self._snap()
+        self.assertEqual((second["stats"]["reused"], second["stats"]["hashed"]), (2, 0))
+
+        time.sleep(0.01)
+        self._write("tasks/b.yml", "name: B\nstatus: done\n")
+        self._write("tasks/c.yml", "name: A\n")  # same content as a.yml
+        third = self._snap()
+        self.assertEqual(third["stats"]["hashed"], 2)
+        self.assertEqual(third["stats"]["chunks_new"], 1)
+
+        dest = os.path.join(self.tmp, "restored")
+        counts = Store.restore_snapshot(first["id"], dest_root=dest, store_dir=self.store)
+        self.assertEqual(counts["restored"], 2)
+        with open(os.path.join(dest, "user", "tasks", "b.yml"), encoding="utf-8") as fh:
+            self.assertEqual(fh.read(), "name: B\n")
+        self.assertFalse(os.path.exists(os.path.join(dest, "user", "backups")))
+        again = Store.restore_snapshot(first["id"], dest_root=dest, store_dir=self.store)
+        self.assertEqual(again["unchanged"], 2)
+
+    def test_verify_detects_corruption_and_prune_collects_chunks(self):
+        first = self._snap()
+        self._write("tasks/a.yml", "name: A changed\n")
+        os.utime(os.path.join(self.user, "tasks", "a.yml"), (1, 1))
+        second = self._snap()
+        self.assertTrue(Store.verify(store_dir=self.store)["ok"])
+
+        result = Store.prune(keep_last=1, store_dir=self.store)
+        self.assertEqual(result["snapshots_removed"], [first["id"]])
+        self.assertEqual(result["chunks_removed"], 1)
+        self.assertEqual([s["id"] for s in Store.list_snapshots(self.store)], [second["id"]])
+
+        manifest = Store.load_manifest("latest", self.store)
+        digest = manifest["files"]["user/tasks/a.yml"]["chunks"][0]
+        with open(Store._object_path(self.store, digest), "wb") as fh:
+            fh.write(b"garbage")
+        report = Store.verify("latest", store_dir=self.store)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["problems"][0]["path"], "user/tasks/a.yml")
+
+
+if __name__ == "__main__":
+    unittest.main()
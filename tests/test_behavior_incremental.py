@@ -0,0 +1,190 @@
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from modules.sequence import behavior_builder, trends_builder
+
+
+def _schedule(day, idx, rng):
+    start = f"{day}T{8 + idx:02d}:00:00"
+    return {
+        "schedule_date": day,
+        "name": f"Block {idx}",
+        "type": "task",
+        "item_slug": f"task_{idx}",
+        "item_type": "task",
+        "parent_slug": None,
+        "block_key": f"{day}|block_{idx}",
+        "start_time": start,
+        "end_time": f"{day}T{8 + idx:02d}:45:00",
+        "duration_minutes": 45,
+        "status": rng.choice(["pending", "completed", "in_progress"]),
+        "importance_score": rng.random(),
+        "is_parallel": 0,
+        "depth": 0,
+        "order_index": idx,
+        "raw_json": "{}",
+    }
+
+
+def _completion(row, rng, logged):
+    delay = rng.randint(-15, 40)
+    hour = int(row["start_time"][11:13])
+    minute = 30 + delay if delay < 30 else 59
+    actual = f"{row['schedule_date']}T{hour:02d}:{max(0, min(59, minute)):02d}:00"
+    payload = {"status": "completed", "quality": rng.choice([None, "3", "4", "5"])}
+    if rng.random() < 0.3:
+        payload["mood"] = "good"
+    return {
+        "block_key": row["block_key"],
+        "source_date": row["schedule_date"],
+        "name": row["name"],
+        "item_slug": row["item_slug"],
+        "item_type": "task",
+        "status": rng.choice(["completed", "skipped", "partial"]),
+        "quality": payload["quality"],
+        "scheduled_start": row["start_time"],
+        "scheduled_end": row["end_time"],
+        "actual_start": actual,
+        "actual_end": None,
+        "logged_at": logged,
+        "note": None,
+        "raw_json": json.dumps(payload),
+    }
+
+
+def _habit(idx, rng):
+    bad = rng.random() < 0.3
+    data = {"name": f"Habit {idx}", "polarity": "bad" if bad else "good"}
+    if bad:
+        data["last_incident"] = (date.today() - timedelta(days=rng.randint(1, 30))).isoformat()
+    else:
+        data["current_streak"] = rng.randint(0, 20)
+        data["longest_streak"] = rng.randint(20, 40)
+        data["completion_dates"] = [date.today().isoformat()] if rng.random() < 0.5 else []
+    return {"slug": f"habit_{idx}", "name": data["name"], "raw_json": json.dumps(data)}
+
+
+class _History:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.schedules = []
+        self.completions = []
+        self.habits = {i: _habit(i, self.rng) for i in range(6)}
+        self.clock = 0
+        start = date(2026, 1, 5)
+        self.days = [(start + timedelta(days=d)).isoformat() for d in range(21)]
+        for day in self.days[:14]:
+            self._add_day(day)
+
+    def _add_day(self, day):
+        for idx in range(self.rng.randint(2, 6)):
+            row = _schedule(day, idx, self.rng)
+            self.schedules.append(row)
+            if self.rng.random() < 0.6:
+                self._complete(row)
+
+    def _complete(self, row):
+        self.clock += 1
+        self.completions.append(_completion(row, self.rng, f"2026-02-01T00:{self.clock // 60:02d}:{self.clock % 60:02d}"))
+
+    def mutate(self):
+        action = self.rng.choice(["complete", "new_day", "drop_day", "habit", "habit_drop", "reschedule"])
+        if action == "complete" and self.schedules:
+            self._complete(self.rng.choice(self.schedules))
+        elif action == "new_day":
+            used = {r["schedule_date"] for r in self.schedules}
+            free = [d for d in self.days if d not in used]
+            if free:
+                self._add_day(free[0])
+        elif action == "drop_day" and self.schedules:
+            day = self.rng.choice(self.schedules)["schedule_date"]
+            self.schedules = [r for r in self.schedules if r["schedule_date"] != day]
+        elif action == "habit":
+            idx = self.rng.randint(0, 8)
+            self.habits[idx] = _habit(idx, self.rng)
+        elif action == "habit_drop" and self.habits:
+            self.habits.pop(self.rng.choice(sorted(self.habits)))
+        elif action == "reschedule" and self.schedules:
+            row = self.rng.choice(self.schedules)
+            row["status"] = self.rng.choice(["pending", "completed", "missed"])
+
+    def core_data(self):
+        completions = sorted((dict(c) for c in self.completions), key=lambda c: c["logged_at"], reverse=True)
+        return {
+            "schedules": [dict(r) for r in self.schedules],
+            "completions": completions,
+            "habits": [self.habits[k] for k in sorted(self.habits)],
+        }
+
+
+def _dump(conn):
+    out = {}
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(activity_facts)") if r[1] != "id"]
+    out["facts"] = sorted(conn.execute(f"SELECT {', '.join(cols)} FROM activity_facts").fetchall(), key=repr)
+    for table in ("daily_rollup", "weekly_rollup", "habit_facts"):
+        out[table] = sorted(conn.execute(f"SELECT * FROM {table}").fetchall(), key=repr)
+    return out
+
+
+class TestBehaviorIncrementalParity(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_incremental_matches_full_rebuild_on_random_history(self):
+        for seed in range(4):
+            history = _History(seed)
+            inc_path = os.path.join(self.tmp, f"inc_{seed}.db")
+            inc = sqlite3.connect(inc_path)
+            first = behavior_builder.refresh_behavior(inc, history.core_data())
+            self.assertEqual(first["mode"], "full")
+            for step in range(25):
+                for _ in range(history.rng.randint(1, 3)):
+                    history.mutate()
+                result = behavior_builder.refresh_behavior(inc, history.core_data())
+                inc.commit()
+                self.assertEqual(result["mode"], "incremental")
+
+                full_path = os.path.join(self.tmp, f"full_{seed}_{step}.db")
+                full = sqlite3.connect(full_path)
+                behavior_builder.refresh_behavior(full, history.core_data(), full=True)
+                full.commit()
+                self.assertEqual(_dump(inc), _dump(full), f"seed={seed} step={step}")
+
+                self.assertEqual(trends_builder._fetch_behavior_stats(inc_path), trends_builder._fetch_behavior_stats(full_path))
+                self.assertEqual(trends_builder._fetch_habit_stats(inc_path), trends_builder._fetch_habit_stats(full_path))
+                full.close()
+            inc.close()
+
+    def test_unchanged_history_touches_nothing(self):
+        history = _History(99)
+        conn = sqlite3.connect(os.path.join(self.tmp, "b.db"))
+        behavior_builder.refresh_behavior(conn, history.core_data())
+        again = behavior_builder.refresh_behavior(conn, history.core_data())
+        self.assertEqual((again["dates_changed"], again["habits_changed"]), (0, 0))
+        history._complete(history.schedules[0])
+        third = behavior_builder.refresh_behavior(conn, history.core_data())
+        self.assertEqual((third["dates_changed"], third["weeks_changed"]), (1, 1))
+        conn.close()
+
+    def test_trends_digest_skips_rewrite_when_sections_unchanged(self):
+        path = os.path.join(self.tmp, "trends.md")
+        stats = {"blocks_total": 3, "blocks_completed": 1, "quality_counts": {"4": 1}}
+        written, digests = trends_builder._write_digest(stats, None, path)
+        self.assertTrue(written)
+        written, _ = trends_builder._write_digest(dict(stats), digests, path)
+        self.assertFalse(written)
+        written, _ = trends_builder._write_digest(dict(stats, blocks_completed=2), digests, path)
+        self.assertTrue(written)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import json
+import queue
+import threading
+import time
+import unittest
+
+from utilities.console_pool import GLOBAL_LANE, ConsolePool, _Job, _LaneGate, classify_command
+
+
+class TestConsoleClassification(unittest.TestCase):
+    def test_reads_and_write_lanes(self):
+        self.assertEqual(classify_command("list", ["task"]), ("read", None))
+        self.assertEqual(classify_command("status", []), ("read", None))
+        self.assertEqual(classify_command("status", ["energy:high"]), ("write", "cmd:status"))
+        # The dashboard passes status changes as properties of a bare `status`.
+        self.assertEqual(classify_command("status", [], {"energy": "low"}), ("write", "cmd:status"))
+        self.assertEqual(classify_command("status", [], {"help": True}), ("read", None))
+        self.assertEqual(classify_command("status", ["history"], {"limit": 5}), ("read", None))
+        self.assertEqual(classify_command("new", ["task", "Write Report"]), ("write", "type:task"))
+        self.assertEqual(classify_command("delete", ["tasks", "Old"]), ("write", "type:task"))
+        self.assertEqual(classify_command("today", ["reschedule"]), ("write", GLOBAL_LANE))
+        self.assertEqual(classify_command("set", ["var", "x:1"]), ("write", "vars"))
+
+
+class TestLaneGate(unittest.TestCase):
+    def _job(self):
+        return _Job(1, "x", [], "write", None, timeout=5)
+
+    def test_same_lane_serializes_and_global_is_exclusive(self):
+        gate = _LaneGate()
+        self.assertTrue(gate.acquire("type:task", self._job()))
+        self.assertTrue(gate.acquire("type:note", self._job()))
+
+        blocked = _Job(2, "x", [], "write", "type:task", timeout=0.3)
+        self.assertFalse(gate.acquire("type:task", blocked))
+
+        order = []
+
+        def _global():
+            gate.acquire(GLOBAL_LANE, self._job())
+            order.append("global")
+            gate.release(GLOBAL_LANE)
+
+        t = threading.Thread(target=_global)
+        t.start()
+        time.sleep(0.2)
+        self.assertEqual(order, [])
+        gate.release("type:task")
+        gate.release("type:note")
+        t.join(timeout=5)
+        self.assertEqual(order, ["global"])
+
+
+class TestConsolePoolWorkers(unittest.TestCase):
+    def test_round_trip_captures_output_and_syncs_vars(self):
+        pool = ConsolePool(size=2)
+        try:
+            res = pool.run("echo", ["hello", "pool"], variables={"keep": "1"})
+            self.assertTrue(res["ok"])
+            self.assertEqual(res["stdout"], "hello pool")
+            res = pool.run("set", ["var", "pool_probe:42"], variables={"keep": "1"})
+            self.assertEqual(res["vars"].get("pool_probe"), "42")
+            self.assertEqual(res["vars"].get("keep"), "1")
+            metrics = pool.metrics()
+            self.assertEqual(metrics["totals"]["completed"], 2)
+            self.assertEqual(metrics["latency"]["echo"]["count"], 1)
+        finally:
+            pool.shutdown()
+
+    def test_run_line_uses_console_parser(self):
+        pool = ConsolePool(size=1)
+        try:
+            res = pool.run_line('echo "quoted words" plain')
+            self.assertTrue(res["ok"])
+            self.assertEqual(res["stdout"], "quoted words plain")
+            res = pool.run_line("set var line_probe:7")
+            self.assertEqual(res["vars"].get("line_probe"), "7")
+            self.assertEqual(classify_command("scripts/nightly.chs", []), ("write", GLOBAL_LANE))
+        finally:
+            pool.shutdown()
+
+    def test_input_does_not_consume_job_stream(self):
+        pool = ConsolePool(size=1)
+        try:
+            pool.run("pause", [])
+            res = pool.run("echo", ["still", "here"])
+            self.assertEqual(res["stdout"], "still here")
+        finally:
+            pool.shutdown()
+
+    def test_cancel_queued_write(self):
+        pool = ConsolePool(size=1)
+        job = _Job(0, "edit", [], "write", "type:task", timeout=5)
+        self.assertTrue(pool._gate.acquire("type:task", job))
+        try:
+            result = {}
+            t = threading.Thread(target=lambda: result.update(pool.run("new", ["task", "Pool Probe"], timeout=30)))
+            t.start()
+            deadline = time.time() + 5
+            while not pool.jobs() and time.time() < deadline:
+                time.sleep(0.02)
+            queued = pool.jobs()[0]
+            self.assertEqual((queued["state"], queued["lane"]), ("queued", "type:task"))
+            self.assertEqual(pool.metrics()["queue_depth"], 1)
+            self.assertTrue(pool.cancel(queued["id"]))
+            t.join(timeout=5)
+            self.assertFalse(result.get("ok"))
+            self.assertEqual(pool.metrics()["totals"]["cancelled"], 1)
+        finally:
+            pool._gate.release("type:task")
+            pool.shutdown()
+
+
+class _SlowWorker:
+    """Stands in for a worker process that is busy until a reply is pushed."""
+
+    def __init__(self):
+        self.replies = queue.Queue()
+        self.killed = False
+
+    def alive(self):
+        return not self.killed
+
+    def send(self, payload):
+        pass
+
+    def kill(self):
+        self.killed = True
+
+
+class TestConsolePoolTimeouts(unittest.TestCase):
+    def test_timed_out_write_is_detached_not_killed(self):
+        pool = ConsolePool(size=1)
+        worker = _SlowWorker()
+        pool._idle.get_nowait()
+        pool._idle.put(worker)
+
+        res = pool.run("backup", [], timeout=0.2)
+        self.assertFalse(res["ok"])
+        self.assertIn("still running", res["stderr"])
+        self.assertFalse(worker.killed)
+        self.assertEqual([(j["state"], j["lane"]) for j in pool.jobs()], [("detached", GLOBAL_LANE)])
+        self.assertEqual(pool.metrics()["detached"], 1)
+        # The global lane stays held until the command really ends.
+        self.assertFalse(pool._gate._allowed("type:task"))
+
+        worker.replies.put(json.dumps({"ok": True, "stdout": "done"}) + "\n")
+        deadline = time.time() + 5
+        while pool.jobs() and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(pool.jobs(), [])
+        self.assertTrue(pool._gate._allowed(GLOBAL_LANE))
+        self.assertFalse(worker.killed)
+        self.assertIs(pool._idle.get_nowait(), worker)
+
+    def test_cancel_kills_a_detached_job(self):
+        pool = ConsolePool(size=1)
+        worker = _SlowWorker()
+        pool._idle.get_nowait()
+        pool._idle.put(worker)
+
+        pool.run("today", ["reschedule"], timeout=0.1)
+        self.assertTrue(pool.cancel(pool.jobs()[0]["id"]))
+        deadline = time.time() + 5
+        while pool.jobs() and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertTrue(worker.killed)
+        self.assertEqual(pool.metrics()["totals"]["cancelled"], 1)
+        self.assertTrue(pool._gate._allowed(GLOBAL_LANE))
+
+
+if __name__ == "__main__":
+    unittest.main()
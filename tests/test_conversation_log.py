@@ -0,0 +1,162 @@
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Agents Dress Up Committee", "tools"))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+import conversation_log  # noqa: E402
+from conversation_log import ConversationLog  # noqa: E402
+
+
+def _turn(tid, familiar="nia", role="user", **extra):
+    return dict({"id": tid, "familiar": familiar, "role": role, "text": f"text {tid}"}, **extra)
+
+
+def _append_many(temp_dir, prefix, count):
+    log = ConversationLog(Path(temp_dir))
+    for i in range(count):
+        log.append_turn(_turn(f"{prefix}-{i}"))
+
+
+class ConversationLogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aduc_conv_"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_append_and_replay(self):
+        log = ConversationLog(self.tmp)
+        log.append_turn(_turn("u1", status="pending"))
+        log.append_turn(_turn("c1", role="cli", in_reply_to="u1"))
+        log.append_turn(_turn("u2", familiar="rex"))
+        log.update_turn("u1", status="answered")
+
+        # A second process only has the segment files to go on.
+        other = ConversationLog(self.tmp)
+        self.assertEqual([t["id"] for t in other.all_turns()], ["u1", "c1", "u2"])
+        self.assertEqual(other.get_turn("u1")["status"], "answered")
+        self.assertEqual(other.find_reply("u1")["id"], "c1")
+        self.assertEqual([t["id"] for t in other.history("nia")], ["u1", "c1"])
+        self.assertEqual(other.previous_ids("u2"), ["u1", "c1"])
+
+        self.assertEqual(other.forget_familiar("nia"), 2)
+        log.append_turn(_turn("u3", familiar="rex"))
+        self.assertEqual([t["id"] for t in log.all_turns()], ["u2", "u3"])
+        self.assertIsNone(log.find_reply("u1"))
+        # The forgotten text is gone from disk, not just from the index.
+        on_disk = b"".join(p.read_bytes() for p in self.tmp.glob("conversation/segment_*.jsonl"))
+        self.assertNotIn(b"text u1", on_disk)
+        self.assertNotIn(b"text c1", on_disk)
+        self.assertEqual([t["id"] for t in ConversationLog(self.tmp).all_turns()], ["u2", "u3"])
+
+    def test_forget_rolls_segments_and_drops_legacy_forget_records(self):
+        with mock.patch.object(conversation_log, "SEGMENT_BYTES", 200):
+            log = ConversationLog(self.tmp)
+            for i in range(4):
+                log.append_turn(_turn(f"n{i}"))
+                log.append_turn(_turn(f"r{i}", familiar="rex"))
+            # A `forget` record left by an older version of the log.
+            log._append({"op": "forget", "familiar": "nia"})
+            log.update_turn("n0", status="late")
+            log.append_turn(_turn("n9"))
+            self.assertEqual(log.forget_familiar("rex"), 4)
+        self.assertEqual([t["id"] for t in log.all_turns()], ["n9"])
+        on_disk = b"".join(p.read_bytes() for p in self.tmp.glob("conversation/segment_*.jsonl"))
+        self.assertEqual(on_disk.count(b"\n"), 1)
+
+    def test_legacy_import_runs_once_under_the_lock(self):
+        (self.tmp / "conversation.json").write_text('{"turns": [{"id": "old", "familiar": "nia"}]}', encoding="utf-8")
+        log = ConversationLog(self.tmp)
+        with mock.patch.object(log, "_acquire", wraps=log._acquire) as acquire:
+            self.assertEqual([t["id"] for t in log.all_turns()], ["old"])
+        acquire.assert_called_once()
+        self.assertTrue((self.tmp / "conversation.json.migrated").exists())
+        self.assertFalse(log.lock_path.exists())
+
+    def test_segment_rollover(self):
+        with mock.patch.object(conversation_log, "SEGMENT_BYTES", 200):
+            log = ConversationLog(self.tmp)
+            for i in range(6):
+                log.append_turn(_turn(f"t{i}"))
+        segments = log._segments()
+        self.assertGreater(len(segments), 1)
+        for seg in segments:
+            self.assertLessEqual((log.root / conversation_log._segment_name(seg)).stat().st_size, 200)
+        other = ConversationLog(self.tmp)
+        self.assertEqual([t["id"] for t in other.all_turns()], [f"t{i}" for i in range(6)])
+        self.assertEqual(other.get_turn("t5")["text"], "text t5")
+        self.assertEqual(other.cursor[0], segments[-1])
+
+    def test_snapshot_catch_up(self):
+        with mock.patch.object(conversation_log, "SNAPSHOT_EVERY", 3):
+            log = ConversationLog(self.tmp)
+            for i in range(4):
+                log.append_turn(_turn(f"t{i}"))
+        self.assertTrue(log.index_path.exists())
+        log.append_turn(_turn("t4"))
+
+        # A fresh reader starts from the snapshot and applies only what came after it.
+        other = ConversationLog(self.tmp)
+        with mock.patch.object(ConversationLog, "_apply", autospec=True,
+                               side_effect=ConversationLog._apply) as apply:
+            ids = [t["id"] for t in other.all_turns()]
+        self.assertEqual(ids, [f"t{i}" for i in range(5)])
+        self.assertEqual([c.args[1]["turn"]["id"] for c in apply.call_args_list], ["t3", "t4"])
+        self.assertEqual(other.turn_meta("t4")["n"], 5)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_concurrent_appenders(self):
+        ctx = multiprocessing.get_context("fork")
+        with mock.patch.object(conversation_log, "SEGMENT_BYTES", 2048):
+            procs = [ctx.Process(target=_append_many, args=(str(self.tmp), f"p{n}", 30)) for n in range(4)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join(30)
+        self.assertEqual([p.exitcode for p in procs], [0, 0, 0, 0])
+        log = ConversationLog(self.tmp)
+        ids = [t["id"] for t in log.all_turns()]
+        self.assertEqual(sorted(ids), sorted(f"p{n}-{i}" for n in range(4) for i in range(30)))
+        for n in range(4):
+            own = [i for i in ids if i.startswith(f"p{n}-")]
+            self.assertEqual(own, [f"p{n}-{i}" for i in range(30)])
+        self.assertGreater(len(log._segments()), 1)
+
+    def test_busy_lock_raises_instead_of_writing_unlocked(self):
+        log = ConversationLog(self.tmp)
+        log.append_turn(_turn("t0"))
+        log.lock_path.write_text("")
+        stop = threading.Event()
+
+        def hold():
+            # A live holder keeps touching the lock so it never looks stale.
+            while not stop.is_set():
+                os.utime(log.lock_path)
+                time.sleep(0.01)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        try:
+            with mock.patch.object(conversation_log, "LOCK_STALE_SECONDS", 0.1):
+                with self.assertRaises(TimeoutError):
+                    log.append_turn(_turn("t1"))
+        finally:
+            stop.set()
+            holder.join()
+        self.assertTrue(log.lock_path.exists())
+        log.lock_path.unlink()
+        self.assertEqual([t["id"] for t in ConversationLog(self.tmp).all_turns()], ["t0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+from utilities.dashboard import server
+
+
+class TestDashboardMediaIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        media = os.path.join(self.test_dir, "Media")
+        self.mp3_dir = os.path.join(media, "mp3")
+        self.patches = [
+            patch.object(server, "MEDIA_ROOT", media),
+            patch.object(server, "MP3_DIR", self.mp3_dir),
+            patch.object(server, "PLAYLIST_DIR", os.path.join(media, "playlists")),
+            patch.object(server, "MEDIA_INDEX_PATH", os.path.join(media, "media_index.json")),
+            patch.object(server, "_MEDIA_INDEX", {"loaded": False, "entries": {}, "building": False}),
+        ]
+        for p in self.patches:
+            p.start()
+        os.makedirs(self.mp3_dir)
+        self.reads = []
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.test_dir)
+
+    def _fake_id3(self, path):
+        self.reads.append(os.path.basename(path))
+        return {"artist": "Artist " + os.path.basename(path)}
+
+    def _touch(self, name, data=b"x"):
+        with open(os.path.join(self.mp3_dir, name), "wb") as fh:
+            fh.write(data)
+
+    def test_unchanged_tracks_are_not_reread(self):
+        self._touch("a.mp3")
+        self._touch("b.mp3")
+        with patch.object(server, "_read_id3_metadata", side_effect=self._fake_id3):
+            files = server._list_mp3_files()
+            self.assertEqual([f["file"] for f in files], ["a.mp3", "b.mp3"])
+            self.assertEqual(files[0]["artist"], "Artist a.mp3")
+            self.assertEqual(sorted(self.reads), ["a.mp3", "b.mp3"])
+
+            self.reads.clear()
+            server._list_mp3_files()
+            self.assertEqual(self.reads, [])
+
+            self._touch("b.mp3", b"longer")
+            os.remove(os.path.join(self.mp3_dir, "a.mp3"))
+            files = server._list_mp3_files()
+            self.assertEqual(self.reads, ["b.mp3"])
+            self.assertEqual([f["file"] for f in files], ["b.mp3"])
+
+    def test_index_persists_and_sidecar_changes_refresh(self):
+        self._touch("song.mp3")
+        with patch.object(server, "_read_id3_metadata", side_effect=self._fake_id3):
+            server._list_mp3_files()
+        server._MEDIA_INDEX.update({"loaded": False, "entries": {}})
+        with open(os.path.join(self.mp3_dir, "song.yml"), "w", encoding="utf-8") as fh:
+            fh.write("title: Custom\n")
+        self.reads.clear()
+        with patch.object(server, "_read_id3_metadata", side_effect=self._fake_id3):
+            files = server._list_mp3_files()
+        self.assertEqual(self.reads, [])
+        self.assertEqual(files[0]["title"], "Custom")
+
+    def test_large_first_scan_runs_in_background(self):
+        for i in range(server.MEDIA_INDEX_SYNC_LIMIT + 5):
+            self._touch(f"t{i:03d}.mp3")
+        with patch.object(server, "_read_id3_metadata", side_effect=self._fake_id3):
+            files = server._list_mp3_files()
+            self.assertEqual(len(files), server.MEDIA_INDEX_SYNC_LIMIT + 5)
+            deadline = time.time() + 5
+            while server._media_index_building() and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertFalse(server._media_index_building())
+            files = server._list_mp3_files()
+        self.assertTrue(all(f["artist"] for f in files))
+        self.assertTrue(os.path.exists(server.MEDIA_INDEX_PATH))
+
+
+if __name__ == "__main__":
+    unittest.main()
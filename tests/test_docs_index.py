@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from modules.sequence import docs_index as DocsIndex
+
+
+class TestDocsIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.docs_dir = os.path.join(self.test_dir, "docs")
+        os.makedirs(os.path.join(self.docs_dir, "agents", "skills", "demo"))
+        self.original = (DocsIndex.DOCS_DIR, DocsIndex.DOCS_INDEX_PATH)
+        DocsIndex.DOCS_DIR = self.docs_dir
+        DocsIndex.DOCS_INDEX_PATH = os.path.join(self.test_dir, "chronos_docs.db")
+        self._write("guide.md", "# Guide\nRun today reschedule after lunch.\nNothing else.\n")
+        self._write("agents/skills/demo/skill.md", "# Demo\nUse Sequence Sync nightly.\n")
+
+    def tearDown(self):
+        DocsIndex.DOCS_DIR, DocsIndex.DOCS_INDEX_PATH = self.original
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, rel, text):
+        path = os.path.join(self.docs_dir, rel)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def test_search_is_case_insensitive_substring(self):
+        hits = DocsIndex.search("sequence sync")
+        self.assertEqual([(h["path"], h["line"]) for h in hits], [("agents/skills/demo/skill.md", 2)])
+        hits = DocsIndex.search("ESCHED")
+        self.assertEqual(hits[0]["path"], "guide.md")
+        self.assertEqual(hits[0]["text"], "Run today reschedule after lunch.")
+
+    def test_short_query_and_prefix(self):
+        self.assertTrue(DocsIndex.search("no"))
+        self.assertEqual(DocsIndex.matching_paths("demo", prefix="agents/skills/"), ["agents/skills/demo/skill.md"])
+        self.assertEqual(DocsIndex.search("guide", prefix="agents/"), [])
+
+    def test_incremental_refresh(self):
+        first = DocsIndex.refresh_index()
+        self.assertEqual(first["added"], 2)
+        self.assertEqual(DocsIndex.refresh_index()["updated"], 0)
+        time.sleep(0.01)
+        self._write("guide.md", "# Guide\nBrand new wording here.\n")
+        stats = DocsIndex.refresh_index()
+        self.assertEqual((stats["updated"], stats["added"]), (1, 0))
+        self.assertEqual(DocsIndex.search("reschedule"), [])
+        self.assertTrue(DocsIndex.search("brand new"))
+        os.remove(os.path.join(self.docs_dir, "guide.md"))
+        self.assertEqual(DocsIndex.refresh_index()["removed"], 1)
+        self.assertEqual(DocsIndex.list_paths(), ["agents/skills/demo/skill.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from unittest import mock
+
+from commands import quickwins
+from modules import due_index
+from modules import item_manager
+
+
+class DueIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_due_")
+        self._orig_root = item_manager.ROOT_DIR
+        self._orig_user_dir = item_manager.USER_DIR
+        self._orig_hook = item_manager._core_upsert_hook
+        item_manager.ROOT_DIR = self.tmp
+        item_manager.USER_DIR = os.path.join(self.tmp, "user")
+        item_manager._core_upsert_hook = lambda *a: (lambda doc: None)
+        self.today = date.today()
+
+    def tearDown(self):
+        item_manager.ROOT_DIR = self._orig_root
+        item_manager.USER_DIR = self._orig_user_dir
+        item_manager._core_upsert_hook = self._orig_hook
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _day(self, offset):
+        return (self.today + timedelta(days=offset)).isoformat()
+
+    def _seed(self):
+        item_manager.write_item_data("task", "Late Report", {"name": "Late Report", "deadline": self._day(-2), "duration": "10m"})
+        item_manager.write_item_data("task", "Call Bank", {"name": "Call Bank", "due_date": self._day(1), "duration": 5})
+        item_manager.write_item_data("task", "Big Essay", {"name": "Big Essay", "deadline": self._day(1), "duration": "2h"})
+        item_manager.write_item_data("task", "Finished", {"name": "Finished", "deadline": self._day(0), "duration": 5, "status": "completed"})
+        item_manager.write_item_data("task", "Someday", {"name": "Someday", "duration": 5})
+        item_manager.write_item_data("appointment", "Dentist", {"name": "Dentist", "date": f"{self._day(2)} 09:30"})
+
+    def _quickwins(self):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            quickwins.run([], {"format": "json", "missed": "false", "minutes": "15", "days": "3"})
+        return json.loads(buf.getvalue())["items"]
+
+    def test_range_queries_and_quickwins(self):
+        self._seed()
+        self.assertEqual([r["name"] for r in due_index.overdue(self.today)], ["Late Report"])
+        soon = due_index.due_within(3, self.today, include_overdue=False, max_minutes=15,
+                                    exclude_statuses=quickwins.DONE_STATUSES)
+        self.assertEqual([r["name"] for r in soon], ["Call Bank"])
+        tray = due_index.query(fields=("due_at",), end=self._day(3), types=["appointment"])
+        self.assertEqual(tray[0]["due_at"], f"{self._day(2)}T09:30:00")
+
+        items = self._quickwins()
+        self.assertEqual([(i["name"], i["rank"]) for i in items], [("Late Report", 0), ("Call Bank", 6)])
+
+    def test_writes_deletes_and_external_edits_update_the_index(self):
+        self._seed()
+        due_index.rebuild()
+        item_manager.write_item_data("task", "Call Bank", {"name": "Call Bank", "due_date": self._day(1), "status": "done"})
+        item_manager.delete_item("task", "Late Report")
+        self.assertEqual(self._quickwins(), [])
+
+        # Edited outside Chronos: found by the fingerprint pass, not a full re-read.
+        path = item_manager.get_item_path("task", "Someday")
+        time.sleep(0.01)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(f"name: Someday\nduration: 5\ndeadline: {self._day(0)}\n")
+        with mock.patch.object(due_index, "_load", wraps=due_index._load) as loader:
+            self.assertEqual(due_index.reconcile(force=True), 1)
+            self.assertEqual(loader.call_count, 1)
+        self.assertEqual([i["name"] for i in self._quickwins()], ["Someday"])
+
+    def test_direct_saves_refresh_the_index(self):
+        self._seed()
+        due_index.rebuild()
+        path = item_manager.get_item_path("task", "Someday")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(f"name: Someday\nduration: 5\ndeadline: {self._day(-1)}\n")
+        # A text file under user/ is not an item and is left alone.
+        notes = os.path.join(item_manager.USER_DIR, "notes", "readme.md")
+        os.makedirs(os.path.dirname(notes), exist_ok=True)
+        with open(notes, "w", encoding="utf-8") as fh:
+            fh.write("not yaml: [")
+        item_manager.item_file_saved(notes)
+        item_manager.item_file_saved(path)
+        with mock.patch.object(due_index, "reconcile"):
+            names = [r["name"] for r in due_index.overdue(self.today)]
+        self.assertEqual(names, ["Late Report", "Someday"])
+
+
+if __name__ == "__main__":
+    unittest.main()
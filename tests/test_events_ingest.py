@@ -0,0 +1,61 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from modules.sequence import events_builder
+
+
+class TestEventsIngest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.log = os.path.join(self.tmp, "listener.log")
+        self.conn = sqlite3.connect(os.path.join(self.tmp, "events.db"))
+        events_builder._create_schema(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _append(self, text):
+        with open(self.log, "a", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def _messages(self):
+        return [r[0] for r in self.conn.execute("SELECT message FROM events ORDER BY id")]
+
+    def _ingest(self):
+        return events_builder._ingest_listener_log(self.conn, self.log)
+
+    def test_appends_only_the_tail(self):
+        self._append("[2026-01-01 08:00] alarm fired\n[2026-01-01 08:05] reminder shown\n")
+        first = self._ingest()
+        self.assertEqual((first["mode"], first["appended"]), ("full", 2))
+
+        self._append("noise line\n[2026-01-01 09:00] timer done\n[2026-01-01 09:01] part")
+        second = self._ingest()
+        self.assertEqual((second["mode"], second["appended"]), ("incremental", 1))
+        self.assertLess(second["offset"], second["source_size"])
+
+        self._append("ial\n")
+        self._ingest()
+        self.assertEqual(self._messages(), ["alarm fired", "reminder shown", "timer done", "partial"])
+
+    def test_rewritten_or_truncated_log_rebuilds(self):
+        self._append("[a] one\n[b] two\n")
+        self._ingest()
+        with open(self.log, "w", encoding="utf-8") as fh:
+            fh.write("[c] three\n")
+        result = self._ingest()
+        self.assertEqual(result["mode"], "full")
+        self.assertEqual(self._messages(), ["three"])
+
+        with open(self.log, "r+", encoding="utf-8") as fh:
+            fh.write("[X]")  # same size, different head
+        self.assertEqual(self._ingest()["mode"], "full")
+        self.assertEqual(self._messages(), ["three"])
+
+
+if __name__ == "__main__":
+    unittest.main()
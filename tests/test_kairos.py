@@ -1,15 +1,21 @@
 import io
+import json
 import os
 import shutil
 import sys
 import tempfile
+import sqlite3
 import types
 import unittest
 import uuid
 from contextlib import contextmanager, redirect_stdout
+from datetime import date
 from unittest.mock import patch
 
+import yaml
+
 from commands import today as Today
+from modules import item_manager
 from modules.scheduler.kairos import KairosScheduler
 from modules.scheduler.weekly_generator import WeeklyGenerator
 
@@ -34,6 +40,29 @@ def _today_user_dir():
         shutil.rmtree(td, ignore_errors=True)
 
 
+def _write_core_db(path, rows):
+    """Minimal chronos_core.db with an `items` table holding (name, type, status, raw) rows."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slug TEXT UNIQUE, name TEXT, type TEXT, category TEXT, status TEXT,
+            priority TEXT, due_date TEXT, duration_minutes INTEGER, points_value REAL,
+            tags TEXT, path TEXT, relative_path TEXT, created_at TEXT, updated_at TEXT,
+            raw_json TEXT
+        )
+        """
+    )
+    for name, item_type, status, raw in rows:
+        conn.execute(
+            "INSERT INTO items (slug, name, type, status, priority, duration_minutes, path, raw_json) VALUES (?, ?, ?, ?, 'high', 30, '/x', ?)",
+            (name.lower().replace(" ", "_"), name, item_type, status, json.dumps(raw)),
+        )
+    conn.commit()
+    conn.close()
+
+
 class TestKairosEngine(unittest.TestCase):
     def test_pre_schedule_hooks_enabled_runs_commitment_and_milestone(self):
         scheduler = KairosScheduler(user_context={"evaluate_hooks": True})
@@ -985,6 +1014,114 @@ class TestWeeklyGenerator(unittest.TestCase):
             self.assertEqual(plans[0].get("remaining"), 2)
             self.assertTrue(len(plans[0].get("recommended_days", [])) >= 1)
 
+    def test_weekly_serial_horizon_shares_world_and_latest_log_goes_to_last_day(self):
+        seen = []
+
+        class FakeKairos:
+            loads = 0
+
+            def __init__(self, user_context=None):
+                self.user_context = user_context or {}
+                self.phase_notes = {}
+
+            def generate_schedule(self, d):
+                if self.world is None:
+                    FakeKairos.loads += 1
+                    self.world = {"loaded": True}
+                seen.append((d.isoformat(), self.write_latest_decision_log, self.core_reader is not None))
+                return {"blocks": [], "stats": {"valid": True, "scheduled_items": 0}}
+
+        with patch("modules.scheduler.weekly_generator.KairosScheduler", FakeKairos), patch(
+            "modules.scheduler.weekly_generator.list_all_items", return_value=[]
+        ):
+            payload = WeeklyGenerator().generate_skeleton(days=3, start_date=date(2026, 3, 2), workers=1)
+
+        self.assertEqual(FakeKairos.loads, 1)
+        self.assertEqual([s[1] for s in seen], [False, False, True])
+        self.assertTrue(all(s[2] for s in seen))
+        self.assertEqual([r["date"] for r in payload["skeleton"]], ["2026-03-02", "2026-03-03", "2026-03-04"])
+
+    def test_weekly_parallel_failure_falls_back_to_serial(self):
+        gen = WeeklyGenerator()
+        with patch.object(WeeklyGenerator, "_generate_parallel", return_value=None) as parallel, patch.object(
+            WeeklyGenerator, "_generate_serial", side_effect=lambda dates, _context: {d.isoformat(): ({"date": d.isoformat()}, []) for d in dates}
+        ) as serial, patch("modules.scheduler.weekly_generator.list_all_items", return_value=[]):
+            payload = gen.generate_skeleton(days=20, start_date=date(2026, 3, 2), workers=4)
+        parallel.assert_called_once()
+        self.assertEqual(parallel.call_args[0][1], 4)
+        serial.assert_called_once()
+        self.assertEqual(len(payload["skeleton"]), 20)
+        self.assertEqual(payload["skeleton"][0]["date"], "2026-03-02")
+
+    def test_weekly_serial_and_parallel_match_on_fixture(self):
+        tmp = tempfile.mkdtemp(prefix="kairos_horizon_")
+        old_user_dir = item_manager.USER_DIR
+        try:
+            item_manager.USER_DIR = os.path.join(tmp, "user")
+            os.makedirs(os.path.join(item_manager.USER_DIR, "data"))
+            _write_core_db(
+                os.path.join(item_manager.USER_DIR, "data", "chronos_core.db"),
+                [
+                    ("Write Report", "task", "pending", {"name": "Write Report", "duration": 30}),
+                    ("Stretch", "habit", None, {"name": "Stretch", "duration": 15}),
+                    ("Plan Week", "task", None, {"name": "Plan Week", "duration": 45}),
+                ],
+            )
+            template = os.path.join(tmp, "Fixture Day.yml")
+            with open(template, "w", encoding="utf-8") as fh:
+                yaml.safe_dump({
+                    "type": "day",
+                    "name": "Fixture Day",
+                    "sequence": [{"name": "Deep Work", "window": True, "start": "09:00", "end": "11:00", "filters": {}}],
+                }, fh)
+            hook_log = os.path.join(tmp, "hooks.log")
+
+            def _hook():
+                # Appends from whichever process runs it.
+                with open(hook_log, "a", encoding="utf-8") as fh:
+                    fh.write(f"{os.getpid()}\n")
+
+            commitment_main = types.ModuleType("modules.commitment.main")
+            milestone_main = types.ModuleType("modules.milestone.main")
+            commitment_main.evaluate_and_trigger = _hook
+            milestone_main.evaluate_and_update_milestones = lambda: None
+            commitment_pkg = types.ModuleType("modules.commitment")
+            milestone_pkg = types.ModuleType("modules.milestone")
+            commitment_pkg.main = commitment_main
+            milestone_pkg.main = milestone_main
+
+            gen = WeeklyGenerator({"force_template": template, "evaluate_hooks": True})
+            runs = {}
+            hook_calls = {}
+            with patch.dict(sys.modules, {
+                "modules.commitment": commitment_pkg,
+                "modules.commitment.main": commitment_main,
+                "modules.milestone": milestone_pkg,
+                "modules.milestone.main": milestone_main,
+            }):
+                for workers in (1, 3):
+                    runs[workers] = gen.generate_skeleton(days=3, start_date=date(2026, 3, 2), workers=workers)
+                    with open(hook_log, encoding="utf-8") as fh:
+                        hook_calls[workers] = len(fh.read().split())
+                    os.remove(hook_log)
+        finally:
+            item_manager.USER_DIR = old_user_dir
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.assertEqual(runs[1]["skeleton"], runs[3]["skeleton"])
+        self.assertEqual([r["scheduled_items"] for r in runs[1]["skeleton"]], [4, 4, 4])
+        self.assertEqual(
+            [b["name"] for b in runs[1]["skeleton"][0]["top_blocks"]],
+            ["Deep Work", "Plan Week", "Stretch", "Write Report"],
+        )
+        self.assertEqual(hook_calls, {1: 1, 3: 1})
+
+    def test_weekly_short_horizon_stays_serial_by_default(self):
+        gen = WeeklyGenerator()
+        self.assertEqual(gen._pool_size(7, None), 1)
+        self.assertEqual(gen._pool_size(30, 1), 1)
+        self.assertEqual(gen._pool_size(3, 8), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
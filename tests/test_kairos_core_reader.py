@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from modules.scheduler.core_reader import CANDIDATE_COLUMNS, CoreReader
+from modules.scheduler.kairos import KairosScheduler
+
+
+def _write_core_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slug TEXT UNIQUE, name TEXT, type TEXT, category TEXT, status TEXT,
+            priority TEXT, due_date TEXT, duration_minutes INTEGER, points_value REAL,
+            tags TEXT, path TEXT, relative_path TEXT, created_at TEXT, updated_at TEXT,
+            raw_json TEXT
+        )
+        """
+    )
+    for name, item_type, status, raw in rows:
+        conn.execute(
+            "INSERT INTO items (slug, name, type, status, priority, duration_minutes, path, raw_json) VALUES (?, ?, ?, ?, 'high', 30, '/x', ?)",
+            (name.lower().replace(" ", "_"), name, item_type, status, json.dumps(raw)),
+        )
+    conn.commit()
+    conn.close()
+
+
+class TestKairosCoreReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, "chronos_core.db")
+        _write_core_db(
+            self.db,
+            [
+                ("Write Report", "task", "pending", {"name": "Write Report", "place": "desk"}),
+                ("Stretch", "habit", None, {"name": "Stretch"}),
+                ("Old Task", "task", "completed", {"name": "Old Task"}),
+                ("Gym 3x", "commitment", None, {"name": "Gym 3x", "frequency": 3}),
+            ],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_candidate_rows_are_projected_and_memoized(self):
+        with CoreReader(self.db) as reader:
+            backlog, commitments = reader.candidate_rows()
+            self.assertEqual(sorted(r["name"] for r in backlog), ["Stretch", "Write Report"])
+            self.assertEqual([r["name"] for r in commitments], ["Gym 3x"])
+            self.assertEqual(set(backlog[0].keys()), set(CANDIDATE_COLUMNS))
+            backlog[0]["mutated"] = True
+            again, _ = reader.candidate_rows()
+            self.assertNotIn("mutated", again[0])
+            self.assertEqual(reader.stats["connects"], 1)
+            self.assertEqual(reader.stats["queries"], 1)
+
+    def test_reader_reopens_after_database_is_replaced(self):
+        reader = CoreReader(self.db)
+        try:
+            reader.candidate_rows()
+            reader.close()
+            replacement = os.path.join(self.tmp, "next.db")
+            _write_core_db(replacement, [("Fresh", "task", None, {"name": "Fresh"})])
+            os.replace(replacement, self.db)
+            backlog, commitments = reader.candidate_rows()
+            self.assertEqual([r["name"] for r in backlog], ["Fresh"])
+            self.assertEqual(commitments, [])
+        finally:
+            reader.close()
+
+    def test_payload_decoded_lazily_and_shared_across_runs(self):
+        with CoreReader(self.db) as reader:
+            for _ in range(2):
+                ks = KairosScheduler(core_reader=reader)
+                ks.runtime = {"status_context": {"current": {}}}
+                candidates = ks.gather_candidates(date(2026, 1, 5))
+                commitment = next(c for c in candidates if c["_source_kind"] == "commitment_rule")
+                self.assertNotIn("_raw", commitment)
+                kept = ks.filter_candidates(candidates)
+                self.assertEqual(sorted(k["name"] for k in kept), ["Stretch", "Write Report"])
+                self.assertNotIn("_raw", commitment)
+                self.assertEqual(next(k for k in kept if k["name"] == "Write Report")["_raw"]["place"], "desk")
+            self.assertEqual(reader.stats["decoded"], 2)
+            self.assertEqual(reader.stats["decode_reused"], 2)
+
+    def test_column_checks_run_before_payload_decode(self):
+        with CoreReader(self.db) as reader:
+            backlog, commitments = reader.candidate_rows()
+            rows = backlog + commitments
+            rows.append(dict(rows[0], id=99, name="Loose Note", type="note", raw_json='{"name": "Loose Note"}'))
+            rows.append(dict(rows[0], id=100, name=None, raw_json='{"name": "Nameless", "observer_only": true}'))
+            rows[-3]["_source_kind"] = "commitment_rule"
+            ks = KairosScheduler(core_reader=reader)
+            ks.runtime = {"status_context": {"current": {}}}
+            kept = ks.filter_candidates(rows)
+            self.assertEqual(sorted(k["name"] for k in kept), ["Stretch", "Write Report"])
+            reasons = {r["name"]: r["reason"] for r in ks.phase_notes["filter"]["sample_rejections"]}
+            self.assertEqual(reasons["Loose Note"], "non_executable_type")
+            self.assertEqual(reasons[None], "observer_only_item")
+            # Only the three executable rows were decoded; the note and the commitment never were.
+            self.assertEqual(reader.stats["decoded"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
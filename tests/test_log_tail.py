@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from utilities import log_tail
+from utilities.log_tail import read_log
+
+
+class TestLogTail(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "engine.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _append(self, text):
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def test_tail_spans_blocks_and_cursor_returns_only_new_lines(self):
+        self._append("".join(f"[2026-01-01 00:00:00] INFO: line {i}\n" for i in range(2000)))
+        first = read_log(self.path, limit=3)
+        self.assertEqual([ln.split(": ", 1)[1] for ln in first["logs"]], ["line 1997", "line 1998", "line 1999"])
+        self.assertEqual(read_log(self.path, limit=3, cursor=first["cursor"])["logs"], [])
+
+        self._append("[2026-01-01 00:00:01] INFO: fresh\n[2026-01-01 00:00:02] INFO: half")
+        nxt = read_log(self.path, limit=10, cursor=first["cursor"])
+        self.assertEqual(nxt["logs"], ["[2026-01-01 00:00:01] INFO: fresh"])
+        self.assertFalse(nxt["reset"])
+        self._append(" done\n")
+        self.assertEqual(read_log(self.path, cursor=nxt["cursor"])["logs"], ["[2026-01-01 00:00:02] INFO: half done"])
+
+    def test_level_and_substring_filters_keep_continuation_lines(self):
+        self._append(
+            "[t] INFO: sequence start\n"
+            "[t] ERROR: sequence failed\n"
+            "Traceback:\n"
+            "  boom\n"
+            "[t] ERROR: other failure\n"
+            "[t] INFO: done\n"
+        )
+        res = read_log(self.path, limit=10, levels=["error"], contains="sequence")
+        self.assertEqual(res["logs"], ["[t] ERROR: sequence failed", "Traceback:", "boom"])
+        cursor = read_log(self.path)["cursor"]
+        self._append("[t] WARN: sequence slow\n[t] INFO: sequence ok\n")
+        res = read_log(self.path, cursor=cursor, levels=["warn"])
+        self.assertEqual(res["logs"], ["[t] WARN: sequence slow"])
+
+    def test_rotation_and_truncation_reset_the_cursor(self):
+        self._append("[t] INFO: old one\n[t] INFO: old two\n")
+        cursor = read_log(self.path)["cursor"]
+        os.replace(self.path, self.path + ".1")
+        self._append("[t] INFO: new one\n")
+        res = read_log(self.path, cursor=cursor)
+        self.assertTrue(res["reset"])
+        self.assertEqual(res["logs"], ["[t] INFO: new one"])
+
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.write("")
+        res = read_log(self.path, cursor=res["cursor"])
+        self.assertTrue(res["reset"])
+        self.assertEqual(res["logs"], [])
+
+    def test_small_blocks(self):
+        old = log_tail.BLOCK_SIZE
+        log_tail.BLOCK_SIZE = 7
+        try:
+            self._append("[t] INFO: alpha\n[t] INFO: beta\n[t] INFO: gamma\n")
+            self.assertEqual(read_log(self.path, limit=2)["logs"], ["[t] INFO: beta", "[t] INFO: gamma"])
+        finally:
+            log_tail.BLOCK_SIZE = old
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from modules import logger as logger_module
+from modules.logger import Logger
+
+
+class LoggerBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_logger_")
+        self._orig_log_file = logger_module.LOG_FILE
+        self._orig_sampler = logger_module._sampler
+        logger_module.LOG_FILE = os.path.join(self.tmp, "engine.log")
+
+    def tearDown(self):
+        Logger.flush()
+        logger_module.LOG_FILE = self._orig_log_file
+        logger_module._sampler = self._orig_sampler
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _lines(self):
+        with open(logger_module.LOG_FILE, "r", encoding="utf-8") as fh:
+            return fh.read().splitlines()
+
+    def test_lines_are_batched_in_order_and_flushed(self):
+        for idx in range(500):
+            Logger.info(f"line {idx}")
+        Logger.error("boom", exc=ValueError("bad"))
+        Logger.flush()
+        lines = self._lines()
+        self.assertEqual([ln.split("INFO: ")[1] for ln in lines[:500]], [f"line {i}" for i in range(500)])
+        self.assertIn("ERROR: boom", lines[500])
+        self.assertTrue(any("ValueError: bad" in ln for ln in lines[501:]))
+
+    def test_debug_sampling_and_suppression(self):
+        logger_module._sampler = logger_module._Sampler({"[hot]": 0.25, "[mute]": 0})
+        for idx in range(8):
+            Logger.debug(f"[hot] tick {idx}")
+            Logger.debug(f"[mute] tick {idx}")
+        Logger.debug("[cold] kept")
+        Logger.info("[mute] info is never sampled")
+        Logger.flush()
+        lines = self._lines()
+        self.assertEqual(sum("[hot]" in ln for ln in lines), 2)
+        self.assertEqual(sum("[mute] tick" in ln for ln in lines), 0)
+        self.assertTrue(any("[cold] kept" in ln for ln in lines))
+        self.assertTrue(any("info is never sampled" in ln for ln in lines))
+
+    def test_rotation_keeps_configured_backups(self):
+        path = logger_module.LOG_FILE
+        for generation in range(4):
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(f"gen {generation}\n" + "x" * 100)
+            logger_module._rotate(path, max_bytes=50, backups=2)
+        self.assertFalse(os.path.exists(path))
+        with open(path + ".1", encoding="utf-8") as fh:
+            self.assertTrue(fh.read().startswith("gen 3"))
+        with open(path + ".2", encoding="utf-8") as fh:
+            self.assertTrue(fh.read().startswith("gen 2"))
+        self.assertFalse(os.path.exists(path + ".3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from modules.sequence import matrix_builder
+from utilities import dashboard_matrix
+
+
+def _dataset(rng, count=60):
+    payload = []
+    for idx in range(count):
+        item_type = rng.choice(["task", "habit", "routine"])
+        data = {
+            "name": f"Item {idx % 45}",
+            "type": item_type,
+            "status": rng.choice(["pending", "completed", "In Progress", None]),
+            "priority": rng.choice(["high", "low", None]),
+            "category": rng.choice(["work", "home"]),
+            "duration": f"{rng.choice([15, 30, 60])}m",
+            "points": rng.choice([0, 1, 2.5]),
+            "tags": rng.sample(["alpha", "beta", "gamma", "Beta"], rng.randint(0, 3)),
+            "energy": rng.choice(["low", "high"]),
+            "dataset": "item",
+        }
+        if idx % 3 == 0:
+            data["dataset"] = "schedule"
+            data["schedule_date"] = rng.choice(["2026-09-30", "2026-10-01", "2026-10-19"])
+        payload.append((item_type, data))
+    return payload
+
+
+def _normalized(result):
+    cells = {}
+    for key, cell in result["cells"].items():
+        cell = dict(cell)
+        cell["items"] = sorted(cell.get("items") or [])
+        if isinstance(cell.get("value"), str):
+            # The list metric samples the first five names; order is not part of the contract.
+            cell.pop("value")
+        cells[key] = cell
+    return (
+        sorted((row["id"], row["label"]) for row in result["rows"]),
+        sorted((col["id"], col["label"]) for col in result["cols"]),
+        cells,
+    )
+
+
+class MatrixCubeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_matrix_")
+        self.db_path = os.path.join(self.tmp, "chronos_matrix.db")
+        self._orig_path = dashboard_matrix.MATRIX_DB_PATH
+        dashboard_matrix.MATRIX_DB_PATH = self.db_path
+        dashboard_matrix._RESULT_CACHE.clear()
+
+    def tearDown(self):
+        dashboard_matrix.MATRIX_DB_PATH = self._orig_path
+        dashboard_matrix._RESULT_CACHE.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _build(self, dataset):
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            matrix_builder._create_schema(conn)
+            matrix_builder._populate(conn, dataset)
+            cube = matrix_builder._build_cube(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        return cube
+
+    def test_cube_answers_match_raw_join(self):
+        rng = random.Random(38)
+        self._build(_dataset(rng))
+        pairs = [
+            ("item_type", "item_status"),
+            ("item_status", "item_type"),
+            ("tag", "priority"),
+            ("category", "tag"),
+            ("tag", "tag"),
+        ]
+        for row, col in pairs:
+            for metric in ("count", "duration", "points", "list"):
+                for filters in ({}, {"period": "2026-10"}):
+                    with self.subTest(row=row, col=col, metric=metric, filters=filters):
+                        cube = dashboard_matrix._compute_matrix_from_db([row], [col], metric, filters)
+                        raw = dashboard_matrix._compute_matrix_from_db([row], [col], metric, filters, use_cube=False)
+                        self.assertEqual(cube["meta"]["source"], "cube")
+                        self.assertEqual(raw["meta"]["source"], "join")
+                        self.assertEqual(_normalized(cube), _normalized(raw))
+
+    def test_uncovered_requests_fall_back_to_join(self):
+        rng = random.Random(7)
+        self._build(_dataset(rng))
+        multi = dashboard_matrix._compute_matrix_from_db(["item_type", "priority"], ["item_status"], "count")
+        prop = dashboard_matrix._compute_matrix_from_db(["energy"], ["item_type"], "count")
+        filtered = dashboard_matrix._compute_matrix_from_db(["item_type"], ["item_status"], "count", {"tag": "alpha"})
+        for result in (multi, prop, filtered):
+            self.assertEqual(result["meta"]["source"], "join")
+            self.assertTrue(result["cells"])
+
+    def test_cube_version_tracks_content(self):
+        dataset = _dataset(random.Random(1))
+        first = self._build(dataset)
+        again = self._build(dataset)
+        self.assertEqual(first["version"], again["version"])
+        changed = list(dataset)
+        changed[0] = (changed[0][0], dict(changed[0][1], priority="urgent"))
+        other = self._build(changed)
+        self.assertNotEqual(first["version"], other["version"])
+
+        result = dashboard_matrix.compute_matrix(["item_type"], ["priority"], "count")
+        self.assertEqual(result["meta"]["cube_version"], other["version"])
+        cached = dashboard_matrix.compute_matrix(["item_type"], ["priority"], "count")
+        self.assertEqual(cached, result)
+        self.assertEqual(len(dashboard_matrix._RESULT_CACHE), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
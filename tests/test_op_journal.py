@@ -0,0 +1,135 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from commands import redo as Redo
+from commands import undo as Undo
+from modules import item_manager
+from modules import op_journal
+from modules import status_store
+from modules import write_coordinator
+from utilities import points
+from utilities import tracking_history
+
+
+class OpJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_journal_")
+        self._orig_root = item_manager.ROOT_DIR
+        self._orig_user_dir = item_manager.USER_DIR
+        self._orig_hook = item_manager._core_upsert_hook
+        item_manager.ROOT_DIR = self.tmp
+        item_manager.USER_DIR = os.path.join(self.tmp, "user")
+        item_manager._core_upsert_hook = lambda *a: (lambda doc: None)
+
+    def tearDown(self):
+        item_manager.ROOT_DIR = self._orig_root
+        item_manager.USER_DIR = self._orig_user_dir
+        item_manager._core_upsert_hook = self._orig_hook
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _run(self, module, *args, **props):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            module.run(list(args), props)
+        return buf.getvalue()
+
+    def test_operation_groups_writes_and_deletes(self):
+        item_manager.write_item_data("task", "Report", {"name": "Report", "status": "pending"})
+        item_manager.write_item_data("note", "Scratch", {"name": "Scratch"})
+        report = item_manager.get_item_path("task", "Report")
+        scratch = item_manager.get_item_path("note", "Scratch")
+
+        with op_journal.operation("complete Report"):
+            item_manager.write_item_data("task", "Report", {"name": "Report", "status": "in_progress"})
+            item_manager.write_item_data("task", "Report", {"name": "Report", "status": "completed"})
+            item_manager.delete_item("note", "Scratch")
+        ops = op_journal.history()
+        self.assertEqual([op["label"] for op in ops[:1]], ["complete Report"])
+        self.assertEqual(len(ops[0]["paths"]), 2)
+
+        out = self._run(Undo)
+        self.assertIn("Undid", out)
+        self.assertEqual(item_manager.read_item_data("task", "Report")["status"], "pending")
+        self.assertTrue(os.path.exists(scratch))
+
+        self._run(Redo)
+        self.assertEqual(item_manager.read_item_data("task", "Report")["status"], "completed")
+        self.assertFalse(os.path.exists(scratch))
+
+        # Undo the whole history, including the two creations.
+        self._run(Undo, "5")
+        self.assertFalse(os.path.exists(report))
+        self.assertFalse(os.path.exists(scratch))
+        self.assertIn("Nothing to undo", self._run(Undo))
+
+        # A new operation discards the redo stack.
+        item_manager.write_item_data("task", "Other", {"name": "Other"})
+        self.assertIn("Nothing to redo", self._run(Redo))
+
+    def test_side_stores_are_compensated(self):
+        item_manager.write_item_data("task", "Report", {"name": "Report", "status": "pending"})
+        points.add_points(5, reason="seed")
+        with op_journal.operation("complete Report"):
+            item_manager.write_item_data("task", "Report", {"name": "Report", "status": "completed"})
+            tracking_history.record("task", "Report", "completion", "2026-01-05")
+            points.add_points(10, reason="complete:task", source_item="Report")
+            status_store.record({"energy": "high"}, "2026-01-05T09:00:00")
+        self.assertEqual(op_journal.history()[0]["effects"], ["tracking_history", "points", "status_history"])
+
+        self.assertIn("points", self._run(Undo))
+        self.assertEqual(item_manager.read_item_data("task", "Report")["status"], "pending")
+        self.assertEqual(tracking_history.dates("task", "Report"), [])
+        self.assertEqual(points.get_balance(), 5)
+        self.assertEqual(points.get_history(1)[0]["reason"], "undo:complete:task")
+        self.assertEqual(status_store.latest_at("2026-01-06"), {})
+
+        self._run(Redo)
+        self.assertEqual(tracking_history.dates("task", "Report"), ["2026-01-05"])
+        self.assertEqual(points.get_balance(), 15)
+        self.assertEqual(status_store.latest_at("2026-01-06"), {"energy": "high"})
+        # Replays are not journaled themselves.
+        self.assertEqual(len(op_journal.history()), 3)
+
+    def test_conflicts_and_compaction(self):
+        item_manager.write_item_data("task", "Report", {"name": "Report", "status": "pending"})
+        item_manager.write_item_data("task", "Report", {"name": "Report", "status": "completed"})
+        path = item_manager.get_item_path("task", "Report")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("name: Report\nstatus: edited by hand\n")
+
+        with self.assertRaises(op_journal.JournalConflictError) as ctx:
+            op_journal.undo()
+        self.assertEqual(ctx.exception.paths, [os.path.abspath(path)])
+        self.assertIn("force:true", self._run(Undo))
+        self._run(Undo, force="true")
+        self.assertEqual(item_manager.read_item_data("task", "Report")["status"], "pending")
+
+        for i in range(5):
+            item_manager.write_item_data("task", f"T{i}", {"name": f"T{i}"})
+        self.assertEqual(op_journal.compact(max_ops=3), 3)
+        self.assertEqual([op["label"] for op in op_journal.history()],
+                         [os.path.join("tasks", f"t{i}.yml") for i in (4, 3, 2)])
+
+    def test_journal_writes_wait_for_the_lock_and_compaction_is_off_the_write_path(self):
+        path = os.path.join(item_manager.USER_DIR, "tasks", "held.yml")
+        with write_coordinator.file_lock(path):
+            op_journal.record_change(path, None, b"name: Held\n")
+            self.assertEqual(op_journal.history(), [])
+        self.assertEqual([op["label"] for op in op_journal.history()], [os.path.join("tasks", "held.yml")])
+
+        with mock.patch.object(op_journal, "RETENTION_OPS", 2), mock.patch.object(op_journal, "COMPACT_EVERY", 2):
+            for i in range(4):
+                item_manager.write_item_data("task", f"T{i}", {"name": f"T{i}"})
+            self.assertEqual(len(op_journal.history()), 5)
+            self.assertEqual(op_journal.compact_if_due(), 3)
+            self.assertEqual(op_journal.compact_if_due(), 0)
+        self.assertEqual(len(op_journal.history()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from modules import item_manager as ItemManager
+from utilities import points as Points
+
+
+def _add_many(user_dir, count):
+    ItemManager.USER_DIR = user_dir
+    for _ in range(count):
+        Points.add_points(1, reason="worker")
+
+
+class TestPointsLedger(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_user_dir = ItemManager.USER_DIR
+        ItemManager.USER_DIR = self.test_dir
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+        ItemManager.USER_DIR = self.original_user_dir
+
+    def test_add_and_balance(self):
+        self.assertEqual(Points.get_balance(), 0)
+        self.assertEqual(Points.add_points(10, reason="a"), 10)
+        self.assertEqual(Points.add_points(-3, reason="b"), 7)
+        self.assertEqual(Points.get_balance(), 7)
+        self.assertEqual([t["reason"] for t in Points.get_history()], ["a", "b"])
+
+    def test_history_tail(self):
+        for i in range(500):
+            Points.add_points(1, reason=f"r{i}")
+        tail = Points.get_history(last=3)
+        self.assertEqual([t["reason"] for t in tail], ["r497", "r498", "r499"])
+        self.assertEqual(len(Points.get_history(last=1000)), 500)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_concurrent_appenders_keep_every_delta(self):
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_add_many, args=(self.test_dir, 25)) for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        self.assertEqual(len(Points.get_history()), 100)
+        self.assertEqual(Points._read_checkpoint()[0], 100)
+        self.assertEqual(Points.get_balance(), 100)
+
+    def test_stale_checkpoint_replays_tail(self):
+        Points.add_points(5)
+        with open(Points._ledger_file(), "a", encoding="utf-8") as f:
+            f.write('{"date": "2026-01-01 00:00:00", "delta": 4, "reason": "x"}\n')
+        self.assertEqual(Points.get_balance(), 9)
+
+    def test_reset_keep_ledger(self):
+        Points.add_points(5)
+        self.assertEqual(Points.reset_points(keep_ledger=True), 0)
+        self.assertEqual(Points.get_balance(), 0)
+        self.assertEqual(len(Points.get_history()), 1)
+        Points.add_points(2)
+        self.assertEqual(Points.get_balance(), 2)
+        Points.reset_points()
+        self.assertEqual(Points.get_history(), [])
+
+    def test_migrates_legacy_yaml(self):
+        rewards = os.path.join(self.test_dir, "Rewards")
+        os.makedirs(rewards)
+        legacy = {
+            "balance": 42,
+            "ledger": [
+                {"date": "2026-01-01 09:00:00", "delta": 40, "reason": "old"},
+                {"date": "2026-01-02 09:00:00", "delta": 2, "reason": "older"},
+            ],
+        }
+        with open(os.path.join(rewards, "points.yml"), "w") as f:
+            yaml.dump(legacy, f)
+        self.assertEqual(Points.get_balance(), 42)
+        self.assertEqual(len(Points.get_history()), 2)
+        self.assertFalse(os.path.exists(os.path.join(rewards, "points.yml")))
+        self.assertEqual(Points.add_points(1), 43)
+
+
+if __name__ == "__main__":
+    unittest.main()
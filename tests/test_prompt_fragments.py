@@ -0,0 +1,105 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Agents Dress Up Committee", "tools"))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+from prompt_fragments import FragmentCache  # noqa: E402
+
+
+def _touch_later(path, text=None):
+    """Rewrite (optionally) and move the mtime forward so the fingerprint changes on any filesystem."""
+    if text is not None:
+        path.write_text(text, encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+class FragmentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="aduc_fragments_"))
+        self.cache = FragmentCache()
+        self.renders = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _outfits(self, folder):
+        # Renders like the watcher's folder-backed fragments: depends on the folder and each file.
+        def render():
+            self.renders.append(folder)
+            files = sorted(folder.glob("*.md"))
+            return [f.read_text(encoding="utf-8") for f in files], [folder] + files
+        return self.cache.fragment("outfits", str(folder), render)
+
+    def test_hit_and_miss_after_edit(self):
+        doc = self.tmp / "familiar.md"
+        doc.write_text("v1", encoding="utf-8")
+        self.assertEqual(self.cache.text(doc), "v1")
+        self.assertEqual(self.cache.text(doc), "v1")
+
+        self.cache.begin_turn()
+        self.assertEqual(self.cache.text(doc), "v1")
+        self.assertEqual(self.cache.end_turn()["rendered"], 0)
+
+        _touch_later(doc, "version 2")
+        self.cache.begin_turn()
+        self.assertEqual(self.cache.text(doc), "version 2")
+        metrics = self.cache.end_turn()
+        self.assertEqual((metrics["reused"], metrics["rendered"]), (0, 1))
+
+    def test_watched_paths_invalidate_fragments(self):
+        folder = self.tmp / "outfits"
+        folder.mkdir()
+        (folder / "casual.md").write_text("casual", encoding="utf-8")
+        self.assertEqual(self._outfits(folder), ["casual"])
+        self.assertEqual(self._outfits(folder), ["casual"])
+        self.assertEqual(len(self.renders), 1)
+
+        # A new file in a watched folder moves the folder's fingerprint.
+        (folder / "formal.md").write_text("formal", encoding="utf-8")
+        _touch_later(folder)
+        self.assertEqual(self._outfits(folder), ["casual", "formal"])
+        self.assertEqual(len(self.renders), 2)
+
+        # A path that was missing at render time invalidates once it appears.
+        memory = self.tmp / "memory.md"
+        self.assertEqual(self.cache.text(memory), "")
+        memory.write_text("remember", encoding="utf-8")
+        self.assertEqual(self.cache.text(memory), "remember")
+
+        self.cache.clear()
+        self._outfits(folder)
+        self.assertEqual(len(self.renders), 3)
+
+    def test_turn_metrics(self):
+        docs = []
+        for i in range(3):
+            doc = self.tmp / f"doc{i}.md"
+            doc.write_text(f"doc {i}", encoding="utf-8")
+            docs.append(doc)
+        for doc in docs:
+            self.cache.text(doc)
+
+        self.cache.begin_turn()
+        prompt = "".join(self.cache.text(doc) for doc in docs)
+        extra = self.cache.fragment("slow", "x", lambda: (time.sleep(0.02) or "é", []))
+        metrics = self.cache.end_turn(prompt + extra)
+        self.assertEqual((metrics["reused"], metrics["rendered"]), (3, 1))
+        self.assertEqual(metrics["bytes"], len("doc 0doc 1doc 2") + 2)
+        self.assertGreaterEqual(metrics["build_ms"], 20.0)
+
+        # Outside a turn nothing is counted, and a stray end_turn reports zeros.
+        self.cache.text(docs[0])
+        metrics = self.cache.end_turn()
+        self.assertEqual((metrics["bytes"], metrics["reused"], metrics["rendered"]), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from commands import tree as Tree
+from modules import item_manager
+from modules import reference_graph
+
+
+class ReferenceGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_refs_")
+        self._orig_root = item_manager.ROOT_DIR
+        self._orig_user_dir = item_manager.USER_DIR
+        self._orig_hook = item_manager._core_upsert_hook
+        item_manager.ROOT_DIR = self.tmp
+        item_manager.USER_DIR = os.path.join(self.tmp, "user")
+        item_manager._core_upsert_hook = lambda *a: (lambda doc: None)
+        item_manager.write_item_data("microroutine", "Stretch", {"name": "Stretch", "status": "active"})
+        item_manager.write_item_data("subroutine", "Wake Up", {
+            "name": "Wake Up",
+            "children": [{"name": "Stretch", "type": "microroutine"}, {"name": "Water"}],
+        })
+        item_manager.write_item_data("routine", "Morning", {
+            "name": "Morning",
+            "subroutines": ["Wake Up"],
+            "sequence": [{"name": "Wake Up", "type": "subroutine"}],
+        })
+
+    def tearDown(self):
+        item_manager.ROOT_DIR = self._orig_root
+        item_manager.USER_DIR = self._orig_user_dir
+        item_manager._core_upsert_hook = self._orig_hook
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _tree(self, *args, **props):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            Tree.run(list(args), props)
+        return buf.getvalue().splitlines()
+
+    def test_tree_renders_shared_subtrees_from_the_graph(self):
+        with mock.patch.object(Tree, "read_item_data", wraps=Tree.read_item_data) as reader:
+            lines = self._tree("routine", "Morning")
+        self.assertEqual(reader.call_count, 1)  # the root only
+        self.assertEqual(lines, [
+            "📦 Morning (routine)",
+            "├── Wake Up (subroutine)",
+            "│   ├── Stretch (microroutine) [active]",
+            "│   └── Water (item)",
+            "└── Wake Up (subroutine)",
+            "    ├── Stretch (microroutine) [active]",
+            "    └── Water (item)",
+        ])
+        reverse = self._tree("microroutine", "Stretch", reverse="true")
+        self.assertEqual(reverse[1:], [
+            "└── Wake Up (subroutine)",
+            "    ├── Morning (routine)",
+            "    └── Morning (routine)",
+        ])
+
+    def test_incremental_updates_and_cycles(self):
+        self.assertEqual(reference_graph.cycles(), [])
+        # Write hook: the new edge is visible without a reconcile pass.
+        item_manager.write_item_data("microroutine", "Stretch", {"name": "Stretch", "children": [{"name": "Morning", "type": "routine"}]})
+        self.assertEqual(reference_graph.cycles(fresh=False), [["microroutine:stretch", "routine:morning", "subroutine:wake up"]])
+        lines = self._tree("routine", "Morning")
+        self.assertIn("│   │       └── [Recursive: Morning]", lines)
+
+        item_manager.delete_item("subroutine", "Wake Up")
+        self.assertEqual(reference_graph.cycles(fresh=False), [])
+        parents = reference_graph.referenced_by("subroutine", "Wake Up", fresh=False)
+        self.assertEqual({p["field"] for p in parents}, {"subroutines", "sequence"})
+
+        # Edited outside Chronos: a fresh graph re-reads it by fingerprint even
+        # though a reconcile pass just ran.
+        path = item_manager.get_item_path("routine", "Morning")
+        time.sleep(0.01)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("name: Morning\ntasks:\n  - 'Habit: Floss'\n")
+        self.assertEqual(reference_graph.reconcile(), 0)
+        self.assertEqual(reference_graph.referenced_by("subroutine", "Wake Up"), [])
+        with reference_graph.Graph(fresh=False) as graph:
+            self.assertEqual([(c["type"], c["name"]) for c in graph.children("routine", "Morning")], [("habit", "Floss")])
+
+
+if __name__ == "__main__":
+    unittest.main()
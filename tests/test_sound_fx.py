@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from modules import sound_fx
+
+
+class SoundBankTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_sound_")
+        os.makedirs(os.path.join(self.tmp, "sounds"))
+        for name in ("startup", "done", "error", "exit"):
+            self._sound(name, b"x" * 100)
+        self.settings_path = os.path.join(self.tmp, "sound_settings.yml")
+        self._patches = [
+            mock.patch.object(sound_fx, "ASSETS_DIR", self.tmp),
+            mock.patch.object(sound_fx, "SETTINGS_PATH", self.settings_path),
+        ]
+        for p in self._patches:
+            p.start()
+        self.backend = sound_fx.NullBackend()
+        self.bank = sound_fx.set_backend(self.backend)
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        sound_fx._bank = None
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _sound(self, name, data):
+        path = os.path.join(self.tmp, "sounds", f"{name}.mp3")
+        with open(path, "wb") as fh:
+            fh.write(data)
+        return path
+
+    def test_preloaded_sounds_play_from_cache(self):
+        sound_fx.save_settings({"sounds": {"exit": False}})
+        self.assertEqual(self.bank.preload(), 3)
+        self.assertEqual(len(self.backend.loads), 3)
+
+        with mock.patch.object(sound_fx, "load_settings", wraps=sound_fx.load_settings) as settings:
+            for _ in range(5):
+                self.assertTrue(sound_fx.play("done", wait=True))
+            self.assertFalse(sound_fx.play("exit", wait=True))
+        self.assertEqual(settings.call_count, 0)
+        self.assertEqual(len(self.backend.loads), 3)
+        self.assertEqual(len(self.backend.played), 5)
+        self.assertEqual(self.bank.stats()["hits"], 5)
+
+        # A settings change is picked up without a restart.
+        sound_fx.set_sound_enabled("exit", True)
+        self.assertTrue(sound_fx.play("exit", wait=True))
+
+    def test_changed_files_reload_and_lru_is_bounded(self):
+        path = os.path.join(self.tmp, "sounds", "done.mp3")
+        self.assertTrue(sound_fx.play("done", wait=True))
+        time.sleep(0.01)
+        self._sound("done", b"y" * 120)
+        self.assertTrue(sound_fx.play("done", wait=True))
+        self.assertEqual(self.backend.played[-1], b"y" * 120)
+        self.assertEqual(self.backend.loads, [path, path])
+
+        bank = sound_fx.set_backend(self.backend, max_bytes=250)
+        for name in ("startup", "done", "error"):
+            bank.sample(bank.resolve(name))
+        stats = bank.stats()
+        self.assertEqual((stats["entries"], stats["bytes"], stats["evictions"]), (2, 220, 1))
+        self.assertEqual(list(bank._samples), [path, os.path.join(self.tmp, "sounds", "error.mp3")])
+
+
+if __name__ == "__main__":
+    unittest.main()
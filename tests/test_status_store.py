@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import yaml
+
+from modules import item_manager
+from modules import status_store
+
+
+class StatusStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_status_")
+        self._orig_user_dir = item_manager.USER_DIR
+        item_manager.USER_DIR = self.tmp
+        logs = os.path.join(self.tmp, "logs")
+        os.makedirs(logs)
+        with open(os.path.join(logs, "status_2026-10-01.yml"), "w", encoding="utf-8") as fh:
+            yaml.dump({"date": "2026-10-01", "entries": [
+                {"at": "08:00:00", "status": {"energy": "low", "focus": "good"}},
+                {"at": "12:30:00", "status": {"energy": "high", "focus": "good"}},
+            ]}, fh)
+        with open(os.path.join(logs, "status_2026-10-02.yml"), "w", encoding="utf-8") as fh:
+            yaml.dump({"date": "2026-10-02", "entries": [
+                {"at": "09:00:00", "status": {"energy": "high", "focus": "poor"}},
+            ]}, fh)
+
+    def tearDown(self):
+        item_manager.USER_DIR = self._orig_user_dir
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_legacy_import_keeps_changes_only(self):
+        samples = status_store.history("2026-10-01", "2026-10-03")
+        self.assertEqual(
+            [(s["at"], s["indicator"], s["value"]) for s in samples],
+            [
+                ("2026-10-01T08:00:00", "energy", "low"),
+                ("2026-10-01T08:00:00", "focus", "good"),
+                ("2026-10-01T12:30:00", "energy", "high"),
+                ("2026-10-02T09:00:00", "focus", "poor"),
+            ],
+        )
+        # Importing is one-time: reopening does not duplicate.
+        status_store.record({"energy": "medium"}, when="2026-10-02T18:00:00")
+        self.assertEqual(len(status_store.history("2026-10-01", "2026-10-03")), 5)
+
+    def test_concurrent_first_opens_import_once(self):
+        original = status_store._insert
+
+        def slow_insert(*args):
+            time.sleep(0.02)
+            return original(*args)
+
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def open_store():
+            barrier.wait()
+            try:
+                status_store.connect().close()
+            except Exception as e:
+                errors.append(e)
+
+        with mock.patch.object(status_store, "_insert", side_effect=slow_insert):
+            threads = [threading.Thread(target=open_store) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(30)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(status_store.history("2026-10-01", "2026-10-03")), 4)
+
+    def test_latest_at_and_prior(self):
+        status_store.record({"energy": "medium"}, when="2026-10-02T18:00:00")
+        self.assertEqual(status_store.latest_at("2026-10-01T10:00:00"), {"energy": "low", "focus": "good"})
+        self.assertEqual(status_store.latest_at("2026-10-03", ["energy"]), {"energy": "medium"})
+        self.assertEqual(status_store.latest_at("2026-09-30"), {})
+        window = status_store.history("2026-10-02T00:00:00", "2026-10-02T23:59:59", ["energy"], include_prior=True)
+        self.assertEqual([s["value"] for s in window], ["high", "medium"])
+
+    def test_downsample_time_weighted(self):
+        buckets = status_store.downsample("energy", "2026-10-01T06:00:00", "2026-10-01T18:00:00", 6 * 60)
+        self.assertEqual(len(buckets), 2)
+        # 06:00-12:00: nothing before 08:00, then low.
+        self.assertEqual((buckets[0]["value"], buckets[0]["last"], buckets[0]["changes"]), ("low", "low", 1))
+        # 12:00-18:00: low until 12:30, then high.
+        self.assertEqual((buckets[1]["value"], buckets[1]["last"], buckets[1]["changes"]), ("high", "high", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import yaml
+
+from commands import today as Today
+from modules import item_manager
+from modules.scheduler import template_cache
+
+
+class TemplateCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_tpl_")
+        self._orig_root = item_manager.ROOT_DIR
+        self._orig_reader = Today.read_item_data
+        item_manager.ROOT_DIR = self.tmp
+        Today.read_item_data = item_manager.read_item_data
+        template_cache.clear()
+        self._write("microroutine", "Stretch", {"name": "Stretch", "type": "microroutine", "duration": "5m"})
+        self._write("subroutine", "Wake Up", {
+            "name": "Wake Up",
+            "type": "subroutine",
+            "children": [
+                {"name": "Stretch", "type": "microroutine"},
+                {"name": "Water", "duration": "2m"},
+            ],
+        })
+        self._write("routine", "Morning", {
+            "name": "Morning",
+            "type": "routine",
+            "children": [{"name": "Wake Up", "type": "subroutine"}],
+        })
+        self.template = {"sequence": [
+            {"name": "Morning", "type": "routine", "ideal_start_time": "07:00"},
+            {"name": "Inline Walk", "duration": "20m", "essential": True},
+        ]}
+
+    def tearDown(self):
+        item_manager.ROOT_DIR = self._orig_root
+        Today.read_item_data = self._orig_reader
+        template_cache.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, item_type, name, data):
+        path = item_manager.get_item_path(item_type, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            yaml.dump(data, fh)
+
+    def _durations(self, schedule):
+        return [(item["name"], item["duration"], [self._durations(item["children"])]) for item in schedule]
+
+    def test_repeat_builds_hit_cache_and_match(self):
+        first, _ = Today.build_initial_schedule(self.template)
+        misses = template_cache.stats()["misses"]
+        second, _ = Today.build_initial_schedule(self.template)
+        stats = template_cache.stats()
+        self.assertEqual(stats["misses"], misses)
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertEqual(self._durations(first), self._durations(second))
+        self.assertEqual(first[0]["duration"], 7)
+        self.assertTrue(second[1]["essential"])
+        # Items do not share data with the cache or each other.
+        second[0]["original_item_data"]["name"] = "changed"
+        third, _ = Today.build_initial_schedule(self.template)
+        self.assertEqual(third[0]["original_item_data"]["name"], "Morning")
+
+    def test_nested_file_change_invalidates_subtree(self):
+        Today.build_initial_schedule(self.template)
+        time.sleep(0.01)
+        self._write("microroutine", "Stretch", {"name": "Stretch", "type": "microroutine", "duration": "15m"})
+        schedule, _ = Today.build_initial_schedule(self.template)
+        self.assertEqual(schedule[0]["duration"], 17)
+
+    def test_new_file_replaces_inline_fallback(self):
+        template = {"sequence": [{"name": "Journal", "type": "task", "duration": "5m"}]}
+        schedule, _ = Today.build_initial_schedule(template)
+        self.assertEqual(schedule[0]["duration"], 5)
+        self._write("task", "Journal", {"name": "Journal", "type": "task", "duration": "25m"})
+        schedule, _ = Today.build_initial_schedule(template)
+        self.assertEqual(schedule[0]["duration"], 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
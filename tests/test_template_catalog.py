@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import yaml
+
+from commands import today as Today
+from modules.scheduler import template_catalog
+from modules.scheduler import v1 as scheduler_v1
+
+
+STATUS = {
+    "types": {"energy": {"name": "Energy"}, "place": {"name": "Place"}},
+    "current": {"energy": "low", "place": "home"},
+    "values": {},
+}
+
+
+class TemplateCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_catalog_")
+        os.makedirs(os.path.join(self.tmp, "days"))
+        os.makedirs(os.path.join(self.tmp, "settings"))
+        self._patches = [
+            mock.patch.object(Today, "USER_DIR", self.tmp),
+            mock.patch.object(scheduler_v1, "USER_DIR", self.tmp),
+        ]
+        for patch in self._patches:
+            patch.start()
+        template_catalog.clear()
+        self._write("Monday.yml", {"sequence": [{"name": "Work"}]})
+        self._write("Tuesday.yml", {"sequence": [{"name": "Gym"}]})
+        self._write("Sick Day.yml", {
+            "status_requirements": {"energy": ["low"]},
+            "sequence": [{"name": "Rest"}],
+        })
+        self._write("Weekend.yml", {"days": ["Saturday", "Sunday"], "sequence": []})
+
+    def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+        template_catalog.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, filename, data, subdir="days"):
+        path = os.path.join(self.tmp, subdir, filename)
+        with open(path, "w", encoding="utf-8") as fh:
+            yaml.safe_dump(data, fh)
+        return path
+
+    def _reference(self, day, status_context):
+        # The pre-catalog algorithm: read, filter and score every file.
+        best = None
+        for path in scheduler_v1.list_day_template_paths(day):
+            template = scheduler_v1.read_template(path)
+            if not template or not scheduler_v1.is_template_eligible_for_day(template, day):
+                continue
+            stem = os.path.splitext(os.path.basename(path))[0].lower()
+            has_req = bool(template.get("status_requirements"))
+            if template.get("days") is None and not has_req:
+                if not (stem == day.lower() or stem.startswith(f"{day.lower()}_")):
+                    continue
+            req = Today.extract_status_requirements(template, status_context)
+            score = Today.score_status_alignment(req, status_context)
+            total = score + (5 if stem.startswith(day.lower()) else 0) + (10 if has_req and score > 0 else 0)
+            if best is None or total > best[0]:
+                best = (total, path)
+        return best
+
+    def test_selection_matches_full_scan(self):
+        for day in ("Monday", "Tuesday", "Wednesday", "Saturday"):
+            for status in ({}, STATUS):
+                expected = self._reference(day, status)
+                got = Today.select_template_for_day(day, status)
+                if expected is None:
+                    self.assertEqual(got["score"], 0)
+                    continue
+                self.assertEqual((got["score"], got["path"]), expected, (day, status))
+
+    def test_templates_are_parsed_once_and_returned_as_copies(self):
+        with mock.patch.object(template_catalog, "_read", wraps=template_catalog._read) as reader:
+            first = Today.select_template_for_day("Monday", STATUS)
+            parsed = reader.call_count
+            first["template"]["sequence"].append({"name": "Mutated"})
+            second = Today.select_template_for_day("Monday", STATUS)
+            self.assertEqual(reader.call_count, parsed)
+        self.assertEqual(first["path"], second["path"])
+        self.assertNotIn({"name": "Mutated"}, second["template"]["sequence"])
+
+    def test_edited_and_removed_files_are_recompiled(self):
+        self.assertTrue(Today.select_template_for_day("Wednesday", STATUS)["path"].endswith("Sick Day.yml"))
+        time.sleep(0.01)
+        self._write("Sick Day.yml", {
+            "status_requirements": {"energy": ["low"]},
+            "days": ["Monday"],
+            "sequence": [],
+        })
+        self.assertEqual(Today.select_template_for_day("Wednesday", STATUS)["score"], 0)
+
+        self._write("scheduling_settings.yml", {
+            "template_selection": {"mode": "explicit", "forced_template": "Tuesday.yml"},
+        }, subdir="settings")
+        self.assertTrue(Today.select_template_for_day("Monday", STATUS)["path"].endswith("Tuesday.yml"))
+        os.remove(os.path.join(self.tmp, "settings", "scheduling_settings.yml"))
+        os.remove(os.path.join(self.tmp, "days", "Monday.yml"))
+        self.assertEqual(Today.select_template_for_day("Monday", {})["score"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
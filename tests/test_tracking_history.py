@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+from modules import item_manager
+from utilities import tracking
+from utilities import tracking_history
+
+
+class TrackingHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_tracking_")
+        self._orig_root = item_manager.ROOT_DIR
+        self._orig_user_dir = item_manager.USER_DIR
+        self._orig_hook = item_manager._core_upsert_hook
+        item_manager.ROOT_DIR = self.tmp
+        item_manager.USER_DIR = os.path.join(self.tmp, "user")
+        item_manager._core_upsert_hook = lambda *a: (lambda doc: None)
+
+    def tearDown(self):
+        item_manager.ROOT_DIR = self._orig_root
+        item_manager.USER_DIR = self._orig_user_dir
+        item_manager._core_upsert_hook = self._orig_hook
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _quiet(self, fn, *args, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return fn(*args, **kwargs)
+
+    def test_mark_complete_keeps_history_out_of_item(self):
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        item_manager.write_item_data("routine", "Morning", {
+            "name": "Morning",
+            "completion_dates": ["2025-01-03", yesterday],
+            "sessions": [{"date": "2025-01-03", "minutes": 20}],
+            "missed_dates": ["2025-01-05"],
+            "last_completed": yesterday,
+            "current_streak": 1,
+        })
+        self.assertTrue(self._quiet(tracking.mark_complete, "routine", "Morning", minutes=15))
+        self.assertTrue(self._quiet(tracking.mark_complete, "routine", "Morning"))
+
+        data = item_manager.read_item_data("routine", "Morning")
+        for field in ("completion_dates", "sessions", "missed_dates"):
+            self.assertNotIn(field, data)
+        today = datetime.now().strftime("%Y-%m-%d")
+        self.assertEqual(data["last_completed"], today)
+        self.assertEqual(data["current_streak"], 2)
+
+        self.assertEqual(tracking.completion_dates("routine", "Morning"), ["2025-01-03", yesterday, today])
+        self.assertEqual(tracking.completion_dates("routine", "Morning", start=yesterday), [yesterday, today])
+        self.assertEqual(tracking_history.dates("routine", "morning", "missed"), ["2025-01-05"])
+        sessions = tracking_history.sessions("routine", "Morning")
+        self.assertEqual(len(sessions), 3)
+        self.assertEqual(sessions[0]["minutes"], 20)
+        self.assertEqual(tracking_history.sessions("routine", "Morning", limit=1)[0]["date"], today)
+
+    def test_habits_keep_inline_history(self):
+        item_manager.write_item_data("habit", "Run", {"name": "Run"})
+        self.assertTrue(self._quiet(tracking.mark_missed, "habit", "Run"))
+        self.assertTrue(self._quiet(tracking.mark_complete, "habit", "Run", minutes=30))
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        data = item_manager.read_item_data("habit", "Run")
+        self.assertEqual(data["missed_dates"], [today])
+        self.assertEqual(data["completion_dates"], [today])
+        self.assertEqual([s["outcome"] for s in data["sessions"][:1]], ["missed"])
+        self.assertEqual(data["sessions"][1]["minutes"], 30)
+        self.assertFalse(os.path.exists(tracking_history.store_path())
+                         and tracking_history.sessions("habit", "Run"))
+
+        # Unquoted dates load as datetime.date and still count.
+        with open(item_manager.get_item_path("habit", "Walk"), "w", encoding="utf-8") as fh:
+            fh.write("name: Walk\ncompletion_dates:\n  - 2025-01-03\n  - '2025-01-04'\n")
+        self.assertEqual(tracking.completion_dates("habit", "Walk"), ["2025-01-03", "2025-01-04"])
+
+    def test_migrate_history_moves_lists(self):
+        item_manager.write_item_data("task", "Report", {"name": "Report", "completion_dates": ["2026-01-01", "2026-01-02"]})
+        item_manager.write_item_data("task", "Plain", {"name": "Plain"})
+        item_manager.write_item_data("habit", "Walk", {"name": "Walk", "completion_dates": ["2026-01-01"]})
+        moved = tracking.migrate_history()
+        self.assertEqual(moved["task"], 2)
+        self.assertNotIn("habit", moved)
+        self.assertNotIn("completion_dates", item_manager.read_item_data("task", "Report"))
+        self.assertEqual(item_manager.read_item_data("habit", "Walk")["completion_dates"], ["2026-01-01"])
+        self.assertEqual(tracking_history.dates_by_item("task", start="2026-01-02"), {"report": ["2026-01-02"]})
+        # Re-running finds nothing left to move.
+        self.assertEqual(tracking.migrate_history(["task"]), {"task": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import yaml
+
+from commands import trick
+from utilities import registry_builder
+from utilities import trick_index
+
+
+class TrickIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_trick_")
+        self._orig = (registry_builder.ROOT_DIR, registry_builder.REGISTRY_DIR)
+        registry_builder.ROOT_DIR = self.tmp
+        registry_builder.REGISTRY_DIR = os.path.join(self.tmp, "registry")
+        self._manifest("widgets", "Timer", {
+            "type": "widget", "name": "timer", "label": "Focus Timer",
+            "elements": [
+                {"name": "start_button", "kind": "button", "actions": ["click"]},
+                {"name": "profile_select", "kind": "select", "actions": ["get", "set"]},
+            ],
+        })
+        self._manifest("views", "Editor", {
+            "type": "view", "name": "editor",
+            "elements": [{"name": "textbox", "kind": "input", "actions": ["get", "set", "type"]}],
+        })
+
+    def tearDown(self):
+        registry_builder.ROOT_DIR, registry_builder.REGISTRY_DIR = self._orig
+        registry_builder._TRICK_INDEX_CACHE.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _manifest(self, root, name, data):
+        path = os.path.join(self.tmp, "utilities", "dashboard", root, name, "trick.yml")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            yaml.safe_dump(data, fh)
+        return path
+
+    def _trick(self, *args):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            trick.run(list(args), {})
+        return buf.getvalue().splitlines()
+
+    def test_queries_are_index_lookups(self):
+        index = registry_builder.load_trick_index()
+        self.assertEqual(index.surfaces(type_="widget"), ["widget.timer"])
+        self.assertEqual(index.surfaces(q="focus tim"), ["widget.timer"])
+        self.assertEqual(index.elements(action="set"), ["view.editor.textbox", "widget.timer.profile_select"])
+        self.assertEqual(index.elements(action="set", q="prof"), ["widget.timer.profile_select"])
+        self.assertEqual(index.kind("widget.timer"), "surface")
+        self.assertEqual(index.complete("widget.timer.s"), ["widget.timer.start_button"])
+
+        self.assertEqual(self._trick("where", "action:type"), [
+            "- view.editor.textbox  kind:input  actions:[get, set, type, highlight]",
+            "Matched elements: 1",
+        ])
+        self.assertEqual(self._trick("actions", "widget.timer.start"), ["widget.timer.start_button: click, highlight"])
+        self.assertEqual(self._trick("show", "wid")[0], "- widget.timer  [widget]  Focus Timer  elements:2")
+
+    def test_only_changed_manifests_are_reindexed(self):
+        registry_builder.build_trick_registry()
+        time.sleep(0.01)
+        path = self._manifest("widgets", "Timer", {
+            "type": "widget", "name": "timer",
+            "elements": [{"name": "stop_button", "kind": "button", "actions": ["click"]}],
+        })
+        with mock.patch.object(registry_builder, "_trick_surface_from_manifest",
+                               wraps=registry_builder._trick_surface_from_manifest) as parse:
+            reg = registry_builder.build_trick_registry()
+            registry_builder.build_trick_registry()
+        self.assertEqual([c.args[0] for c in parse.call_args_list], [path])
+
+        patched = trick_index.read(os.path.join(registry_builder.REGISTRY_DIR, "trick_index.json"))
+        self.assertEqual(patched, trick_index.build(reg["surfaces"], reg["input_hash"]))
+        index = registry_builder.load_trick_index()
+        self.assertEqual(index.elements(action="click"), ["widget.timer.stop_button"])
+        self.assertEqual(index.surfaces(q="focus"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
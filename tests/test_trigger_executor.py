@@ -0,0 +1,76 @@
+import threading
+import unittest
+
+from modules.listener.trigger_executor import TriggerExecutor
+
+
+class _FakePool:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lines = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def run_line(self, line, timeout=120.0):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            threading.Event().wait(self.delay)
+            self.lines.append((line, timeout))
+            if "boom" in line:
+                return {"ok": False, "stdout": "", "stderr": "Traceback...\nRuntimeError: boom"}
+            return {"ok": True, "stdout": "done", "stderr": ""}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def shutdown(self):
+        pass
+
+
+class TriggerExecutorTests(unittest.TestCase):
+    def _executor(self, pool, **settings):
+        self.logged = []
+        self.spawned = []
+        base = {"trigger_workers": 2, "trigger_timeout_seconds": 30}
+        base.update(settings)
+        return TriggerExecutor(log=self.logged.append, spawn=self.spawned.append, settings=base, pool=pool)
+
+    def test_burst_is_bounded_and_latency_logged(self):
+        pool = _FakePool(delay=0.05)
+        executor = self._executor(pool)
+        futures = [executor.submit(f"complete task \"Item {i}\"", source="alarm Wake") for i in range(6)]
+        futures.append(executor.submit("set task boom status:done", source="reminder R", timeout=5))
+        results = [f.result(timeout=5) for f in futures]
+        executor.shutdown()
+
+        self.assertEqual(pool.peak, 2)
+        self.assertEqual(len(pool.lines), 7)
+        self.assertIn(("set task boom status:done", 5.0), pool.lines)
+        self.assertTrue(all(line[1] == 30.0 for line in pool.lines if "boom" not in line[0]))
+        self.assertTrue(all("latency_ms" in r for r in results))
+        completed = [m for m in self.logged if m.startswith("Trigger completed: [alarm Wake]")]
+        self.assertEqual(len(completed), 6)
+        self.assertRegex(completed[0], r" in \d+ ms$")
+        self.assertIn("Trigger error: [reminder R] RuntimeError: boom", self.logged)
+
+    def test_unsafe_commands_need_opt_in(self):
+        pool = _FakePool()
+        executor = self._executor(pool)
+        self.assertIsNone(executor.submit('edit task "Deep Work"'))
+        self.assertEqual(self.spawned, [])
+        self.assertTrue(self.logged[-1].startswith("Trigger skipped:"))
+        executor.shutdown()
+
+        executor = self._executor(pool, subprocess_fallback=True)
+        executor.submit('edit task "Deep Work"', source="alarm A")
+        executor.shutdown()
+        self.assertEqual(self.spawned, ['edit task "Deep Work"'])
+        self.assertEqual(pool.lines, [])
+        self.assertIn("via subprocess", self.logged[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
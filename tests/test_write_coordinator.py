@@ -0,0 +1,151 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import yaml
+
+from modules import item_manager
+from modules import write_coordinator
+
+WRITERS = 4
+ROUNDS = 25
+
+
+def _stress_writer(root, idx, rounds, errors):
+    from modules import item_manager as im
+    from modules import write_coordinator as wc
+
+    im.ROOT_DIR = root
+    wc.LOCK_DIR = os.path.join(root, "locks")
+    im._core_upsert_hook = lambda *a: (lambda doc: None)
+    path = im.get_item_path("note", "Stress")
+    for j in range(rounds):
+        data = im.read_item_data("note", "Stress") or {"name": "Stress"}
+        data[f"w{idx}"] = j
+        entries = dict(data.get("entries") or {})
+        entries[f"{idx}-{j}"] = True
+        data["entries"] = entries
+        im.write_item_data("note", "Stress", data)
+
+        def _bump(doc):
+            doc["counter"] = int(doc.get("counter") or 0) + 1
+            doc["log"] = list(doc.get("log") or []) + [f"{idx}-{j}"]
+
+        im.update_item_data("note", "Stress", _bump)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                if not isinstance(yaml.safe_load(fh), dict):
+                    errors.put(f"writer {idx}: empty document")
+        except Exception as e:
+            errors.put(f"writer {idx}: {e}")
+
+
+class WriteCoordinatorTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="chronos_writes_")
+        self._orig_root = item_manager.ROOT_DIR
+        self._orig_lock_dir = write_coordinator.LOCK_DIR
+        self._orig_hook = item_manager._core_upsert_hook
+        item_manager.ROOT_DIR = self.tmp
+        write_coordinator.LOCK_DIR = os.path.join(self.tmp, "locks")
+        item_manager._core_upsert_hook = lambda *a: (lambda doc: None)
+        item_manager.write_item_data("note", "Stress", {"name": "Stress", "counter": 0})
+
+    def tearDown(self):
+        item_manager.ROOT_DIR = self._orig_root
+        write_coordinator.LOCK_DIR = self._orig_lock_dir
+        item_manager._core_upsert_hook = self._orig_hook
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_concurrent_processes_lose_no_updates(self):
+        ctx = multiprocessing.get_context("spawn")
+        errors = ctx.Queue()
+        procs = [
+            ctx.Process(target=_stress_writer, args=(self.tmp, idx, ROUNDS, errors))
+            for idx in range(WRITERS)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(120)
+            self.assertEqual(proc.exitcode, 0)
+        problems = []
+        while not errors.empty():
+            problems.append(errors.get())
+        self.assertEqual(problems, [])
+
+        data = item_manager.read_item_data("note", "Stress")
+        self.assertEqual(data["counter"], WRITERS * ROUNDS)
+        self.assertEqual(len(data["log"]), WRITERS * ROUNDS)
+        self.assertEqual(len(data["entries"]), WRITERS * ROUNDS)
+        for idx in range(WRITERS):
+            self.assertEqual(data[f"w{idx}"], ROUNDS - 1)
+        note_dir = os.path.dirname(item_manager.get_item_path("note", "Stress"))
+        self.assertEqual([f for f in os.listdir(note_dir) if f.endswith(".tmp")], [])
+
+    def test_threads_coalesce_updates(self):
+        path = item_manager.get_item_path("note", "Stress")
+        queue = write_coordinator._queue_for(path)
+        before = write_coordinator.stats()
+
+        def _bump(doc):
+            doc["counter"] = int(doc.get("counter") or 0) + 1
+
+        def _worker():
+            for _ in range(20):
+                write_coordinator.update_yaml(path, _bump)
+
+        threads = [threading.Thread(target=_worker) for _ in range(8)]
+        # Hold the file lock so the first flush blocks while the other
+        # threads queue up behind it.
+        with write_coordinator.file_lock(path):
+            for t in threads:
+                t.start()
+            deadline = time.time() + 10
+            while time.time() < deadline:
+                with queue.cond:
+                    if len(queue.ops) == 7:
+                        break
+                time.sleep(0.005)
+        for t in threads:
+            t.join()
+        after = write_coordinator.stats()
+        self.assertEqual(item_manager.read_item_data("note", "Stress")["counter"], 160)
+        self.assertEqual(after["ops"] - before["ops"], 160)
+        # The seven updates queued behind the lock commit as one batch.
+        self.assertLessEqual(after["commits"] - before["commits"], 160 - 6)
+
+    def test_stale_write_merges_or_raises_when_strict(self):
+        path = item_manager.get_item_path("note", "Stress")
+        # The read base is the file's bytes, not a copy of the document.
+        with mock.patch.object(write_coordinator.copy, "deepcopy", side_effect=AssertionError):
+            mine = item_manager.read_item_data("note", "Stress")
+        item_manager.update_item_data("note", "Stress", lambda d: d.update(other="theirs", counter=5))
+        mine["mine"] = "ours"
+        item_manager.write_item_data("note", "Stress", mine)
+        merged = item_manager.read_item_data("note", "Stress")
+        self.assertEqual((merged["other"], merged["mine"], merged["counter"]), ("theirs", "ours", 5))
+
+        item_manager.update_item_data("note", "Stress", lambda d: d.update(counter=7))
+        merged["counter"] = 9
+        with self.assertRaises(write_coordinator.WriteConflictError) as ctx:
+            write_coordinator.write_yaml(path, merged, strict=True)
+        self.assertEqual(ctx.exception.keys, ["counter"])
+        self.assertEqual(item_manager.read_item_data("note", "Stress")["counter"], 7)
+
+        # A file missing at read time merges against the read default.
+        fresh_path = os.path.join(self.tmp, "fresh.yml")
+        fresh = write_coordinator.read_yaml(fresh_path, default={})
+        write_coordinator.update_yaml(fresh_path, lambda d: {"other": "theirs"})
+        fresh["mine"] = "ours"
+        write_coordinator.write_yaml(fresh_path, fresh)
+        self.assertEqual(write_coordinator.read_yaml(fresh_path), {"other": "theirs", "mine": "ours"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,528 @@
+"""
+Worker-process pool for dashboard console commands.
+
+The dashboard used to run every console command on one in-process thread that
+swapped the global sys.stdout, so a slow `today reschedule` or `sequence sync`
+held up every other action. `ConsolePool` keeps a bounded set of worker
+processes (`python -m utilities.console_pool --worker`), each with the console
+command registry and item modules preloaded, and routes jobs by a read/write
+classification:
+
+- read-only commands run concurrently on any idle worker;
+- mutating commands take a lane (the item type they touch, or the command
+  name); jobs on the same lane are serialized, different lanes overlap;
+- global mutators (today, sequence, backup, ...) take the `*` lane and wait
+  for every other write to finish.
+
+Each job gets its own output capture (the worker is single-job), a timeout
+and cancellation. Only cancellation kills the worker (it is replaced); a job
+that outlives its timeout is detached instead: the caller is told it is still
+running, and the job keeps its worker and lane until it finishes, so a
+`backup` or `today reschedule` is never stopped halfway through writing user
+data. Queue depth, running jobs and per-command latency histograms are
+exported via `metrics()`.
+
+`run_line()` takes a raw command line (or a .chs script path) instead; the
+worker parses it with the console's own parser, so variables and key:value
+properties behave exactly as on the command line.
+
+Protocol: one JSON object per line on the worker's stdin/stdout. The worker
+moves its real stdout to a private descriptor so stray prints from commands
+or child processes cannot corrupt the stream.
+"""
+
+import io
+import itertools
+import json
+import os
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+READ_ONLY_COMMANDS = {
+    "autocomplete", "count", "diff", "docs", "echo", "find", "get", "help",
+    "list", "next", "quickwins", "search", "tree", "view",
+}
+# Read-only when called bare (without properties other than HELP_PROPERTIES,
+# e.g. `status energy:low` sets status) or with one of READ_SUBCOMMANDS first.
+SUBCOMMAND_READ_COMMANDS = {"inventory", "points", "profile", "settings", "skills", "status", "timer", "trick", "vars"}
+READ_SUBCOMMANDS = {"show", "list", "view", "get", "status", "history", "search", "where", "info"}
+HELP_PROPERTIES = {"help", "h"}
+# Commands that rewrite schedules, mirrors or many item types at once.
+GLOBAL_WRITE_COMMANDS = {
+    "archive", "backup", "bulk", "clean", "import", "restore", "sequence",
+    "start", "today", "tomorrow", "undo",
+}
+GLOBAL_LANE = "*"
+
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+
+def _is_item_type(token: str) -> bool:
+    t = str(token or "").strip().lower().replace(" ", "_")
+    if not t or not t.replace("_", "").isalnum():
+        return False
+    modules_dir = os.path.join(ROOT_DIR, "modules")
+    return os.path.isdir(os.path.join(modules_dir, t)) or (
+        t.endswith("s") and os.path.isdir(os.path.join(modules_dir, t[:-1]))
+    )
+
+
+def classify_command(command_name: str, args_list: List[Any],
+                     properties: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[str]]:
+    """Return ("read", None) or ("write", lane) for a console invocation."""
+    cmd = str(command_name or "").strip().lower()
+    args = [str(a).strip() for a in (args_list or [])]
+    first = args[0].lower() if args else ""
+    setting = any(str(k).strip().lower() not in HELP_PROPERTIES for k in (properties or {}))
+    if cmd.endswith(".chs"):
+        # Scripts can touch anything.
+        return "write", GLOBAL_LANE
+    if cmd in READ_ONLY_COMMANDS:
+        return "read", None
+    if cmd in SUBCOMMAND_READ_COMMANDS and (first in READ_SUBCOMMANDS or not (first or setting)):
+        return "read", None
+    if cmd in GLOBAL_WRITE_COMMANDS:
+        return "write", GLOBAL_LANE
+    if cmd in ("set", "unset") and first == "var":
+        return "write", "vars"
+    if first and _is_item_type(first):
+        t = first.replace(" ", "_")
+        if t.endswith("s") and not os.path.isdir(os.path.join(ROOT_DIR, "modules", t)):
+            t = t[:-1]
+        return "write", f"type:{t}"
+    return "write", f"cmd:{cmd}"
+
+
+class _LaneGate:
+    """Admission control: reads always pass, writes serialize per lane, `*` is exclusive."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._running: Dict[str, int] = {}
+
+    def _allowed(self, lane: str) -> bool:
+        if self._running.get(GLOBAL_LANE):
+            return False
+        if lane == GLOBAL_LANE:
+            return not any(self._running.values())
+        return not self._running.get(lane)
+
+    def acquire(self, lane: str, job: "_Job") -> bool:
+        with self._cond:
+            while not self._allowed(lane):
+                if job.cancelled.is_set() or time.monotonic() >= job.deadline:
+                    return False
+                self._cond.wait(timeout=0.1)
+            self._running[lane] = self._running.get(lane, 0) + 1
+            return True
+
+    def release(self, lane: str) -> None:
+        with self._cond:
+            self._running[lane] = max(0, self._running.get(lane, 0) - 1)
+            if not self._running[lane]:
+                self._running.pop(lane, None)
+            self._cond.notify_all()
+
+
+class _Job:
+    def __init__(self, job_id: int, command_name: str, args_list: List[Any], mode: str, lane: Optional[str], timeout: float):
+        self.id = job_id
+        self.command_name = command_name
+        self.args_list = args_list
+        self.mode = mode
+        self.lane = lane
+        self.state = "queued"
+        self.submitted = time.monotonic()
+        self.timeout = timeout
+        self.deadline = self.submitted + timeout
+        self.cancelled = threading.Event()
+        self.worker: Optional["_Worker"] = None
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "command": self.command_name,
+            "args": [str(a) for a in self.args_list],
+            "mode": self.mode,
+            "lane": self.lane,
+            "state": self.state,
+            "elapsed_ms": int((time.monotonic() - self.submitted) * 1000),
+        }
+
+
+class _Worker:
+    def __init__(self, root_dir: str):
+        env = dict(os.environ)
+        env["PYTHONIOENCODING"] = "utf-8"
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "utilities.console_pool", "--worker"],
+            cwd=root_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Command output is captured per job; the console's startup banner/clear codes are not wanted here.
+            stderr=subprocess.DEVNULL,
+            env=env,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.replies: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._pump, name="chronos-console-pool-reader", daemon=True).start()
+
+    def _pump(self) -> None:
+        try:
+            for line in self.proc.stdout:  # type: ignore[union-attr]
+                self.replies.put(line)
+        except Exception:
+            pass
+        self.replies.put(None)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def send(self, payload: Dict[str, Any]) -> None:
+        self.proc.stdin.write(json.dumps(payload, default=str) + "\n")  # type: ignore[union-attr]
+        self.proc.stdin.flush()  # type: ignore[union-attr]
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+        except Exception:
+            pass
+
+
+class ConsolePool:
+    def __init__(self, root_dir: str = ROOT_DIR, size: Optional[int] = None):
+        self.root_dir = root_dir
+        if size is None:
+            size = min(4, os.cpu_count() or 1)
+        self.size = max(1, int(size))
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(None)  # slots; workers spawn lazily
+        self._gate = _LaneGate()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, _Job] = {}
+        self._histograms: Dict[str, Dict[str, Any]] = {}
+        self._totals = {"completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0}
+
+    # Execution -----------------------------------------------------------------
+
+    def run(self, command_name: str, args_list: List[Any], properties: Optional[Dict[str, Any]] = None,
+            timeout: float = 120.0, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run one command and wait for it. Returns a dict with ok/stdout/stderr,
+        the worker's variable map (`vars`) and `job_id`.
+        """
+        mode, lane = classify_command(command_name, args_list, properties)
+        job = _Job(next(self._ids), command_name, list(args_list or []), mode, lane, timeout)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            return self._execute(job, dict(properties or {}), dict(variables or {}))
+        finally:
+            self._forget(job)
+
+    def run_line(self, line: str, timeout: float = 120.0, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Like run(), for an unparsed command line or a .chs script path."""
+        try:
+            tokens = shlex.split(str(line or ""))
+        except ValueError:
+            tokens = str(line or "").split()
+        if not tokens:
+            return {"ok": False, "stdout": "", "stderr": "Empty command.", "vars": None, "job_id": None}
+        mode, lane = classify_command(tokens[0], tokens[1:])
+        job = _Job(next(self._ids), tokens[0], tokens[1:], mode, lane, timeout)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            return self._execute(job, {}, dict(variables or {}), line=str(line))
+        finally:
+            self._forget(job)
+
+    def _forget(self, job: _Job) -> None:
+        if job.state == "detached":
+            return  # _follow() drops it when the command ends
+        with self._lock:
+            self._jobs.pop(job.id, None)
+
+    def _execute(self, job: _Job, properties: Dict[str, Any], variables: Dict[str, Any],
+                 line: Optional[str] = None) -> Dict[str, Any]:
+        if job.lane is not None and not self._gate.acquire(job.lane, job):
+            return self._finish(job, self._abort_result(job))
+        detached = False
+        try:
+            worker = self._checkout(job)
+            if worker is None:
+                return self._finish(job, self._abort_result(job))
+            job.worker = worker
+            job.state = "running"
+            started = time.monotonic()
+            try:
+                if line is not None:
+                    worker.send({"line": line, "vars": variables})
+                else:
+                    worker.send({
+                        "command_name": job.command_name,
+                        "args_list": job.args_list,
+                        "properties": properties,
+                        "vars": variables,
+                    })
+                result = self._await_reply(job, worker)
+            except Exception as e:
+                result = {"ok": False, "stdout": "", "stderr": f"Console worker failed: {e}", "_kill": True}
+            if result.get("_detach"):
+                # Past the deadline: report back, but let the command finish on its worker and lane.
+                detached = True
+                finished = self._finish(job, result)
+                job.state = "detached"
+                threading.Thread(
+                    target=self._follow, args=(job, worker, started),
+                    name="chronos-console-pool-detached", daemon=True,
+                ).start()
+                return finished
+            self._release_worker(worker, result)
+            self._observe(job.command_name, (time.monotonic() - started) * 1000.0)
+            return self._finish(job, result)
+        finally:
+            if job.lane is not None and not detached:
+                self._gate.release(job.lane)
+
+    def _release_worker(self, worker: _Worker, result: Dict[str, Any]) -> None:
+        if result.get("_kill"):
+            worker.kill()
+            worker = None
+        self._idle.put(worker)
+
+    def _follow(self, job: _Job, worker: _Worker, started: float) -> None:
+        """Wait out a detached job, then free its worker and lane."""
+        try:
+            result = self._await_reply(job, worker, detached=True)
+        except Exception:
+            result = {"_kill": True}
+        try:
+            self._release_worker(worker, result)
+            self._observe(job.command_name, (time.monotonic() - started) * 1000.0)
+            if result.get("_cancelled"):
+                with self._lock:
+                    self._totals["cancelled"] += 1
+        finally:
+            job.state = "done"
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            if job.lane is not None:
+                self._gate.release(job.lane)
+
+    def _checkout(self, job: _Job) -> Optional[_Worker]:
+        while True:
+            if job.cancelled.is_set():
+                return None
+            remaining = job.deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                worker = self._idle.get(timeout=min(0.1, remaining))
+            except queue.Empty:
+                continue
+            if worker is not None and worker.alive():
+                return worker
+            try:
+                return _Worker(self.root_dir)
+            except Exception:
+                self._idle.put(None)
+                raise
+
+    def _await_reply(self, job: _Job, worker: _Worker, detached: bool = False) -> Dict[str, Any]:
+        while True:
+            if job.cancelled.is_set():
+                return {"ok": False, "stdout": "", "stderr": "Command cancelled.", "_kill": True, "_cancelled": True}
+            remaining = job.deadline - time.monotonic()
+            if remaining <= 0 and not detached:
+                return {
+                    "ok": False, "stdout": "", "_detach": True, "_timed_out": True,
+                    "stderr": (
+                        f"Command still running after {job.timeout:g}s; it continues in the background "
+                        f"as job {job.id} (cancel it to stop it)."
+                    ),
+                }
+            try:
+                line = worker.replies.get(timeout=0.1 if detached else min(0.1, remaining))
+            except queue.Empty:
+                continue
+            if line is None:
+                return {"ok": False, "stdout": "", "stderr": "Console worker exited unexpectedly.", "_kill": True}
+            try:
+                reply = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(reply, dict):
+                return reply
+
+    def _abort_result(self, job: _Job) -> Dict[str, Any]:
+        if job.cancelled.is_set():
+            return {"ok": False, "stdout": "", "stderr": "Command cancelled.", "_cancelled": True}
+        return {"ok": False, "stdout": "", "stderr": "Command queue timed out.", "_timed_out": True}
+
+    def _finish(self, job: _Job, result: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            if result.get("_cancelled"):
+                self._totals["cancelled"] += 1
+            elif result.get("_timed_out"):
+                self._totals["timed_out"] += 1
+            elif result.get("ok"):
+                self._totals["completed"] += 1
+            else:
+                self._totals["failed"] += 1
+        job.state = "done"
+        return {
+            "ok": bool(result.get("ok")),
+            "stdout": str(result.get("stdout") or ""),
+            "stderr": str(result.get("stderr") or ""),
+            "vars": result.get("vars") if isinstance(result.get("vars"), dict) else None,
+            "job_id": job.id,
+        }
+
+    # Control / metrics ------------------------------------------------------
+
+    def cancel(self, job_id: int) -> bool:
+        with self._lock:
+            job = self._jobs.get(int(job_id))
+        if job is None:
+            return False
+        job.cancelled.set()
+        return True
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.describe() for job in self._jobs.values()]
+
+    def _observe(self, command_name: str, elapsed_ms: float) -> None:
+        key = str(command_name or "").strip().lower() or "?"
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = {"count": 0, "sum_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+                self._histograms[key] = hist
+            hist["count"] += 1
+            hist["sum_ms"] += elapsed_ms
+            hist["max_ms"] = max(hist["max_ms"], elapsed_ms)
+            for idx, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    hist["buckets"][idx] += 1
+                    break
+            else:
+                hist["buckets"][-1] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            histograms = {}
+            for name, hist in sorted(self._histograms.items()):
+                bounds = [str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"]
+                histograms[name] = {
+                    "count": hist["count"],
+                    "avg_ms": round(hist["sum_ms"] / max(1, hist["count"]), 2),
+                    "max_ms": round(hist["max_ms"], 2),
+                    "buckets_ms": dict(zip(bounds, hist["buckets"])),
+                }
+            totals = dict(self._totals)
+        return {
+            "workers": self.size,
+            "queue_depth": sum(1 for j in jobs if j.state == "queued"),
+            "running": sum(1 for j in jobs if j.state == "running"),
+            "detached": sum(1 for j in jobs if j.state == "detached"),
+            "totals": totals,
+            "latency": histograms,
+        }
+
+    def shutdown(self) -> None:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.kill()
+
+
+# Worker process --------------------------------------------------------------
+
+
+def _run_line(console, line: str) -> bool:
+    parts = console._split_args_safe(line)
+    if not parts:
+        return False
+    if str(parts[0]).lower().endswith(".chs"):
+        return bool(console.execute_script(os.path.join(ROOT_DIR, parts[0])))
+    command, args, properties = console.parse_input(parts)
+    if not command:
+        return False
+    console.run_command(command, args, properties)
+    return True
+
+
+def _worker_main() -> int:
+    # Keep the protocol stream private; anything else writing to fd 1 lands on stderr.
+    proto = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    # Likewise for stdin: a command calling input() must not eat the next job.
+    jobs_in = os.fdopen(os.dup(sys.stdin.fileno()), "r", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, sys.stdin.fileno())
+    os.close(devnull)
+    sys.stdin = io.StringIO("")
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    commands_dir = os.path.join(ROOT_DIR, "commands")
+    if commands_dir not in sys.path:
+        sys.path.insert(0, commands_dir)
+    from modules import console as ConsoleModule  # type: ignore  # preload registry
+    from modules import item_manager  # type: ignore  # noqa: F401
+    from modules import variables as Variables  # type: ignore
+
+    for line in jobs_in:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except Exception:
+            continue
+        Variables._VARS.clear()
+        Variables._VARS.update({str(k): str(v) for k, v in (job.get("vars") or {}).items()})
+        old_out, old_err = sys.stdout, sys.stderr
+        out_buf, err_buf = io.StringIO(), io.StringIO()
+        sys.stdout, sys.stderr = out_buf, err_buf
+        ok = True
+        try:
+            if job.get("line") is not None:
+                ok = _run_line(ConsoleModule, str(job.get("line")))
+            else:
+                ConsoleModule.run_command(job.get("command_name"), job.get("args_list") or [], job.get("properties") or {})
+        except Exception as e:
+            ok = False
+            print(f"Error: {e}")
+        finally:
+            sys.stdout, sys.stderr = old_out, old_err
+        reply = {
+            "ok": ok,
+            "stdout": out_buf.getvalue().strip(),
+            "stderr": err_buf.getvalue().strip(),
+            "vars": dict(Variables._VARS),
+        }
+        proto.write(json.dumps(reply, default=str) + "\n")
+        proto.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    if "--worker" in sys.argv[1:]:
+        sys.exit(_worker_main())
@@ -44,6 +44,12 @@ function shownToday() {
 
 async function fetchItems(types) {
   const base = apiBase();
+  try {
+    const qs = `types=${encodeURIComponent(types.join(','))}&days=${LOOKAHEAD_DAYS}`;
+    const resp = await fetch(`${base}/api/items/due?${qs}`);
+    const payload = await resp.json().catch(() => ({}));
+    if (resp.ok && payload.ok !== false && Array.isArray(payload.items)) return payload.items;
+  } catch { /* fall back to per-type listing */ }
   let items = [];
   for (const type of types) {
     try {
@@ -29,6 +29,7 @@ if COMMANDS_DIR not in sys.path:
 DASHBOARD_DIR = os.path.abspath(os.path.join(ROOT_DIR, "utilities", "dashboard"))
 
 from modules.logger import Logger
+from modules import write_coordinator
 
 from utilities.dashboard_matrix import (
     compute_matrix,
@@ -4258,11 +4259,8 @@ def _trick_note_surface_action(surface_id, action, actor):
 
 
 def _trick_surface_exists(surface_id):
-    reg = _trick_registry()
-    for s in reg.get("surfaces", []) if isinstance(reg, dict) else []:
-        if str(s.get("id") or "").lower() == surface_id:
-            return True
-    return False
+    from utilities import registry_builder
+    return registry_builder.load_trick_index().kind(surface_id) == "surface"
 
 
 def _trick_surface_entry(surface_id):
@@ -6681,13 +6679,65 @@ def _ensure_console_worker():
     return thr
 
 
+# Commands that must touch this process (dashboard/listener/tray state) stay on the in-process worker.
+_CONSOLE_IN_PROCESS_COMMANDS = {"dashboard", "listener", "tray", "cls", "clear"}
+_CONSOLE_POOL = None
+_CONSOLE_POOL_LOCK = threading.Lock()
+
+
+def _console_pool():
+    """Shared ConsolePool, or None when disabled (CHRONOS_CONSOLE_WORKERS=0)."""
+    global _CONSOLE_POOL
+    with _CONSOLE_POOL_LOCK:
+        if _CONSOLE_POOL is None:
+            raw = str(os.environ.get("CHRONOS_CONSOLE_WORKERS", "") or "").strip()
+            try:
+                size = int(raw) if raw else min(4, os.cpu_count() or 1)
+            except Exception:
+                size = min(4, os.cpu_count() or 1)
+            if size <= 0:
+                return None
+            from utilities.console_pool import ConsolePool
+            _CONSOLE_POOL = ConsolePool(ROOT_DIR, size=size)
+        return _CONSOLE_POOL
+
+
+def _run_console_command_pooled(pool, command_name, args_list, properties=None):
+    from modules import variables as _V
+
+    sent = dict(_V._VARS)
+    result = pool.run(command_name, list(args_list or []), dict(properties or {}), timeout=120, variables=sent)
+    returned = result.get("vars")
+    if isinstance(returned, dict):
+        # Apply only what this job changed so concurrent jobs don't clobber each other.
+        for k, v in returned.items():
+            if sent.get(k) != v:
+                _V._VARS[k] = v
+        for k in sent:
+            if k not in returned:
+                _V._VARS.pop(k, None)
+    return result["ok"], result["stdout"], result["stderr"]
+
+
 def run_console_command(command_name, args_list, properties=None):
     """
     Invoke the Console command pipeline.
-    Preferred: in-process execution through a single-worker queue.
+    Preferred: the console worker pool (utilities/console_pool.py), which runs
+    reads concurrently and serializes writes per item type.
+    Next: in-process execution through a single-worker queue.
     Fallback: subprocess execution of Console via Python.
     Returns (ok, stdout, stderr).
     """
+    if str(command_name or "").strip().lower() not in _CONSOLE_IN_PROCESS_COMMANDS:
+        try:
+            pool = _console_pool()
+            if pool is not None:
+                return _run_console_command_pooled(pool, command_name, args_list, properties)
+        except Exception as e:
+            try:
+                Logger.warn(f"Console pool unavailable, using in-process worker: {e}")
+            except Exception:
+                pass
     # Try in-process via single worker to avoid shared stdout/stderr races.
     try:
         _ensure_console_worker()
@@ -6737,6 +6787,129 @@ def run_console_command(command_name, args_list, properties=None):
         return ok, (out or '').strip(), (err or '').strip()
 
 
+def _engine_log_payload(qs):
+    """
+    /api/logs: last `limit` lines of logs/engine.log, or only what was appended
+    since `cursor`. Optional `level` (comma list, e.g. error,warn) and `q`
+    substring filters are applied while scanning.
+    """
+    from utilities.log_tail import read_log
+
+    def _q(key, default=""):
+        return str((qs.get(key) or [default])[0] or default).strip()
+
+    try:
+        limit = int(_q("limit", "50"))
+    except Exception:
+        limit = 50
+    levels = [lv for lv in _q("level").split(",") if lv.strip()]
+    result = read_log(
+        os.path.join(ROOT_DIR, "logs", "engine.log"),
+        limit=limit,
+        cursor=_q("cursor") or None,
+        levels=levels,
+        contains=_q("q") or None,
+    )
+    return {"ok": True, **result}
+
+
+def _status_history_payload(qs):
+    """
+    /api/status/history: status samples between `start` and `end` (ISO date or
+    datetime; default the last 7 days), optionally for `indicator` (comma
+    list). With `bucket` (minutes) and a single indicator, returns downsampled
+    buckets instead; with `at`, the value of each indicator at that time.
+    """
+    from modules import status_store
+
+    def _q(key, default=""):
+        return str((qs.get(key) or [default])[0] or default).strip()
+
+    indicators = [i.strip() for i in _q("indicator").split(",") if i.strip()] or None
+    if _q("at"):
+        return {"ok": True, "at": _q("at"), "status": status_store.latest_at(_q("at"), indicators)}
+    end = _q("end") or datetime.now().isoformat(timespec="seconds")
+    start = _q("start") or (datetime.now() - timedelta(days=7)).isoformat(timespec="seconds")
+    if _q("bucket"):
+        if not indicators or len(indicators) != 1:
+            raise ValueError("bucket requires exactly one indicator")
+        buckets = status_store.downsample(indicators[0], start, end, int(_q("bucket")))
+        return {"ok": True, "indicator": indicators[0], "buckets": buckets}
+    samples = status_store.history(start, end, indicators, include_prior=_q("prior").lower() in ("1", "true", "yes"))
+    return {"ok": True, "start": start, "end": end, "samples": samples}
+
+
+def _due_items_payload(qs):
+    """
+    /api/items/due: items due within `days` (default 3) from the deadline
+    index, optionally filtered by `types` (comma list) and `minutes` (max
+    duration). `overdue=0` leaves out items due before today.
+    """
+    from modules import due_index
+
+    def _q(key, default=""):
+        return str((qs.get(key) or [default])[0] or default).strip()
+
+    types = [t.strip() for t in _q("types").split(",") if t.strip()] or None
+    exclude = [s.strip() for s in _q("exclude", "done,completed,complete").split(",") if s.strip()]
+    minutes = int(_q("minutes")) if _q("minutes") else None
+    rows = due_index.due_within(
+        int(_q("days", "3")),
+        fields=("deadline", "due_date", "due_at"),
+        include_overdue=_q("overdue", "1").lower() not in ("0", "false", "no"),
+        max_minutes=minutes,
+        types=types,
+        exclude_statuses=exclude,
+    )
+    items = []
+    for row in rows:
+        items.append({
+            "name": row.get("name"),
+            "type": row.get("item_type"),
+            "status": row.get("status"),
+            "minutes": row.get("minutes"),
+            "deadline": row.get("deadline"),
+            "due_date": row.get("due_date"),
+            "due": row.get("due_raw"),
+            "due_kind": row.get("due_kind"),
+            "due_at": row.get("due_at"),
+        })
+    return {"ok": True, "items": items}
+
+
+def _graph_references_payload(qs):
+    """
+    /api/graph/references: forward (`children`) and reverse (`parents`)
+    references of `type`/`name` from the reference graph index. `cycles=1`
+    adds every reference cycle in the library.
+    """
+    from modules import reference_graph
+
+    def _q(key, default=""):
+        return str((qs.get(key) or [default])[0] or default).strip()
+
+    item_type, name = _q("type").lower(), _q("name")
+    payload = {"ok": True}
+    if name:
+        if not item_type:
+            raise ValueError("type is required with name")
+
+        def _edge(ref):
+            node = ref.get("node") or {}
+            return {"id": ref["id"], "type": ref["type"], "name": ref["name"], "field": ref["field"],
+                    "status": node.get("status"), "exists": bool(node)}
+
+        with reference_graph.Graph() as graph:
+            node = graph.node(item_type, name)
+            payload["node"] = {"id": node["id"], "type": node["item_type"], "name": node["name"],
+                               "status": node["status"]} if node else None
+            payload["children"] = [_edge(ref) for ref in graph.children(item_type, name)]
+            payload["parents"] = [_edge(ref) for ref in graph.parents(item_type, name)]
+    if _q("cycles").lower() in ("1", "true", "yes"):
+        payload["cycles"] = reference_graph.cycles(fresh=not name)
+    return payload
+
+
 def _prepare_sleep_gate(command_name, args_list, properties=None):
     props = dict(properties or {})
     interrupt = build_sleep_interrupt(command_name, args_list, props)
@@ -6848,6 +7021,11 @@ DEFAULT_STICKY_NOTE_COLOR = "amber"
 MEDIA_ROOT = os.path.join(ROOT_DIR, "user", "Media")
 MP3_DIR = os.path.join(MEDIA_ROOT, "mp3")
 PLAYLIST_DIR = os.path.join(MEDIA_ROOT, "playlists")
+MEDIA_INDEX_PATH = os.path.join(MEDIA_ROOT, "media_index.json")
+MEDIA_INDEX_VERSION = 1
+MEDIA_INDEX_SYNC_LIMIT = 25
+_MEDIA_INDEX_LOCK = threading.Lock()
+_MEDIA_INDEX = {"loaded": False, "entries": {}, "building": False}
 DEFAULT_PLAYLIST_SLUG = "default"
 CALENDAR_OVERLAY_PRESET_DIR = os.path.join(ROOT_DIR, "presets", "calendar_overlays")
 
@@ -7093,14 +7271,17 @@ def _normalize_track_path(path):
     return s
 
 
-def _read_track_metadata(mp3_path):
+def _track_sidecar_paths(mp3_path):
     base = os.path.splitext(mp3_path)[0]
-    candidates = [
+    return [
         base + ".yml",
         base + ".yaml",
         os.path.join(os.path.dirname(mp3_path), "metadata.yml"),
     ]
-    for candidate in candidates:
+
+
+def _read_track_metadata(mp3_path):
+    for candidate in _track_sidecar_paths(mp3_path):
         if os.path.exists(candidate):
             try:
                 with open(candidate, "r", encoding="utf-8") as fh:
@@ -7181,38 +7362,171 @@ def _write_playlist(slug, data):
         yaml.safe_dump(safe_data, fh, allow_unicode=True, sort_keys=False)
 
 
-def _list_mp3_files():
-    _ensure_media_dirs()
-    files = []
+def _media_index_load():
+    """Load the persisted media index once per process (caller holds the lock)."""
+    if _MEDIA_INDEX["loaded"]:
+        return _MEDIA_INDEX["entries"]
+    entries = {}
+    try:
+        with open(MEDIA_INDEX_PATH, "r", encoding="utf-8") as fh:
+            data = json.load(fh) or {}
+        if isinstance(data, dict) and data.get("version") == MEDIA_INDEX_VERSION:
+            entries = data.get("tracks") or {}
+    except Exception:
+        entries = {}
+    _MEDIA_INDEX["entries"] = entries if isinstance(entries, dict) else {}
+    _MEDIA_INDEX["loaded"] = True
+    return _MEDIA_INDEX["entries"]
+
+
+def _media_index_save(entries):
+    try:
+        tmp = MEDIA_INDEX_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"version": MEDIA_INDEX_VERSION, "tracks": entries}, fh)
+        os.replace(tmp, MEDIA_INDEX_PATH)
+    except Exception:
+        pass
+
+
+def _track_sidecar_fingerprint(full):
+    fp = []
+    for candidate in _track_sidecar_paths(full):
+        try:
+            fp.append(os.path.getmtime(candidate))
+        except OSError:
+            fp.append(None)
+    return fp
+
+
+def _scan_mp3_dir():
+    """Walk the MP3 folder and return {rel_path: (full_path, stat)} without reading files."""
+    found = {}
     mp3_root = os.path.abspath(MP3_DIR)
     for root, _, filenames in os.walk(mp3_root):
         for filename in filenames:
             if not filename.lower().endswith(".mp3"):
                 continue
             full = os.path.join(root, filename)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
             if not os.path.isfile(full):
                 continue
             rel_path = os.path.relpath(full, mp3_root).replace("\\", "/")
-            safe_rel = _normalize_track_path(rel_path)
-            info = {
-                "id": safe_rel,
-                "file": safe_rel,
-                "title": os.path.splitext(filename)[0],
-                "artist": None,
-                "album": None,
-                "length": None,
-                "size": os.path.getsize(full),
-                "mtime": datetime.fromtimestamp(os.path.getmtime(full)).isoformat(timespec="seconds"),
-                "url": f"/media/mp3/{quote(safe_rel, safe='/')}",
-            }
-            meta = _read_id3_metadata(full)
-            for key, value in meta.items():
-                if value:
-                    info[key] = value
-            extra = _read_track_metadata(full)
-            if isinstance(extra, dict):
-                info.update(extra)
-            files.append(info)
+            found[_normalize_track_path(rel_path)] = (full, st)
+    return found
+
+
+def _index_track(full, st, prev):
+    """Build an index entry, reusing tag/sidecar data whose fingerprint is unchanged."""
+    sidecar_fp = _track_sidecar_fingerprint(full)
+    prev = prev if isinstance(prev, dict) else {}
+    same_file = prev.get("size") == st.st_size and prev.get("mtime") == st.st_mtime
+    entry = {
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+        "sidecar": sidecar_fp,
+        "id3": prev.get("id3") if same_file and "id3" in prev else _read_id3_metadata(full),
+        "extra": prev.get("extra") if prev.get("sidecar") == sidecar_fp and "extra" in prev else _read_track_metadata(full),
+    }
+    return entry
+
+
+def _entry_is_fresh(entry, full, st):
+    return (
+        isinstance(entry, dict)
+        and entry.get("size") == st.st_size
+        and entry.get("mtime") == st.st_mtime
+        and entry.get("sidecar") == _track_sidecar_fingerprint(full)
+    )
+
+
+def _media_index_fill(scan):
+    """Index every stale track in `scan` and persist the result."""
+    with _MEDIA_INDEX_LOCK:
+        current = dict(_media_index_load())
+    updated = {}
+    for rel, (full, st) in scan.items():
+        prev = current.get(rel)
+        if _entry_is_fresh(prev, full, st):
+            updated[rel] = prev
+        else:
+            updated[rel] = _index_track(full, st, prev)
+    with _MEDIA_INDEX_LOCK:
+        _MEDIA_INDEX["entries"] = updated
+        _MEDIA_INDEX["building"] = False
+        _media_index_save(updated)
+    return updated
+
+
+def _media_index_background(scan):
+    try:
+        _media_index_fill(scan)
+    except Exception:
+        with _MEDIA_INDEX_LOCK:
+            _MEDIA_INDEX["building"] = False
+
+
+def _media_index_entries():
+    """
+    Return {rel_path: (full, stat, entry_or_None)} for the current MP3 folder.
+
+    Only new or changed files (by size, mtime and sidecar mtimes) are re-read.
+    When more than MEDIA_INDEX_SYNC_LIMIT files are stale (first use of a large
+    library), tagging continues in a background thread and the stale tracks are
+    returned with filename-only metadata until it finishes.
+    """
+    _ensure_media_dirs()
+    scan = _scan_mp3_dir()
+    with _MEDIA_INDEX_LOCK:
+        entries = _media_index_load()
+        stale = [rel for rel, (full, st) in scan.items() if not _entry_is_fresh(entries.get(rel), full, st)]
+        removed = [rel for rel in entries if rel not in scan]
+        building = _MEDIA_INDEX["building"]
+        if len(stale) > MEDIA_INDEX_SYNC_LIMIT and not building:
+            _MEDIA_INDEX["building"] = True
+            threading.Thread(target=_media_index_background, args=(scan,), daemon=True).start()
+            building = True
+    if not building and (stale or removed):
+        entries = _media_index_fill(scan)
+    return {rel: (full, st, entries.get(rel)) for rel, (full, st) in scan.items()}
+
+
+def _track_info(rel, full, st, entry):
+    info = {
+        "id": rel,
+        "file": rel,
+        "title": os.path.splitext(os.path.basename(full))[0],
+        "artist": None,
+        "album": None,
+        "length": None,
+        "size": st.st_size,
+        "mtime": datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds"),
+        "url": f"/media/mp3/{quote(rel, safe='/')}",
+    }
+    if isinstance(entry, dict):
+        for key, value in (entry.get("id3") or {}).items():
+            if value:
+                info[key] = value
+        extra = entry.get("extra")
+        if isinstance(extra, dict):
+            info.update(extra)
+    return info
+
+
+def _media_library_map():
+    return {rel: _track_info(rel, full, st, entry) for rel, (full, st, entry) in _media_index_entries().items()}
+
+
+def _media_index_building():
+    with _MEDIA_INDEX_LOCK:
+        return bool(_MEDIA_INDEX["building"])
+
+
+def _list_mp3_files():
+    files = list(_media_library_map().values())
     files.sort(key=lambda row: (row.get("title") or row.get("file") or "").lower())
     return files
 
@@ -7304,8 +7618,10 @@ def _serialize_playlist(slug, library=None):
     playlist = _read_playlist(slug)
     if not playlist:
         return None
-    lib = library if library is not None else _list_mp3_files()
-    lib_map = {track["file"]: track for track in lib}
+    if library is not None:
+        lib_map = {track["file"]: track for track in library}
+    else:
+        lib_map = _media_library_map()
     resolved = []
     for entry in playlist.get("tracks") or []:
         file_name = None
@@ -7586,7 +7902,7 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         if parsed.path == "/api/media/mp3":
             try:
                 tracks = _list_mp3_files()
-                self._write_json(200, {"ok": True, "files": tracks})
+                self._write_json(200, {"ok": True, "files": tracks, "indexing": _media_index_building()})
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Failed to list MP3 files: {e}"})
             return
@@ -7594,9 +7910,8 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             try:
                 qs = parse_qs(parsed.query or "")
                 slug = (qs.get("name") or qs.get("slug") or [""])[0].strip()
-                library = _list_mp3_files()
                 if slug:
-                    playlist = _serialize_playlist(slug, library)
+                    playlist = _serialize_playlist(slug)
                     if not playlist:
                         self._write_json(404, {"ok": False, "error": "Playlist not found"})
                     else:
@@ -7775,13 +8090,8 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                 if not os.path.exists(docs_root):
                     self._write_json(404, {"ok": False, "error": "Docs folder not found"})
                     return
-                paths = []
-                for root_dir, _dirs, files in os.walk(docs_root):
-                    for fname in files:
-                        rel = os.path.relpath(os.path.join(root_dir, fname), docs_root)
-                        rel = rel.replace("\\", "/")
-                        paths.append(rel)
-                paths.sort(key=lambda p: p.lower())
+                from modules.sequence import docs_index as DocsIndex
+                paths = DocsIndex.list_paths()
                 self._write_json(200, {"ok": True, "paths": paths})
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Failed to list docs: {e}"})
@@ -7820,29 +8130,9 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                 if not os.path.exists(docs_root):
                     self._write_json(404, {"ok": False, "error": "Docs folder not found"})
                     return
-                needle = query.lower()
-                results = []
-                for root_dir, _dirs, files in os.walk(docs_root):
-                    for fname in files:
-                        path = os.path.join(root_dir, fname)
-                        try:
-                            with open(path, 'r', encoding='utf-8') as f:
-                                for idx, line in enumerate(f, start=1):
-                                    if needle in line.lower():
-                                        rel = os.path.relpath(path, docs_root).replace("\\", "/")
-                                        results.append({
-                                            "path": rel,
-                                            "line": idx,
-                                            "text": line.strip()[:240],
-                                        })
-                                        if len(results) >= limit:
-                                            raise StopIteration
-                        except StopIteration:
-                            raise
-                        except Exception:
-                            continue
-                self._write_json(200, {"ok": True, "results": results})
-            except StopIteration:
+                from modules.sequence import docs_index as DocsIndex
+                prefix = (qs.get("prefix") or [""])[0].strip() or None
+                results = DocsIndex.search(query, limit=limit, prefix=prefix)
                 self._write_json(200, {"ok": True, "results": results})
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Failed to search docs: {e}"})
@@ -8030,6 +8320,14 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Trends error: {e}"})
             return
+        if parsed.path == "/api/status/history":
+            try:
+                self._write_json(200, _status_history_payload(parse_qs(parsed.query or "")))
+            except ValueError as e:
+                self._write_json(400, {"ok": False, "error": str(e)})
+            except Exception as e:
+                self._write_json(500, {"ok": False, "error": f"Failed to read status history: {e}"})
+            return
         if parsed.path == "/api/status/current":
             try:
                 status_path = status_current_path()
@@ -9132,6 +9430,14 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Registry error: {e}"})
             return
+        if parsed.path == "/api/items/due":
+            try:
+                self._write_json(200, _due_items_payload(parse_qs(parsed.query or "")))
+            except ValueError as e:
+                self._write_json(400, {"ok": False, "error": str(e)})
+            except Exception as e:
+                self._write_json(500, {"ok": False, "error": f"Failed to read due items: {e}"})
+            return
         if parsed.path == "/api/items":
             # Query params: type, q, props (csv key:value)
             try:
@@ -9546,23 +9852,23 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Happiness overlay error: {e}"})
             return
+        if parsed.path == "/api/console/jobs":
+            pool = _CONSOLE_POOL
+            if pool is None:
+                self._write_json(200, {"ok": True, "enabled": False, "jobs": []})
+            else:
+                self._write_json(200, {"ok": True, "enabled": True, "jobs": pool.jobs()})
+            return
+        if parsed.path == "/api/console/metrics":
+            pool = _CONSOLE_POOL
+            if pool is None:
+                self._write_json(200, {"ok": True, "enabled": False, "metrics": {}})
+            else:
+                self._write_json(200, {"ok": True, "enabled": True, "metrics": pool.metrics()})
+            return
         if parsed.path == "/api/logs":
             try:
-                log_path = os.path.join(ROOT_DIR, "logs", "engine.log")
-                if not os.path.exists(log_path):
-                    self._write_json(200, {"ok": True, "logs": []})
-                    return
-                qs = parse_qs(parsed.query or "")
-                limit = 50
-                try:
-                    limit = int((qs.get("limit") or [50])[0])
-                except Exception:
-                    pass
-                lines = []
-                with open(log_path, "r", encoding="utf-8") as f:
-                    all_lines = f.readlines()
-                    lines = [ln.strip() for ln in all_lines[-limit:]]
-                self._write_json(200, {"ok": True, "logs": lines})
+                self._write_json(200, _engine_log_payload(parse_qs(parsed.query or "")))
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Failed to read logs: {e}"})
             return
@@ -9709,8 +10015,20 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                         }
                         auto_added += 1
                     if auto_added > 0:
-                        with open(completion_path, "w", encoding="utf-8") as fh:
-                            yaml.safe_dump(completion_payload, fh, default_flow_style=False, sort_keys=False, allow_unicode=True)
+                        auto_entries = {k: v for k, v in entries.items() if isinstance(v, dict) and v.get("source") == "auto_miss_yesterday"}
+
+                        def _add_auto_missed(doc):
+                            doc = doc if isinstance(doc, dict) else {}
+                            if not isinstance(doc.get("entries"), dict):
+                                doc["entries"] = {}
+                            for key, entry in auto_entries.items():
+                                doc["entries"].setdefault(key, entry)
+                            return doc
+
+                        write_coordinator.update_yaml(
+                            completion_path, _add_auto_missed,
+                            default_flow_style=False, sort_keys=False, allow_unicode=True,
+                        )
 
                 rows = []
                 for block in scheduled_blocks:
@@ -10265,6 +10583,14 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                 self._write_json(500, {"ok": False, "error": f"Failed to list items: {e}"})
             return
 
+        if parsed.path == "/api/graph/references":
+            try:
+                self._write_json(200, _graph_references_payload(parse_qs(parsed.query or "")))
+            except ValueError as e:
+                self._write_json(400, {"ok": False, "error": str(e)})
+            except Exception as e:
+                self._write_json(500, {"ok": False, "error": f"Failed to read references: {e}"})
+            return
         if parsed.path == "/api/graph":
             try:
                 graph_payload = _graph_build_payload()
@@ -10711,6 +11037,20 @@ class DashboardHandler(SimpleHTTPRequestHandler):
             self._write_json(status, {"ok": ok, "stdout": out, "stderr": err})
             return
 
+        if parsed.path == "/api/console/cancel":
+            # Payload: {id: <job id from /api/console/jobs>}
+            pool = _CONSOLE_POOL
+            try:
+                job_id = int(payload.get("id"))
+            except Exception:
+                self._write_json(400, {"ok": False, "error": "Missing or invalid 'id'"})
+                return
+            if pool is None or not pool.cancel(job_id):
+                self._write_json(404, {"ok": False, "error": f"No running console job {job_id}"})
+                return
+            self._write_json(200, {"ok": True, "id": job_id, "cancelled": True})
+            return
+
         if parsed.path == "/api/yesterday/checkin":
             try:
                 date_raw = str(payload.get("date") or "").strip()
@@ -11178,6 +11518,11 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                     # Fallback
                     with open(target_path, 'w', encoding='utf-8') as f:
                         f.write(content if content is not None else "")
+                try:
+                    from modules.item_manager import item_file_saved
+                    item_file_saved(target_path)
+                except Exception:
+                    pass
 
                 self._write_json(200, {"ok": True})
             except Exception as e:
@@ -11697,6 +12042,11 @@ class DashboardHandler(SimpleHTTPRequestHandler):
                 os.makedirs(os.path.dirname(target), exist_ok=True)
                 with open(target, 'w', encoding='utf-8') as fh:
                     fh.write(str(content))
+                try:
+                    from modules.item_manager import item_file_saved
+                    item_file_saved(target)
+                except Exception:
+                    pass
                 self._write_json(200, {"ok": True, "path": path})
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Write failed: {e}"})
@@ -11744,24 +12094,7 @@ class DashboardHandler(SimpleHTTPRequestHandler):
 
         if parsed.path == "/api/logs":
             try:
-                # Basic log reader: returns last N lines
-                log_path = os.path.join(ROOT_DIR, "logs", "engine.log")
-                if not os.path.exists(log_path):
-                    self._write_json(200, {"ok": True, "logs": []})
-                    return
-                qs = parse_qs(parsed.query or "")
-                limit = 50
-                try:
-                    limit = int((qs.get("limit") or [50])[0])
-                except Exception:
-                    pass
-                lines = []
-                with open(log_path, "r", encoding="utf-8") as f:
-                    # Simple tail implementation
-                    # For very large files, this should be optimized
-                    all_lines = f.readlines()
-                    lines = [ln.strip() for ln in all_lines[-limit:]]
-                self._write_json(200, {"ok": True, "logs": lines})
+                self._write_json(200, _engine_log_payload(parse_qs(parsed.query or "")))
             except Exception as e:
                 self._write_json(500, {"ok": False, "error": f"Failed to read logs: {e}"})
             return
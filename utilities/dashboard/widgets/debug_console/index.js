@@ -304,7 +304,7 @@ export function mount(el, context) {
 
   // Poll backend logs
   let pollTimer = null;
-  const SEEN_LOGS = new Set();
+  let logCursor = '';
   let visibleObserver = null;
 
   function isVisible() {
@@ -316,19 +316,17 @@ export function mount(el, context) {
   async function pollLogs() {
     if (!el.parentNode) return;
     try {
-      const resp = await fetch('/api/logs?limit=20');
+      // The cursor makes repeat polls return only lines appended since the last one.
+      const qs = logCursor ? `&cursor=${encodeURIComponent(logCursor)}` : '';
+      const resp = await fetch(`/api/logs?limit=20${qs}`);
       if (!resp.ok) return;
       const data = await resp.json();
       if (data.ok && Array.isArray(data.logs)) {
+        if (data.reset) append('server', ['(engine log rotated)']);
         for (const line of data.logs) {
-          if (SEEN_LOGS.has(line)) continue;
-          SEEN_LOGS.add(line);
-          if (SEEN_LOGS.size > 200) {
-            const it = SEEN_LOGS.values();
-            SEEN_LOGS.delete(it.next().value);
-          }
           append('server', [String(line || '')]);
         }
+        if (data.cursor) logCursor = data.cursor;
       }
     } catch { }
   }
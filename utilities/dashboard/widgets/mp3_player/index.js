@@ -524,6 +524,8 @@ export function mount(el, context) {
       state.library = data.files || [];
       renderLibrary();
       _ensureDefaultPlaylistPresence();
+      // Server is still tagging a large library in the background; refresh once it settles.
+      if (data.indexing) setTimeout(loadLibrary, 2000);
     } catch (err) {
       setStatus(err?.message || 'Failed to load library', true);
     }
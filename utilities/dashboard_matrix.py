@@ -3,7 +3,8 @@ import sys
 import json
 import sqlite3
 import shutil
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from itertools import product
 from datetime import datetime, date
 from typing import Dict, List, Any
@@ -49,6 +50,8 @@ DEFAULT_SORT_MODE = "label-asc"
 DEFAULT_METRIC = "count"
 TEMPLATE_TYPE_HINTS = ["week", "day", "routine", "subroutine", "microroutine"]
 MAX_PROPERTY_VALUES = 30
+CUBE_ALL_PERIODS = "*"
+RESULT_CACHE_SIZE = 64
 
 def _normalize_preset_dict(raw: Dict[str, Any]) -> Dict[str, Any] | None:
     if not isinstance(raw, dict):
@@ -96,6 +99,14 @@ def _matrix_db_available() -> bool:
     return os.path.exists(MATRIX_DB_PATH)
 
 
+def _period_key(value: Any) -> str:
+    """Month bucket ('YYYY-MM') for a schedule date, or '' when there is none."""
+    text = _normalize_value(value)
+    if len(text) >= 7 and text[4] == "-" and text[:4].isdigit() and text[5:7].isdigit():
+        return text[:7]
+    return ""
+
+
 def _connect_matrix_db() -> sqlite3.Connection:
     conn = sqlite3.connect(MATRIX_DB_PATH)
     conn.row_factory = sqlite3.Row
@@ -946,6 +957,10 @@ def _apply_filters(items: List[Dict[str, Any]], filters: Dict[str, str]) -> List
                 if _normalize_key(item.get("type")) != val:
                     include = False
                     break
+            elif key == "period":
+                if _period_key(item["data"].get("schedule_date")) != val:
+                    include = False
+                    break
             elif key == "tag":
                 tags = [ _normalize_key(tag) for tag in _extract_tags(item["data"]) ]
                 if val not in tags:
@@ -1131,6 +1146,8 @@ def _compute_matrix_from_dataset(
             "col_dimensions": cols_sequence,
             "row_sort": row_sort or DEFAULT_SORT_MODE,
             "col_sort": col_sort or DEFAULT_SORT_MODE,
+            "source": "dataset",
+            "cube_version": None,
         },
     }
     result.update(metadata)
@@ -1151,14 +1168,76 @@ def compute_matrix(
     col_sort: str = None,
 ):
     if _matrix_db_available():
+        version = _cube_version()
+        cache_key = None
+        if version:
+            cache_key = (
+                version,
+                tuple(_normalize_dimension_sequence(row_dimensions, ["item_type"])),
+                tuple(_normalize_dimension_sequence(col_dimensions, ["item_status"])),
+                metric,
+                tuple(sorted((str(k), str(v)) for k, v in (filters or {}).items())),
+                row_sort or DEFAULT_SORT_MODE,
+                col_sort or DEFAULT_SORT_MODE,
+            )
+            cached = _result_cache_get(cache_key)
+            if cached is not None:
+                return cached
         try:
-            return _compute_matrix_from_db(row_dimensions, col_dimensions, metric, filters, row_sort, col_sort)
+            result = _compute_matrix_from_db(row_dimensions, col_dimensions, metric, filters, row_sort, col_sort)
         except Exception:
             pass
-    dataset = _load_items()
+        else:
+            if cache_key is not None and result["meta"].get("cube_version") == version:
+                _result_cache_put(cache_key, result)
+            return result
     return _compute_matrix_from_dataset(row_dimensions, col_dimensions, metric, filters, row_sort, col_sort)
 
 
+_RESULT_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_CUBE_VERSION_SIG: Dict[str, Any] = {"sig": None, "version": None}
+_CACHE_LOCK = threading.Lock()
+
+
+def _cube_version() -> str | None:
+    """Cube version of the matrix db on disk, memoized on the file's identity."""
+    try:
+        st = os.stat(MATRIX_DB_PATH)
+    except OSError:
+        return None
+    sig = (MATRIX_DB_PATH, st.st_ino, st.st_size, st.st_mtime_ns)
+    with _CACHE_LOCK:
+        if _CUBE_VERSION_SIG["sig"] == sig:
+            return _CUBE_VERSION_SIG["version"]
+    version = None
+    try:
+        with _connect_matrix_db() as conn:
+            version = _cube_meta(conn).get("version")
+    except Exception:
+        version = None
+    with _CACHE_LOCK:
+        _CUBE_VERSION_SIG["sig"] = sig
+        _CUBE_VERSION_SIG["version"] = version
+    return version
+
+
+def _result_cache_get(key: tuple) -> Dict[str, Any] | None:
+    with _CACHE_LOCK:
+        hit = _RESULT_CACHE.get(key)
+        if hit is None:
+            return None
+        _RESULT_CACHE.move_to_end(key)
+    return _deepcopy_simple(hit)
+
+
+def _result_cache_put(key: tuple, result: Dict[str, Any]) -> None:
+    with _CACHE_LOCK:
+        _RESULT_CACHE[key] = _deepcopy_simple(result)
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+
 def get_metadata():
     if _matrix_db_available():
         try:
@@ -1168,7 +1247,23 @@ def get_metadata():
     return _metadata_from_dataset()
 
 
+_METADATA_CACHE: Dict[str, Any] = {"version": None, "payload": None}
+
+
 def _db_metadata():
+    version = _cube_version()
+    with _CACHE_LOCK:
+        if version and _METADATA_CACHE["version"] == version:
+            return _deepcopy_simple(_METADATA_CACHE["payload"])
+    payload = _read_db_metadata()
+    if version:
+        with _CACHE_LOCK:
+            _METADATA_CACHE["version"] = version
+            _METADATA_CACHE["payload"] = _deepcopy_simple(payload)
+    return payload
+
+
+def _read_db_metadata():
     with _connect_matrix_db() as conn:
         dimension_rows = conn.execute(
             "SELECT DISTINCT dimension, kind FROM dimension_entries"
@@ -1232,6 +1327,75 @@ def _db_metadata():
     }
 
 
+def _cube_meta(conn: sqlite3.Connection) -> Dict[str, str]:
+    try:
+        return {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM cube_meta")}
+    except sqlite3.Error:
+        # Matrix db built before the cube existed.
+        return {}
+
+
+def _plan_matrix_query(
+    cube: Dict[str, str],
+    rows_sequence: List[str],
+    cols_sequence: List[str],
+    filters: Dict[str, str],
+) -> Dict[str, Any]:
+    """
+    Decide whether a matrix request can be answered from matrix_cube.
+
+    The cube holds one dimension per axis, optionally narrowed to a schedule
+    month, so it covers requests with a single row and a single column
+    dimension (both materialized) whose only filter is `period`. Anything
+    else is planned onto the raw dimension_entries join.
+    """
+    plan: Dict[str, Any] = {"source": "join"}
+    try:
+        covered = set(json.loads(cube.get("dimensions") or "[]"))
+    except Exception:
+        covered = set()
+    if not cube.get("version") or len(rows_sequence) != 1 or len(cols_sequence) != 1:
+        return plan
+    row_dim, col_dim = rows_sequence[0], cols_sequence[0]
+    if row_dim not in covered or col_dim not in covered:
+        return plan
+    period = CUBE_ALL_PERIODS
+    for raw_key, raw_val in filters.items():
+        key = _normalize_key(raw_key)
+        value = _normalize_key(raw_val)
+        if not value:
+            continue
+        if key != "period":
+            return plan
+        period = value
+    # Pairs are stored once with dim_a <= dim_b; read the other way round when needed.
+    swap = row_dim > col_dim
+    return {
+        "source": "cube",
+        "dims": (col_dim, row_dim) if swap else (row_dim, col_dim),
+        "swap": swap,
+        "period": period,
+    }
+
+
+def _fetch_cube_records(conn: sqlite3.Connection, plan: Dict[str, Any], row_alias: str, col_alias: str):
+    row_side, col_side = ("b", "a") if plan["swap"] else ("a", "b")
+    sql = f"""
+        SELECT value_{row_side} AS {row_alias}_value,
+               display_{row_side} AS {row_alias}_display,
+               value_{col_side} AS {col_alias}_value,
+               display_{col_side} AS {col_alias}_display,
+               item_names,
+               item_count AS metric_count,
+               duration_minutes AS metric_duration,
+               points_value AS metric_points
+        FROM matrix_cube
+        WHERE dim_a = ? AND dim_b = ? AND period = ?
+    """
+    dim_a, dim_b = plan["dims"]
+    return conn.execute(sql, (dim_a, dim_b, plan["period"])).fetchall()
+
+
 def _compute_matrix_from_db(
     row_dimensions: List[str],
     col_dimensions: List[str],
@@ -1239,6 +1403,7 @@ def _compute_matrix_from_db(
     filters: Dict[str, str] = None,
     row_sort: str = None,
     col_sort: str = None,
+    use_cube: bool = True,
 ):
     if metric not in METRICS:
         raise ValueError(f"Unknown metric '{metric}'")
@@ -1251,7 +1416,6 @@ def _compute_matrix_from_db(
     params: List[Any] = []
     select_parts: List[str] = []
     group_parts: List[str] = []
-    alias_refs: List[Dict[str, str]] = []
     alias_counter = 0
 
     def attach_dimensions(sequence: List[str], prefix: str) -> List[Dict[str, str]]:
@@ -1286,6 +1450,9 @@ def _compute_matrix_from_db(
         if key == "type":
             where_clauses.append("items.type = ?")
             params.append(value)
+        elif key == "period":
+            where_clauses.append("items.period = ?")
+            params.append(value)
         else:
             alias = f"flt{alias_counter}"
             alias_counter += 1
@@ -1297,9 +1464,10 @@ def _compute_matrix_from_db(
             )
             params.extend([key, value])
 
+    # GROUP_CONCAT(DISTINCT x, sep) needs SQLite 3.44+; names are de-duplicated below instead.
     select_parts.extend(
         [
-            f"GROUP_CONCAT(DISTINCT items.name, '{NAME_SEPARATOR}') AS item_names",
+            f"GROUP_CONCAT(items.name, '{NAME_SEPARATOR}') AS item_names",
             "COUNT(DISTINCT items.id) AS metric_count",
             "COALESCE(SUM(items.duration_minutes), 0) AS metric_duration",
             "COALESCE(SUM(items.points_value), 0) AS metric_points",
@@ -1317,7 +1485,12 @@ def _compute_matrix_from_db(
     """
 
     with _connect_matrix_db() as conn:
-        rows = conn.execute(sql, params).fetchall()
+        cube = _cube_meta(conn)
+        plan = _plan_matrix_query(cube, rows_sequence, cols_sequence, filters) if use_cube else {"source": "join"}
+        if plan["source"] == "cube":
+            rows = _fetch_cube_records(conn, plan, row_refs[0]["alias"], col_refs[0]["alias"])
+        else:
+            rows = conn.execute(sql, params).fetchall()
 
     rows_map: Dict[str, str] = {}
     cols_map: Dict[str, str] = {}
@@ -1348,7 +1521,7 @@ def _compute_matrix_from_db(
 
         names = record["item_names"].split(NAME_SEPARATOR) if record["item_names"] else []
         cell_key = f"{row_id}|{col_id}"
-        cells[cell_key] = _metric_payload(metric, record, [name for name in names if name])
+        cells[cell_key] = _metric_payload(metric, record, list(dict.fromkeys(name for name in names if name)))
 
     rows_list = [{"id": key, "label": rows_map[key]} for key in rows_map.keys()]
     cols_list = [{"id": key, "label": cols_map[key]} for key in cols_map.keys()]
@@ -1390,6 +1563,8 @@ def _compute_matrix_from_db(
             "col_dimensions": cols_sequence,
             "row_sort": row_sort or DEFAULT_SORT_MODE,
             "col_sort": col_sort or DEFAULT_SORT_MODE,
+            "source": plan["source"],
+            "cube_version": cube.get("version"),
         },
     }
     result.update(metadata)
@@ -0,0 +1,186 @@
+"""
+Seek-based tail for the engine log behind /api/logs.
+
+The old handler read the whole of logs/engine.log on every poll and sliced the
+last N lines. Here the first request seeks backward from EOF in fixed blocks
+until it has N matching lines, and hands back a cursor: an opaque token with
+the file identity (dev, inode) and the byte offset it stopped at. A later
+poll with that cursor reads only the bytes appended since. If the file was
+rotated (identity changed) or truncated (shorter than the offset), the
+response is flagged `reset` and starts over from the tail of the new file.
+
+Filters (`level`, substring `q`) are applied per log entry while scanning:
+an entry is a `[timestamp] LEVEL: message` header plus any continuation lines
+(tracebacks), so a matching ERROR keeps its traceback.
+"""
+
+import os
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+BLOCK_SIZE = 8192
+MAX_LIMIT = 2000
+
+_HEADER_RE = re.compile(r"^\[[^\]]*\]\s+([A-Za-z]+):")
+
+
+def _identity(st: os.stat_result) -> str:
+    return f"{st.st_dev:x}-{st.st_ino:x}"
+
+
+def make_cursor(st: os.stat_result, offset: int) -> str:
+    return f"{_identity(st)}:{int(offset)}"
+
+
+def parse_cursor(token: Any) -> Optional[Tuple[str, int]]:
+    raw = str(token or "").strip()
+    if ":" not in raw:
+        return None
+    ident, _, off = raw.rpartition(":")
+    try:
+        offset = int(off)
+    except Exception:
+        return None
+    if not ident or offset < 0:
+        return None
+    return ident, offset
+
+
+class EntryFilter:
+    """Level/substring predicate over log entries (header + continuation lines)."""
+
+    def __init__(self, levels: Optional[Iterable[str]] = None, contains: Optional[str] = None):
+        self.levels = {str(lv).strip().upper() for lv in (levels or []) if str(lv).strip()}
+        self.contains = str(contains or "").strip().lower()
+
+    @property
+    def active(self) -> bool:
+        return bool(self.levels or self.contains)
+
+    def matches(self, entry: List[str]) -> bool:
+        if self.levels:
+            m = _HEADER_RE.match(entry[0]) if entry else None
+            if not m or m.group(1).upper() not in self.levels:
+                return False
+        if self.contains:
+            return any(self.contains in ln.lower() for ln in entry)
+        return True
+
+
+def _reverse_lines(fh, end: int) -> Iterator[bytes]:
+    """Yield complete lines from `end` backward, newest first, reading BLOCK_SIZE at a time."""
+    pos = end
+    carry = b""
+    while pos > 0:
+        step = min(BLOCK_SIZE, pos)
+        pos -= step
+        fh.seek(pos)
+        chunk = fh.read(step) + carry
+        parts = chunk.split(b"\n")
+        carry = parts[0]
+        for part in reversed(parts[1:]):
+            yield part
+    yield carry
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def _tail(fh, end: int, limit: int, flt: EntryFilter) -> List[str]:
+    out: deque = deque()
+    pending: List[str] = []  # continuation lines seen before (i.e. after, in file order) their header
+    for raw in _reverse_lines(fh, end):
+        line = _decode(raw)
+        if not line.strip():
+            continue
+        if _HEADER_RE.match(line) is None:
+            pending.append(line)
+            continue
+        entry = [line] + list(reversed(pending))
+        pending = []
+        if flt.matches(entry):
+            for ln in reversed(entry):
+                out.appendleft(ln.strip())
+            if len(out) >= limit:
+                break
+    else:
+        # Leading lines without any header (e.g. a log that starts mid-entry).
+        if pending and not flt.active:
+            for ln in pending:
+                out.appendleft(ln.strip())
+    return list(out)[-limit:]
+
+
+def _forward(fh, start: int, end: int, limit: int, flt: EntryFilter) -> List[str]:
+    out: deque = deque(maxlen=limit)
+    fh.seek(start)
+    entry: List[str] = []
+
+    def _flush():
+        if entry and flt.matches(entry):
+            out.extend(ln.strip() for ln in entry)
+
+    remaining = end - start
+    carry = b""
+    while remaining > 0:
+        chunk = fh.read(min(BLOCK_SIZE * 8, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        parts = (carry + chunk).split(b"\n")
+        carry = parts.pop()
+        for raw in parts:
+            line = _decode(raw)
+            if not line.strip():
+                continue
+            if _HEADER_RE.match(line) is not None or not entry:
+                _flush()
+                entry = [line]
+            else:
+                entry.append(line)
+    _flush()
+    return list(out)
+
+
+def read_log(path: str, limit: int = 50, cursor: Any = None,
+             levels: Optional[Iterable[str]] = None, contains: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return {"logs": [...], "cursor": token, "reset": bool}.
+
+    Without a cursor (or after rotation/truncation) this is the last `limit`
+    matching lines. With a valid cursor it is what was appended since, capped
+    to the newest `limit` lines. The cursor always stops at the last complete
+    line so a half-written line is picked up whole on the next poll.
+    """
+    limit = max(1, min(MAX_LIMIT, int(limit or 50)))
+    flt = EntryFilter(levels, contains)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"logs": [], "cursor": None, "reset": cursor is not None}
+    parsed = parse_cursor(cursor) if cursor else None
+    reset = bool(cursor) and (parsed is None or parsed[0] != _identity(st) or parsed[1] > st.st_size)
+    with open(path, "rb") as fh:
+        end = _complete_end(fh, st.st_size)
+        if parsed is not None and not reset:
+            start = min(parsed[1], end)
+            logs = _forward(fh, start, end, limit, flt) if end > start else []
+        else:
+            logs = _tail(fh, end, limit, flt)
+    return {"logs": logs, "cursor": make_cursor(st, end), "reset": reset}
+
+
+def _complete_end(fh, size: int) -> int:
+    """Offset just past the last newline at or before `size` (0 if none)."""
+    pos = size
+    while pos > 0:
+        step = min(BLOCK_SIZE, pos)
+        fh.seek(pos - step)
+        chunk = fh.read(step)
+        idx = chunk.rfind(b"\n")
+        if idx >= 0:
+            return pos - step + idx + 1
+        pos -= step
+    return 0
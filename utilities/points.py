@@ -1,7 +1,19 @@
 import os
+import json
 import yaml
 from datetime import datetime
 from modules.item_manager import ensure_dir, get_user_dir
+from modules import write_coordinator
+
+
+# The ledger is an append-only JSONL file (one transaction per line). A small
+# checkpoint file records the balance together with the ledger byte offset it
+# covers, so balance reads only replay lines appended after the checkpoint.
+# Appends and checkpoint writes hold the ledger's write_coordinator lock, so
+# a checkpoint never claims another process's line without its delta.
+# Every add/reset is reported to modules.op_journal; undo compensates with
+# an opposite ledger entry rather than rewriting history.
+_TAIL_CHUNK = 8192
 
 
 def _points_dir():
@@ -9,46 +21,173 @@ def _points_dir():
 
 
 def _points_file():
+    # Legacy YAML store (balance + full ledger list); migrated on first use.
     return os.path.join(_points_dir(), 'points.yml')
 
 
-def _load_state():
-    ensure_dir(_points_dir())
-    p = _points_file()
-    if not os.path.exists(p):
-        return {'balance': 0, 'ledger': []}
+def _ledger_file():
+    return os.path.join(_points_dir(), 'points_ledger.jsonl')
+
+
+def _checkpoint_file():
+    return os.path.join(_points_dir(), 'points_balance.json')
+
+
+def _ledger_size():
+    try:
+        return os.path.getsize(_ledger_file())
+    except OSError:
+        return 0
+
+
+def _read_checkpoint():
     try:
-        with open(p, 'r') as f:
+        with open(_checkpoint_file(), 'r', encoding='utf-8') as f:
+            data = json.load(f) or {}
+        return int(data.get('balance') or 0), int(data.get('offset') or 0)
+    except Exception:
+        return None
+
+
+def _write_checkpoint(balance, offset):
+    path = _checkpoint_file()
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'balance': int(balance), 'offset': int(offset)}, f)
+    os.replace(tmp, path)
+
+
+def _iter_entries(start=0):
+    """Yield (entry, end_offset) for ledger lines at or after byte offset `start`."""
+    path = _ledger_file()
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                # Partial trailing write; ignore until it is completed.
+                break
+            offset = f.tell()
+            try:
+                entry = json.loads(raw.decode('utf-8'))
+            except Exception:
+                continue
+            if isinstance(entry, dict):
+                yield entry, offset
+
+
+def _migrate_legacy():
+    """One-time move of the YAML ledger into the JSONL ledger + checkpoint."""
+    legacy = _points_file()
+    if not os.path.exists(legacy) or os.path.exists(_ledger_file()):
+        return
+    try:
+        with open(legacy, 'r') as f:
             data = yaml.safe_load(f) or {}
-            if 'balance' not in data:
-                data['balance'] = 0
-            if 'ledger' not in data or not isinstance(data.get('ledger'), list):
-                data['ledger'] = []
-            return data
     except Exception:
-        return {'balance': 0, 'ledger': []}
+        return
+    ledger = data.get('ledger') if isinstance(data.get('ledger'), list) else []
+    lines = []
+    for entry in ledger:
+        if isinstance(entry, dict):
+            lines.append(json.dumps(entry, default=str))
+    tmp = _ledger_file() + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line + '\n')
+    os.replace(tmp, _ledger_file())
+    try:
+        balance = int(data.get('balance') or 0)
+    except Exception:
+        balance = 0
+    _write_checkpoint(balance, _ledger_size())
+    os.replace(legacy, legacy + '.migrated')
 
 
-def _save_state(state):
+def _ensure_store():
     ensure_dir(_points_dir())
-    with open(_points_file(), 'w') as f:
-        yaml.dump(state, f, default_flow_style=False)
+    _migrate_legacy()
+
+
+def _ledger_lock():
+    return write_coordinator.file_lock(_ledger_file())
+
+
+def _replay_balance():
+    """(balance, offset) covering every complete ledger line."""
+    size = _ledger_size()
+    cp = _read_checkpoint()
+    if cp is None:
+        balance, offset = 0, 0
+    else:
+        balance, offset = cp
+        if offset > size:
+            # Ledger was truncated/replaced underneath the checkpoint.
+            balance, offset = 0, 0
+    if offset == size:
+        return balance, offset, False
+    for entry, end in _iter_entries(offset):
+        try:
+            balance += int(entry.get('delta') or 0)
+        except Exception:
+            pass
+        offset = end
+    return balance, offset, True
 
 
 def get_balance():
-    return int(_load_state().get('balance') or 0)
+    _ensure_store()
+    balance, offset, replayed = _replay_balance()
+    if not replayed:
+        return balance
+    with _ledger_lock():
+        balance, offset, replayed = _replay_balance()
+        if replayed:
+            _write_checkpoint(balance, offset)
+    return balance
+
+
+def _read_tail(last):
+    """Read the last `last` ledger entries by scanning backward from EOF."""
+    path = _ledger_file()
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b''
+        while pos > 0 and buf.count(b'\n') <= last:
+            step = min(_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    lines = buf.split(b'\n')
+    if pos > 0:
+        # First line may be cut mid-record.
+        lines = lines[1:]
+    out = []
+    for raw in lines:
+        if not raw.strip():
+            continue
+        try:
+            entry = json.loads(raw.decode('utf-8'))
+        except Exception:
+            continue
+        if isinstance(entry, dict):
+            out.append(entry)
+    return out[-last:]
 
 
 def get_history(last=None):
-    led = _load_state().get('ledger') or []
+    _ensure_store()
     if isinstance(last, int) and last > 0:
-        return led[-last:]
-    return led
+        return _read_tail(last)
+    return [entry for entry, _ in _iter_entries(0)]
 
 
 def add_points(delta: int, *, reason: str = '', source_item: str | None = None, tags: list | None = None):
-    st = _load_state()
-    st['balance'] = int(st.get('balance', 0)) + int(delta)
+    _ensure_store()
     entry = {
         'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'delta': int(delta),
@@ -58,19 +197,57 @@ def add_points(delta: int, *, reason: str = '', source_item: str | None = None,
         entry['source'] = source_item
     if tags:
         entry['tags'] = tags
-    st.setdefault('ledger', [])
-    st['ledger'].append(entry)
-    _save_state(st)
-    return int(st['balance'])
+    line = (json.dumps(entry, default=str) + '\n').encode('utf-8')
+    with _ledger_lock():
+        balance, offset, _ = _replay_balance()
+        with open(_ledger_file(), 'ab') as f:
+            f.write(line)
+            end = f.tell()
+        balance += int(delta)
+        # Only lines up to our own are counted; anything later is replayed on read.
+        if end == offset + len(line):
+            _write_checkpoint(balance, end)
+    _journal({'delta': int(delta), 'reason': reason or '', 'source': source_item, 'tags': tags},
+             f"points {int(delta):+d} {reason or ''}".strip())
+    return int(balance)
 
 
 def reset_points(*, keep_ledger: bool = False):
-    st = _load_state()
-    st['balance'] = 0
-    if not keep_ledger:
-        st['ledger'] = []
-    _save_state(st)
-    return int(st.get('balance') or 0)
+    _ensure_store()
+    with _ledger_lock():
+        previous, _, _ = _replay_balance()
+        if not keep_ledger:
+            with open(_ledger_file(), 'w', encoding='utf-8'):
+                pass
+        # Checkpoint past the existing ledger so kept history no longer counts.
+        _write_checkpoint(0, _ledger_size())
+    _journal({'reset': int(previous)}, "points reset")
+    return 0
+
+
+def _journal(payload, label):
+    try:
+        from modules import op_journal
+        op_journal.record_effect('points', payload, label=label)
+    except Exception:
+        pass
+
+
+def undo_effect(payload):
+    """Compensate a journaled add/reset with an opposite ledger entry."""
+    if 'reset' in payload:
+        add_points(int(payload['reset']), reason='undo:reset')
+        return
+    add_points(-int(payload.get('delta') or 0), reason=f"undo:{payload.get('reason') or ''}",
+               source_item=payload.get('source'), tags=payload.get('tags'))
+
+
+def redo_effect(payload):
+    if 'reset' in payload:
+        reset_points(keep_ledger=True)
+        return
+    add_points(int(payload.get('delta') or 0), reason=payload.get('reason') or '',
+               source_item=payload.get('source'), tags=payload.get('tags'))
 
 
 def ensure_balance(required: int) -> bool:
@@ -7,6 +7,8 @@ from datetime import datetime
 
 import yaml
 
+from utilities import trick_index
+
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 COMMANDS_DIR = os.path.join(ROOT_DIR, "commands")
 USER_DIR = os.path.join(ROOT_DIR, "user")
@@ -1159,98 +1161,179 @@ def _iter_trick_manifest_paths():
     return sorted(paths, key=lambda x: x.lower())
 
 
-def _trick_registry_input_hash(manifest_paths):
+def _trick_registry_input_hash(manifest_paths, digests=None):
+    """
+    Hash of every manifest's relative path and content. `digests` maps a
+    relative path to the sha256 of its content when already known.
+    """
+    digests = digests or {}
     hasher = hashlib.sha256()
-    hasher.update(b"trick_registry_v2\n")
+    hasher.update(b"trick_registry_v3\n")
     for p in manifest_paths:
         rel = os.path.relpath(p, ROOT_DIR).replace("\\", "/")
         hasher.update(rel.encode("utf-8", errors="replace"))
         hasher.update(b"\n")
-        try:
-            with open(p, "rb") as fh:
-                hasher.update(fh.read())
-        except Exception:
-            pass
+        digest = digests.get(rel)
+        if digest is None:
+            digest = _file_sha256(p)
+        hasher.update(digest.encode("ascii"))
         hasher.update(b"\n")
     return hasher.hexdigest()
 
 
+def _file_sha256(path: str) -> str:
+    try:
+        with open(path, "rb") as fh:
+            return hashlib.sha256(fh.read()).hexdigest()
+    except Exception:
+        return ""
+
+
+def _trick_manifest_state(manifests, known):
+    """
+    Per-manifest {mtime_ns, size, sha256}, re-hashing only files whose stat
+    changed since `known`. Returns (files, changed relative paths).
+    """
+    files = {}
+    changed = set()
+    for p in manifests:
+        rel = os.path.relpath(p, ROOT_DIR).replace("\\", "/")
+        try:
+            st = os.stat(p)
+            fp = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        except OSError:
+            fp = {"mtime_ns": 0, "size": -1}
+        prev = known.get(rel) if isinstance(known, dict) else None
+        if isinstance(prev, dict) and prev.get("mtime_ns") == fp["mtime_ns"] and prev.get("size") == fp["size"]:
+            files[rel] = prev
+            continue
+        fp["sha256"] = _file_sha256(p)
+        files[rel] = fp
+        if not isinstance(prev, dict) or prev.get("sha256") != fp["sha256"]:
+            changed.add(rel)
+    return files, changed
+
+
+def _trick_surface_from_manifest(path: str):
+    data = _read_yaml(path)
+    if not isinstance(data, dict):
+        return None
+    stype = str(data.get("type") or "").strip().lower()
+    sname = str(data.get("name") or "").strip().lower()
+    if stype not in {"widget", "view", "panel", "popup", "gadget", "wizard"}:
+        return None
+    if not sname:
+        return None
+    surface_id = f"{stype}.{sname}"
+    source = os.path.relpath(path, ROOT_DIR).replace("\\", "/")
+    module = str(data.get("module") or sname).strip()
+    label = str(data.get("label") or _humanize_component_label(sname)).strip()
+    root_id = str(data.get("root") or surface_id).strip().lower()
+
+    rows = data.get("elements") if isinstance(data.get("elements"), list) else []
+    norm_rows = []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        elem_name = str(row.get("name") or row.get("id") or "").strip().lower()
+        if not elem_name:
+            continue
+        full_id = f"{surface_id}.{elem_name}"
+        kind = str(row.get("kind") or "unknown").strip().lower() or "unknown"
+        actions = row.get("actions") if isinstance(row.get("actions"), list) else []
+        actions = [str(a).strip().lower() for a in actions if str(a).strip()]
+        if "highlight" not in actions:
+            actions.append("highlight")
+        value_type = str(row.get("value_type") or "").strip().lower() or None
+        desc = str(row.get("description") or "").strip() or None
+        norm_rows.append({
+            "id": full_id,
+            "name": elem_name,
+            "kind": kind,
+            "actions": actions,
+            "value_type": value_type,
+            "description": desc,
+            "source": source,
+        })
+
+    return {
+        "id": surface_id,
+        "type": stype,
+        "name": sname,
+        "label": label,
+        "module": module,
+        "root": root_id,
+        "elements": norm_rows,
+        "source": source,
+    }
+
+
+_TRICK_INDEX_CACHE = {}
+
+
+def _trick_registry_state():
+    """(manifests, meta, files, changed, input_hash) for the current tree."""
+    manifests = _iter_trick_manifest_paths()
+    meta = _read_json(os.path.join(REGISTRY_DIR, "trick_registry.meta.json")) or {}
+    known = meta.get("files") if isinstance(meta.get("files"), dict) else {}
+    files, changed = _trick_manifest_state(manifests, known)
+    input_hash = _trick_registry_input_hash(manifests, {rel: f["sha256"] for rel, f in files.items()})
+    return manifests, meta, files, changed, input_hash
+
+
 def build_trick_registry(force: bool = False):
     """
     Build TRICK registry from dashboard component trick.yml manifests.
 
-    Caches by input hash in registry/trick_registry.meta.json to avoid
-    unnecessary rebuilds when manifests are unchanged.
+    registry/trick_registry.meta.json records the input hash and each
+    manifest's stat fingerprint and sha256, so an unchanged tree costs one
+    stat per manifest. When only some manifests changed, only those are
+    re-parsed and the inverted index (registry/trick_index.json, see
+    utilities/trick_index.py) is patched rather than rebuilt.
     """
     reg_path = os.path.join(REGISTRY_DIR, "trick_registry.json")
     meta_path = os.path.join(REGISTRY_DIR, "trick_registry.meta.json")
-
-    manifests = _iter_trick_manifest_paths()
-    input_hash = _trick_registry_input_hash(manifests)
-
-    if not force and os.path.exists(reg_path) and os.path.exists(meta_path):
-        meta = _read_json(meta_path) or {}
-        if str(meta.get("input_hash") or "") == input_hash:
-            cached = _read_json(reg_path) or {}
-            if isinstance(cached, dict) and cached:
-                return cached
+    index_path = os.path.join(REGISTRY_DIR, "trick_index.json")
+
+    manifests, meta, files, changed, input_hash = _trick_registry_state()
+    known = meta.get("files") if isinstance(meta.get("files"), dict) else {}
+
+    cached = _read_json(reg_path) if os.path.exists(reg_path) else {}
+    if not isinstance(cached, dict):
+        cached = {}
+    if not force and cached and str(meta.get("input_hash") or "") == input_hash:
+        if files != known:
+            # Touched but identical content: refresh fingerprints only.
+            meta["files"] = files
+            _write_json(meta_path, meta)
+        index = trick_index.read(index_path)
+        if not index or index.get("input_hash") != input_hash:
+            _write_json(index_path, trick_index.build(cached.get("surfaces") or [], input_hash))
+        return cached
+
+    # Reuse surfaces from unchanged manifests when the cached registry matches the recorded state.
+    reuse = {}
+    if not force and cached and str(cached.get("input_hash") or "") == str(meta.get("input_hash") or ""):
+        for surface in cached.get("surfaces") or []:
+            src = str(surface.get("source") or "")
+            if src in files and src not in changed:
+                reuse[src] = surface
+    stale = [s for s in cached.get("surfaces") or [] if str(s.get("source") or "") not in reuse]
 
     surfaces = []
+    fresh = []
     elements_index = {}
-
     for path in manifests:
-        data = _read_yaml(path)
-        if not isinstance(data, dict):
-            continue
-        stype = str(data.get("type") or "").strip().lower()
-        sname = str(data.get("name") or "").strip().lower()
-        if stype not in {"widget", "view", "panel", "popup", "gadget", "wizard"}:
-            continue
-        if not sname:
-            continue
-        surface_id = f"{stype}.{sname}"
-        module = str(data.get("module") or sname).strip()
-        label = str(data.get("label") or _humanize_component_label(sname)).strip()
-        root_id = str(data.get("root") or surface_id).strip().lower()
-
-        rows = data.get("elements") if isinstance(data.get("elements"), list) else []
-        norm_rows = []
-        for row in rows:
-            if not isinstance(row, dict):
+        rel = os.path.relpath(path, ROOT_DIR).replace("\\", "/")
+        surface = reuse.get(rel)
+        if surface is None:
+            surface = _trick_surface_from_manifest(path)
+            if surface is None:
                 continue
-            elem_name = str(row.get("name") or row.get("id") or "").strip().lower()
-            if not elem_name:
-                continue
-            full_id = f"{surface_id}.{elem_name}"
-            kind = str(row.get("kind") or "unknown").strip().lower() or "unknown"
-            actions = row.get("actions") if isinstance(row.get("actions"), list) else []
-            actions = [str(a).strip().lower() for a in actions if str(a).strip()]
-            if "highlight" not in actions:
-                actions.append("highlight")
-            value_type = str(row.get("value_type") or "").strip().lower() or None
-            desc = str(row.get("description") or "").strip() or None
-            element_def = {
-                "id": full_id,
-                "name": elem_name,
-                "kind": kind,
-                "actions": actions,
-                "value_type": value_type,
-                "description": desc,
-                "source": os.path.relpath(path, ROOT_DIR).replace("\\", "/"),
-            }
-            norm_rows.append(element_def)
-            elements_index[full_id] = element_def
-
-        surfaces.append({
-            "id": surface_id,
-            "type": stype,
-            "name": sname,
-            "label": label,
-            "module": module,
-            "root": root_id,
-            "elements": norm_rows,
-            "source": os.path.relpath(path, ROOT_DIR).replace("\\", "/"),
-        })
+            fresh.append(surface)
+        for element_def in surface.get("elements") or []:
+            elements_index[element_def["id"]] = element_def
+        surfaces.append(surface)
 
     surfaces.sort(key=lambda s: s.get("id", ""))
     out = {
@@ -1259,15 +1342,41 @@ def build_trick_registry(force: bool = False):
         "surfaces": surfaces,
         "elements": elements_index,
     }
+
+    index = trick_index.read(index_path) if reuse else None
+    if index and index.get("input_hash") == cached.get("input_hash"):
+        index = trick_index.update(index, stale, fresh, input_hash)
+    else:
+        index = trick_index.build(surfaces, input_hash)
+
     _write_json(reg_path, out)
+    _write_json(index_path, index)
     _write_json(meta_path, {
         "input_hash": input_hash,
         "generated_at": out["generated_at"],
         "manifest_count": len(manifests),
+        "files": files,
     })
+    _TRICK_INDEX_CACHE.clear()
     return out
 
 
+def load_trick_index(force: bool = False):
+    """
+    TrickIndex for the current manifests (kept in memory per input hash),
+    building the registry first if it is stale.
+    """
+    index_path = os.path.join(REGISTRY_DIR, "trick_index.json")
+    _manifests, meta, files, _changed, input_hash = _trick_registry_state()
+    key = (index_path, input_hash)
+    fresh = str(meta.get("input_hash") or "") == input_hash and files == meta.get("files")
+    if force or not fresh or key not in _TRICK_INDEX_CACHE:
+        build_trick_registry(force=force)
+        _TRICK_INDEX_CACHE.clear()
+        _TRICK_INDEX_CACHE[key] = trick_index.TrickIndex(trick_index.read(index_path) or trick_index.empty(input_hash))
+    return _TRICK_INDEX_CACHE[key]
+
+
 def write_trick_registry(path: str = None) -> str:
     if path is None:
         path = os.path.join(REGISTRY_DIR, "trick_registry.json")
@@ -1,6 +1,7 @@
 import os
-from datetime import datetime, timedelta
-from modules.item_manager import read_item_data, write_item_data
+from datetime import date, datetime, timedelta
+from modules.item_manager import list_all_items, read_item_data, update_item_data
+from utilities import tracking_history
 
 
 # Whitelist of item types that are trackable by default
@@ -16,27 +17,64 @@ TRACKABLE_TYPES = {
 }
 
 
+# Types whose completion/session/missed history lives in tracking_history
+# rather than in the item file. Habits keep their bespoke inline tracking.
+HISTORY_TYPES = TRACKABLE_TYPES - {"habit"}
+
+
 def is_trackable(item_type: str) -> bool:
     return (item_type or "").lower() in TRACKABLE_TYPES
 
 
-def _ensure_tracking_fields(data: dict) -> dict:
+def completion_dates(item_type: str, item_name: str, data: dict | None = None,
+                     start=None, end=None) -> list[str]:
+    """
+    Completion days for an item, oldest first: the history store plus any
+    inline `completion_dates` not migrated yet (and habits' own list, kept
+    as-is including repeats).
+    `start`/`end` (YYYY-MM-DD) bound the range.
+    """
+    item_type = (item_type or "").lower()
+    if data is None:
+        data = read_item_data(item_type, item_name) or {}
+    inline = data.get("completion_dates") if isinstance(data, dict) else None
+    # YAML loads unquoted dates as datetime.date; str() gives the same ISO prefix.
+    days = [str(d)[:10] for d in inline if isinstance(d, (str, date))] if isinstance(inline, list) else []
+    if start is not None:
+        days = [d for d in days if d >= str(start)[:10]]
+    if end is not None:
+        days = [d for d in days if d <= str(end)[:10]]
+    if item_type in HISTORY_TYPES:
+        try:
+            seen = set(days)
+            days.extend(d for d in tracking_history.dates(item_type, item_name, "completion", start, end) if d not in seen)
+        except Exception:
+            pass
+    return sorted(days)
+
+
+def _move_inline_history(item_type: str, item_name: str, data: dict) -> int:
+    if item_type not in HISTORY_TYPES:
+        return 0
+    return tracking_history.migrate_item(item_type, (data or {}).get("name") or item_name, data)
+
+
+def _ensure_tracking_fields(data: dict, item_type: str = "") -> dict:
     if data is None:
         data = {}
-    if "completion_dates" not in data or data.get("completion_dates") is None:
-        data["completion_dates"] = []
+    if (item_type or "").lower() not in HISTORY_TYPES:
+        # Habits (and untracked types) keep their history lists inline.
+        for field in ("completion_dates", "sessions", "missed_dates"):
+            if field not in data or data.get(field) is None:
+                data[field] = []
     if "last_completed" not in data:
         data["last_completed"] = None
     if "current_streak" not in data or data.get("current_streak") is None:
         data["current_streak"] = 0
     if "longest_streak" not in data or data.get("longest_streak") is None:
         data["longest_streak"] = 0
-    if "sessions" not in data or data.get("sessions") is None:
-        data["sessions"] = []  # list of {date, minutes?, count?}
     if "totals" not in data or data.get("totals") is None:
         data["totals"] = {"sessions": 0, "minutes": 0}
-    if "missed_dates" not in data or data.get("missed_dates") is None:
-        data["missed_dates"] = []
     return data
 
 
@@ -46,39 +84,13 @@ def mark_complete(item_type: str, item_name: str, minutes: int | None = None, co
     Returns True if updated, False if item not found.
     """
     item_type = (item_type or "").lower()
-    data = read_item_data(item_type, item_name)
-    if not data:
+    if not read_item_data(item_type, item_name):
         print(f"{item_type.capitalize()} '{item_name}' not found.")
         return False
 
-    data = _ensure_tracking_fields(data)
-
     today = datetime.now().strftime("%Y-%m-%d")
     yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    # Handle completion vs non-completion outcomes (e.g., appointment no-show)
-    if count_as_completion:
-        # Update completion dates (avoid duplicates for the same day)
-        if today not in data["completion_dates"]:
-            data["completion_dates"].append(today)
-
-        last_completed = data.get("last_completed")
-        if last_completed == yesterday:
-            data["current_streak"] = int(data.get("current_streak", 0)) + 1
-        elif last_completed == today:
-            # already counted today; keep current_streak as-is
-            data["current_streak"] = int(data.get("current_streak", 0)) or 1
-        else:
-            data["current_streak"] = 1
-
-        if data["current_streak"] > int(data.get("longest_streak", 0)):
-            data["longest_streak"] = data["current_streak"]
-
-        data["last_completed"] = today
-    else:
-        # Do not adjust completion dates or streaks
-        pass
-
     # Log session data if provided
     session_entry = {"date": today}
     if minutes is not None:
@@ -86,7 +98,6 @@ def mark_complete(item_type: str, item_name: str, minutes: int | None = None, co
             minutes_val = int(minutes)
             if minutes_val > 0:
                 session_entry["minutes"] = minutes_val
-                data["totals"]["minutes"] = int(data["totals"].get("minutes", 0)) + minutes_val
         except Exception:
             pass
     if count is not None:
@@ -96,27 +107,60 @@ def mark_complete(item_type: str, item_name: str, minutes: int | None = None, co
                 session_entry["count"] = count_val
         except Exception:
             pass
-
-    # Only add a session record if any detail or the completion event counts as a session
     # Outcome tagging (useful for appointments)
     if outcome:
         session_entry["outcome"] = outcome
 
-    data["sessions"].append(session_entry)
-    data["totals"]["sessions"] = int(data["totals"].get("sessions", 0)) + 1
-
-    # Appointment-specific aggregates
-    if item_type == "appointment":
-        if "attended" not in data["totals"]:
-            data["totals"]["attended"] = 0
-        if "no_shows" not in data["totals"]:
-            data["totals"]["no_shows"] = 0
-        if outcome == "attended" and count_as_completion:
-            data["totals"]["attended"] += 1
-        elif outcome == "no_show":
-            data["totals"]["no_shows"] += 1
-
-    write_item_data(item_type, item_name, data)
+    # History events go to the tracking store; the item keeps summaries only.
+    # Record the completion day once (the store ignores a second one for the same day)
+    if item_type in HISTORY_TYPES:
+        if count_as_completion:
+            tracking_history.record(item_type, item_name, "completion", today)
+        tracking_history.record(item_type, item_name, "session", **session_entry)
+
+    def _apply(data):
+        _move_inline_history(item_type, item_name, data)
+        data = _ensure_tracking_fields(data, item_type)
+
+        # Handle completion vs non-completion outcomes (e.g., appointment no-show);
+        # the latter do not adjust completion dates or streaks.
+        if count_as_completion:
+            if item_type not in HISTORY_TYPES and today not in data["completion_dates"]:
+                data["completion_dates"].append(today)
+
+            last_completed = data.get("last_completed")
+            if last_completed == yesterday:
+                data["current_streak"] = int(data.get("current_streak", 0)) + 1
+            elif last_completed == today:
+                # already counted today; keep current_streak as-is
+                data["current_streak"] = int(data.get("current_streak", 0)) or 1
+            else:
+                data["current_streak"] = 1
+
+            if data["current_streak"] > int(data.get("longest_streak", 0)):
+                data["longest_streak"] = data["current_streak"]
+
+            data["last_completed"] = today
+
+        if "minutes" in session_entry:
+            data["totals"]["minutes"] = int(data["totals"].get("minutes", 0)) + session_entry["minutes"]
+        if item_type not in HISTORY_TYPES:
+            data["sessions"].append(session_entry)
+        data["totals"]["sessions"] = int(data["totals"].get("sessions", 0)) + 1
+
+        # Appointment-specific aggregates
+        if item_type == "appointment":
+            if "attended" not in data["totals"]:
+                data["totals"]["attended"] = 0
+            if "no_shows" not in data["totals"]:
+                data["totals"]["no_shows"] = 0
+            if outcome == "attended" and count_as_completion:
+                data["totals"]["attended"] += 1
+            elif outcome == "no_show":
+                data["totals"]["no_shows"] += 1
+        return data
+
+    data = update_item_data(item_type, item_name, _apply)
 
     # Friendly output
     minutes_str = f", minutes: {session_entry.get('minutes')}" if "minutes" in session_entry else ""
@@ -142,7 +186,7 @@ def show_tracking(item_type: str, item_name: str) -> bool:
         print(f"{item_type.capitalize()} '{item_name}' not found.")
         return False
 
-    data = _ensure_tracking_fields(data)
+    data = _ensure_tracking_fields(data, item_type)
 
     print(f"--- Tracking for {item_type.capitalize()}: {item_name} ---")
     print(f"  Current Streak: {data.get('current_streak', 0)}")
@@ -163,27 +207,16 @@ def show_tracking(item_type: str, item_name: str) -> bool:
 
     # Commitment period summaries (weekly/monthly)
     if item_type == "commitment":
-        from datetime import date
-        dates = [d for d in data.get("completion_dates", []) if isinstance(d, str)]
         today_dt = datetime.now().date()
-        year, week_num, _ = today_dt.isocalendar()
-        this_month = today_dt.strftime("%Y-%m")
-        weekly = 0
-        monthly = 0
-        for ds in dates:
-            try:
-                ddt = datetime.strptime(ds, "%Y-%m-%d").date()
-            except Exception:
-                continue
-            y, w, _ = ddt.isocalendar()
-            if (y, w) == (year, week_num):
-                weekly += 1
-            if ds.startswith(this_month):
-                monthly += 1
+        week_start = today_dt - timedelta(days=today_dt.weekday())
+        month_start = today_dt.replace(day=1)
+        # Range queries: only this week's/month's completions are read.
+        weekly = len(completion_dates(item_type, item_name, data, start=week_start.isoformat()))
+        monthly = len(completion_dates(item_type, item_name, data, start=month_start.isoformat()))
         print(f"  This week completions: {weekly}  |  This month: {monthly}")
 
     # Show a short recent history list (last 10 entries)
-    dates = list(data.get("completion_dates", []))
+    dates = completion_dates(item_type, item_name, data)
     if dates:
         recent = ", ".join(dates[-10:])
         print(f"  Recent Completions: {recent}")
@@ -199,35 +232,97 @@ def mark_missed(item_type: str, item_name: str, *, outcome: str | None = None) -
     resets the current streak, and tracks totals. For appointments, defaults to no_show.
     """
     item_type = (item_type or "").lower()
-    data = read_item_data(item_type, item_name)
-    if not data:
+    if not read_item_data(item_type, item_name):
         print(f"{item_type.capitalize()} '{item_name}' not found.")
         return False
 
-    data = _ensure_tracking_fields(data)
-
     today = datetime.now().strftime("%Y-%m-%d")
+    # Session entry with outcome
+    sess = {"date": today, "outcome": outcome or ("no_show" if item_type == "appointment" else "missed")}
 
-    # Record missed date (avoid duplicates)
-    if today not in data["missed_dates"]:
-        data["missed_dates"].append(today)
+    # Record missed date once per day
+    if item_type in HISTORY_TYPES:
+        tracking_history.record(item_type, item_name, "missed", today)
+        tracking_history.record(item_type, item_name, "session", **sess)
 
-    # Reset current streak on a miss (do not change longest)
-    data["current_streak"] = 0
+    def _apply(data):
+        _move_inline_history(item_type, item_name, data)
+        data = _ensure_tracking_fields(data, item_type)
+        if item_type not in HISTORY_TYPES:
+            if today not in data["missed_dates"]:
+                data["missed_dates"].append(today)
+            data["sessions"].append(sess)
 
-    # Session entry with outcome
-    sess = {"date": today, "outcome": outcome or ("no_show" if item_type == "appointment" else "missed")}
-    data["sessions"].append(sess)
-    data["totals"]["sessions"] = int(data["totals"].get("sessions", 0)) + 1
+        # Reset current streak on a miss (do not change longest)
+        data["current_streak"] = 0
+        data["totals"]["sessions"] = int(data["totals"].get("sessions", 0)) + 1
 
-    # Totals
-    if item_type == "appointment":
-        if "no_shows" not in data["totals"]:
-            data["totals"]["no_shows"] = 0
-        data["totals"]["no_shows"] += 1
-    else:
-        data["totals"]["missed"] = int(data["totals"].get("missed", 0)) + 1
+        # Totals
+        if item_type == "appointment":
+            if "no_shows" not in data["totals"]:
+                data["totals"]["no_shows"] = 0
+            data["totals"]["no_shows"] += 1
+        else:
+            data["totals"]["missed"] = int(data["totals"].get("missed", 0)) + 1
+        return data
 
-    write_item_data(item_type, item_name, data)
+    update_item_data(item_type, item_name, _apply)
     print(f"Recorded missed: '{item_name}' ({item_type}). Streak reset.")
     return True
+
+
+def record_session(item_type: str, item_name: str, minutes: int, source: str | None = None) -> bool:
+    """
+    Logs a session (e.g. from a bound timer) without counting a completion.
+    Returns True if updated, False if item not found.
+    """
+    item_type = (item_type or "").lower()
+
+    def _apply(data):
+        if not data:
+            return None
+        _move_inline_history(item_type, item_name, data)
+        data = _ensure_tracking_fields(data, item_type)
+        if item_type not in HISTORY_TYPES:
+            data["sessions"].append({"date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                     "minutes": int(minutes), "source": source})
+        data["totals"]["sessions"] = int(data["totals"].get("sessions", 0)) + 1
+        data["totals"]["minutes"] = int(data["totals"].get("minutes", 0)) + int(minutes)
+        return data
+
+    if not read_item_data(item_type, item_name):
+        return False
+    if item_type in HISTORY_TYPES:
+        tracking_history.record(item_type, item_name, "session", datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                minutes=minutes, source=source)
+    update_item_data(item_type, item_name, _apply)
+    return True
+
+
+def migrate_history(item_types=None) -> dict:
+    """
+    One-time move of inline completion_dates / sessions / missed_dates lists
+    into the history store, for every item of the tracked types.
+    Returns {item_type: events moved}.
+    """
+    moved = {}
+    for item_type in sorted(item_types or HISTORY_TYPES):
+        item_type = item_type.lower()
+        if item_type not in HISTORY_TYPES:
+            continue
+        total = 0
+        for raw in list_all_items(item_type):
+            if not isinstance(raw, dict) or not raw.get("name"):
+                continue
+            if not any(isinstance(raw.get(f), list) for f in tracking_history.INLINE_FIELDS):
+                continue
+            name = raw["name"]
+            counts = []
+
+            def _apply(data, name=name, counts=counts):
+                counts.append(_move_inline_history(item_type, name, data))
+
+            update_item_data(item_type, name, _apply)
+            total += sum(counts)
+        moved[item_type] = total
+    return moved
@@ -0,0 +1,296 @@
+"""
+Out-of-line completion history for tracked items.
+
+`utilities.tracking` used to append every completion date, session and missed
+date to lists inside the item's YAML, so a long-lived routine or commitment
+carried years of history through every read, listing and registry scan.
+Those events now live in `user/logs/tracking_history.db`, one row each:
+
+    events(item_type, item_key, item_name, day, kind, minutes, count, outcome, source, at)
+    index (item_type, item_key, kind, day)
+
+`kind` is `completion`, `session` or `missed`. Completions and misses are
+unique per item and day (the old lists de-duplicated them too); sessions are
+not. The item file keeps only the summaries (`last_completed`,
+`current_streak`, `longest_streak`, `totals`).
+
+Queries are ranged index scans: `dates`, `count`, `sessions` for one item and
+`dates_by_item` for a whole type (list/review style readers). `migrate_item`
+moves an item's inline lists into the store; `utilities.tracking.migrate_history`
+runs it over every tracked item.
+
+Inserted rows are reported to `modules.op_journal`, so `undo` deletes them
+again (`undo_effect`) and `redo` re-inserts them (`redo_effect`).
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.item_manager import get_user_dir
+
+KINDS = ("completion", "session", "missed")
+# Inline list field -> event kind.
+INLINE_FIELDS = {"completion_dates": "completion", "missed_dates": "missed", "sessions": "session"}
+
+
+def store_path() -> str:
+    return os.path.join(get_user_dir(), "logs", "tracking_history.db")
+
+
+def item_key(name: Any) -> str:
+    return " ".join(str(name or "").split()).lower()
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY,
+            item_type TEXT NOT NULL,
+            item_key TEXT NOT NULL,
+            item_name TEXT,
+            day TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            minutes INTEGER,
+            count INTEGER,
+            outcome TEXT,
+            source TEXT,
+            at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_item ON events(item_type, item_key, kind, day);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_events_daily
+            ON events(item_type, item_key, kind, day) WHERE kind IN ('completion', 'missed');
+        """
+    )
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or store_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass
+    _create_schema(conn)
+    return conn
+
+
+def _query(sql: str, params: List[Any]) -> List[sqlite3.Row]:
+    # Reads never create the store: no file means no history yet.
+    path = store_path()
+    if not os.path.exists(path):
+        return []
+    conn = connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def _day(value: Any) -> str:
+    if value is None:
+        return datetime.now().strftime("%Y-%m-%d")
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return str(value).strip()[:10]
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+_COLUMNS = ("item_type", "item_key", "item_name", "day", "kind", "minutes", "count", "outcome", "source", "at")
+
+
+def _row(item_type: str, name: str, kind: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "item_type": str(item_type).lower(),
+        "item_key": item_key(name),
+        "item_name": str(name),
+        "day": _day(entry.get("date")),
+        "kind": kind,
+        "minutes": _int_or_none(entry.get("minutes")),
+        "count": _int_or_none(entry.get("count")),
+        "outcome": entry.get("outcome"),
+        "source": entry.get("source"),
+        "at": str(entry.get("date")) if entry.get("date") is not None else datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def _insert_row(conn: sqlite3.Connection, row: Dict[str, Any]) -> bool:
+    cur = conn.execute(
+        f"INSERT OR IGNORE INTO events ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})",
+        [row.get(col) for col in _COLUMNS],
+    )
+    return cur.rowcount > 0
+
+
+def _insert(conn: sqlite3.Connection, item_type: str, name: str, kind: str, entry: Dict[str, Any],
+            inserted: Optional[List[Dict[str, Any]]] = None) -> bool:
+    row = _row(item_type, name, kind, entry)
+    if not _insert_row(conn, row):
+        return False
+    if inserted is not None:
+        inserted.append(row)
+    return True
+
+
+def _journal(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    try:
+        from modules import op_journal
+        op_journal.record_effect("tracking_history", {"rows": rows},
+                                 label=f"{rows[0]['kind']}: {rows[0]['item_name']}")
+    except Exception:
+        pass
+
+
+def undo_effect(payload: Dict[str, Any]) -> None:
+    """Delete the rows a journaled write inserted (newest matching row each)."""
+    conn = connect()
+    try:
+        with conn:
+            for row in payload.get("rows") or []:
+                match = " AND ".join(f"{col} IS ?" for col in _COLUMNS)
+                conn.execute(
+                    f"DELETE FROM events WHERE id = (SELECT id FROM events WHERE {match} ORDER BY id DESC LIMIT 1)",
+                    [row.get(col) for col in _COLUMNS],
+                )
+    finally:
+        conn.close()
+
+
+def redo_effect(payload: Dict[str, Any]) -> None:
+    conn = connect()
+    try:
+        with conn:
+            for row in payload.get("rows") or []:
+                _insert_row(conn, row)
+    finally:
+        conn.close()
+
+
+def record(item_type: str, name: str, kind: str, date: Any = None, **fields) -> bool:
+    """
+    Append one event. Returns False if it was a duplicate completion/miss for
+    that day. `fields`: minutes, count, outcome, source.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown tracking event kind: {kind}")
+    inserted: List[Dict[str, Any]] = []
+    conn = connect()
+    try:
+        with conn:
+            _insert(conn, item_type, name, kind, dict(fields, date=date), inserted)
+    finally:
+        conn.close()
+    _journal(inserted)
+    return bool(inserted)
+
+
+def _range_sql(start: Any, end: Any) -> Tuple[str, List[str]]:
+    sql, params = "", []
+    if start is not None:
+        sql += " AND day >= ?"
+        params.append(_day(start))
+    if end is not None:
+        sql += " AND day <= ?"
+        params.append(_day(end))
+    return sql, params
+
+
+def dates(item_type: str, name: str, kind: str = "completion", start: Any = None, end: Any = None) -> List[str]:
+    """Distinct days with a `kind` event in [start, end], oldest first."""
+    rng, params = _range_sql(start, end)
+    rows = _query(
+        f"SELECT DISTINCT day FROM events WHERE item_type = ? AND item_key = ? AND kind = ?{rng} ORDER BY day",
+        [str(item_type).lower(), item_key(name), kind] + params,
+    )
+    return [row["day"] for row in rows]
+
+
+def count(item_type: str, name: str, kind: str = "completion", start: Any = None, end: Any = None) -> int:
+    rng, params = _range_sql(start, end)
+    rows = _query(
+        f"SELECT COUNT(*) FROM events WHERE item_type = ? AND item_key = ? AND kind = ?{rng}",
+        [str(item_type).lower(), item_key(name), kind] + params,
+    )
+    return int(rows[0][0] or 0) if rows else 0
+
+
+def sessions(item_type: str, name: str, start: Any = None, end: Any = None,
+             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Session entries (the old inline `sessions` shape), oldest first; `limit` keeps the newest."""
+    rng, params = _range_sql(start, end)
+    sql = (
+        "SELECT at, day, minutes, count, outcome, source FROM events "
+        f"WHERE item_type = ? AND item_key = ? AND kind = 'session'{rng} ORDER BY day DESC, id DESC"
+    )
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    rows = _query(sql, [str(item_type).lower(), item_key(name)] + params)
+    out = []
+    for row in reversed(rows):
+        entry = {"date": row["at"] or row["day"]}
+        for field in ("minutes", "count", "outcome", "source"):
+            if row[field] is not None:
+                entry[field] = row[field]
+        out.append(entry)
+    return out
+
+
+def dates_by_item(item_type: str, kind: str = "completion", start: Any = None, end: Any = None) -> Dict[str, List[str]]:
+    """{item_key: [days]} for every item of a type, in one scan."""
+    rng, params = _range_sql(start, end)
+    rows = _query(
+        f"SELECT DISTINCT item_key, day FROM events WHERE item_type = ? AND kind = ?{rng} ORDER BY item_key, day",
+        [str(item_type).lower(), kind] + params,
+    )
+    out: Dict[str, List[str]] = {}
+    for row in rows:
+        out.setdefault(row["item_key"], []).append(row["day"])
+    return out
+
+
+def migrate_item(item_type: str, name: str, data: Dict[str, Any],
+                 fields: Iterable[str] = tuple(INLINE_FIELDS)) -> int:
+    """
+    Move inline history lists out of `data` (in place) into the store.
+    Returns the number of events written; the caller saves `data`.
+    """
+    moved = 0
+    pending = []
+    for field in fields:
+        values = data.get(field)
+        if not isinstance(values, list):
+            continue
+        kind = INLINE_FIELDS[field]
+        for value in values:
+            entry = dict(value) if isinstance(value, dict) else {"date": value}
+            if entry.get("date"):
+                pending.append((kind, entry))
+        pending.append((None, field))
+    if not pending:
+        return 0
+    inserted: List[Dict[str, Any]] = []
+    conn = connect()
+    try:
+        with conn:
+            for kind, entry in pending:
+                if kind is None:
+                    data.pop(entry, None)
+                elif _insert(conn, item_type, name, kind, entry, inserted):
+                    moved += 1
+    finally:
+        conn.close()
+    _journal(inserted)
+    return moved
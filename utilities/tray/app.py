@@ -46,7 +46,7 @@ from modules.timer import main as Timer
 from modules.scheduler import get_flattened_schedule, schedule_path_for_date, status_current_path
 from modules.scheduler.sleep_gate import SLEEP_POLICY_OPTIONS, build_sleep_interrupt
 from modules.console import invoke_command
-from modules.item_manager import list_all_items
+from modules import due_index
 
 DEFAULT_NOTIFICATION_SETTINGS = {
     "enabled": True,
@@ -919,33 +919,28 @@ $notifier.Show($toast)
             lookahead_days = 0
         horizon = datetime.now() + timedelta(days=lookahead_days)
         items = []
-        for item_type in ["task", "goal", "milestone", "project", "appointment"]:
-            try:
-                rows = list_all_items(item_type) or []
-            except Exception:
-                rows = []
-            for row in rows:
-                if not isinstance(row, dict):
-                    continue
-                deadline = row.get("deadline")
-                due_raw = deadline or row.get("due_date") or row.get("due") or row.get("date")
-                due_dt = self._parse_date_value(due_raw)
-                if not due_dt:
-                    continue
-                status = str(row.get("status") or "").strip().lower()
-                if status in {"done", "completed", "complete"}:
-                    continue
-                if due_dt > horizon:
-                    continue
-                items.append(
-                    {
-                        "name": str(row.get("name") or "(untitled)"),
-                        "type": item_type,
-                        "due_kind": "deadline" if deadline else "due_date",
-                        "due_raw": str(due_raw or ""),
-                        "due_dt": due_dt,
-                    }
-                )
+        try:
+            rows = due_index.query(
+                fields=("due_at",),
+                end=horizon.isoformat(timespec="seconds"),
+                types=["task", "goal", "milestone", "project", "appointment"],
+                exclude_statuses={"done", "completed", "complete"},
+            )
+        except Exception:
+            rows = []
+        for row in rows:
+            due_dt = self._parse_date_value(row.get("due_at"))
+            if not due_dt:
+                continue
+            items.append(
+                {
+                    "name": str(row.get("name") or "(untitled)"),
+                    "type": row.get("item_type"),
+                    "due_kind": row.get("due_kind") or "due_date",
+                    "due_raw": str(row.get("due_raw") or ""),
+                    "due_dt": due_dt,
+                }
+            )
         now = datetime.now()
         items.sort(
             key=lambda item: (
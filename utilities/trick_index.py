@@ -0,0 +1,212 @@
+"""
+Inverted index over the TRICK registry.
+
+`registry_builder.build_trick_registry` writes it next to the registry as
+registry/trick_index.json, stamped with the registry's input hash:
+
+    actions   action -> element ids
+    types     surface type -> surface ids
+    tokens    token -> {"surfaces": [...], "elements": [...]}
+    trie      dotted-id segment trie, e.g.
+              {"widget": {"timer": {"$": "surface", "start_button": {"$": "element"}}}}
+
+Postings are sorted lists. Surface tokens are the words of the id, type and
+label; element tokens are the words of the id (split on anything that is
+not a letter or digit).
+
+When only some manifests changed, `update()` withdraws the postings of their
+old surfaces and adds the new ones instead of re-indexing every surface.
+Queries (`TrickIndex.surfaces` / `elements` / `complete`) intersect posting
+lists; a query word matches every token it is a prefix of.
+"""
+
+import bisect
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+INDEX_VERSION = 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokens(text: Any) -> List[str]:
+    return _WORD_RE.findall(str(text or "").lower())
+
+
+def _postings(surface: Dict[str, Any]) -> Iterable[Tuple[Tuple[str, ...], str]]:
+    """(path into the index, id) pairs contributed by one surface."""
+    sid = str(surface.get("id") or "")
+    stype = str(surface.get("type") or "")
+    yield ("types", stype), sid
+    for tok in set(tokens(f"{sid} {stype} {surface.get('label') or ''}")):
+        yield ("tokens", tok, "surfaces"), sid
+    for row in surface.get("elements") or []:
+        eid = str(row.get("id") or "")
+        for action in row.get("actions") or []:
+            yield ("actions", str(action)), eid
+        for tok in set(tokens(eid)):
+            yield ("tokens", tok, "elements"), eid
+
+
+def _trie_paths(surface: Dict[str, Any]) -> Iterable[Tuple[List[str], str]]:
+    yield str(surface.get("id") or "").split("."), "surface"
+    for row in surface.get("elements") or []:
+        yield str(row.get("id") or "").split("."), "element"
+
+
+def empty(input_hash: str = "") -> Dict[str, Any]:
+    return {"version": INDEX_VERSION, "input_hash": input_hash,
+            "actions": {}, "types": {}, "tokens": {}, "trie": {}}
+
+
+def _add(index: Dict[str, Any], surface: Dict[str, Any]) -> None:
+    for path, ident in _postings(surface):
+        node = index
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        bucket = node.setdefault(path[-1], [])
+        pos = bisect.bisect_left(bucket, ident)
+        if pos == len(bucket) or bucket[pos] != ident:
+            bucket.insert(pos, ident)
+    for segments, kind in _trie_paths(surface):
+        node = index["trie"]
+        for seg in segments:
+            node = node.setdefault(seg, {})
+        node["$"] = kind
+
+
+def _remove(index: Dict[str, Any], surface: Dict[str, Any]) -> None:
+    for path, ident in _postings(surface):
+        chain = [index]
+        for key in path:
+            nxt = chain[-1].get(key) if isinstance(chain[-1], dict) else None
+            if nxt is None:
+                break
+            chain.append(nxt)
+        else:
+            bucket = chain[-1]
+            pos = bisect.bisect_left(bucket, ident)
+            if pos < len(bucket) and bucket[pos] == ident:
+                bucket.pop(pos)
+            # Drop emptied posting lists and token entries.
+            for depth in range(len(path), 1, -1):
+                if chain[depth]:
+                    break
+                del chain[depth - 1][path[depth - 1]]
+    for segments, _kind in sorted(_trie_paths(surface), key=lambda p: -len(p[0])):
+        chain = [index["trie"]]
+        for seg in segments:
+            nxt = chain[-1].get(seg)
+            if nxt is None:
+                break
+            chain.append(nxt)
+        else:
+            chain[-1].pop("$", None)
+            for depth in range(len(segments), 0, -1):
+                if chain[depth]:
+                    break
+                del chain[depth - 1][segments[depth - 1]]
+
+
+def build(surfaces: Iterable[Dict[str, Any]], input_hash: str = "") -> Dict[str, Any]:
+    index = empty(input_hash)
+    for surface in surfaces:
+        _add(index, surface)
+    return index
+
+
+def update(index: Dict[str, Any], removed: Iterable[Dict[str, Any]], added: Iterable[Dict[str, Any]],
+           input_hash: str = "") -> Dict[str, Any]:
+    """Replace the postings of `removed` surfaces with those of `added` in place."""
+    for surface in removed:
+        _remove(index, surface)
+    for surface in added:
+        _add(index, surface)
+    index["input_hash"] = input_hash
+    return index
+
+
+def read(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    return data
+
+
+class TrickIndex:
+    """Read-only queries over a loaded index document."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self._token_keys = sorted(data.get("tokens") or {})
+
+    @property
+    def input_hash(self) -> str:
+        return str(self.data.get("input_hash") or "")
+
+    def _all(self, section: str) -> Set[str]:
+        out: Set[str] = set()
+        for ids in (self.data.get(section) or {}).values():
+            out.update(ids)
+        return out
+
+    def _match(self, word: str, kind: str) -> Set[str]:
+        out: Set[str] = set()
+        token_map = self.data.get("tokens") or {}
+        pos = bisect.bisect_left(self._token_keys, word)
+        while pos < len(self._token_keys) and self._token_keys[pos].startswith(word):
+            out.update(token_map[self._token_keys[pos]].get(kind) or [])
+            pos += 1
+        return out
+
+    def _narrow(self, ids: Optional[Set[str]], q: str, kind: str) -> Optional[Set[str]]:
+        for word in tokens(q):
+            found = self._match(word, kind)
+            ids = found if ids is None else ids & found
+            if not ids:
+                return set()
+        return ids
+
+    def surfaces(self, q: str = "", type_: str = "") -> List[str]:
+        """Surface ids of `type_` whose id/type/label words are prefixed by every word of `q`."""
+        ids = set((self.data.get("types") or {}).get(type_.lower(), [])) if type_ else None
+        ids = self._narrow(ids, q, "surfaces")
+        return sorted(self._all("types") if ids is None else ids)
+
+    def elements(self, action: str = "", q: str = "") -> List[str]:
+        """Element ids allowing `action` whose id words are prefixed by every word of `q`."""
+        ids = set((self.data.get("actions") or {}).get(action.lower(), [])) if action else None
+        ids = self._narrow(ids, q, "elements")
+        return sorted(self._all("actions") if ids is None else ids)
+
+    def kind(self, ident: str) -> Optional[str]:
+        """'surface', 'element' or None."""
+        node = self.data.get("trie") or {}
+        for seg in str(ident or "").strip().lower().split("."):
+            node = node.get(seg)
+            if node is None:
+                return None
+        return node.get("$")
+
+    def complete(self, prefix: str, kind: Optional[str] = None) -> List[str]:
+        """Ids starting with `prefix`; the last dotted segment may be partial."""
+        segments = str(prefix or "").strip().lower().split(".")
+        node = self.data.get("trie") or {}
+        for seg in segments[:-1]:
+            node = node.get(seg)
+            if node is None:
+                return []
+        base = segments[:-1]
+        stack = [(base + [seg], child) for seg, child in node.items()
+                 if seg != "$" and seg.startswith(segments[-1])]
+        out = []
+        while stack:
+            path, node = stack.pop()
+            if node.get("$") and (kind is None or node["$"] == kind):
+                out.append(".".join(path))
+            stack.extend((path + [seg], child) for seg, child in node.items() if seg != "$")
+        return sorted(out)